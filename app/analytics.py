@@ -1,17 +1,40 @@
 """
 Analytics Module - Comprehensive analytics and data processing system
+
+Metrics are stored column-wise: one series per metric name and tag set,
+each a buffer of parallel timestamp and value arrays kept in time order.
+Every metric holds at most ``max_points_per_metric`` points across all its
+tag sets, evicting the earliest-arrived first, and series left empty are
+dropped with their index entries. Time ranges are found by binary search and
+tag filters resolve to series ids through an inverted index, so queries
+touch only matching data.
 """
 
 import asyncio
 import hashlib
+import heapq
+import itertools
 # json import removed as it was unused
 import logging
+import math
 import statistics
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict, deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Optional, Union
 
+# Optional imports with fallbacks
+try:
+    import numpy as np
+
+    numpy_available = True
+except ImportError:
+    np = None
+    numpy_available = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -90,14 +113,125 @@ class AnalyticsReport:
     data: dict[str, Any]
 
 
+class MetricSeries:
+    """One metric's points for one tag set, in time order"""
+
+    __slots__ = ("metric_name", "tags", "timestamps", "values", "head")
+
+    def __init__(self, metric_name: str, tags: dict[str, str]):
+        self.metric_name = metric_name
+        self.tags = tags
+        # Epoch seconds and values; entries before ``head`` are expired
+        self.timestamps = array("d")
+        self.values = array("d")
+        self.head = 0
+
+    def __len__(self) -> int:
+        return len(self.timestamps) - self.head
+
+    def append(self, timestamp: float, value: float):
+        if len(self.timestamps) > self.head and timestamp < self.timestamps[-1]:
+            # Late point: keep the columns sorted
+            index = bisect_right(self.timestamps, timestamp, self.head)
+            self.timestamps.insert(index, timestamp)
+            self.values.insert(index, value)
+        else:
+            self.timestamps.append(timestamp)
+            self.values.append(value)
+
+    def drop_oldest(self):
+        self.drop_before_index(self.head + 1)
+
+    def drop_before(self, timestamp: float):
+        self.drop_before_index(bisect_left(self.timestamps, timestamp, self.head))
+
+    def drop_before_index(self, index: int):
+        self.head = max(self.head, index)
+        # Compact once the dead prefix outgrows the live data
+        if self.head > len(self):
+            del self.timestamps[: self.head]
+            del self.values[: self.head]
+            self.head = 0
+
+    def range(self, start: Optional[float], end: Optional[float]) -> tuple[int, int]:
+        """Index bounds of the points with start <= timestamp <= end"""
+        lo = self.head if start is None else bisect_left(self.timestamps, start, self.head)
+        hi = len(self.timestamps) if end is None else bisect_right(self.timestamps, end, lo)
+        return lo, hi
+
+
 class MetricStore:
-    """In-memory metric storage with time-based retention"""
+    """In-memory columnar metric storage with time-based retention"""
 
-    def __init__(self, retention_hours: int = 24):
-        self.data: dict[str, deque[DataPoint]] = defaultdict(lambda: deque(maxlen=10000))
+    def __init__(self, retention_hours: int = 24, max_points_per_metric: int = 10000):
         self.retention_hours = retention_hours
+        self.max_points_per_metric = max_points_per_metric
         self.last_cleanup = datetime.now()
 
+        self.series: dict[int, MetricSeries] = {}
+        self._next_series_id = itertools.count()
+        self._series_ids: dict[tuple[str, frozenset], int] = {}
+        # Series ids of each metric, in creation order
+        self._metric_series: dict[str, dict[int, None]] = defaultdict(dict)
+        # (metric, tag, value) -> ids of the series carrying that tag
+        self._tag_index: dict[tuple[str, str, str], set[int]] = defaultdict(set)
+        # Series id of every stored point of a metric, in arrival order
+        self._arrivals: dict[str, deque[int]] = defaultdict(deque)
+
+    def _get_series(self, metric_name: str, tags: dict[str, str]) -> tuple[int, MetricSeries]:
+        key = (metric_name, frozenset(tags.items()))
+        series_id = self._series_ids.get(key)
+        if series_id is None:
+            series_id = self._series_ids[key] = next(self._next_series_id)
+            self.series[series_id] = MetricSeries(metric_name, dict(tags))
+            self._metric_series[metric_name][series_id] = None
+            for tag, value in tags.items():
+                self._tag_index[(metric_name, tag, value)].add(series_id)
+        return series_id, self.series[series_id]
+
+    def _remove_series(self, series_id: int):
+        series = self.series.pop(series_id)
+        metric_name = series.metric_name
+        del self._series_ids[(metric_name, frozenset(series.tags.items()))]
+        self._metric_series[metric_name].pop(series_id, None)
+        for tag, value in series.tags.items():
+            index_key = (metric_name, tag, value)
+            ids = self._tag_index.get(index_key)
+            if ids is not None:
+                ids.discard(series_id)
+                if not ids:
+                    del self._tag_index[index_key]
+        if not self._metric_series[metric_name]:
+            del self._metric_series[metric_name]
+            self._arrivals.pop(metric_name, None)
+
+    def _evict_oldest(self, metric_name: str):
+        """Drop the earliest-arrived point of a metric, and its series once empty"""
+        arrivals = self._arrivals[metric_name]
+        while arrivals:
+            series_id = arrivals.popleft()
+            series = self.series.get(series_id)
+            if series is None or not len(series):
+                continue
+            series.drop_oldest()
+            if not len(series):
+                self._remove_series(series_id)
+            return
+
+    def _matching_series(
+        self, metric_name: str, tags: Optional[dict[str, str]]
+    ) -> list[MetricSeries]:
+        if not tags:
+            return [self.series[i] for i in self._metric_series.get(metric_name, ())]
+
+        ids: Optional[set[int]] = None
+        for tag, value in tags.items():
+            tagged = self._tag_index.get((metric_name, tag, value), set())
+            ids = tagged if ids is None else ids & tagged
+            if not ids:
+                return []
+        return [self.series[i] for i in sorted(ids)]
+
     def add_point(
         self,
         metric_name: str,
@@ -112,14 +246,47 @@ class MetricStore:
         if tags is None:
             tags = {}
 
-        point = DataPoint(timestamp=timestamp, value=value, tags=tags, metric_name=metric_name)
-
-        self.data[metric_name].append(point)
+        series_id, series = self._get_series(metric_name, tags)
+        series.append(timestamp.timestamp(), value)
+        arrivals = self._arrivals[metric_name]
+        arrivals.append(series_id)
+        while len(arrivals) > self.max_points_per_metric:
+            self._evict_oldest(metric_name)
 
         # Periodic cleanup
         if (datetime.now() - self.last_cleanup).total_seconds() > 3600:  # Every hour
             self._cleanup_old_data()
 
+    def get_values(
+        self,
+        metric_name: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        tags: Optional[dict[str, str]] = None,
+    ) -> tuple[array, array]:
+        """Timestamps (epoch seconds) and values of the matching points, in time order"""
+        start = start_time.timestamp() if start_time else None
+        end = end_time.timestamp() if end_time else None
+
+        slices = []
+        for series in self._matching_series(metric_name, tags):
+            lo, hi = series.range(start, end)
+            if lo < hi:
+                slices.append((series.timestamps[lo:hi], series.values[lo:hi]))
+
+        if not slices:
+            return array("d"), array("d")
+        if len(slices) == 1:
+            return slices[0]
+
+        # Several tag sets matched; interleave them by time
+        timestamps, values = array("d"), array("d")
+        for series_timestamps, series_values in slices:
+            timestamps.extend(series_timestamps)
+            values.extend(series_values)
+        order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+        return array("d", (timestamps[i] for i in order)), array("d", (values[i] for i in order))
+
     def get_points(
         self,
         metric_name: str,
@@ -128,35 +295,46 @@ class MetricStore:
         tags: Optional[dict[str, str]] = None,
     ) -> list[DataPoint]:
         """Retrieve data points with optional filtering"""
-        if metric_name not in self.data:
-            return []
-
-        points = list(self.data[metric_name])
-
-        # Time filtering
-        if start_time:
-            points = [p for p in points if p.timestamp >= start_time]
-        if end_time:
-            points = [p for p in points if p.timestamp <= end_time]
-
-        # Tag filtering
-        if tags:
-            points = [p for p in points if all(p.tags.get(k) == v for k, v in tags.items())]
-
+        start = start_time.timestamp() if start_time else None
+        end = end_time.timestamp() if end_time else None
+
+        points = []
+        for series in self._matching_series(metric_name, tags):
+            lo, hi = series.range(start, end)
+            points.extend(
+                DataPoint(
+                    timestamp=datetime.fromtimestamp(series.timestamps[i]),
+                    value=series.values[i],
+                    tags=series.tags,
+                    metric_name=metric_name,
+                )
+                for i in range(lo, hi)
+            )
+        points.sort(key=lambda p: p.timestamp)
         return points
 
     def get_metric_names(self) -> list[str]:
         """Get all metric names"""
-        return list(self.data.keys())
+        return list(self._metric_series.keys())
 
     def _cleanup_old_data(self):
         """Remove old data points beyond retention period"""
-        cutoff_time = datetime.now() - timedelta(hours=self.retention_hours)
-
-        for metric_name in self.data:
-            # Remove old points
-            while self.data[metric_name] and self.data[metric_name][0].timestamp < cutoff_time:
-                self.data[metric_name].popleft()
+        cutoff = (datetime.now() - timedelta(hours=self.retention_hours)).timestamp()
+
+        for series_id, series in list(self.series.items()):
+            series.drop_before(cutoff)
+            if not len(series):
+                self._remove_series(series_id)
+
+        # Rebuild the arrival order from what survived, oldest first
+        for metric_name, series_ids in self._metric_series.items():
+            merged = heapq.merge(
+                *(
+                    zip(self.series[i].timestamps[self.series[i].head :], itertools.repeat(i))
+                    for i in series_ids
+                )
+            )
+            self._arrivals[metric_name] = deque(series_id for _, series_id in merged)
 
         self.last_cleanup = datetime.now()
         logger.info("Completed data cleanup")
@@ -176,34 +354,22 @@ class AnalyticsProcessor:
         tags: Optional[dict[str, str]] = None,
     ) -> Optional[MetricSummary]:
         """Calculate summary statistics for a metric"""
-        points = self.metric_store.get_points(metric_name, start_time, end_time, tags)
+        timestamps, values = self.metric_store.get_values(
+            metric_name, start_time, end_time, tags
+        )
 
-        if not points:
+        if not values:
             return None
 
-        values = [p.value for p in points]
-
         try:
+            stats = self._summarize(values)
             summary = MetricSummary(
                 name=metric_name,
-                count=len(values),
-                sum=sum(values),
-                min=min(values),
-                max=max(values),
-                average=statistics.mean(values),
-                median=statistics.median(values),
-                std_dev=statistics.stdev(values) if len(values) > 1 else 0.0,
-                percentiles={
-                    "p50": statistics.median(values),
-                    "p90": self._percentile(values, 0.9),
-                    "p95": self._percentile(values, 0.95),
-                    "p99": self._percentile(values, 0.99),
-                },
                 time_range=(
-                    (points[0].timestamp, points[-1].timestamp)
-                    if points
-                    else (datetime.now(), datetime.now())
+                    datetime.fromtimestamp(timestamps[0]),
+                    datetime.fromtimestamp(timestamps[-1]),
                 ),
+                **stats,
             )
 
             return summary
@@ -212,14 +378,40 @@ class AnalyticsProcessor:
             logger.error(f"Failed to calculate summary for {metric_name}: {e}")
             return None
 
-    def _percentile(self, values: list[float], percentile: float) -> float:
-        """Calculate percentile value"""
-        if not values:
-            return 0.0
+    def _summarize(self, values: array) -> dict[str, Any]:
+        """Summary statistics from one sort (or one vectorised partition) of the values"""
+        n = len(values)
+        ranks = {"p90": 0.9, "p95": 0.95, "p99": 0.99}
 
-        sorted_values = sorted(values)
-        index = int(percentile * (len(sorted_values) - 1))
-        return sorted_values[index]
+        if numpy_available:
+            data = np.frombuffer(values, dtype=np.float64)
+            # Lower nearest-rank percentiles, as in the sorted fallback below
+            ordered = np.partition(
+                data, sorted({int(q * (n - 1)) for q in ranks.values()} | {n // 2, (n - 1) // 2})
+            )
+            total = float(data.sum())
+            minimum, maximum = float(data.min()), float(data.max())
+            std_dev = float(data.std(ddof=1)) if n > 1 else 0.0
+        else:
+            ordered = sorted(values)
+            total = math.fsum(values)
+            minimum, maximum = ordered[0], ordered[-1]
+            std_dev = statistics.stdev(values) if n > 1 else 0.0
+
+        median = float(ordered[n // 2] + ordered[(n - 1) // 2]) / 2
+        return {
+            "count": n,
+            "sum": total,
+            "min": minimum,
+            "max": maximum,
+            "average": total / n,
+            "median": median,
+            "std_dev": std_dev,
+            "percentiles": {
+                "p50": median,
+                **{name: float(ordered[int(q * (n - 1))]) for name, q in ranks.items()},
+            },
+        }
 
     def detect_anomalies(
         self, metric_name: str, window_minutes: int = 60, threshold_std: float = 2.0
@@ -251,13 +443,12 @@ class AnalyticsProcessor:
         end_time = datetime.now()
         start_time = end_time - timedelta(minutes=window_minutes)
 
-        points = self.metric_store.get_points(metric_name, start_time, end_time)
+        _, values = self.metric_store.get_values(metric_name, start_time, end_time)
 
-        if len(points) < 2:
+        if len(values) < 2:
             return None
 
         # Simple linear trend calculation
-        values = [p.value for p in points]
         n = len(values)
 
         # Calculate slope using least squares
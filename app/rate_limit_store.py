@@ -0,0 +1,362 @@
+"""
+Rate limit state stores.
+
+Every key holds a fixed-size state (three numbers and a block deadline), so
+memory is O(1) per key whatever the request rate. Two algorithms are
+supported:
+
+* ``sliding_window`` - sliding-window counter: the previous window's count
+  is weighted by how much of it still overlaps the sliding window.
+* ``token_bucket`` - ``limit`` tokens refilled evenly over the window.
+
+Stores apply a check atomically: in process with a lock, across gunicorn
+workers with a SQLite write transaction, and across hosts with a Redis Lua
+script. The SQLite and Redis stores do I/O, so they set ``blocking`` and
+async callers run their checks off the event loop.
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+SLIDING_WINDOW = "sliding_window"
+TOKEN_BUCKET = "token_bucket"
+ALGORITHMS = (SLIDING_WINDOW, TOKEN_BUCKET)
+
+# (window_start | tokens, previous_count | updated_at, current_count, blocked_until)
+State = tuple[float, float, float, float]
+
+
+class RateLimitDecision(NamedTuple):
+    """Outcome of a rate limit check"""
+
+    allowed: bool
+    remaining: int
+    retry_after: float
+
+
+def state_ttl(window: float, block_seconds: float) -> float:
+    """How long a key's state stays relevant after its last update"""
+    return 2 * window + block_seconds
+
+
+def apply_rate_limit(
+    algorithm: str,
+    state: Optional[State],
+    limit: int,
+    window: float,
+    block_seconds: float,
+    now: float,
+) -> tuple[RateLimitDecision, State]:
+    """Count one request against ``state`` and return the decision and new state"""
+    blocked_until = state[3] if state else 0.0
+    if blocked_until > now:
+        return RateLimitDecision(False, 0, blocked_until - now), state
+
+    if algorithm == TOKEN_BUCKET:
+        rate = limit / window
+        tokens, updated = (state[0], state[1]) if state else (float(limit), now)
+        tokens = min(float(limit), tokens + max(0.0, now - updated) * rate)
+        if tokens >= 1:
+            tokens -= 1
+            decision = RateLimitDecision(True, int(tokens), 0.0)
+        else:
+            decision = RateLimitDecision(False, 0, (1 - tokens) / rate)
+        new_state = (tokens, now, 0.0)
+
+    elif algorithm == SLIDING_WINDOW:
+        start = math.floor(now / window) * window
+        window_start, previous, current = state[:3] if state else (start, 0.0, 0.0)
+        if start != window_start:
+            previous = current if math.isclose(start - window_start, window) else 0.0
+            current = 0.0
+            window_start = start
+
+        elapsed = now - window_start
+        estimated = previous * (1 - elapsed / window) + current
+        if estimated + 1 <= limit:
+            current += 1
+            decision = RateLimitDecision(True, int(limit - estimated - 1), 0.0)
+        else:
+            if current + 1 > limit:
+                # Wait for the next window, then for this one's weight to decay
+                retry_after = window - elapsed + window * max(0.0, 1 - (limit - 1) / current)
+            else:
+                retry_after = window * (1 - (limit - 1 - current) / previous) - elapsed
+            decision = RateLimitDecision(False, 0, max(0.0, retry_after))
+        new_state = (window_start, previous, current)
+
+    else:
+        raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+
+    if not decision.allowed and block_seconds > 0:
+        blocked_until = now + block_seconds
+        decision = RateLimitDecision(False, 0, max(decision.retry_after, block_seconds))
+
+    return decision, (*new_state, blocked_until)
+
+
+class RateLimitStore:
+    """Base class for rate limit state stores"""
+
+    backend = "base"
+    # True when hit() waits on I/O and must not run on an event loop
+    blocking = False
+
+    def hit(
+        self,
+        key: str,
+        algorithm: str,
+        limit: int,
+        window: float,
+        block_seconds: float = 0.0,
+        now: Optional[float] = None,
+    ) -> RateLimitDecision:
+        """Count a request for ``key`` and decide whether it is allowed"""
+        raise NotImplementedError
+
+    def reset(self, key: str) -> None:
+        """Forget all state for ``key``"""
+        raise NotImplementedError
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": self.backend}
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """In-process store; keys are kept in last-touched order for O(1) expiry"""
+
+    backend = "memory"
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._states: OrderedDict[str, tuple[State, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def hit(self, key, algorithm, limit, window, block_seconds=0.0, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._states.pop(key, None)
+            state = entry[0] if entry and entry[1] > now else None
+            decision, state = apply_rate_limit(algorithm, state, limit, window, block_seconds, now)
+            self._states[key] = (state, now + state_ttl(window, block_seconds))
+
+            # The oldest-touched keys sit at the front; drop them once idle or over capacity
+            while self._states:
+                oldest_key, (_, expires_at) = next(iter(self._states.items()))
+                if expires_at > now and len(self._states) <= self.max_keys:
+                    break
+                del self._states[oldest_key]
+
+        return decision
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._states.pop(key, None)
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": self.backend, "keys": len(self._states), "max_keys": self.max_keys}
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """SQLite store shared by every worker process on a host"""
+
+    backend = "sqlite"
+    blocking = True
+
+    def __init__(self, path: Union[str, Path], table: str = "rate_limits", purge_every: int = 1000):
+        if not table.replace("_", "").isalnum():
+            raise ValueError(f"Invalid rate limit table name: {table}")
+
+        self.path = str(path)
+        self.table = table
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._hits = 0
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._connect().executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                a REAL NOT NULL,
+                b REAL NOT NULL,
+                c REAL NOT NULL,
+                blocked_until REAL NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_{table}_expires ON {table}(expires_at);
+            """
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, reopened after a fork so workers never share one
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def hit(self, key, algorithm, limit, window, block_seconds=0.0, now=None):
+        now = time.time() if now is None else now
+        conn = self._connect()
+
+        # IMMEDIATE takes the write lock up front so the read-modify-write is atomic
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT a, b, c, blocked_until FROM {self.table} WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            decision, state = apply_rate_limit(
+                algorithm, tuple(row) if row else None, limit, window, block_seconds, now
+            )
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, a, b, c, blocked_until, expires_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, *state, now + state_ttl(window, block_seconds)),
+            )
+
+            self._hits += 1
+            if self._hits % self.purge_every == 0:
+                conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return decision
+
+    def reset(self, key: str) -> None:
+        self._connect().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def stats(self) -> dict[str, Any]:
+        keys = self._connect().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        return {"backend": self.backend, "keys": keys, "path": self.path}
+
+
+# KEYS[1] = state hash; ARGV = algorithm, limit, window, block_seconds, now.
+# Mirrors apply_rate_limit so every store enforces identical limits.
+RATE_LIMIT_SCRIPT = """
+local algorithm = ARGV[1]
+local limit = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+local block = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+local state = redis.call('HMGET', KEYS[1], 'a', 'b', 'c', 'blocked')
+local blocked = tonumber(state[4]) or 0
+if blocked > now then
+    return {0, 0, tostring(blocked - now)}
+end
+
+local allowed, remaining, retry_after = 0, 0, 0
+local a, b, c
+if algorithm == 'token_bucket' then
+    local rate = limit / window
+    local tokens = tonumber(state[1]) or limit
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(limit, tokens + math.max(0, now - updated) * rate)
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+        remaining = math.floor(tokens)
+    else
+        retry_after = (1 - tokens) / rate
+    end
+    a, b, c = tokens, now, 0
+else
+    local start = math.floor(now / window) * window
+    local window_start = tonumber(state[1]) or start
+    local previous = tonumber(state[2]) or 0
+    local current = tonumber(state[3]) or 0
+    if start ~= window_start then
+        if math.abs(start - window_start - window) < 1e-9 then
+            previous = current
+        else
+            previous = 0
+        end
+        current = 0
+        window_start = start
+    end
+    local elapsed = now - window_start
+    local estimated = previous * (1 - elapsed / window) + current
+    if estimated + 1 <= limit then
+        current = current + 1
+        allowed = 1
+        remaining = math.floor(limit - estimated - 1)
+    elseif current + 1 > limit then
+        retry_after = window - elapsed + window * math.max(0, 1 - (limit - 1) / current)
+    else
+        retry_after = math.max(0, window * (1 - (limit - 1 - current) / previous) - elapsed)
+    end
+    a, b, c = window_start, previous, current
+end
+
+if allowed == 0 and block > 0 then
+    blocked = now + block
+    retry_after = math.max(retry_after, block)
+end
+redis.call('HSET', KEYS[1], 'a', tostring(a), 'b', tostring(b), 'c', tostring(c), 'blocked', tostring(blocked))
+redis.call('PEXPIRE', KEYS[1], math.ceil((2 * window + block) * 1000))
+return {allowed, remaining, tostring(retry_after)}
+"""
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """Redis store shared by every host; each check is one atomic script call"""
+
+    backend = "redis"
+    blocking = True
+
+    def __init__(self, client: Any = None, url: Optional[str] = None, prefix: str = "ratelimit:"):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("Redis rate limit store requires the redis package") from e
+            client = redis.Redis.from_url(url or os.getenv("REDIS_URL", "redis://localhost:6379"))
+
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(RATE_LIMIT_SCRIPT)
+
+    def hit(self, key, algorithm, limit, window, block_seconds=0.0, now=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+        now = time.time() if now is None else now
+        allowed, remaining, retry_after = self._script(
+            keys=[self.prefix + key], args=[algorithm, limit, window, block_seconds, repr(now)]
+        )
+        return RateLimitDecision(bool(allowed), int(remaining), float(retry_after))
+
+    def reset(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": self.backend, "prefix": self.prefix}
+
+
+def create_rate_limit_store(backend: Optional[str] = None) -> RateLimitStore:
+    """Build the store named by ``backend`` or the RATE_LIMIT_BACKEND env var"""
+    backend = (backend or os.getenv("RATE_LIMIT_BACKEND", "memory")).lower()
+    if backend == "sqlite":
+        return SQLiteRateLimitStore(os.getenv("RATE_LIMIT_DB", "data/rate_limits.db"))
+    if backend == "redis":
+        return RedisRateLimitStore(url=os.getenv("REDIS_URL"))
+    if backend != "memory":
+        logger.warning(f"Unknown rate limit backend {backend!r}, using in-process store")
+    return MemoryRateLimitStore()
@@ -4,16 +4,25 @@ Provides authentication, authorization, rate limiting, CSRF protection, and secu
 """
 
 import asyncio
+import base64
+import functools
 import hashlib
 import hmac
 import json
 import logging
 import re
 import secrets
+import threading
 import time
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from app.rate_limit_store import (SLIDING_WINDOW, RateLimitDecision, RateLimitStore,
+                                  create_rate_limit_store)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -87,6 +96,18 @@ class RateLimitRule:
     window_seconds: int
     rule_type: RateLimitType
     endpoint_pattern: Optional[str] = None
+    algorithm: str = SLIDING_WINDOW
+    block_seconds: Optional[int] = None  # Defaults to window_seconds; 0 disables blocking
+
+    def __post_init__(self):
+        if self.limit < 1:
+            raise ValueError(f"Rate limit must allow at least one request, got {self.limit}")
+        if self.window_seconds <= 0:
+            raise ValueError(f"Rate limit window must be positive, got {self.window_seconds}")
+
+    @property
+    def rule_id(self) -> str:
+        return f"{self.algorithm}:{self.limit}/{self.window_seconds}"
 
 
 @dataclass
@@ -113,65 +134,108 @@ class AuthToken:
     token_id: str
 
 
+@functools.lru_cache(maxsize=256)
+def _pattern_regex(pattern: str) -> "re.Pattern[str]":
+    """Compile a route pattern where ``*`` matches any run of characters."""
+    return re.compile("^" + ".*".join(re.escape(part) for part in pattern.split("*")) + "$")
+
+
+class RouteSecurityMatcher:
+    """Resolves a path to the security level of the first matching pattern.
+
+    Exact patterns are checked first when no earlier wildcard could shadow
+    them; everything else is compiled into one alternation whose named
+    groups keep the original pattern order.
+    """
+
+    def __init__(self, endpoint_security: dict[str, SecurityLevel]):
+        self.exact: dict[str, SecurityLevel] = {}
+        self.levels: dict[str, SecurityLevel] = {}
+        alternatives = []
+        wildcards_seen = False
+
+        for index, (pattern, level) in enumerate(endpoint_security.items()):
+            if "*" not in pattern and not wildcards_seen:
+                self.exact.setdefault(pattern, level)
+                continue
+            wildcards_seen = wildcards_seen or "*" in pattern
+            group = f"p{index}"
+            self.levels[group] = level
+            alternatives.append(f"(?P<{group}>{_pattern_regex(pattern).pattern[1:-1]})")
+
+        self.regex = re.compile(f"^(?:{'|'.join(alternatives)})$") if alternatives else None
+
+    def match(self, path: str) -> Optional[SecurityLevel]:
+        level = self.exact.get(path)
+        if level is not None:
+            return level
+        if self.regex is not None:
+            found = self.regex.match(path)
+            if found:
+                return self.levels[found.lastgroup]
+        return None
+
+
 class RateLimiter:
-    """Rate limiting implementation."""
+    """Rate limiting implementation.
 
-    def __init__(self):
-        self.requests: dict[str, list[float]] = defaultdict(list)
-        self.blocked_ips: dict[str, float] = {}
-        self.cleanup_interval = 300  # 5 minutes
-        self.last_cleanup = time.time()
+    State lives in a pluggable store with O(1) memory per key; see
+    app.rate_limit_store. Without an explicit store, RATE_LIMIT_BACKEND
+    selects the in-process, SQLite or Redis backend.
+    """
+
+    def __init__(self, store: Optional[RateLimitStore] = None):
+        self.store = store or create_rate_limit_store()
+        self.checks = 0
+        self.denied = 0
+        self.errors = 0
 
     def is_allowed(self, key: str, rule: RateLimitRule) -> bool:
         """Check if request is allowed under rate limit."""
-        current_time = time.time()
+        return self.check(key, rule).allowed
 
-        # Clean up old entries periodically
-        if current_time - self.last_cleanup > self.cleanup_interval:
-            self._cleanup_old_entries()
-            self.last_cleanup = current_time
+    async def is_allowed_async(self, key: str, rule: RateLimitRule) -> bool:
+        """Check a request from a coroutine without blocking the event loop."""
+        if self.store.blocking:
+            decision = await asyncio.to_thread(self.check, key, rule)
+        else:
+            decision = self.check(key, rule)
+        return decision.allowed
 
-        # Check if IP is temporarily blocked
-        if key in self.blocked_ips:
-            if current_time < self.blocked_ips[key]:
-                return False
-            else:
-                del self.blocked_ips[key]
-
-        # Get request history for this key
-        request_times = self.requests[key]
+    def check(self, key: str, rule: RateLimitRule) -> RateLimitDecision:
+        """Count a request for key under rule and return the full decision."""
+        block_seconds = rule.window_seconds if rule.block_seconds is None else rule.block_seconds
+        self.checks += 1
 
-        # Remove requests outside the window
-        window_start = current_time - rule.window_seconds
-        request_times[:] = [t for t in request_times if t > window_start]
+        try:
+            decision = self.store.hit(
+                f"{rule.rule_id}:{key}",
+                rule.algorithm,
+                rule.limit,
+                rule.window_seconds,
+                block_seconds,
+            )
+        except Exception as e:
+            # Fail open: an unavailable store must not take the API down with it
+            self.errors += 1
+            logger.error(f"Rate limit store error for {key}: {e}")
+            return RateLimitDecision(True, rule.limit, 0.0)
 
-        # Check if limit exceeded
-        if len(request_times) >= rule.limit:
-            # Block IP for window duration
-            self.blocked_ips[key] = current_time + rule.window_seconds
+        if not decision.allowed:
+            self.denied += 1
             logger.warning(
-                f"Rate limit exceeded for {key}: {len(request_times)} requests in {rule.window_seconds}s"
+                f"Rate limit exceeded for {key}: {rule.limit} requests per {rule.window_seconds}s"
             )
-            return False
-
-        # Record this request
-        request_times.append(current_time)
-        return True
-
-    def _cleanup_old_entries(self):
-        """Clean up old request entries."""
-        current_time = time.time()
-        max_age = 3600  # Keep entries for 1 hour max
+        return decision
 
-        for key in list(self.requests.keys()):
-            self.requests[key] = [t for t in self.requests[key] if current_time - t < max_age]
-            if not self.requests[key]:
-                del self.requests[key]
-
-        # Clean up expired blocks
-        for ip in list(self.blocked_ips.keys()):
-            if current_time >= self.blocked_ips[ip]:
-                del self.blocked_ips[ip]
+    def get_stats(self) -> dict[str, Any]:
+        """Get rate limiter statistics."""
+        return {
+            **self.store.stats(),
+            "checks": self.checks,
+            "denied": self.denied,
+            "errors": self.errors,
+        }
 
 
 class CSRFProtection:
@@ -295,10 +359,19 @@ class SecurityAuditor:
 
 
 class JWTManager:
-    """JWT token management."""
+    """JWT token management.
 
-    def __init__(self, secret_key: str):
+    Verified tokens are cached by digest until they expire, so repeat
+    requests with the same bearer token skip decoding and the HMAC check.
+    """
+
+    def __init__(self, secret_key: str, cache_size: int = 10000):
         self.secret_key = secret_key.encode()
+        self.cache_size = cache_size
+        self._verified: OrderedDict[bytes, AuthToken] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def create_token(
         self, user_id: str, username: str, roles: list[str], expiry_hours: int = 24
@@ -321,8 +394,6 @@ class JWTManager:
         header = {"alg": "HS256", "typ": "JWT"}
 
         # Encode header and payload
-        import base64
-
         header_encoded = base64.urlsafe_b64encode(json.dumps(header).encode()).decode().rstrip("=")
 
         payload_encoded = (
@@ -339,6 +410,44 @@ class JWTManager:
 
     def verify_token(self, token: str) -> Optional[AuthToken]:
         """Verify and decode JWT token."""
+        if self.cache_size <= 0:
+            return self._decode_token(token)
+
+        digest = hashlib.sha256(token.encode()).digest()
+        with self._cache_lock:
+            cached = self._verified.get(digest)
+            if cached is not None:
+                if cached.expires_at.timestamp() >= time.time():
+                    self._verified.move_to_end(digest)
+                    self.cache_hits += 1
+                    return cached
+                del self._verified[digest]
+            self.cache_misses += 1
+
+        auth_token = self._decode_token(token)
+        if auth_token is not None:
+            with self._cache_lock:
+                self._verified[digest] = auth_token
+                while len(self._verified) > self.cache_size:
+                    self._verified.popitem(last=False)
+        return auth_token
+
+    def invalidate_token(self, token: str) -> None:
+        """Drop a token from the verified cache."""
+        with self._cache_lock:
+            self._verified.pop(hashlib.sha256(token.encode()).digest(), None)
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Get verified-token cache statistics."""
+        return {
+            "cached_tokens": len(self._verified),
+            "max_tokens": self.cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+        }
+
+    def _decode_token(self, token: str) -> Optional[AuthToken]:
+        """Check the signature and expiry of a token and decode its payload."""
         try:
             parts = token.split(".")
             if len(parts) != 3:
@@ -352,8 +461,6 @@ class JWTManager:
                 self.secret_key, message.encode(), hashlib.sha256
             ).digest()
 
-            import base64
-
             # Add padding if needed
             signature_encoded += "=" * (4 - len(signature_encoded) % 4)
             actual_signature = base64.urlsafe_b64decode(signature_encoded)
@@ -417,6 +524,25 @@ class SecurityMiddleware:
             "/api/public/*": SecurityLevel.PUBLIC,
         }
 
+    @property
+    def endpoint_security(self) -> Mapping[str, SecurityLevel]:
+        """Route patterns and their levels, in match order (read-only).
+
+        Use set_endpoint_security or assign a new mapping so that the
+        compiled route matcher is rebuilt.
+        """
+        return MappingProxyType(self._endpoint_security)
+
+    @endpoint_security.setter
+    def endpoint_security(self, routes: Mapping[str, SecurityLevel]) -> None:
+        self._endpoint_security = dict(routes)
+        self.route_matcher = RouteSecurityMatcher(self._endpoint_security)
+
+    def set_endpoint_security(self, pattern: str, level: SecurityLevel) -> None:
+        """Add or change the security level for a route pattern."""
+        self._endpoint_security[pattern] = level
+        self.route_matcher = RouteSecurityMatcher(self._endpoint_security)
+
     async def process_request(self, request: dict[str, Any]) -> dict[str, Any]:
         """Process incoming request through security middleware."""
         response = {
@@ -519,7 +645,7 @@ class SecurityMiddleware:
                     continue
                 key = f"{ip_address}:{path}"
 
-            if not self.rate_limiter.is_allowed(key, rule):
+            if not await self.rate_limiter.is_allowed_async(key, rule):
                 return False
 
         return True
@@ -595,9 +721,9 @@ class SecurityMiddleware:
 
     def _get_required_security_level(self, path: str) -> SecurityLevel:
         """Get required security level for path."""
-        for pattern, level in self.endpoint_security.items():
-            if self._matches_pattern(path, pattern):
-                return level
+        level = self.route_matcher.match(path)
+        if level is not None:
+            return level
 
         # Default to authenticated for API endpoints
         if path.startswith("/api/"):
@@ -610,9 +736,7 @@ class SecurityMiddleware:
         if "*" not in pattern:
             return path == pattern
 
-        # Convert pattern to regex
-        regex_pattern = pattern.replace("*", ".*")
-        return bool(re.match(f"^{regex_pattern}$", path))
+        return _pattern_regex(pattern).match(path) is not None
 
     def _check_authorization(self, auth_token: AuthToken, required_level: SecurityLevel) -> bool:
         """Check if user has required authorization level."""
@@ -636,11 +760,9 @@ class SecurityMiddleware:
     def get_security_status(self) -> dict[str, Any]:
         """Get current security status."""
         return {
-            "rate_limiter": {
-                "active_limits": len(self.rate_limiter.requests),
-                "blocked_ips": len(self.rate_limiter.blocked_ips),
-            },
+            "rate_limiter": self.rate_limiter.get_stats(),
             "csrf_protection": {"active_tokens": len(self.csrf_protection.tokens)},
+            "token_cache": self.jwt_manager.get_cache_stats(),
             "security_events": self.security_auditor.get_security_summary(),
             "config": {
                 "require_https": self.config.require_https,
@@ -0,0 +1,489 @@
+"""
+Cross-process pub/sub bridges for the WebSocket manager.
+
+Each worker process only holds its own sockets, so topic and user messages
+are also published to a bridge that every worker subscribes to. Envelopes
+published within one flush tick travel together as a single JSON line:
+
+* ``unix`` - a broker on a Unix domain socket, run by whichever worker holds
+  the lock file; the others connect as clients and take over if it exits.
+* ``redis`` - a Redis pub/sub channel, for workers spread across hosts.
+
+Both transports echo a batch back to its publisher, which serves as the
+acknowledgement: senders hold each envelope until its echo arrives, keep
+batches that failed to send, and re-send both once the transport is back.
+Envelopes are identified by message id, kind and target, since one message
+may be sent to several topics or users. Receivers skip envelopes they
+published themselves and any envelope they have already delivered, so each
+socket sees a message once. Both transports reconnect with exponential
+backoff. Redis pub/sub keeps nothing for a subscriber that is offline, so
+with Redis a worker that has lost its subscription misses what is published
+until it resubscribes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+Envelope = dict[str, Any]
+EnvelopeHandler = Callable[[Envelope], Awaitable[None]]
+EnvelopeKey = tuple[Any, Any, Any]
+
+# Batches are single lines, so allow lines well beyond the 64 KiB default
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+def envelope_key(envelope: Envelope) -> EnvelopeKey:
+    """Identity of one delivery: message id, kind and target"""
+    return envelope.get("id"), envelope.get("kind"), envelope.get("target")
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Delay before reconnect ``attempt`` (0-based), doubling up to ``cap``"""
+    return min(cap, base * (2 ** min(attempt, 30)))
+
+
+class PubSubBridge:
+    """Base class for bridges; subclasses implement the transport"""
+
+    backend = "base"
+
+    def __init__(
+        self,
+        flush_interval: float = 0.005,
+        max_batch: int = 500,
+        retry_delay: float = 0.05,
+        max_buffered: int = 10000,
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.retry_delay = retry_delay
+        self.max_buffered = max_buffered
+        self._handler: Optional[EnvelopeHandler] = None
+        self._pending: list[Envelope] = []
+        # Sent envelopes whose echo has not come back yet, by envelope_key
+        self._unacked: OrderedDict[EnvelopeKey, Envelope] = OrderedDict()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task[None]] = None
+        self.published = 0
+        self.received = 0
+        self.batches_sent = 0
+        self.send_errors = 0
+        self.resent = 0
+        self.dropped = 0
+
+    async def start(self, handler: EnvelopeHandler):
+        """Connect and start delivering received envelopes to ``handler``"""
+        self._handler = handler
+        self._wakeup = asyncio.Event()
+        await self._connect()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Flush anything pending and disconnect"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+        await self._close()
+
+    def publish(self, envelope: Envelope):
+        """Queue an envelope for the next flush; never blocks the caller"""
+        self._pending.append(envelope)
+        self.published += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> bool:
+        """Send pending envelopes, at most ``max_batch`` per frame
+
+        Returns False when a send fails; that batch and the rest stay pending.
+        """
+        batch, self._pending = self._pending, []
+        for i in range(0, len(batch), self.max_batch):
+            frame = batch[i : i + self.max_batch]
+            try:
+                await self._send_batch(json.dumps(frame))
+                self.batches_sent += 1
+            except Exception as e:
+                self.send_errors += 1
+                logger.warning(f"Failed to publish {self.backend} bridge batch: {e}")
+                self._pending[:0] = batch[i:]
+                self._trim_pending()
+                return False
+            for envelope in frame:
+                if envelope.get("id") is not None:
+                    self._unacked[envelope_key(envelope)] = envelope
+            while len(self._unacked) > self.max_buffered:
+                self._unacked.popitem(last=False)
+                self.dropped += 1
+        return True
+
+    def _requeue_unacked(self):
+        """Queue every unacknowledged envelope again, e.g. after a reconnect"""
+        if not self._unacked:
+            return
+        envelopes = list(self._unacked.values())
+        self._unacked.clear()
+        self._pending[:0] = envelopes
+        self._trim_pending()
+        self.resent += len(envelopes)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _trim_pending(self):
+        overflow = len(self._pending) - self.max_buffered
+        if overflow > 0:
+            del self._pending[:overflow]
+            self.dropped += overflow
+            logger.warning(f"{self.backend} bridge buffer full, dropped {overflow} messages")
+
+    async def _flush_loop(self):
+        while True:
+            await self._wakeup.wait()
+            # Let the rest of this tick's messages join the batch
+            await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            if not await self.flush():
+                # Transport is down; keep retrying until it is back
+                await asyncio.sleep(self.retry_delay)
+                self._wakeup.set()
+
+    async def _deliver(self, raw: Union[str, bytes]):
+        try:
+            batch = json.loads(raw)
+        except ValueError:
+            logger.warning(f"Discarding malformed {self.backend} bridge frame")
+            return
+
+        self.received += len(batch)
+        for envelope in batch:
+            # Our own envelope coming back means the transport relayed it
+            self._unacked.pop(envelope_key(envelope), None)
+            try:
+                await self._handler(envelope)
+            except Exception as e:
+                logger.error(f"Error handling bridged message {envelope.get('id')}: {e}")
+
+    async def _connect(self):
+        raise NotImplementedError
+
+    async def _send_batch(self, data: str):
+        raise NotImplementedError
+
+    async def _close(self):
+        raise NotImplementedError
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "published": self.published,
+            "received": self.received,
+            "batches_sent": self.batches_sent,
+            "send_errors": self.send_errors,
+            "pending": len(self._pending),
+            "unacked": len(self._unacked),
+            "resent": self.resent,
+            "dropped": self.dropped,
+        }
+
+
+class UnixSocketBridge(PubSubBridge):
+    """Bridge for workers on one host, relayed by a broker on a Unix socket
+
+    The broker role goes to whichever worker holds an exclusive lock on
+    ``<path>.lock``. The OS releases the lock when that worker exits, and the
+    remaining workers race for it when they reconnect.
+    """
+
+    backend = "unix"
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        reconnect_delay: float = 0.05,
+        max_reconnect_delay: float = 5.0,
+        connect_timeout: float = 5.0,
+        **kwargs,
+    ):
+        if fcntl is None:
+            raise RuntimeError("Unix socket bridge requires fcntl")
+        super().__init__(**kwargs)
+        self.path = str(path)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connect_timeout = connect_timeout
+        self.is_broker = False
+        self.reconnects = 0
+        self._lock_fd: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._peers: set[asyncio.StreamWriter] = set()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task[None]] = None
+        self._closing = False
+
+    async def _connect(self):
+        self._closing = False
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        reader = await self._open()
+        self._reader_task = asyncio.create_task(self._read_loop(reader))
+
+    async def _open(self) -> asyncio.StreamReader:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.connect_timeout
+        while True:
+            if not self.is_broker and self._try_lock():
+                # The socket file may be left over from a dead broker; asyncio replaces it
+                self._server = await asyncio.start_unix_server(
+                    self._serve_peer, path=self.path, limit=STREAM_LIMIT
+                )
+                self.is_broker = True
+                logger.info(f"WebSocket bridge broker listening on {self.path}")
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(
+                    self.path, limit=STREAM_LIMIT
+                )
+                return reader
+            except OSError:
+                if loop.time() >= deadline:
+                    raise
+                await asyncio.sleep(self.reconnect_delay)
+
+    def _try_lock(self) -> bool:
+        if self._lock_fd is None:
+            self._lock_fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        while True:
+            try:
+                line = await reader.readline()
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+                # A reset or a frame over STREAM_LIMIT leaves the stream unusable
+                logger.warning(f"WebSocket bridge read failed: {e!r}")
+                line = b""
+            if line:
+                await self._deliver(line)
+                continue
+            if self._closing:
+                return
+
+            # Broker went away; elect a new one and resubscribe
+            logger.warning("WebSocket bridge broker disconnected, reconnecting")
+            self.reconnects += 1
+            if self._writer is not None:
+                self._writer.close()
+            self._writer = None
+            attempt = 0
+            while True:
+                await asyncio.sleep(
+                    backoff_delay(attempt, self.reconnect_delay, self.max_reconnect_delay)
+                )
+                try:
+                    reader = await self._open()
+                    break
+                except OSError as e:
+                    attempt += 1
+                    logger.error(f"WebSocket bridge could not reconnect, retrying: {e}")
+            # Hold sends back while the other workers reconnect, then re-send
+            # what the old broker may have died before relaying, oldest first
+            writer, self._writer = self._writer, None
+            try:
+                await asyncio.sleep(self.reconnect_delay)
+            except asyncio.CancelledError:
+                writer.close()
+                raise
+            self._writer = writer
+            self._requeue_unacked()
+
+    async def _serve_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._peers.add(writer)
+        try:
+            while line := await reader.readline():
+                peers = list(self._peers)
+                for peer in peers:
+                    peer.write(line)
+                await asyncio.gather(*(peer.drain() for peer in peers), return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._peers.discard(writer)
+            writer.close()
+
+    async def _send_batch(self, data: str):
+        if self._writer is None or self._writer.is_closing():
+            raise ConnectionError("not connected to bridge broker")
+        self._writer.write(data.encode() + b"\n")
+        await self._writer.drain()
+
+    async def _close(self):
+        self._closing = True
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+        if self._server is not None:
+            for peer in list(self._peers):
+                peer.close()
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            self.is_broker = False
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        stats.update(
+            path=self.path,
+            is_broker=self.is_broker,
+            peers=len(self._peers),
+            reconnects=self.reconnects,
+        )
+        return stats
+
+
+class RedisBridge(PubSubBridge):
+    """Bridge over a Redis pub/sub channel"""
+
+    backend = "redis"
+
+    def __init__(
+        self,
+        client: Any = None,
+        url: Optional[str] = None,
+        channel: str = "websocket:bridge",
+        reconnect_delay: float = 0.05,
+        max_reconnect_delay: float = 5.0,
+        **kwargs,
+    ):
+        if client is None:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError as e:
+                raise RuntimeError("Redis bridge requires the redis package") from e
+            client = aioredis.Redis.from_url(url or os.getenv("REDIS_URL", "redis://localhost:6379"))
+
+        super().__init__(**kwargs)
+        self.client = client
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reconnects = 0
+        self._pubsub = None
+        self._reader_task: Optional[asyncio.Task[None]] = None
+
+    async def _connect(self):
+        await self._subscribe()
+        self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _subscribe(self):
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.channel)
+
+    async def _read_loop(self):
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message.get("type") == "message":
+                        await self._deliver(message["data"])
+                logger.warning("WebSocket bridge Redis subscription ended, resubscribing")
+            except Exception as e:
+                logger.warning(f"WebSocket bridge lost Redis connection, resubscribing: {e}")
+
+            self.reconnects += 1
+            await self._close_pubsub()
+            attempt = 0
+            while True:
+                await asyncio.sleep(
+                    backoff_delay(attempt, self.reconnect_delay, self.max_reconnect_delay)
+                )
+                try:
+                    await self._subscribe()
+                    break
+                except Exception as e:
+                    attempt += 1
+                    await self._close_pubsub()
+                    logger.error(f"WebSocket bridge could not resubscribe to Redis, retrying: {e}")
+            # Re-send what was published while the subscription was down
+            self._requeue_unacked()
+
+    async def _send_batch(self, data: str):
+        await self.client.publish(self.channel, data)
+
+    async def _close(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._close_pubsub()
+
+    async def _close_pubsub(self):
+        if self._pubsub is None:
+            return
+        pubsub, self._pubsub = self._pubsub, None
+        try:
+            # redis-py < 5 only has close()
+            close = getattr(pubsub, "aclose", None) or pubsub.close
+            await close()
+        except Exception as e:
+            logger.debug(f"Error closing Redis pub/sub: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        stats.update(channel=self.channel, reconnects=self.reconnects)
+        return stats
+
+
+def create_pubsub_bridge(backend: Optional[str] = None) -> Optional[PubSubBridge]:
+    """Build the bridge named by ``backend`` or the WEBSOCKET_BRIDGE env var
+
+    Returns None when no bridge is configured, i.e. a single-worker deployment.
+    """
+    backend = (backend or os.getenv("WEBSOCKET_BRIDGE", "")).lower()
+    if not backend or backend == "none":
+        return None
+    if backend == "unix":
+        return UnixSocketBridge(os.getenv("WEBSOCKET_BRIDGE_SOCKET", "data/websocket_bridge.sock"))
+    if backend == "redis":
+        return RedisBridge(
+            url=os.getenv("REDIS_URL"),
+            channel=os.getenv("WEBSOCKET_BRIDGE_CHANNEL", "websocket:bridge"),
+        )
+    logger.warning(f"Unknown WebSocket bridge backend {backend!r}, running without one")
+    return None
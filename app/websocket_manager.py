@@ -8,11 +8,16 @@ capabilities for the TRAE.AI dashboard system.
 import asyncio
 import json
 import logging
+import time
 import uuid
+from collections import OrderedDict
 from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Callable, Optional
 
+from app.websocket_bridge import PubSubBridge, create_pubsub_bridge, envelope_key
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -41,6 +46,14 @@ class MessageType(Enum):
     HEARTBEAT = "heartbeat"
 
 
+class SlowConsumerPolicy(Enum):
+    """What to do when a connection's outbound queue is full"""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    DISCONNECT = "disconnect"
+
+
 @dataclass
 class WebSocketMessage:
     """WebSocket message data structure"""
@@ -64,12 +77,44 @@ class ConnectionInfo:
     last_activity: datetime
     status: ConnectionStatus
     metadata: dict[str, Any]
+    queue_depth: int = 0
+    messages_sent: int = 0
+    messages_dropped: int = 0
+    avg_send_latency: float = 0.0
+
+
+def serialize_message(message: WebSocketMessage) -> str:
+    """Serialise a message to the JSON text sent over the wire"""
+    return json.dumps(
+        {
+            "id": message.id,
+            "type": message.type.value,
+            "payload": message.payload,
+            "timestamp": message.timestamp.isoformat(),
+            "sender": message.sender,
+            "recipient": message.recipient,
+        }
+    )
 
 
 class WebSocketConnection:
-    """Individual WebSocket connection wrapper"""
+    """Individual WebSocket connection wrapper
+
+    Outgoing frames go through a bounded queue drained by a per-connection
+    sender task, so a slow client only ever delays itself. When the queue is
+    full the connection's SlowConsumerPolicy decides what gives way.
+    """
 
-    def __init__(self, connection_id: str, websocket, user_id: Optional[str] = None):
+    def __init__(
+        self,
+        connection_id: str,
+        websocket,
+        user_id: Optional[str] = None,
+        max_queue_size: int = 256,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+        send_timeout: float = 10.0,
+        send_slots: Optional[asyncio.Semaphore] = None,
+    ):
         self.connection_id = connection_id
         self.websocket = websocket
         self.user_id = user_id
@@ -80,19 +125,85 @@ class WebSocketConnection:
         self.metadata: dict[str, Any] = {}
         self.subscriptions: set[str] = set()
 
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.outbound: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue_size)
+        self.sender_task: Optional[asyncio.Task[None]] = None
+        self._send_slots = send_slots
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.max_queue_depth = 0
+        self.send_time_total = 0.0
+        self.send_time_max = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in (ConnectionStatus.CONNECTED, ConnectionStatus.CONNECTING)
+
+    def enqueue(self, data: str) -> bool:
+        """Queue pre-serialised text for sending; returns whether it was accepted"""
+        if not self.is_open:
+            return False
+
+        if self.outbound.full():
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                logger.warning(f"Disconnecting slow consumer {self.connection_id}")
+                self.status = ConnectionStatus.ERROR
+                return False
+            self.messages_dropped += 1
+            if self.policy == SlowConsumerPolicy.DROP_NEWEST:
+                return False
+            self.outbound.get_nowait()
+            self.outbound.task_done()
+
+        self.outbound.put_nowait(data)
+        self.max_queue_depth = max(self.max_queue_depth, self.outbound.qsize())
+        if self.sender_task is None or self.sender_task.done():
+            self.sender_task = asyncio.get_running_loop().create_task(self._sender_loop())
+        return True
+
+    async def _sender_loop(self):
+        """Drain the outbound queue until the connection fails or is closed"""
+        while True:
+            data = await self.outbound.get()
+            started = time.perf_counter()
+            try:
+                if self._send_slots is not None:
+                    async with self._send_slots:
+                        await asyncio.wait_for(self.websocket.send(data), self.send_timeout)
+                else:
+                    await asyncio.wait_for(self.websocket.send(data), self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to send message to connection {self.connection_id}: {e}")
+                self.status = ConnectionStatus.ERROR
+                return
+            finally:
+                self.outbound.task_done()
+
+            elapsed = time.perf_counter() - started
+            self.messages_sent += 1
+            self.send_time_total += elapsed
+            self.send_time_max = max(self.send_time_max, elapsed)
+            self.last_activity = datetime.now(timezone.utc)
+
+    async def close(self):
+        """Stop the sender task and discard anything still queued"""
+        if self.status != ConnectionStatus.ERROR:
+            self.status = ConnectionStatus.DISCONNECTED
+        if self.sender_task is not None and not self.sender_task.done():
+            self.sender_task.cancel()
+            try:
+                await self.sender_task
+            except asyncio.CancelledError:
+                pass
+        self.sender_task = None
+
     async def send_message(self, message: WebSocketMessage) -> bool:
-        """Send a message through this connection"""
+        """Send a message through this connection, bypassing the queue"""
         try:
-            message_data = {
-                "id": message.id,
-                "type": message.type.value,
-                "payload": message.payload,
-                "timestamp": message.timestamp.isoformat(),
-                "sender": message.sender,
-                "recipient": message.recipient,
-            }
-
-            await self.websocket.send(json.dumps(message_data))
+            await self.websocket.send(serialize_message(message))
             self.last_activity = datetime.now(timezone.utc)
             return True
 
@@ -122,6 +233,12 @@ class WebSocketConnection:
             last_activity=self.last_activity,
             status=self.status,
             metadata=self.metadata,
+            queue_depth=self.outbound.qsize(),
+            messages_sent=self.messages_sent,
+            messages_dropped=self.messages_dropped,
+            avg_send_latency=(
+                self.send_time_total / self.messages_sent if self.messages_sent else 0.0
+            ),
         )
 
 
@@ -130,7 +247,15 @@ class WebSocketManager:
     WebSocket Manager for handling multiple WebSocket connections and real-time communication
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_queue_size: int = 256,
+        slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+        send_timeout: float = 10.0,
+        max_concurrent_sends: int = 1000,
+        bridge: Optional[PubSubBridge] = None,
+        dedup_size: int = 10000,
+    ):
         self.connections: dict[str, WebSocketConnection] = {}
         self.user_connections: dict[str, set[str]] = {}  # user_id -> connection_ids
         self.subscriptions: dict[str, set[str]] = {}  # topic -> connection_ids
@@ -139,11 +264,28 @@ class WebSocketManager:
         self.heartbeat_task: Optional[asyncio.Task[None]] = None
         self.running = False
 
+        self.max_queue_size = max_queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.send_timeout = send_timeout
+        # Caps sends in flight across all connections
+        self.send_slots = asyncio.Semaphore(max_concurrent_sends)
+        self.slow_consumer_disconnects = 0
+
+        # Topic and user messages are relayed to other workers through the bridge
+        self.bridge = bridge
+        self.worker_id = str(uuid.uuid4())
+        self.dedup_size = dedup_size
+        self._delivered_ids: OrderedDict[tuple[str, str, str], None] = OrderedDict()
+        self.duplicates_skipped = 0
+
     async def start(self):
         """Start the WebSocket manager"""
         logger.info("Starting WebSocket Manager")
         self.running = True
 
+        if self.bridge is not None:
+            await self.bridge.start(self._on_bridge_message)
+
         # Start heartbeat task
         self.heartbeat_task = asyncio.create_task(self._heartbeat_loop())
 
@@ -160,13 +302,24 @@ class WebSocketManager:
             except asyncio.CancelledError:
                 pass
 
+        if self.bridge is not None:
+            await self.bridge.stop()
+
         # Close all connections
         await self.disconnect_all()
 
     async def add_connection(self, websocket, user_id: Optional[str] = None) -> str:
         """Add a new WebSocket connection"""
         connection_id = str(uuid.uuid4())
-        connection = WebSocketConnection(connection_id, websocket, user_id)
+        connection = WebSocketConnection(
+            connection_id,
+            websocket,
+            user_id,
+            max_queue_size=self.max_queue_size,
+            policy=self.slow_consumer_policy,
+            send_timeout=self.send_timeout,
+            send_slots=self.send_slots,
+        )
 
         self.connections[connection_id] = connection
 
@@ -198,44 +351,76 @@ class WebSocketManager:
 
         # Remove connection
         del self.connections[connection_id]
+        await connection.close()
 
         logger.info(f"Removed WebSocket connection {connection_id}")
 
     async def send_to_connection(self, connection_id: str, message: WebSocketMessage) -> bool:
-        """Send a message to a specific connection"""
+        """Queue a message for a specific connection"""
         if connection_id not in self.connections:
             logger.warning(f"Connection {connection_id} not found")
             return False
 
-        connection = self.connections[connection_id]
-        return await connection.send_message(message)
+        return await self._fan_out([connection_id], serialize_message(message)) == 1
 
     async def send_to_user(self, user_id: str, message: WebSocketMessage) -> int:
-        """Send a message to all connections for a specific user"""
+        """Queue a message for all connections of a specific user
+
+        Returns the number of local connections reached; with a bridge the
+        message is also relayed to the user's connections on other workers.
+        """
+        data = serialize_message(message)
+        self._relay(message.id, "user", user_id, data)
+
         if user_id not in self.user_connections:
-            logger.warning(f"No connections found for user {user_id}")
+            if self.bridge is None:
+                logger.warning(f"No connections found for user {user_id}")
             return 0
 
-        sent_count = 0
-        for connection_id in list(self.user_connections[user_id]):
-            if await self.send_to_connection(connection_id, message):
-                sent_count += 1
-
-        return sent_count
+        return await self._fan_out(list(self.user_connections[user_id]), data)
 
     async def broadcast(
         self, message: WebSocketMessage, exclude_connections: Optional[set[str]] = None
     ) -> int:
-        """Broadcast a message to all connections"""
+        """Queue a message for all connections, returning how many accepted it"""
         exclude_connections = exclude_connections or set()
-        sent_count = 0
-
-        for connection_id in list(self.connections.keys()):
-            if connection_id not in exclude_connections:
-                if await self.send_to_connection(connection_id, message):
-                    sent_count += 1
-
-        return sent_count
+        connection_ids = [cid for cid in self.connections if cid not in exclude_connections]
+        return await self._fan_out(connection_ids, serialize_message(message))
+
+    async def _fan_out(self, connection_ids: list[str], data: str) -> int:
+        """Queue pre-serialised text for each connection.
+
+        Queuing never waits on a client; sender tasks deliver concurrently.
+        Connections that have failed or tripped the disconnect policy are
+        closed and removed.
+        """
+        queued = 0
+        failed = []
+        for connection_id in connection_ids:
+            connection = self.connections.get(connection_id)
+            if connection is None:
+                continue
+            if connection.enqueue(data):
+                queued += 1
+            elif connection.status == ConnectionStatus.ERROR:
+                failed.append(connection)
+
+        for connection in failed:
+            await self._disconnect_failed(connection)
+
+        return queued
+
+    async def _disconnect_failed(self, connection: WebSocketConnection):
+        """Close and remove a connection whose sends failed or fell too far behind"""
+        if connection.outbound.full():
+            self.slow_consumer_disconnects += 1
+        close = getattr(connection.websocket, "close", None)
+        if close is not None:
+            try:
+                await close()
+            except Exception as e:
+                logger.debug(f"Error closing connection {connection.connection_id}: {e}")
+        await self.remove_connection(connection.connection_id)
 
     async def subscribe(self, connection_id: str, topic: str) -> bool:
         """Subscribe a connection to a topic"""
@@ -269,16 +454,58 @@ class WebSocketManager:
         return True
 
     async def publish_to_topic(self, topic: str, message: WebSocketMessage) -> int:
-        """Publish a message to all subscribers of a topic"""
+        """Publish a message to all subscribers of a topic
+
+        Returns the number of local subscribers reached; with a bridge the
+        message is also relayed to subscribers on other workers.
+        """
+        data = serialize_message(message)
+        self._relay(message.id, "topic", topic, data)
+
         if topic not in self.subscriptions:
             return 0
 
-        sent_count = 0
-        for connection_id in list(self.subscriptions[topic]):
-            if await self.send_to_connection(connection_id, message):
-                sent_count += 1
+        return await self._fan_out(list(self.subscriptions[topic]), data)
 
-        return sent_count
+    def _relay(self, message_id: str, kind: str, target: str, data: str):
+        """Hand a serialised message to the bridge for the other workers"""
+        if self.bridge is None:
+            return
+        self._mark_delivered((message_id, kind, target))
+        self.bridge.publish(
+            {"id": message_id, "origin": self.worker_id, "kind": kind, "target": target, "data": data}
+        )
+
+    def _mark_delivered(self, key: tuple[str, str, str]) -> bool:
+        """Record a (message id, kind, target) delivery; returns False if already seen
+
+        A message sent to several topics or users is one delivery per target.
+        """
+        if key in self._delivered_ids:
+            return False
+        self._delivered_ids[key] = None
+        if len(self._delivered_ids) > self.dedup_size:
+            self._delivered_ids.popitem(last=False)
+        return True
+
+    async def _on_bridge_message(self, envelope: dict[str, Any]):
+        """Deliver a message published by another worker to local sockets"""
+        if envelope.get("origin") == self.worker_id:
+            return
+        if not self._mark_delivered(envelope_key(envelope)):
+            self.duplicates_skipped += 1
+            return
+
+        if envelope["kind"] == "topic":
+            connection_ids = self.subscriptions.get(envelope["target"], ())
+        elif envelope["kind"] == "user":
+            connection_ids = self.user_connections.get(envelope["target"], ())
+        else:
+            logger.warning(f"Unknown bridged message kind {envelope['kind']!r}")
+            return
+
+        if connection_ids:
+            await self._fan_out(list(connection_ids), envelope["data"])
 
     def add_message_handler(
         self, message_type: MessageType, handler: Callable[[str, WebSocketMessage], Any]
@@ -363,6 +590,7 @@ class WebSocketManager:
 
                 # Remove stale connections
                 stale_connections = []
+                live_connections = []
                 current_time = datetime.now(timezone.utc)
 
                 for connection_id, connection in self.connections.items():
@@ -371,7 +599,9 @@ class WebSocketManager:
                     if time_since_activity > self.heartbeat_interval * 3:  # 3 missed heartbeats
                         stale_connections.append(connection_id)
                     else:
-                        await connection.send_message(heartbeat_message)
+                        live_connections.append(connection_id)
+
+                await self._fan_out(live_connections, serialize_message(heartbeat_message))
 
                 # Clean up stale connections
                 for connection_id in stale_connections:
@@ -403,12 +633,38 @@ class WebSocketManager:
 
     def get_status(self) -> dict[str, Any]:
         """Get WebSocket manager status"""
+        queued = sent = dropped = max_depth = 0
+        send_time = max_latency = 0.0
+        for connection in self.connections.values():
+            queued += connection.outbound.qsize()
+            max_depth = max(max_depth, connection.max_queue_depth)
+            sent += connection.messages_sent
+            dropped += connection.messages_dropped
+            send_time += connection.send_time_total
+            max_latency = max(max_latency, connection.send_time_max)
+
         return {
             "running": self.running,
             "total_connections": self.get_connection_count(),
             "total_users": len(self.user_connections),
             "total_topics": len(self.subscriptions),
             "heartbeat_interval": self.heartbeat_interval,
+            "outbound": {
+                "queued_messages": queued,
+                "max_queue_depth": max_depth,
+                "queue_capacity": self.max_queue_size,
+                "messages_sent": sent,
+                "messages_dropped": dropped,
+                "avg_send_latency": send_time / sent if sent else 0.0,
+                "max_send_latency": max_latency,
+                "slow_consumer_policy": self.slow_consumer_policy.value,
+                "slow_consumer_disconnects": self.slow_consumer_disconnects,
+            },
+            "bridge": (
+                dict(self.bridge.stats(), duplicates_skipped=self.duplicates_skipped)
+                if self.bridge is not None
+                else None
+            ),
         }
 
     def get_connections_info(self) -> list[dict[str, Any]]:
@@ -417,7 +673,7 @@ class WebSocketManager:
 
 
 # Global WebSocket manager instance
-websocket_manager = WebSocketManager()
+websocket_manager = WebSocketManager(bridge=create_pubsub_bridge())
 
 
 async def main():
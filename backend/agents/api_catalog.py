@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+API Catalog
+
+SQLite catalog of discovered APIs, keyed by name and base URL. Writes are
+upserts that skip rows whose content has not changed, so re-running
+discovery only touches what actually changed. Category, auth type, free
+flag and status are indexed, and name, description and tags are searchable
+through an FTS5 index (with a LIKE fallback where SQLite lacks FTS5).
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    "name",
+    "base_url",
+    "category",
+    "description",
+    "auth_type",
+    "is_free",
+    "rate_limit",
+    "documentation_url",
+    "status",
+    "validation_score",
+    "last_validated",
+    "tags",
+    "metadata",
+    "source",
+)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _row_hash(record: dict[str, Any]) -> str:
+    return hashlib.sha1(
+        json.dumps([record[column] for column in COLUMNS], sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class APICatalog:
+    """Persistent, indexed catalog of discovered APIs
+
+    Records are plain dicts with the keys in ``COLUMNS``; ``tags`` is a list
+    and ``metadata`` a dict.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS apis (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                base_url TEXT NOT NULL,
+                category TEXT NOT NULL,
+                description TEXT NOT NULL,
+                auth_type TEXT NOT NULL,
+                is_free INTEGER NOT NULL,
+                rate_limit TEXT,
+                documentation_url TEXT,
+                status TEXT NOT NULL,
+                validation_score REAL NOT NULL,
+                last_validated TEXT,
+                tags TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                source TEXT,
+                row_hash TEXT NOT NULL,
+                UNIQUE (name, base_url)
+            );
+            CREATE INDEX IF NOT EXISTS idx_apis_category ON apis(category);
+            CREATE INDEX IF NOT EXISTS idx_apis_auth_type ON apis(auth_type);
+            CREATE INDEX IF NOT EXISTS idx_apis_is_free ON apis(is_free);
+            CREATE INDEX IF NOT EXISTS idx_apis_status ON apis(status);
+            """
+        )
+        # Catalogs created before sources were recorded lack the column
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(apis)")}
+        if "source" not in existing:
+            self._conn.execute("ALTER TABLE apis ADD COLUMN source TEXT")
+        self.full_text = self._create_fts()
+
+    def _create_fts(self) -> bool:
+        try:
+            self._conn.executescript(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS apis_fts USING fts5(
+                    name, description, tags, content='apis', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS apis_fts_insert AFTER INSERT ON apis BEGIN
+                    INSERT INTO apis_fts(rowid, name, description, tags)
+                    VALUES (new.id, new.name, new.description, new.tags);
+                END;
+                CREATE TRIGGER IF NOT EXISTS apis_fts_delete AFTER DELETE ON apis BEGIN
+                    INSERT INTO apis_fts(apis_fts, rowid, name, description, tags)
+                    VALUES ('delete', old.id, old.name, old.description, old.tags);
+                END;
+                CREATE TRIGGER IF NOT EXISTS apis_fts_update AFTER UPDATE ON apis BEGIN
+                    INSERT INTO apis_fts(apis_fts, rowid, name, description, tags)
+                    VALUES ('delete', old.id, old.name, old.description, old.tags);
+                    INSERT INTO apis_fts(rowid, name, description, tags)
+                    VALUES (new.id, new.name, new.description, new.tags);
+                END;
+                """
+            )
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, API search falls back to LIKE: {e}")
+            return False
+
+    def upsert(self, records: list[dict[str, Any]]) -> int:
+        """Insert new records and update changed ones, returning rows written"""
+        rows = []
+        for record in records:
+            record = dict(record, tags=sorted(record["tags"]), is_free=bool(record["is_free"]))
+            record.setdefault("source", None)
+            row = {column: record[column] for column in COLUMNS}
+            row_hash = _row_hash(row)
+            row.update(tags=json.dumps(row["tags"]), metadata=json.dumps(row["metadata"]))
+            rows.append((*row.values(), row_hash))
+
+        assignments = ", ".join(
+            f"{column} = excluded.{column}" for column in COLUMNS[2:] + ("row_hash",)
+        )
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                cursor = self._conn.executemany(
+                    f"INSERT INTO apis ({', '.join(COLUMNS)}, row_hash) "
+                    f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))}) "
+                    f"ON CONFLICT(name, base_url) DO UPDATE SET {assignments} "
+                    "WHERE apis.row_hash != excluded.row_hash",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        # Counts direct inserts and updates only, not the FTS trigger writes
+        return max(cursor.rowcount, 0)
+
+    def retain(self, keys: list[tuple[str, str]], sources: Optional[list[str]] = None) -> int:
+        """Delete every record whose (name, base_url) is not in ``keys``, returning the count
+
+        With ``sources``, only records last reported by one of those sources
+        are candidates for deletion.
+        """
+        source_filter = ""
+        params: tuple = ()
+        if sources is not None:
+            source_filter = f" AND source IN ({', '.join('?' * len(sources))})"
+            params = tuple(sources)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "CREATE TEMP TABLE IF NOT EXISTS retained (name TEXT, base_url TEXT)"
+                )
+                self._conn.execute("DELETE FROM retained")
+                self._conn.executemany("INSERT INTO retained VALUES (?, ?)", keys)
+                cursor = self._conn.execute(
+                    "DELETE FROM apis WHERE NOT EXISTS (SELECT 1 FROM retained "
+                    "WHERE retained.name = apis.name AND retained.base_url = apis.base_url)"
+                    + source_filter,
+                    params,
+                )
+                self._conn.execute("DELETE FROM retained")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return max(cursor.rowcount, 0)
+
+    def _select(self, where: str = "", params: tuple = (), order: str = "name") -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM apis {where} ORDER BY {order}", params
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> dict[str, Any]:
+        record = {column: row[column] for column in COLUMNS}
+        record.update(
+            is_free=bool(record["is_free"]),
+            tags=json.loads(record["tags"]),
+            metadata=json.loads(record["metadata"]),
+        )
+        return record
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        auth_type: Optional[str] = None,
+        is_free: Optional[bool] = None,
+        status: Optional[str] = None,
+        exclude_statuses: tuple[str, ...] = (),
+    ) -> list[dict[str, Any]]:
+        """Records matching every given filter and none of ``exclude_statuses``"""
+        filters = {
+            "category": category,
+            "auth_type": auth_type,
+            "is_free": None if is_free is None else int(is_free),
+            "status": status,
+        }
+        filters = {column: value for column, value in filters.items() if value is not None}
+        clauses = [f"{column} = ?" for column in filters]
+        params = tuple(filters.values())
+        if exclude_statuses:
+            clauses.append(f"status NOT IN ({', '.join('?' * len(exclude_statuses))})")
+            params += tuple(exclude_statuses)
+        where = " AND ".join(clauses)
+        return self._select(f"WHERE {where}" if where else "", params)
+
+    def search(self, query: str) -> list[dict[str, Any]]:
+        """Records whose name, description or tags contain words starting with the query's"""
+        tokens = _TOKEN.findall(query.lower())
+        if not tokens:
+            return []
+
+        if self.full_text:
+            match = " ".join(f'"{token}"*' for token in tokens)
+            return self._select(
+                "WHERE id IN (SELECT rowid FROM apis_fts WHERE apis_fts MATCH ?)", (match,)
+            )
+
+        clauses = " AND ".join(
+            "(lower(name) LIKE ? OR lower(description) LIKE ? OR lower(tags) LIKE ?)"
+            for _ in tokens
+        )
+        params = tuple(f"%{token}%" for token in tokens for _ in range(3))
+        return self._select(f"WHERE {clauses}", params)
+
+    def get(self, name: str, base_url: str) -> Optional[dict[str, Any]]:
+        records = self._select("WHERE name = ? AND base_url = ?", (name, base_url))
+        return records[0] if records else None
+
+    def all(self) -> list[dict[str, Any]]:
+        return self._select()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM apis").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
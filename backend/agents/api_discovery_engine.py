@@ -4,10 +4,13 @@ API Discovery Engine
 
 Automated API discovery and integration system that:
 - Discovers APIs from multiple sources (PublicAPIs.org, RapidAPI, GitHub, etc.)
-- Validates API endpoints and documentation
+  concurrently
+- Validates API endpoints and documentation concurrently, reading only
+  headers and a capped prefix of each response body
 - Generates integration code automatically
 - Manages API credentials and rate limits
-- Provides unified interface for discovered APIs
+- Provides unified interface for discovered APIs, backed by an indexed
+  SQLite catalog (see api_catalog.py)
 """
 
 import asyncio
@@ -20,6 +23,18 @@ from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from backend.agents.api_catalog import APICatalog
+from backend.utils.sqlite_cache import SQLiteCache
+
+try:
+    import aiohttp
+
+    aiohttp_available = True
+except ImportError:
+    aiohttp = None
+    aiohttp_available = False
 
 try:
     import requests
@@ -130,6 +145,7 @@ class APIInfo:
     error_count: int = 0
     tags: set[str] = field(default_factory=set)
     metadata: dict[str, Any] = field(default_factory=dict)
+    source: Optional[str] = None  # Discovery source that last reported this API
 
 
 @dataclass
@@ -139,8 +155,10 @@ class APIDiscoveryConfig:
     max_apis_per_source: int = 100
     validate_endpoints: bool = True
     generate_integration_code: bool = True
-    cache_duration: int = 86400  # 24 hours
-    concurrent_validations: int = 10
+    cache_duration: int = 86400  # 24 hours, also the TTL of cached validation results
+    concurrent_validations: int = 100
+    max_validations_per_host: int = 4
+    validation_body_bytes: int = 64 * 1024  # Body prefix read when validating
     timeout: float = 30.0
     retry_attempts: int = 3
     categories_filter: Optional[list[APICategory]] = None
@@ -158,16 +176,30 @@ class APIDiscoveryEngine:
         self.cache_dir = Path("api_discovery_cache")
         self.cache_dir.mkdir(exist_ok=True)
 
-        # Initialize web scraper
-        scraping_config = ScrapingConfig(
-            method=ScrapingMethod.REQUESTS,
-            max_retries=self.config.retry_attempts,
-            timeout=self.config.timeout,
-            cache_responses=True,
-            rate_limit=1.0,
+        # Validation results by base URL, kept for cache_duration
+        self.validation_cache = SQLiteCache(
+            self.cache_dir / "validations.db",
+            table="api_validations",
+            ttl=self.config.cache_duration,
         )
+        self.validation_stats = {"checked": 0, "cached": 0, "errors": 0}
+
+        # Persistent catalog behind the get_*/search queries
+        self.catalog = APICatalog(self.cache_dir / "api_catalog.db")
+        # Sources whose last discovery raised; their catalog rows are kept
+        self.failed_sources: set[str] = set()
+        self._http: Any = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
 
+        # Initialize web scraper
         if EnhancedWebScraper:
+            scraping_config = ScrapingConfig(
+                method=ScrapingMethod.REQUESTS,
+                max_retries=self.config.retry_attempts,
+                timeout=self.config.timeout,
+                cache_responses=True,
+                rate_limit=1.0,
+            )
             self.scraper = EnhancedWebScraper(scraping_config)
         else:
             self.scraper = None
@@ -194,20 +226,27 @@ class APIDiscoveryEngine:
         }
 
     async def discover_apis_from_all_sources(self) -> dict[str, list[APIInfo]]:
-        """Discover APIs from all configured sources"""
-        results = {}
+        """Discover APIs from all configured sources concurrently
+
+        A source that fails yields no APIs and is recorded in ``failed_sources``.
+        """
+        self.failed_sources = set()
 
-        for source_name, source_config in self.api_sources.items():
+        async def discover(source_name: str, source_config: dict) -> list[APIInfo]:
             try:
                 self.logger.info(f"Discovering APIs from {source_name}")
                 apis = await self._discover_from_source(source_name, source_config)
-                results[source_name] = apis
                 self.logger.info(f"Discovered {len(apis)} APIs from {source_name}")
+                return apis
             except Exception as e:
                 self.logger.error(f"Failed to discover APIs from {source_name}: {e}")
-                results[source_name] = []
+                self.failed_sources.add(source_name)
+                return []
 
-        return results
+        results = await asyncio.gather(
+            *(discover(name, source_config) for name, source_config in self.api_sources.items())
+        )
+        return dict(zip(self.api_sources, results))
 
     async def _discover_from_source(self, source_name: str, source_config: dict) -> list[APIInfo]:
         """Discover APIs from a specific source"""
@@ -224,131 +263,115 @@ class APIDiscoveryEngine:
             return []
 
     async def _discover_from_api_endpoint(self, url: str) -> list[APIInfo]:
-        """Discover APIs from PublicAPIs.org API endpoint"""
+        """Discover APIs from PublicAPIs.org API endpoint; fetch errors propagate"""
         if not requests:
-            return []
+            raise RuntimeError("requests is not installed")
 
-        try:
-            response = requests.get(url, timeout=self.config.timeout)
-            response.raise_for_status()
-            data = response.json()
-
-            apis = []
-            entries = data.get("entries", [])
-
-            for entry in entries[: self.config.max_apis_per_source]:
-                try:
-                    # Parse category
-                    category_str = entry.get("Category", "other").lower().replace(" ", "_")
-                    category = self._parse_category(category_str)
-
-                    # Skip if category filter is set and doesn't match
-                    if (
-                        self.config.categories_filter
-                        and category not in self.config.categories_filter
-                    ):
-                        continue
-
-                    # Parse authentication
-                    auth_str = entry.get("Auth", "").lower()
-                    auth_type = self._parse_auth_type(auth_str)
-
-                    # Check if free (skip paid APIs if free_only is True)
-                    is_free = (
-                        auth_str in ["", "no", "none"]
-                        or "free" in entry.get("Description", "").lower()
-                    )
-                    if self.config.free_only and not is_free:
-                        continue
-
-                    api_info = APIInfo(
-                        name=entry.get("API", "Unknown API"),
-                        base_url=entry.get("Link", ""),
-                        category=category,
-                        description=entry.get("Description", ""),
-                        auth_type=auth_type,
-                        is_free=is_free,
-                        documentation_url=entry.get("Link", ""),
-                        tags={category_str, "publicapis"},
-                    )
-
-                    apis.append(api_info)
-
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse API entry: {e}")
+        response = await asyncio.to_thread(requests.get, url, timeout=self.config.timeout)
+        response.raise_for_status()
+        data = response.json()
+
+        apis = []
+        entries = data.get("entries", [])
+
+        for entry in entries[: self.config.max_apis_per_source]:
+            try:
+                # Parse category
+                category_str = entry.get("Category", "other").lower().replace(" ", "_")
+                category = self._parse_category(category_str)
+
+                # Skip if category filter is set and doesn't match
+                if (
+                    self.config.categories_filter
+                    and category not in self.config.categories_filter
+                ):
                     continue
 
-            return apis
+                # Parse authentication
+                auth_str = entry.get("Auth", "").lower()
+                auth_type = self._parse_auth_type(auth_str)
 
-        except Exception as e:
-            self.logger.error(f"Failed to discover APIs from endpoint {url}: {e}")
-            return []
+                # Check if free (skip paid APIs if free_only is True)
+                is_free = (
+                    auth_str in ["", "no", "none"]
+                    or "free" in entry.get("Description", "").lower()
+                )
+                if self.config.free_only and not is_free:
+                    continue
+
+                api_info = APIInfo(
+                    name=entry.get("API", "Unknown API"),
+                    base_url=entry.get("Link", ""),
+                    category=category,
+                    description=entry.get("Description", ""),
+                    auth_type=auth_type,
+                    is_free=is_free,
+                    documentation_url=entry.get("Link", ""),
+                    tags={category_str, "publicapis"},
+                )
+
+                apis.append(api_info)
+
+            except Exception as e:
+                self.logger.warning(f"Failed to parse API entry: {e}")
+                continue
+
+        return apis
 
     async def _discover_from_web_scraping(self, source_name: str, url: str) -> list[APIInfo]:
-        """Discover APIs using web scraping"""
+        """Discover APIs using web scraping; scrape failures propagate"""
         if not self.scraper:
-            return []
+            raise RuntimeError("Enhanced web scraper not available")
 
-        try:
-            # Define extraction rules based on source
-            if source_name == "rapidapi_hub":
-                extraction_rules = [
-                    ExtractionRule(
-                        name="api_cards",
-                        selector=".api - card, [data - testid='api - card']",
-                        is_list=True,
-                        required=False,
-                    )
-                ]
-            elif source_name == "programmableweb":
-                extraction_rules = [
-                    ExtractionRule(
-                        name="api_listings",
-                        selector=".api - listing, .directory - listing",
-                        is_list=True,
-                        required=False,
-                    )
-                ]
-            else:
-                extraction_rules = [
-                    ExtractionRule(
-                        name="api_links",
-                        selector="a[href*='api'], a[href*='API']",
-                        is_list=True,
-                        required=False,
-                    )
-                ]
-
-            result = await self.scraper.scrape_url(url, extraction_rules)
-
-            if not result.success:
-                self.logger.error(f"Failed to scrape {url}: {result.error_message}")
-                return []
+        # Define extraction rules based on source
+        if source_name == "rapidapi_hub":
+            extraction_rules = [
+                ExtractionRule(
+                    name="api_cards",
+                    selector=".api - card, [data - testid='api - card']",
+                    is_list=True,
+                    required=False,
+                )
+            ]
+        elif source_name == "programmableweb":
+            extraction_rules = [
+                ExtractionRule(
+                    name="api_listings",
+                    selector=".api - listing, .directory - listing",
+                    is_list=True,
+                    required=False,
+                )
+            ]
+        else:
+            extraction_rules = [
+                ExtractionRule(
+                    name="api_links",
+                    selector="a[href*='api'], a[href*='API']",
+                    is_list=True,
+                    required=False,
+                )
+            ]
 
-            # Parse scraped data into API info
-            apis = self._parse_scraped_apis(result.data, source_name)
-            return apis[: self.config.max_apis_per_source]
+        result = await self.scraper.scrape_url(url, extraction_rules)
 
-        except Exception as e:
-            self.logger.error(f"Failed to scrape APIs from {url}: {e}")
-            return []
+        if not result.success:
+            raise RuntimeError(f"Failed to scrape {url}: {result.error_message}")
+
+        # Parse scraped data into API info
+        apis = self._parse_scraped_apis(result.data, source_name)
+        return apis[: self.config.max_apis_per_source]
 
     async def _discover_from_markdown(self, url: str) -> list[APIInfo]:
-        """Discover APIs from GitHub awesome lists (markdown format)"""
+        """Discover APIs from GitHub awesome lists (markdown format); fetch errors propagate"""
         if not requests:
-            return []
+            raise RuntimeError("requests is not installed")
 
-        try:
-            response = requests.get(url, timeout=self.config.timeout)
-            response.raise_for_status()
-            markdown_content = response.text
+        response = await asyncio.to_thread(requests.get, url, timeout=self.config.timeout)
+        response.raise_for_status()
+        markdown_content = response.text
 
-            apis = self._parse_markdown_apis(markdown_content)
-            return apis[: self.config.max_apis_per_source]
-
-        except Exception as e:
-            self.logger.error(f"Failed to discover APIs from markdown {url}: {e}")
-            return []
+        apis = self._parse_markdown_apis(markdown_content)
+        return apis[: self.config.max_apis_per_source]
 
     def _parse_category(self, category_str: str) -> APICategory:
         """Parse category string to APICategory enum"""
@@ -486,65 +509,170 @@ class APIDiscoveryEngine:
         return APICategory.OTHER
 
     async def validate_apis(self, apis: list[APIInfo]) -> list[APIInfo]:
-        """Validate discovered APIs by testing their endpoints"""
+        """Validate discovered APIs by testing their endpoints
+
+        Runs up to ``concurrent_validations`` checks at once, at most
+        ``max_validations_per_host`` per host, over one pooled HTTP client.
+        APIs sharing a base URL are checked once, and results younger than
+        ``cache_duration`` are reused.
+        """
         if not self.config.validate_endpoints:
             return apis
 
         semaphore = asyncio.Semaphore(self.config.concurrent_validations)
+        self._host_slots = {}
+        by_url: dict[str, list[APIInfo]] = {}
+        for api in apis:
+            by_url.setdefault(self._validation_key(api.base_url), []).append(api)
 
-        async def validate_single_api(api: APIInfo) -> APIInfo:
+        async def validate_single_api(group: list[APIInfo]) -> list[APIInfo]:
             async with semaphore:
-                return await self._validate_api(api)
-
-        tasks = [validate_single_api(api) for api in apis]
-        validated_apis = await asyncio.gather(*tasks, return_exceptions=True)
+                api = await self._validate_api(group[0])
+            for duplicate in group[1:]:
+                duplicate.validation_score = api.validation_score
+                duplicate.last_validated = api.last_validated
+                duplicate.status = api.status
+            return group
+
+        await self._open_http()
+        try:
+            tasks = [validate_single_api(group) for group in by_url.values()]
+            validated_groups = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            await self._close_http()
 
         # Filter out exceptions and failed validations
         successful_apis = []
-        for result in validated_apis:
-            if (
-                isinstance(result, APIInfo)
-                and result.validation_score >= self.config.min_validation_score
-            ):
-                successful_apis.append(result)
+        for result in validated_groups:
+            if isinstance(result, BaseException):
+                continue
+            for api in result:
+                if api.validation_score >= self.config.min_validation_score:
+                    successful_apis.append(api)
 
         return successful_apis
 
-    async def _validate_api(self, api: APIInfo) -> APIInfo:
-        """Validate a single API"""
-        try:
-            if not requests:
-                api.status = APIStatus.FAILED
-                return api
-
-            # Test basic connectivity
-            response = requests.get(api.base_url, timeout=self.config.timeout, allow_redirects=True)
-
-            score = 0.0
-
-            # Check if URL is reachable
-            if response.status_code < 400:
-                score += 0.3
+    @staticmethod
+    def _validation_key(base_url: str) -> str:
+        return base_url.strip().lower().rstrip("/")
+
+    async def _open_http(self):
+        if aiohttp_available:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.config.concurrent_validations,
+                    limit_per_host=self.config.max_validations_per_host,
+                    ttl_dns_cache=300,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+            )
+        elif requests:
+            self._http = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self.config.concurrent_validations,
+                pool_maxsize=self.config.max_validations_per_host,
+            )
+            self._http.mount("http://", adapter)
+            self._http.mount("https://", adapter)
+
+    async def _close_http(self):
+        if self._http is not None:
+            result = self._http.close()
+            if asyncio.iscoroutine(result):
+                await result
+            self._http = None
+
+    async def _fetch_for_validation(self, url: str) -> tuple[int, dict[str, str], bytes]:
+        """Status, headers and at most ``validation_body_bytes`` of the body"""
+        limit = self.config.validation_body_bytes
+        host = urlsplit(url).netloc.lower()
+        slots = self._host_slots.setdefault(
+            host, asyncio.Semaphore(self.config.max_validations_per_host)
+        )
 
-            # Check if it returns JSON (common for APIs)
+        async with slots:
+            if aiohttp_available:
+                async with self._http.get(url, allow_redirects=True) as response:
+                    body = b""
+                    while len(body) < limit:
+                        chunk = await response.content.read(limit - len(body))
+                        if not chunk:
+                            break
+                        body += chunk
+                    # Leaving the block drops the connection if the body was not drained
+                    return response.status, dict(response.headers), body
+
+            def fetch():
+                with self._http.get(
+                    url, timeout=self.config.timeout, allow_redirects=True, stream=True
+                ) as response:
+                    body = response.raw.read(limit, decode_content=True)
+                    return response.status_code, dict(response.headers), body
+
+            return await asyncio.to_thread(fetch)
+
+    @staticmethod
+    def _score_response(status_code: int, headers: dict[str, str], body: bytes) -> float:
+        score = 0.0
+
+        # Check if URL is reachable
+        if status_code < 400:
+            score += 0.3
+
+        # Check if it returns JSON (common for APIs)
+        header_names = {name.lower(): value for name, value in headers.items()}
+        if "json" in header_names.get("content-type", "").lower():
+            score += 0.2
+        else:
             try:
-                response.json()
+                json.loads(body)
                 score += 0.2
-            except Exception:
+            except ValueError:
                 pass
 
-            # Check for API - like headers
-            headers = response.headers
-            if any(header in headers for header in ["content - type", "x - ratelimit", "x - api"]):
-                score += 0.2
+        # Check for API-like headers
+        if any(
+            name.startswith(prefix)
+            for name in header_names
+            for prefix in ("x-ratelimit", "x-api", "x-rate-limit")
+        ):
+            score += 0.2
+
+        # Check for documentation indicators
+        content = body.decode("utf-8", errors="ignore").lower()
+        if any(word in content for word in ["api", "endpoint", "documentation", "swagger"]):
+            score += 0.3
+
+        return score
 
-            # Check for documentation indicators
-            content = response.text.lower()
-            if any(word in content for word in ["api", "endpoint", "documentation", "swagger"]):
-                score += 0.3
+    async def _validate_api(self, api: APIInfo) -> APIInfo:
+        """Validate a single API"""
+        key = self._validation_key(api.base_url)
+        # Called outside validate_apis: use a client for just this check
+        owns_http = self._http is None
+        try:
+            cached = self.validation_cache.get(key)
+            if cached is not None:
+                self.validation_stats["cached"] += 1
+                score = cached["score"]
+                api.last_validated = datetime.fromisoformat(cached["validated_at"])
+            else:
+                if owns_http:
+                    await self._open_http()
+                if self._http is None:
+                    api.status = APIStatus.FAILED
+                    return api
+
+                # Test basic connectivity
+                status_code, headers, body = await self._fetch_for_validation(api.base_url)
+                self.validation_stats["checked"] += 1
+                score = self._score_response(status_code, headers, body)
+                api.last_validated = datetime.now()
+                self.validation_cache.set(
+                    key, {"score": score, "validated_at": api.last_validated.isoformat()}
+                )
 
             api.validation_score = score
-            api.last_validated = datetime.now()
 
             if score >= self.config.min_validation_score:
                 api.status = APIStatus.VALIDATED
@@ -552,9 +680,21 @@ class APIDiscoveryEngine:
                 api.status = APIStatus.FAILED
 
         except Exception as e:
+            # Network errors are not cached, so the next run retries them, and
+            # do not overwrite the outcome of an earlier validation
+            self.validation_stats["errors"] += 1
             self.logger.warning(f"Failed to validate API {api.name}: {e}")
-            api.status = APIStatus.FAILED
-            api.validation_score = 0.0
+            stored = self.catalog.get(api.name, api.base_url)
+            if stored is not None and stored["last_validated"]:
+                api.status = APIStatus(stored["status"])
+                api.validation_score = stored["validation_score"]
+                api.last_validated = datetime.fromisoformat(stored["last_validated"])
+            else:
+                api.status = APIStatus.FAILED
+                api.validation_score = 0.0
+        finally:
+            if owns_http:
+                await self._close_http()
 
         return api
 
@@ -685,61 +825,74 @@ if __name__ == "__main__":
 
         return "\n".join(methods)  # Fixed escaped newline
 
-    def save_discovered_apis(
-        self, apis: list[APIInfo], filename: str = "discovered_apis.json"
-    ) -> None:
-        """Save discovered APIs to file"""
-        api_data = []
-        for api in apis:
-            api_dict = {
-                "name": api.name,
-                "base_url": api.base_url,
-                "category": api.category.value,
-                "description": api.description,
-                "auth_type": api.auth_type.value,
-                "is_free": api.is_free,
-                "rate_limit": api.rate_limit,
-                "documentation_url": api.documentation_url,
-                "status": api.status.value,
-                "validation_score": api.validation_score,
-                "last_validated": (api.last_validated.isoformat() if api.last_validated else None),
-                "tags": list(api.tags),
-                "metadata": api.metadata,
-            }
-            api_data.append(api_dict)
+    @staticmethod
+    def _api_to_record(api: APIInfo) -> dict[str, Any]:
+        return {
+            "name": api.name,
+            "base_url": api.base_url,
+            "category": api.category.value,
+            "description": api.description,
+            "auth_type": api.auth_type.value,
+            "is_free": api.is_free,
+            "rate_limit": api.rate_limit,
+            "documentation_url": api.documentation_url,
+            "status": api.status.value,
+            "validation_score": api.validation_score,
+            "last_validated": (api.last_validated.isoformat() if api.last_validated else None),
+            "tags": sorted(api.tags),
+            "metadata": api.metadata,
+            "source": api.source,
+        }
+
+    @staticmethod
+    def _record_to_api(data: dict[str, Any]) -> APIInfo:
+        api = APIInfo(
+            name=data["name"],
+            base_url=data["base_url"],
+            category=APICategory(data["category"]),
+            description=data["description"],
+            auth_type=AuthType(data["auth_type"]),
+            is_free=data["is_free"],
+            rate_limit=data.get("rate_limit"),
+            documentation_url=data.get("documentation_url"),
+            status=APIStatus(data["status"]),
+            validation_score=data.get("validation_score", 0.0),
+            tags=set(data.get("tags", [])),
+            metadata=data.get("metadata", {}),
+            source=data.get("source"),
+        )
+
+        if data.get("last_validated"):
+            api.last_validated = datetime.fromisoformat(data["last_validated"])
 
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(api_data, f, indent=2, ensure_ascii=False)
+        return api
 
-        self.logger.info(f"Saved {len(apis)} APIs to {filename}")
+    def save_discovered_apis(self, apis: list[APIInfo], filename: Optional[str] = None) -> int:
+        """Merge APIs into the catalog, optionally also exporting them to a JSON file
+
+        Returns the number of catalog rows that were new or changed.
+        """
+        records = [self._api_to_record(api) for api in apis]
+        changed = self.catalog.upsert(records)
+        self.logger.info(f"Saved {len(apis)} APIs to the catalog ({changed} new or changed)")
+
+        if filename:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(records, f, indent=2, ensure_ascii=False)
+            self.logger.info(f"Exported {len(apis)} APIs to {filename}")
+
+        return changed
+
+    def load_discovered_apis(self, filename: Optional[str] = None) -> list[APIInfo]:
+        """Load APIs from the catalog, or from a JSON export when ``filename`` is given"""
+        if not filename:
+            return [self._record_to_api(record) for record in self.catalog.all()]
 
-    def load_discovered_apis(self, filename: str = "discovered_apis.json") -> list[APIInfo]:
-        """Load discovered APIs from file"""
         try:
             with open(filename, encoding="utf-8") as f:
                 api_data = json.load(f)
 
-            apis = []
-            for data in api_data:
-                api = APIInfo(
-                    name=data["name"],
-                    base_url=data["base_url"],
-                    category=APICategory(data["category"]),
-                    description=data["description"],
-                    auth_type=AuthType(data["auth_type"]),
-                    is_free=data["is_free"],
-                    rate_limit=data.get("rate_limit"),
-                    documentation_url=data.get("documentation_url"),
-                    status=APIStatus(data["status"]),
-                    validation_score=data.get("validation_score", 0.0),
-                    tags=set(data.get("tags", [])),
-                    metadata=data.get("metadata", {}),
-                )
-
-                if data.get("last_validated"):
-                    api.last_validated = datetime.fromisoformat(data["last_validated"])
-
-                apis.append(api)
+            apis = [self._record_to_api(data) for data in api_data]
 
             self.logger.info(f"Loaded {len(apis)} APIs from {filename}")
             return apis
@@ -749,31 +902,27 @@ if __name__ == "__main__":
             return []
 
     def get_apis_by_category(self, category: APICategory) -> list[APIInfo]:
-        """Get APIs filtered by category"""
-        return [api for api in self.discovered_apis.values() if api.category == category]
+        """Get APIs filtered by category, leaving out failed validations"""
+        records = self.catalog.query(
+            category=category.value, exclude_statuses=(APIStatus.FAILED.value,)
+        )
+        return [self._record_to_api(r) for r in records]
 
     def get_free_apis(self) -> list[APIInfo]:
-        """Get only free APIs"""
-        return [api for api in self.discovered_apis.values() if api.is_free]
+        """Get only free APIs, leaving out failed validations"""
+        records = self.catalog.query(is_free=True, exclude_statuses=(APIStatus.FAILED.value,))
+        return [self._record_to_api(r) for r in records]
 
     def get_validated_apis(self) -> list[APIInfo]:
         """Get only validated APIs"""
-        return [api for api in self.discovered_apis.values() if api.status == APIStatus.VALIDATED]
+        return [
+            self._record_to_api(r)
+            for r in self.catalog.query(status=APIStatus.VALIDATED.value)
+        ]
 
     def search_apis(self, query: str) -> list[APIInfo]:
-        """Search APIs by name or description"""
-        query_lower = query.lower()
-        results = []
-
-        for api in self.discovered_apis.values():
-            if (
-                query_lower in api.name.lower()
-                or query_lower in api.description.lower()
-                or any(query_lower in tag for tag in api.tags)
-            ):
-                results.append(api)
-
-        return results
+        """Search APIs by name, description or tags"""
+        return [self._record_to_api(r) for r in self.catalog.search(query)]
 
     async def run_full_discovery(self) -> dict[str, Any]:
         """Run complete API discovery process"""
@@ -784,7 +933,9 @@ if __name__ == "__main__":
 
         # Flatten results
         all_apis = []
-        for source_apis in discovery_results.values():
+        for source_name, source_apis in discovery_results.items():
+            for api in source_apis:
+                api.source = source_name
             all_apis.extend(source_apis)
 
         # Remove duplicates based on base URL
@@ -810,8 +961,23 @@ if __name__ == "__main__":
             for api in top_apis:
                 integration_codes[api.name] = self.generate_integration_code(api)
 
-        # Save results
-        self.save_discovered_apis(validated_apis)
+        # Save every API with its current status, and drop catalog rows that a
+        # source which completed this run no longer reports. Rows of failed
+        # sources are kept, so a transient outage does not empty the catalog.
+        catalog_changes = self.save_discovered_apis(unique_apis_list)
+        catalog_removed = 0
+        completed_sources = [
+            name for name in discovery_results if name not in self.failed_sources
+        ]
+        if not unique_apis_list:
+            self.logger.warning("No APIs discovered, keeping the existing catalog")
+        elif completed_sources:
+            keys = [(api.name, api.base_url) for api in unique_apis_list]
+            # Rows saved before sources were recorded can only be pruned
+            # when every source completed
+            catalog_removed = self.catalog.retain(
+                keys, sources=completed_sources if self.failed_sources else None
+            )
 
         end_time = time.time()
 
@@ -827,12 +993,17 @@ if __name__ == "__main__":
             },
             "free_apis": len(self.get_free_apis()),
             "validated_count": len(self.get_validated_apis()),
+            "validation_stats": dict(self.validation_stats),
+            "catalog_changes": catalog_changes,
+            "catalog_removed": catalog_removed,
         }
 
     def cleanup(self) -> None:
         """Clean up resources"""
         if self.scraper:
             self.scraper.cleanup()
+        self.validation_cache.close()
+        self.catalog.close()
 
         self.logger.info("API Discovery Engine cleanup completed")
 
@@ -1,12 +1,28 @@
-"""Upload API endpoints for file upload and management."""
-
+"""Upload API endpoints for file upload and management.
+
+Uploads are streamed to disk in ``UPLOAD_CHUNK_SIZE`` chunks and hashed as
+they are written, so memory use does not grow with file size. File contents
+are stored once per SHA-256 digest under ``uploads/.blobs`` and each upload
+is a hard link to its blob. Large files can also be sent as a resumable
+series of parts. File metadata is kept in a SQLite index (see
+``backend.api.upload_index``); rebuild it from disk with
+``python -m backend.api.upload reconcile``.
+"""
+
+import asyncio
 import hashlib
+import json
 import logging
 import mimetypes
+import os
+import shutil
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+from backend.api.upload_index import UploadIndex
 
 # Simple fallback classes for missing dependencies
 
@@ -29,6 +45,13 @@ class APIRouter:
 
         return decorator
 
+    def put(self, path: str, **kwargs):
+        def decorator(func):
+            self.routes.append({"method": "PUT", "path": path, "func": func})
+            return func
+
+        return decorator
+
     def delete(self, path: str, **kwargs):
         def decorator(func):
             self.routes.append({"method": "DELETE", "path": path, "func": func})
@@ -56,9 +79,9 @@ class UploadFile:
         self.content_type = content_type
         self.file = file
 
-    async def read(self) -> bytes:
+    async def read(self, size: int = -1) -> bytes:
         if self.file:
-            return await self.file.read()
+            return await self.file.read(size)
         return b""
 
     async def write(self, data: bytes):
@@ -69,6 +92,7 @@ class UploadFile:
 class status:
     HTTP_500_INTERNAL_SERVER_ERROR = 500
     HTTP_404_NOT_FOUND = 404
+    HTTP_409_CONFLICT = 409
     HTTP_200_OK = 200
     HTTP_400_BAD_REQUEST = 400
     HTTP_413_REQUEST_ENTITY_TOO_LARGE = 413
@@ -80,11 +104,16 @@ logger = logging.getLogger(__name__)
 
 # Configuration
 UPLOAD_DIR = Path("uploads")
+BLOB_DIR = UPLOAD_DIR / ".blobs"  # Content-addressed file contents
+PARTIAL_DIR = UPLOAD_DIR / ".partial"  # Resumable uploads in progress
+UPLOAD_INDEX_DB = UPLOAD_DIR / ".index.db"
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".pdf", ".txt", ".doc", ".docx"}
 
-# Ensure upload directory exists
-UPLOAD_DIR.mkdir(exist_ok=True)
+# Ensure upload directories exist
+for directory in (UPLOAD_DIR, BLOB_DIR, PARTIAL_DIR):
+    directory.mkdir(exist_ok=True)
 
 # Pydantic Models
 
@@ -126,9 +155,32 @@ class UploadResponse(BaseModel):
 
 
 class FileListResponse(BaseModel):
-    def __init__(self, files: Optional[list[FileInfo]] = None, total: int = 0, **kwargs):
+    def __init__(
+        self,
+        files: Optional[list[FileInfo]] = None,
+        total: int = 0,
+        next_cursor: Optional[str] = None,
+        **kwargs,
+    ):
         self.files = files or []
         self.total = total
+        self.next_cursor = next_cursor
+        super().__init__(**kwargs)
+
+
+class UploadSessionResponse(BaseModel):
+    def __init__(
+        self,
+        upload_id: str = "",
+        original_filename: str = "",
+        offset: int = 0,
+        total_size: Optional[int] = None,
+        **kwargs,
+    ):
+        self.upload_id = upload_id
+        self.original_filename = original_filename
+        self.offset = offset
+        self.total_size = total_size
         super().__init__(**kwargs)
 
 
@@ -139,6 +191,41 @@ class DeleteResponse(BaseModel):
         super().__init__(**kwargs)
 
 
+# Metadata index, one per index database path
+_indexes: dict[Path, UploadIndex] = {}
+
+
+def _describe_file(file_path: Path) -> dict[str, Any]:
+    """Index record for a stored file, as reconstructed from its name and stat."""
+    filename = file_path.name
+    file_id, _, original_filename = filename.partition("_")
+    return {
+        "file_id": file_id,
+        "filename": filename,
+        "original_filename": original_filename or filename,
+        "content_type": mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        "size": file_path.stat().st_size,
+        "upload_date": file_path.stat().st_ctime,
+    }
+
+
+def get_upload_index() -> UploadIndex:
+    """Open the upload index, building it from disk the first time."""
+    index = _indexes.get(UPLOAD_INDEX_DB)
+    if index is None:
+        is_new = not UPLOAD_INDEX_DB.exists()
+        index = _indexes[UPLOAD_INDEX_DB] = UploadIndex(UPLOAD_INDEX_DB)
+        if is_new:
+            # Uploads from before the index existed
+            index.reconcile(UPLOAD_DIR, _describe_file)
+    return index
+
+
+def reconcile_upload_index() -> dict[str, int]:
+    """Rebuild the upload index from the files in UPLOAD_DIR."""
+    return get_upload_index().reconcile(UPLOAD_DIR, _describe_file)
+
+
 # Service Class
 
 
@@ -156,7 +243,7 @@ class UploadService:
         try:
             hash_sha256 = hashlib.sha256()
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
+                for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
                     hash_sha256.update(chunk)
             return hash_sha256.hexdigest()
         except Exception as e:
@@ -176,60 +263,136 @@ class UploadService:
         safe_filename = "".join(c for c in filename if c in safe_chars)
         return safe_filename[:255]  # Limit filename length
 
+    @staticmethod
+    def _check_filename(filename: str) -> None:
+        """Reject missing filenames and disallowed extensions."""
+        if not filename:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "No file provided")
+
+        if not UploadService._is_allowed_file(filename):
+            raise HTTPException(
+                status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}",
+            )
+
+    @staticmethod
+    def _too_large() -> HTTPException:
+        return HTTPException(
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            f"File too large. Maximum size: {MAX_FILE_SIZE / (1024 * 1024):.1f}MB",
+        )
+
+    @staticmethod
+    async def _stream_to_file(file: UploadFile, f, hasher, size: int = 0) -> int:
+        """Copy an upload into an open file chunk by chunk, hashing as it goes.
+
+        ``size`` is the number of bytes already in the file. Raises 413 as
+        soon as the total passes MAX_FILE_SIZE.
+        """
+
+        def write(chunk: bytes) -> None:
+            f.write(chunk)
+            hasher.update(chunk)
+
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_FILE_SIZE:
+                raise UploadService._too_large()
+            # Keep disk writes and hashing of large chunks off the event loop
+            await asyncio.to_thread(write, chunk)
+        return size
+
+    @staticmethod
+    def _store_blob(temp_path: Path, file_hash: str, filename: str) -> str:
+        """Move finished content into the blob store and link it as a new upload.
+
+        Content already in the store is kept and the new copy discarded.
+        Returns the stored filename.
+        """
+        blob_path = BLOB_DIR / file_hash
+        if blob_path.exists():
+            temp_path.unlink()
+            logger.info(f"Deduplicated upload {filename} against blob {file_hash[:12]}")
+        else:
+            os.replace(temp_path, blob_path)
+
+        file_id = UploadService._generate_file_id()
+        stored_filename = f"{file_id}_{UploadService._get_safe_filename(filename)}"
+        try:
+            os.link(blob_path, UPLOAD_DIR / stored_filename)
+        except OSError:
+            # Filesystems without hard links get a copy
+            shutil.copyfile(blob_path, UPLOAD_DIR / stored_filename)
+        return stored_filename
+
+    @staticmethod
+    def _release_blob(file_hash: str) -> None:
+        """Remove a blob once no indexed upload refers to it any more."""
+        if not file_hash or get_upload_index().find_by_hash(file_hash):
+            return
+        try:
+            (BLOB_DIR / file_hash).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not release blob {file_hash}: {e}")
+
+    @staticmethod
+    def _to_file_info(record: dict[str, Any]) -> FileInfo:
+        record = dict(record)
+        record["upload_date"] = datetime.fromtimestamp(record["upload_date"])
+        return FileInfo(**record)
+
+    @staticmethod
+    def _register(
+        stored_filename: str,
+        original_filename: str,
+        content_type: Optional[str],
+        size: int,
+        file_hash: str,
+    ) -> FileInfo:
+        """Add a newly stored file to the index."""
+        record = {
+            "file_id": stored_filename.split("_", 1)[0],
+            "filename": stored_filename,
+            "original_filename": original_filename,
+            "content_type": (
+                content_type
+                or mimetypes.guess_type(original_filename)[0]
+                or "application/octet-stream"
+            ),
+            "size": size,
+            "file_hash": file_hash,
+            "upload_date": time.time(),
+        }
+        get_upload_index().add(**record)
+        return UploadService._to_file_info(record)
+
+    @staticmethod
+    def _lookup(file_id: str) -> tuple[dict[str, Any], Path]:
+        """Index record and path of an uploaded file, or 404."""
+        record = get_upload_index().get(file_id)
+        if record is not None:
+            file_path = UPLOAD_DIR / record["filename"]
+            if file_path.is_file():
+                return record, file_path
+            # Removed behind the index's back
+            get_upload_index().remove(file_id)
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "File not found")
+
     @staticmethod
     async def upload_file(file: UploadFile) -> UploadResponse:
         """Upload a file to the server."""
+        temp_path = PARTIAL_DIR / f"{UploadService._generate_file_id()}.tmp"
         try:
-            if not file.filename:
-                raise HTTPException(status.HTTP_400_BAD_REQUEST, "No file provided")
-
-            # Check file extension
-            if not UploadService._is_allowed_file(file.filename):
-                raise HTTPException(
-                    status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                    f"File type not allowed. Allowed types: {
-                        ', '.join(ALLOWED_EXTENSIONS)
-                    }",
-                )
-
-            # Read file content
-            content = await file.read()
-
-            # Check file size
-            if len(content) > MAX_FILE_SIZE:
-                raise HTTPException(
-                    status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    f"File too large. Maximum size: {MAX_FILE_SIZE / (1024 * 1024):.1f}MB",
-                )
-
-            # Generate unique file ID and safe filename
-            file_id = UploadService._generate_file_id()
-            safe_filename = UploadService._get_safe_filename(file.filename)
-            stored_filename = f"{file_id}_{safe_filename}"
-            file_path = UPLOAD_DIR / stored_filename
-
-            # Save file
-            with open(file_path, "wb") as f:
-                f.write(content)
-
-            # Calculate file hash
-            file_hash = UploadService._calculate_file_hash(file_path)
-
-            # Determine content type
-            content_type = (
-                file.content_type
-                or mimetypes.guess_type(file.filename)[0]
-                or "application/octet-stream"
-            )
+            UploadService._check_filename(file.filename)
+
+            hasher = hashlib.sha256()
+            with open(temp_path, "wb") as f:
+                size = await UploadService._stream_to_file(file, f, hasher)
+            file_hash = hasher.hexdigest()
 
-            # Create file info
-            file_info = FileInfo(
-                file_id=file_id,
-                filename=stored_filename,
-                original_filename=file.filename,
-                content_type=content_type,
-                size=len(content),
-                file_hash=file_hash,
+            stored_filename = UploadService._store_blob(temp_path, file_hash, file.filename)
+            file_info = UploadService._register(
+                stored_filename, file.filename, file.content_type, size, file_hash
             )
 
             logger.info(f"File uploaded successfully: {file.filename} -> {stored_filename}")
@@ -243,34 +406,171 @@ class UploadService:
         except Exception as e:
             logger.error(f"Error uploading file: {e}")
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Failed to upload file")
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    # Resumable uploads: start a session, send parts at increasing offsets,
+    # then complete it. The partial file and a JSON sidecar live in
+    # PARTIAL_DIR, so an interrupted upload can resume from get_upload_status.
+
+    # upload_id -> (bytes hashed, running SHA-256)
+    _hashers: dict[str, tuple[int, Any]] = {}
+    # Uploads with a part currently streaming; a second part is refused
+    _parts_in_flight: set[str] = set()
+
+    @staticmethod
+    def _check_not_in_flight(upload_id: str) -> None:
+        if upload_id in UploadService._parts_in_flight:
+            raise HTTPException(
+                status.HTTP_409_CONFLICT, "Another part of this upload is still in progress"
+            )
+
+    @staticmethod
+    def _session_paths(upload_id: str) -> tuple[Path, Path]:
+        try:
+            upload_id = str(uuid.UUID(upload_id))
+        except ValueError:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Upload not found")
+        return PARTIAL_DIR / f"{upload_id}.part", PARTIAL_DIR / f"{upload_id}.json"
+
+    @staticmethod
+    def _load_session(upload_id: str) -> tuple[Path, dict]:
+        part_path, meta_path = UploadService._session_paths(upload_id)
+        if not meta_path.exists():
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Upload not found")
+        return part_path, json.loads(meta_path.read_text())
+
+    @staticmethod
+    def _session_hasher(upload_id: str, part_path: Path, size: int):
+        """Running hash of a partial upload, rebuilt from disk after a restart"""
+        hashed, hasher = UploadService._hashers.get(upload_id, (None, None))
+        if hashed != size:
+            hasher = hashlib.sha256()
+            with open(part_path, "rb") as f:
+                for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+            UploadService._hashers[upload_id] = (size, hasher)
+        return hasher
+
+    @staticmethod
+    def start_upload(
+        filename: str, content_type: Optional[str] = None, total_size: Optional[int] = None
+    ) -> UploadSessionResponse:
+        """Start a resumable upload."""
+        UploadService._check_filename(filename)
+        if total_size is not None and total_size > MAX_FILE_SIZE:
+            raise UploadService._too_large()
+
+        upload_id = UploadService._generate_file_id()
+        part_path, meta_path = UploadService._session_paths(upload_id)
+        part_path.touch()
+        meta_path.write_text(
+            json.dumps(
+                {"filename": filename, "content_type": content_type, "total_size": total_size}
+            )
+        )
+        UploadService._hashers[upload_id] = (0, hashlib.sha256())
+        return UploadSessionResponse(
+            upload_id=upload_id, original_filename=filename, total_size=total_size
+        )
+
+    @staticmethod
+    def get_upload_status(upload_id: str) -> UploadSessionResponse:
+        """Get the offset a resumable upload should continue from."""
+        part_path, meta = UploadService._load_session(upload_id)
+        return UploadSessionResponse(
+            upload_id=upload_id,
+            original_filename=meta["filename"],
+            offset=part_path.stat().st_size,
+            total_size=meta["total_size"],
+        )
+
+    @staticmethod
+    async def upload_part(upload_id: str, offset: int, file: UploadFile) -> UploadSessionResponse:
+        """Append a part to a resumable upload.
+
+        ``offset`` must equal the bytes received so far; a mismatch (e.g. a
+        part retried after it was already stored) is answered with 409 and
+        the client resumes from get_upload_status.
+        """
+        part_path, meta = UploadService._load_session(upload_id)
+        upload_id = part_path.stem
+        # Checked and claimed before the first await, so two requests for the
+        # same upload can never both pass the offset check and append
+        UploadService._check_not_in_flight(upload_id)
+        size = part_path.stat().st_size
+        if offset != size:
+            raise HTTPException(
+                status.HTTP_409_CONFLICT, f"Upload is at offset {size}, not {offset}"
+            )
+
+        UploadService._parts_in_flight.add(upload_id)
+        try:
+            hasher = UploadService._session_hasher(upload_id, part_path, size)
+            with open(part_path, "ab") as f:
+                try:
+                    size = await UploadService._stream_to_file(file, f, hasher, size)
+                except BaseException:
+                    # Drop the partly written part so the stored bytes and hash agree
+                    f.truncate(offset)
+                    UploadService._hashers.pop(upload_id, None)
+                    raise
+            UploadService._hashers[upload_id] = (size, hasher)
+        finally:
+            UploadService._parts_in_flight.discard(upload_id)
+
+        return UploadSessionResponse(
+            upload_id=upload_id,
+            original_filename=meta["filename"],
+            offset=size,
+            total_size=meta["total_size"],
+        )
+
+    @staticmethod
+    def complete_upload(upload_id: str, expected_hash: Optional[str] = None) -> UploadResponse:
+        """Finish a resumable upload and store it like a single-request upload."""
+        part_path, meta = UploadService._load_session(upload_id)
+        upload_id = part_path.stem
+        UploadService._check_not_in_flight(upload_id)
+        size = part_path.stat().st_size
+        if meta["total_size"] is not None and size != meta["total_size"]:
+            raise HTTPException(
+                status.HTTP_409_CONFLICT,
+                f"Upload has {size} of {meta['total_size']} bytes",
+            )
+
+        file_hash = UploadService._session_hasher(upload_id, part_path, size).hexdigest()
+        if expected_hash and expected_hash.lower() != file_hash:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "Uploaded content hash mismatch")
+
+        stored_filename = UploadService._store_blob(part_path, file_hash, meta["filename"])
+        UploadService._session_paths(upload_id)[1].unlink()
+        UploadService._hashers.pop(upload_id, None)
+
+        file_info = UploadService._register(
+            stored_filename, meta["filename"], meta["content_type"], size, file_hash
+        )
+        logger.info(f"Resumable upload completed: {meta['filename']} -> {stored_filename}")
+        return UploadResponse(
+            success=True, message="File uploaded successfully", file_info=file_info
+        )
+
+    @staticmethod
+    def abort_upload(upload_id: str) -> DeleteResponse:
+        """Discard a resumable upload."""
+        upload_id = UploadService._load_session(upload_id)[0].stem
+        UploadService._check_not_in_flight(upload_id)
+        for path in UploadService._session_paths(upload_id):
+            path.unlink(missing_ok=True)
+        UploadService._hashers.pop(upload_id, None)
+        return DeleteResponse(success=True, message="Upload aborted")
 
     @staticmethod
     def get_file_info(file_id: str) -> FileInfo:
         """Get information about an uploaded file."""
         try:
-            # Find file by ID
-            for file_path in UPLOAD_DIR.glob(f"{file_id}_*"):
-                if file_path.is_file():
-                    stat = file_path.stat()
-                    content_type = (
-                        mimetypes.guess_type(str(file_path))[0] or "application/octet-stream"
-                    )
-
-                    # Extract original filename
-                    stored_filename = file_path.name
-                    original_filename = stored_filename[len(file_id) + 1 :]  # Remove file_id prefix
-
-                    return FileInfo(
-                        file_id=file_id,
-                        filename=stored_filename,
-                        original_filename=original_filename,
-                        content_type=content_type,
-                        size=stat.st_size,
-                        upload_date=datetime.fromtimestamp(stat.st_ctime),
-                        file_hash=UploadService._calculate_file_hash(file_path),
-                    )
-
-            raise HTTPException(status.HTTP_404_NOT_FOUND, "File not found")
+            record, _ = UploadService._lookup(file_id)
+            return UploadService._to_file_info(record)
 
         except HTTPException:
             raise
@@ -279,45 +579,25 @@ class UploadService:
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Failed to get file info")
 
     @staticmethod
-    def list_files(limit: int = 100, offset: int = 0) -> FileListResponse:
-        """List uploaded files."""
+    def list_files(
+        limit: int = 100, offset: int = 0, cursor: Optional[str] = None
+    ) -> FileListResponse:
+        """List uploaded files, newest first.
+
+        Pass the previous page's ``next_cursor`` as ``cursor`` to page
+        without the cost of skipping ``offset`` rows.
+        """
         try:
-            files = []
-            all_files = list(UPLOAD_DIR.glob("*"))
-            all_files.sort(key=lambda x: x.stat().st_ctime, reverse=True)
-
-            for file_path in all_files[offset : offset + limit]:
-                if file_path.is_file():
-                    try:
-                        # Extract file ID from filename
-                        filename = file_path.name
-                        if "_" in filename:
-                            file_id = filename.split("_", 1)[0]
-                            original_filename = filename.split("_", 1)[1]
-                        else:
-                            file_id = filename
-                            original_filename = filename
-
-                        stat = file_path.stat()
-                        content_type = (
-                            mimetypes.guess_type(str(file_path))[0] or "application/octet-stream"
-                        )
-
-                        file_info = FileInfo(
-                            file_id=file_id,
-                            filename=filename,
-                            original_filename=original_filename,
-                            content_type=content_type,
-                            size=stat.st_size,
-                            upload_date=datetime.fromtimestamp(stat.st_ctime),
-                        )
-                        files.append(file_info)
-                    except Exception as e:
-                        logger.warning(f"Error processing file {file_path}: {e}")
-                        continue
-
-            return FileListResponse(files=files, total=len(all_files))
+            index = get_upload_index()
+            records, next_cursor = index.page(limit, offset, cursor)
+            return FileListResponse(
+                files=[UploadService._to_file_info(record) for record in records],
+                total=index.count(),
+                next_cursor=next_cursor,
+            )
 
+        except ValueError:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid cursor")
         except Exception as e:
             logger.error(f"Error listing files: {e}")
             raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR, "Failed to list files")
@@ -326,17 +606,11 @@ class UploadService:
     def delete_file(file_id: str) -> DeleteResponse:
         """Delete an uploaded file."""
         try:
-            # Find and delete file by ID
-            deleted = False
-            for file_path in UPLOAD_DIR.glob(f"{file_id}_*"):
-                if file_path.is_file():
-                    file_path.unlink()
-                    deleted = True
-                    logger.info(f"File deleted: {file_path.name}")
-                    break
-
-            if not deleted:
-                raise HTTPException(status.HTTP_404_NOT_FOUND, "File not found")
+            record, file_path = UploadService._lookup(file_id)
+            file_path.unlink()
+            get_upload_index().remove(file_id)
+            UploadService._release_blob(record["file_hash"])
+            logger.info(f"File deleted: {file_path.name}")
 
             return DeleteResponse(success=True, message="File deleted successfully")
 
@@ -349,10 +623,7 @@ class UploadService:
     @staticmethod
     def get_file_path(file_id: str) -> Path:
         """Get the file path for a given file ID."""
-        for file_path in UPLOAD_DIR.glob(f"{file_id}_*"):
-            if file_path.is_file():
-                return file_path
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "File not found")
+        return UploadService._lookup(file_id)[1]
 
 
 # API Router
@@ -365,10 +636,42 @@ async def upload_file(file: UploadFile):
     return await UploadService.upload_file(file)
 
 
+@router.post("/sessions", response_model=UploadSessionResponse)
+def start_upload(
+    filename: str, content_type: Optional[str] = None, total_size: Optional[int] = None
+):
+    """Start a resumable upload."""
+    return UploadService.start_upload(filename, content_type, total_size)
+
+
+@router.get("/sessions/{upload_id}", response_model=UploadSessionResponse)
+def get_upload_status(upload_id: str):
+    """Get the offset a resumable upload should continue from."""
+    return UploadService.get_upload_status(upload_id)
+
+
+@router.put("/sessions/{upload_id}", response_model=UploadSessionResponse)
+async def upload_part(upload_id: str, offset: int, file: UploadFile):
+    """Append a part to a resumable upload."""
+    return await UploadService.upload_part(upload_id, offset, file)
+
+
+@router.post("/sessions/{upload_id}/complete", response_model=UploadResponse)
+def complete_upload(upload_id: str, expected_hash: Optional[str] = None):
+    """Finish a resumable upload."""
+    return UploadService.complete_upload(upload_id, expected_hash)
+
+
+@router.delete("/sessions/{upload_id}", response_model=DeleteResponse)
+def abort_upload(upload_id: str):
+    """Discard a resumable upload."""
+    return UploadService.abort_upload(upload_id)
+
+
 @router.get("/files", response_model=FileListResponse)
-def list_files(limit: int = 100, offset: int = 0):
+def list_files(limit: int = 100, offset: int = 0, cursor: Optional[str] = None):
     """List uploaded files with pagination."""
-    return UploadService.list_files(limit, offset)
+    return UploadService.list_files(limit, offset, cursor)
 
 
 @router.get("/files/{file_id}", response_model=FileInfo)
@@ -407,3 +710,18 @@ def download_file(file_id: str):
 def health_check():
     """Health check endpoint for Upload service."""
     return {"status": "healthy", "service": "upload"}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Upload storage maintenance")
+    parser.add_argument("command", choices=["reconcile"])
+    parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(reconcile_upload_index())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Upload Index
+
+SQLite index of uploaded files, kept up to date on upload and delete so that
+lookups by file id or content hash, and paging through the newest uploads,
+do not scan the upload directory. Pages use keyset pagination on
+``(upload_date, file_id)`` and return an opaque cursor for the next page.
+``reconcile`` rebuilds the index from the files on disk.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+# Logger setup
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    "file_id",
+    "filename",
+    "original_filename",
+    "content_type",
+    "size",
+    "file_hash",
+    "upload_date",
+)
+
+
+def _hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class UploadIndex:
+    """Persistent metadata index for uploaded files"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS uploads (
+                file_id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                original_filename TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                file_hash TEXT NOT NULL,
+                upload_date REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_uploads_hash ON uploads(file_hash);
+            CREATE INDEX IF NOT EXISTS idx_uploads_date ON uploads(upload_date DESC, file_id DESC);
+            """
+        )
+
+    def add(self, **record: Any) -> None:
+        """Insert or replace the record for ``record["file_id"]``"""
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO uploads ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                tuple(record[column] for column in COLUMNS),
+            )
+
+    def get(self, file_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM uploads WHERE file_id = ?", (file_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def find_by_hash(self, file_hash: str) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM uploads WHERE file_hash = ?", (file_hash,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def remove(self, file_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM uploads WHERE file_id = ?", (file_id,))
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM uploads").fetchone()[0]
+
+    def page(
+        self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        """Newest uploads first, starting after ``cursor`` or at ``offset``
+
+        Returns the records and the cursor for the following page, or None
+        on the last page.
+        """
+        if cursor:
+            upload_date, file_id = cursor.split(":", 1)
+            query = (
+                "SELECT * FROM uploads WHERE (upload_date, file_id) < (?, ?) "
+                "ORDER BY upload_date DESC, file_id DESC LIMIT ?"
+            )
+            params: tuple = (float(upload_date), file_id, limit + 1)
+        else:
+            query = "SELECT * FROM uploads ORDER BY upload_date DESC, file_id DESC LIMIT ? OFFSET ?"
+            params = (limit + 1, offset)
+
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(query, params).fetchall()]
+
+        # One extra row tells whether another page follows
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, f"{rows[-1]['upload_date']!r}:{rows[-1]['file_id']}"
+
+    def reconcile(
+        self, upload_dir: Union[str, Path], describe: Callable[[Path], dict[str, Any]]
+    ) -> dict[str, int]:
+        """Bring the index in line with the files in ``upload_dir``
+
+        Files missing from the index are added using ``describe(path)``,
+        records whose file is gone are dropped, and records whose size no
+        longer matches are re-hashed.
+        """
+        on_disk = {
+            path.name: path
+            for path in Path(upload_dir).iterdir()
+            if path.is_file() and not path.name.startswith(".")
+        }
+        with self._lock:
+            indexed = {
+                row["filename"]: dict(row)
+                for row in self._conn.execute("SELECT * FROM uploads").fetchall()
+            }
+
+        stats = {"added": 0, "removed": 0, "updated": 0}
+        for filename, record in indexed.items():
+            path = on_disk.get(filename)
+            if path is None:
+                self.remove(record["file_id"])
+                stats["removed"] += 1
+            elif path.stat().st_size != record["size"]:
+                record.update(size=path.stat().st_size, file_hash=_hash_file(path))
+                self.add(**record)
+                stats["updated"] += 1
+
+        for filename, path in on_disk.items():
+            if filename not in indexed:
+                self.add(**describe(path), file_hash=_hash_file(path))
+                stats["added"] += 1
+
+        logger.info(f"Reconciled upload index with {upload_dir}: {stats}")
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,390 @@
+"""Frame extraction and thumbnail pipeline.
+
+Frames are pulled from keyframes in a single ffmpeg pass per video and
+streamed to the output directory as ffmpeg writes them. Every decoder takes
+a slot from one budget of ``MAX_DECODERS`` held in the parent process:
+direct calls take theirs when they start, and batch jobs when they are
+submitted to the shared process pool. Direct calls and concurrent batches
+together therefore never exceed the cap. Each decoder is started under
+``nice`` so a thumbnail backlog cannot starve the API process sharing the
+host.
+"""
+
+import contextlib
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from backend.engines.media_probe import FFMPEG_BIN
+
+# Logger setup
+logger = logging.getLogger(__name__)
+
+MAX_DECODERS = int(os.getenv("VIDEO_MAX_DECODERS", max(1, (os.cpu_count() or 2) // 2)))
+DECODER_NICENESS = int(os.getenv("VIDEO_DECODER_NICENESS", "10"))
+SLOT_POLL_INTERVAL = 0.05  # how often a batch with jobs in flight looks for a free slot
+
+NICE_BIN = shutil.which("nice")
+
+# The decoder budget. Pool jobs are charged when submitted, so workers skip it
+_decoder_slots: Any = threading.BoundedSemaphore(MAX_DECODERS)
+
+# Process pool shared by every FramePipeline in this process
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class FrameExtractionError(Exception):
+    """Raised when ffmpeg fails to produce frames."""
+
+
+def _decoder_threads(max_decoders: int = MAX_DECODERS) -> int:
+    """Split the host's cores between concurrently running decoders."""
+    return max(1, (os.cpu_count() or 1) // max(1, max_decoders))
+
+
+def _decoder_command(command: list[str]) -> list[str]:
+    """Run ``command`` under ``nice``; preexec_fn is unsafe in threaded processes."""
+    if DECODER_NICENESS > 0 and NICE_BIN and shutil.which(command[0]):
+        return [NICE_BIN, "-n", str(DECODER_NICENESS), *command]
+    return command
+
+
+def _init_pool_worker() -> None:
+    """Pool initializer: the parent already holds a slot for every submitted job."""
+    global _decoder_slots
+    _decoder_slots = contextlib.nullcontext()
+
+
+def _shared_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_DECODERS, initializer=_init_pool_worker
+            )
+        return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _release_slot(future: Future) -> None:
+    _decoder_slots.release()
+
+
+def build_frames_command(
+    file_path: str,
+    output_pattern: str,
+    frame_count: int,
+    duration: Optional[float] = None,
+    width: Optional[int] = None,
+    threads: Optional[int] = None,
+) -> list[str]:
+    """Build an ffmpeg command that decodes keyframes only, in one pass.
+
+    ``-skip_frame nokey`` makes the decoder drop everything but keyframes,
+    and the select filter spaces the kept frames evenly over ``duration``.
+    """
+    filters = []
+    if duration and frame_count > 1:
+        interval = duration / frame_count
+        filters.append(f"select='isnan(prev_selected_t)+gte(t-prev_selected_t\\,{interval:.3f})'")
+    if width:
+        filters.append(f"scale={width}:-2")
+
+    command = [
+        FFMPEG_BIN,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-nostdin",
+        "-threads",
+        str(threads or _decoder_threads()),
+        "-skip_frame",
+        "nokey",
+        "-i",
+        file_path,
+    ]
+    if filters:
+        command += ["-vf", ",".join(filters)]
+    command += [
+        "-vsync",
+        "vfr",
+        "-frames:v",
+        str(frame_count),
+        "-q:v",
+        "3",
+        "-f",
+        "image2",
+        # Frames are renamed into place once complete, so readers never see partial files
+        "-atomic_writing",
+        "1",
+        "-y",
+        output_pattern,
+    ]
+    return command
+
+
+def iter_frames(
+    file_path: str,
+    output_dir: str,
+    frame_count: int = 10,
+    duration: Optional[float] = None,
+    width: Optional[int] = None,
+    timeout: Optional[float] = 300.0,
+    poll_interval: float = 0.05,
+) -> Iterator[str]:
+    """Extract frames in one ffmpeg pass, yielding each path as it is written.
+
+    Each call writes into its own fresh subdirectory of ``output_dir``, so
+    frames left by earlier runs or by another input with the same stem are
+    never picked up or overwritten. The subdirectory is removed on failure.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stem = Path(file_path).stem
+    job_dir = tempfile.mkdtemp(prefix=f"{stem}_frames_", dir=output_dir)
+    output_pattern = os.path.join(job_dir, f"{stem}_frame_%04d.jpg")
+    command = build_frames_command(file_path, output_pattern, frame_count, duration, width)
+
+    with _decoder_slots, tempfile.TemporaryFile() as stderr:
+        try:
+            process = subprocess.Popen(
+                _decoder_command(command), stdout=subprocess.DEVNULL, stderr=stderr
+            )
+        except FileNotFoundError as e:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise FrameExtractionError("ffmpeg is not installed") from e
+
+        deadline = time.monotonic() + timeout if timeout else None
+        emitted = 0
+        failed = False
+        try:
+            while True:
+                finished = process.poll() is not None
+                while emitted < frame_count:
+                    frame_path = output_pattern % (emitted + 1)
+                    if not os.path.exists(frame_path):
+                        break
+                    emitted += 1
+                    yield frame_path
+
+                if finished or emitted >= frame_count:
+                    break
+                if deadline is not None and time.monotonic() > deadline:
+                    raise FrameExtractionError(f"ffmpeg timed out after {timeout}s")
+                time.sleep(poll_interval)
+
+            if process.wait() != 0:
+                stderr.seek(0)
+                message = stderr.read().decode("utf-8", "replace").strip()
+                raise FrameExtractionError(message or f"ffmpeg exited with code {process.returncode}")
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            if failed:
+                shutil.rmtree(job_dir, ignore_errors=True)
+
+
+def create_thumbnail(
+    file_path: str,
+    output_path: str,
+    timestamp: float = 1.0,
+    width: Optional[int] = 320,
+    timeout: Optional[float] = 60.0,
+) -> str:
+    """Write a single thumbnail, seeking on the input to the nearest keyframe."""
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    command = [
+        FFMPEG_BIN,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-nostdin",
+        "-threads",
+        str(_decoder_threads()),
+        "-ss",
+        f"{max(0.0, timestamp):.3f}",
+        "-i",
+        file_path,
+        "-frames:v",
+        "1",
+    ]
+    if width:
+        command += ["-vf", f"scale={width}:-2"]
+    command += ["-q:v", "3", "-y", output_path]
+
+    with _decoder_slots:
+        try:
+            completed = subprocess.run(
+                _decoder_command(command), capture_output=True, timeout=timeout, check=False
+            )
+        except FileNotFoundError as e:
+            raise FrameExtractionError("ffmpeg is not installed") from e
+        except subprocess.TimeoutExpired as e:
+            raise FrameExtractionError(f"ffmpeg timed out after {timeout}s") from e
+
+    if completed.returncode != 0 or not os.path.exists(output_path):
+        message = completed.stderr.decode("utf-8", "replace").strip()
+        raise FrameExtractionError(message or f"ffmpeg exited with code {completed.returncode}")
+    return output_path
+
+
+def _run_job(job: dict[str, Any]) -> dict[str, Any]:
+    """Process-pool worker: run one frame or thumbnail job."""
+    started = time.perf_counter()
+    result: dict[str, Any] = {"file_path": job["file_path"], "kind": job["kind"]}
+    try:
+        if job["kind"] == "thumbnail":
+            result["output_path"] = create_thumbnail(
+                job["file_path"], job["output_path"], job.get("timestamp", 1.0), job.get("width", 320)
+            )
+            result["frames_written"] = 1
+        else:
+            frames = list(
+                iter_frames(
+                    job["file_path"],
+                    job["output_dir"],
+                    job.get("frame_count", 10),
+                    job.get("duration"),
+                    job.get("width"),
+                )
+            )
+            result["frames"] = frames
+            result["frames_written"] = len(frames)
+        result["success"] = True
+    except Exception as e:
+        result["success"] = False
+        result["error"] = str(e)
+        result["frames_written"] = 0
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+
+class FramePipeline:
+    """Runs frame and thumbnail jobs across a capped pool of decoder processes."""
+
+    def __init__(self, max_decoders: Optional[int] = None):
+        self.max_decoders = max(1, max_decoders or MAX_DECODERS)
+        self.frames_written = 0
+        self.jobs_completed = 0
+        self.decode_seconds = 0.0
+
+    def run(self, jobs: list[dict[str, Any]]) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Yield ``(job_index, result)`` pairs as jobs complete.
+
+        Each job is a dict with ``kind`` (``"frames"`` or ``"thumbnail"``),
+        ``file_path`` and the matching ``output_dir`` or ``output_path``.
+        """
+        for index, result in self._run_jobs(jobs):
+            self.jobs_completed += 1
+            self.frames_written += result["frames_written"]
+            self.decode_seconds += result["elapsed"]
+            yield index, result
+
+    def _run_jobs(self, jobs: list[dict[str, Any]]) -> Iterator[tuple[int, dict[str, Any]]]:
+        if self.max_decoders <= 1 or len(jobs) <= 1:
+            for index, job in enumerate(jobs):
+                yield index, _run_job(job)
+            return
+
+        queued = deque(enumerate(jobs))
+        in_flight: dict[Future, int] = {}
+        try:
+            while queued or in_flight:
+                # Only wait for a slot when this batch has nothing else to collect
+                while (
+                    queued
+                    and len(in_flight) < self.max_decoders
+                    and _decoder_slots.acquire(blocking=not in_flight)
+                ):
+                    index, job = queued[0]
+                    future = self._submit(job)
+                    if future is None:
+                        _decoder_slots.release()
+                        break
+                    queued.popleft()
+                    future.add_done_callback(_release_slot)
+                    in_flight[future] = index
+
+                if not in_flight:
+                    # No process pool; decode the rest here, charged to the same budget
+                    while queued:
+                        index, job = queued.popleft()
+                        yield index, _run_job(job)
+                    return
+
+                done, _ = wait(
+                    in_flight,
+                    timeout=SLOT_POLL_INTERVAL if queued else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    index = in_flight.pop(future)
+                    yield index, self._job_result(jobs[index], future)
+        finally:
+            # The pool is shared; only drop this batch's queued jobs
+            for future in in_flight:
+                future.cancel()
+
+    @staticmethod
+    def _submit(job: dict[str, Any]) -> Optional[Future]:
+        """Submit one job to the shared pool, or return None if no pool is usable."""
+        for _ in range(2):
+            executor = None
+            try:
+                executor = _shared_executor()
+                return executor.submit(_run_job, job)
+            except (BrokenProcessPool, RuntimeError):
+                # A worker died or the pool was shut down; replace it for later batches too
+                if executor is not None:
+                    _discard_executor(executor)
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Process pool unavailable, decoding in-process: {e}")
+                return None
+        return None
+
+    @staticmethod
+    def _job_result(job: dict[str, Any], future: Future) -> dict[str, Any]:
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Frame job failed for {job['file_path']}: {e}")
+            return {
+                "file_path": job["file_path"],
+                "kind": job["kind"],
+                "success": False,
+                "error": str(e),
+                "frames_written": 0,
+                "elapsed": 0.0,
+            }
+
+    def stats(self) -> dict[str, Any]:
+        """Throughput so far, in frames per second of decoder time."""
+        return {
+            "max_decoders": self.max_decoders,
+            "decoder_threads": _decoder_threads(self.max_decoders),
+            "jobs_completed": self.jobs_completed,
+            "frames_written": self.frames_written,
+            "frames_per_decoder_second": (
+                self.frames_written / self.decode_seconds if self.decode_seconds else 0.0
+            ),
+        }
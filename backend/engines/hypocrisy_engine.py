@@ -1,10 +1,22 @@
 """Hypocrisy detection and analysis engine."""
 
+import hashlib
+import json
 import logging
+import math
+import os
 import re
+import threading
+from bisect import bisect_right
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from typing import Any, Optional
 
+from backend.utils.lru_cache import LRUCache
+from backend.utils.sqlite_cache import SQLiteCache
+
 # Logger setup
 logger = logging.getLogger(__name__)
 
@@ -12,6 +24,17 @@ logger = logging.getLogger(__name__)
 class HypocrisyAnalyzer:
     """Analyzes text for potential hypocrisy patterns."""
 
+    negation_words = ("not", "never", "no", "don't", "won't", "can't", "shouldn't")
+    affirmation_words = ("always", "yes", "do", "will", "can", "should", "must")
+    positive_words = ("good", "great", "excellent", "love", "support", "agree", "favor")
+    negative_words = ("bad", "terrible", "awful", "hate", "oppose", "disagree", "against")
+
+    # Per-sentence feature bits; pattern bits follow from bit 4 upwards
+    NEGATION = 1
+    AFFIRMATION = 2
+    POSITIVE = 4
+    NEGATIVE = 8
+
     def __init__(self):
         self.contradiction_patterns = [
             # Basic contradiction patterns
@@ -38,6 +61,20 @@ class HypocrisyAnalyzer:
             "historically",
         ]
 
+        # Word checks are substring tests, so one alternation per list is equivalent
+        self._negation_re = self._compile_any(self.negation_words)
+        self._affirmation_re = self._compile_any(self.affirmation_words)
+        self._positive_re = self._compile_any(self.positive_words)
+        self._negative_re = self._compile_any(self.negative_words)
+        self._compiled_patterns = [
+            (re.compile(pattern1), re.compile(pattern2))
+            for pattern1, pattern2 in self.contradiction_patterns
+        ]
+
+    @staticmethod
+    def _compile_any(words: tuple[str, ...]) -> "re.Pattern[str]":
+        return re.compile("|".join(re.escape(word) for word in words))
+
     def analyze_text(self, text: str, context: Optional[dict[str, Any]] = None) -> dict[str, Any]:
         """Analyze text for hypocrisy patterns."""
         try:
@@ -92,22 +129,64 @@ class HypocrisyAnalyzer:
         return normalized.strip()
 
     def _detect_contradictions(self, text: str) -> dict[str, Any]:
-        """Detect contradictory statements in text."""
-        contradictions = []
+        """Detect contradictory statements in text.
 
+        Each sentence is reduced once to a feature bitset. Whether a pair
+        contradicts depends only on the two bitsets, so pairs are counted per
+        distinct bitset and the first few are located via per-bitset position
+        lists instead of comparing every sentence pair.
+        """
         try:
             # Split text into sentences
             sentences = re.split(r"[.!?]+", text)
-
-            # Check for contradiction patterns
-            for i, sentence1 in enumerate(sentences):
-                for j, sentence2 in enumerate(sentences[i + 1 :], i + 1):
-                    contradiction = self._check_sentence_contradiction(sentence1, sentence2)
+            features = [self._sentence_features(sentence) for sentence in sentences]
+            pair_types: dict[tuple[int, int], Optional[dict[str, Any]]] = {}
+
+            def pair_type(left: int, right: int) -> Optional[dict[str, Any]]:
+                key = (left, right)
+                if key not in pair_types:
+                    pair_types[key] = self._classify_feature_pair(left, right)
+                return pair_types[key]
+
+            # Count contradicting pairs (i < j) against the bitsets seen so far
+            total = 0
+            high_confidence = 0
+            seen: dict[int, int] = {}
+            for mask in features:
+                for earlier, count in seen.items():
+                    contradiction = pair_type(earlier, mask)
                     if contradiction:
+                        total += count
+                        if contradiction["confidence"] > 0.7:
+                            high_confidence += count
+                seen[mask] = seen.get(mask, 0) + 1
+
+            contradictions = []
+            if total:
+                positions: dict[int, list[int]] = {}
+                for index, mask in enumerate(features):
+                    positions.setdefault(mask, []).append(index)
+
+                # Collect the first pairs in (i, j) order, as a nested scan would
+                for i, left in enumerate(features):
+                    remaining = 5 - len(contradictions)
+                    if remaining <= 0:
+                        break
+
+                    partners = []
+                    for right, indexes in positions.items():
+                        contradiction = pair_type(left, right)
+                        if contradiction:
+                            start = bisect_right(indexes, i)
+                            partners.extend(
+                                (j, contradiction) for j in indexes[start : start + remaining]
+                            )
+
+                    for j, contradiction in sorted(partners, key=lambda pair: pair[0])[:remaining]:
                         contradictions.append(
                             {
-                                "sentence1": sentence1.strip(),
-                                "sentence2": sentence2.strip(),
+                                "sentence1": sentences[i].strip(),
+                                "sentence2": sentences[j].strip(),
                                 "type": contradiction["type"],
                                 "confidence": contradiction["confidence"],
                                 "positions": [i, j],
@@ -115,16 +194,58 @@ class HypocrisyAnalyzer:
                         )
 
             return {
-                "found": len(contradictions) > 0,
-                "count": len(contradictions),
-                "contradictions": contradictions[:5],  # Limit to top 5
-                "severity": self._assess_contradiction_severity(contradictions),
+                "found": total > 0,
+                "count": total,
+                "contradictions": contradictions,  # Limited to top 5
+                "severity": self._severity_from_counts(total, high_confidence),
             }
 
         except Exception as e:
             logger.error(f"Error detecting contradictions: {e}")
             return {"found": False, "count": 0, "contradictions": [], "error": str(e)}
 
+    def _sentence_features(self, sentence: str) -> int:
+        """Extract the contradiction-relevant feature bitset of a sentence."""
+        mask = 0
+        if self._negation_re.search(sentence):
+            mask |= self.NEGATION
+        if self._affirmation_re.search(sentence):
+            mask |= self.AFFIRMATION
+        if self._positive_re.search(sentence):
+            mask |= self.POSITIVE
+        if self._negative_re.search(sentence):
+            mask |= self.NEGATIVE
+
+        pattern_count = len(self._compiled_patterns)
+        for k, (pattern1, pattern2) in enumerate(self._compiled_patterns):
+            if pattern1.search(sentence):
+                mask |= 1 << (4 + k)
+            if pattern2.search(sentence):
+                mask |= 1 << (4 + pattern_count + k)
+        return mask
+
+    def _classify_feature_pair(self, left: int, right: int) -> Optional[dict[str, Any]]:
+        """Classify an ordered sentence pair from its feature bitsets.
+
+        Mirrors _check_sentence_contradiction rule for rule.
+        """
+        if (left & self.NEGATION and right & self.AFFIRMATION) or (
+            right & self.NEGATION and left & self.AFFIRMATION
+        ):
+            return {"type": "direct_negation", "confidence": 0.8}
+
+        if (left & self.POSITIVE and right & self.NEGATIVE) or (
+            left & self.NEGATIVE and right & self.POSITIVE
+        ):
+            return {"type": "sentiment_opposition", "confidence": 0.6}
+
+        pattern_count = len(self._compiled_patterns)
+        pattern_mask = (1 << pattern_count) - 1
+        if (left >> 4) & (right >> (4 + pattern_count)) & pattern_mask:
+            return {"type": "pattern_contradiction", "confidence": 0.7}
+
+        return None
+
     def _check_sentence_contradiction(
         self, sentence1: str, sentence2: str
     ) -> Optional[dict[str, Any]]:
@@ -139,8 +260,8 @@ class HypocrisyAnalyzer:
                 return {"type": "sentiment_opposition", "confidence": 0.6}
 
             # Check for contradiction patterns
-            for pattern1, pattern2 in self.contradiction_patterns:
-                if re.search(pattern1, sentence1) and re.search(pattern2, sentence2):
+            for pattern1, pattern2 in self._compiled_patterns:
+                if pattern1.search(sentence1) and pattern2.search(sentence2):
                     return {"type": "pattern_contradiction", "confidence": 0.7}
 
             return None
@@ -150,45 +271,23 @@ class HypocrisyAnalyzer:
 
     def _contains_negation_pair(self, sentence1: str, sentence2: str) -> bool:
         """Check if sentences contain negation pairs."""
-        negation_words = ["not", "never", "no", "don't", "won't", "can't", "shouldn't"]
-        affirmation_words = ["always", "yes", "do", "will", "can", "should", "must"]
-
         # Simple heuristic: check for negation in one and affirmation in
         # another
-        has_negation_1 = any(word in sentence1 for word in negation_words)
-        has_affirmation_2 = any(word in sentence2 for word in affirmation_words)
+        has_negation_1 = bool(self._negation_re.search(sentence1))
+        has_affirmation_2 = bool(self._affirmation_re.search(sentence2))
 
-        has_negation_2 = any(word in sentence2 for word in negation_words)
-        has_affirmation_1 = any(word in sentence1 for word in affirmation_words)
+        has_negation_2 = bool(self._negation_re.search(sentence2))
+        has_affirmation_1 = bool(self._affirmation_re.search(sentence1))
 
         return (has_negation_1 and has_affirmation_2) or (has_negation_2 and has_affirmation_1)
 
     def _contains_opposite_sentiments(self, sentence1: str, sentence2: str) -> bool:
         """Check for opposite sentiment words."""
-        positive_words = [
-            "good",
-            "great",
-            "excellent",
-            "love",
-            "support",
-            "agree",
-            "favor",
-        ]
-        negative_words = [
-            "bad",
-            "terrible",
-            "awful",
-            "hate",
-            "oppose",
-            "disagree",
-            "against",
-        ]
-
-        has_positive_1 = any(word in sentence1 for word in positive_words)
-        has_negative_2 = any(word in sentence2 for word in negative_words)
+        has_positive_1 = bool(self._positive_re.search(sentence1))
+        has_negative_2 = bool(self._negative_re.search(sentence2))
 
-        has_negative_1 = any(word in sentence1 for word in negative_words)
-        has_positive_2 = any(word in sentence2 for word in positive_words)
+        has_negative_1 = bool(self._negative_re.search(sentence1))
+        has_positive_2 = bool(self._positive_re.search(sentence2))
 
         return (has_positive_1 and has_negative_2) or (has_negative_1 and has_positive_2)
 
@@ -198,12 +297,18 @@ class HypocrisyAnalyzer:
             return "none"
 
         high_confidence_count = sum(1 for c in contradictions if c.get("confidence", 0) > 0.7)
+        return self._severity_from_counts(len(contradictions), high_confidence_count)
+
+    def _severity_from_counts(self, total: int, high_confidence_count: int) -> str:
+        """Assess severity from the number of (high-confidence) contradictions."""
+        if not total:
+            return "none"
 
         if high_confidence_count >= 3:
             return "severe"
         elif high_confidence_count >= 1:
             return "moderate"
-        elif len(contradictions) >= 2:
+        elif total >= 2:
             return "mild"
         else:
             return "minimal"
@@ -459,31 +564,115 @@ class HypocrisyAnalyzer:
 
 # Main engine class
 
+# Below this many uncached texts, pool start-up and pickling cost more than
+# the analysis itself
+PARALLEL_MIN_TEXTS = 64
+
+_worker_analyzer: Optional[HypocrisyAnalyzer] = None
+
+# Worker processes are created lazily and shared by every batch, keyed by size
+_executors: dict[int, ProcessPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _shared_executor(workers: int) -> ProcessPoolExecutor:
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = _executors[workers] = ProcessPoolExecutor(max_workers=workers)
+        return executor
+
+
+def _discard_executor(workers: int, executor: ProcessPoolExecutor) -> None:
+    with _executors_lock:
+        if _executors.get(workers) is executor:
+            del _executors[workers]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _analyze_chunk(chunk: list[tuple[int, str, dict[str, Any]]]) -> list[tuple[int, dict[str, Any]]]:
+    """Analyze a chunk of texts inside a worker process."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = HypocrisyAnalyzer()
+    return [(index, _worker_analyzer.analyze_text(text, context)) for index, text, context in chunk]
+
+
+class CancellationToken:
+    """Cooperative cancellation flag shared between a caller and a batch run."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
 
 class HypocrisyEngine:
     """Main hypocrisy detection engine."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        cache_size: int = 1000,
+        cache_path: Optional[str] = None,
+        parallel_min_texts: int = PARALLEL_MIN_TEXTS,
+    ):
         self.analyzer = HypocrisyAnalyzer()
-        self.cache = {}  # Simple in-memory cache
+        self.parallel_min_texts = parallel_min_texts
+        self.cache = LRUCache(max_entries=cache_size)
+        cache_path = cache_path or os.getenv("HYPOCRISY_CACHE_DB")
+        self.store: Optional[SQLiteCache] = None
+        if cache_path:
+            try:
+                self.store = SQLiteCache(cache_path, table="hypocrisy_results")
+            except Exception as e:
+                logger.error(f"Could not open hypocrisy cache at {cache_path}: {e}")
+
+    @staticmethod
+    def _cache_key(text: str, context: Optional[dict[str, Any]] = None) -> str:
+        """Stable content hash of the text and its context."""
+        payload = json.dumps([text, context or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[dict[str, Any]]:
+        result = self.cache.get(key)
+        if result is None and self.store is not None:
+            result = self.store.get(key)
+            if result is not None:
+                self.cache.set(key, result)
+        return result
+
+    def _cache_set_many(self, results: dict[str, dict[str, Any]]) -> None:
+        for key, result in results.items():
+            self.cache.set(key, result)
+        if self.store is not None:
+            try:
+                self.store.set_many(results)
+            except Exception as e:
+                logger.error(f"Error persisting hypocrisy results: {e}")
 
     def analyze(self, text: str, context: Optional[dict[str, Any]] = None) -> dict[str, Any]:
         """Analyze text for hypocrisy patterns."""
         try:
             # Create cache key
-            cache_key = hash(text + str(context or {}))
+            cache_key = self._cache_key(text, context)
 
             # Check cache
-            if cache_key in self.cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
                 logger.info("Returning cached hypocrisy analysis")
-                return self.cache[cache_key]
+                return cached
 
             # Perform analysis
             result = self.analyzer.analyze_text(text, context)
 
-            # Cache result (limit cache size)
-            if len(self.cache) < 100:
-                self.cache[cache_key] = result
+            if "error" not in result:
+                self._cache_set_many({cache_key: result})
 
             return result
 
@@ -492,29 +681,153 @@ class HypocrisyEngine:
             return self.analyzer._create_error_result(str(e))
 
     def batch_analyze(
-        self, texts: list[str], context: Optional[dict[str, Any]] = None
+        self,
+        texts: list[str],
+        context: Optional[dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> list[dict[str, Any]]:
         """Analyze multiple texts for hypocrisy patterns."""
-        results = []
+        return [
+            result
+            for _, result in self.iter_batch_analyze(
+                texts, context, max_workers, chunk_size, cancel_token
+            )
+        ]
+
+    def iter_batch_analyze(
+        self,
+        texts: list[str],
+        context: Optional[dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        ordered: bool = True,
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Analyze texts across a process pool, yielding ``(index, result)`` pairs.
+
+        Cached texts are answered without touching the pool; the rest are
+        split into chunks, analysed in-process when fewer than
+        ``parallel_min_texts`` remain. With ``ordered`` results are yielded in input order
+        as soon as each becomes available, otherwise in completion order.
+        Setting ``cancel_token`` stops submission and drops pending chunks.
+        """
+        cancel_token = cancel_token or CancellationToken()
+        ready: dict[int, dict[str, Any]] = {}
+        keys: dict[int, str] = {}
+        pending: list[tuple[int, str, dict[str, Any]]] = []
 
         for i, text in enumerate(texts):
-            try:
+            # The batch index is positional metadata, not part of the content
+            keys[i] = self._cache_key(text, context)
+            cached = self._cache_get(keys[i])
+            if cached is not None:
+                ready[i] = {**cached, "context": {**cached.get("context", {}), "batch_index": i}}
+            else:
                 text_context = context.copy() if context else {}
                 text_context["batch_index"] = i
+                pending.append((i, text, text_context))
 
-                result = self.analyze(text, text_context)
-                results.append(result)
+        next_index = 0
 
-            except Exception as e:
-                logger.error(f"Error analyzing text {i}: {e}")
-                results.append(self.analyzer._create_error_result(str(e)))
+        def drain() -> Iterator[tuple[int, dict[str, Any]]]:
+            nonlocal next_index
+            if ordered:
+                while next_index in ready:
+                    yield next_index, ready.pop(next_index)
+                    next_index += 1
+            else:
+                for index in sorted(ready):
+                    yield index, ready.pop(index)
+
+        yield from drain()
+        if not pending or cancel_token.cancelled:
+            return
+
+        workers = max_workers or os.cpu_count() or 1
+        if len(pending) < self.parallel_min_texts:
+            workers = 1
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(pending) / (workers * 4)))
+        chunks = [pending[k : k + chunk_size] for k in range(0, len(pending), chunk_size)]
+
+        for completed in self._run_chunks(chunks, workers, cancel_token):
+            fresh = {}
+            for index, result in completed:
+                ready[index] = result
+                if "error" not in result:
+                    fresh[keys[index]] = {**result, "context": context or {}}
+            self._cache_set_many(fresh)
+            yield from drain()
+            if cancel_token.cancelled:
+                return
+
+    def _run_chunks(
+        self,
+        chunks: list[list[tuple[int, str, dict[str, Any]]]],
+        workers: int,
+        cancel_token: CancellationToken,
+    ) -> Iterator[list[tuple[int, dict[str, Any]]]]:
+        """Run chunks on the shared process pool, falling back to in-process analysis."""
+        if workers <= 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                if cancel_token.cancelled:
+                    return
+                yield self._analyze_chunk_safely(chunk)
+            return
+
+        futures = None
+        for _ in range(2):
+            try:
+                executor = _shared_executor(workers)
+                futures = {executor.submit(_analyze_chunk, chunk): chunk for chunk in chunks}
+                break
+            except BrokenProcessPool:
+                # A worker died; replace the pool for this and later batches
+                _discard_executor(workers, executor)
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Process pool unavailable, analyzing in-process: {e}")
+                break
+        if futures is None:
+            yield from self._run_chunks(chunks, 1, cancel_token)
+            return
 
+        try:
+            for future in as_completed(futures):
+                if cancel_token.cancelled:
+                    break
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.error(f"Hypocrisy batch chunk failed: {e}")
+                    yield [
+                        (index, self.analyzer._create_error_result(str(e)))
+                        for index, _, _ in futures[future]
+                    ]
+        finally:
+            # The pool is shared; only drop this batch's queued chunks
+            for future in futures:
+                future.cancel()
+
+    def _analyze_chunk_safely(
+        self, chunk: list[tuple[int, str, dict[str, Any]]]
+    ) -> list[tuple[int, dict[str, Any]]]:
+        results = []
+        for index, text, text_context in chunk:
+            try:
+                results.append((index, self.analyzer.analyze_text(text, text_context)))
+            except Exception as e:
+                logger.error(f"Error analyzing text {index}: {e}")
+                results.append((index, self.analyzer._create_error_result(str(e))))
         return results
 
     def get_stats(self) -> dict[str, Any]:
         """Get engine statistics."""
         return {
             "cache_size": len(self.cache),
+            "cache": self.cache.stats(),
+            "persistent_cache": self.store.stats() if self.store else None,
             "engine_status": "active",
             "analyzer_type": "HypocrisyAnalyzer",
             "timestamp": datetime.utcnow().isoformat(),
@@ -523,6 +836,8 @@ class HypocrisyEngine:
     def clear_cache(self) -> None:
         """Clear the analysis cache."""
         self.cache.clear()
+        if self.store is not None:
+            self.store.clear()
         logger.info("Hypocrisy engine cache cleared")
 
 
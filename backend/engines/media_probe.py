@@ -0,0 +1,284 @@
+"""Media probing and metadata caching.
+
+Runs ffprobe as a subprocess to read container and stream metadata, hashes
+files with large reusable buffers, and caches both keyed on
+(path, size, mtime) so unchanged files are never re-hashed or re-probed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from backend.utils.lru_cache import LRUCache
+from backend.utils.sqlite_cache import SQLiteCache
+
+# Logger setup
+logger = logging.getLogger(__name__)
+
+FFPROBE_BIN = os.getenv("FFPROBE_PATH", "ffprobe")
+FFMPEG_BIN = os.getenv("FFMPEG_PATH", "ffmpeg")
+HASH_BUFFER_SIZE = 8 * 1024 * 1024  # 8MB reads keep syscall overhead negligible
+PROBE_RETRY_SECONDS = 300.0  # failed probes (often timeouts) are retried after this
+
+
+class MediaProbeError(Exception):
+    """Raised when ffprobe cannot read a media file."""
+
+
+def ffprobe_available() -> bool:
+    """Check whether the ffprobe binary can be found."""
+    return shutil.which(FFPROBE_BIN) is not None
+
+
+def ffmpeg_available() -> bool:
+    """Check whether the ffmpeg binary can be found."""
+    return shutil.which(FFMPEG_BIN) is not None
+
+
+def hash_file(file_path: str, algorithm: str = "sha256", buffer_size: int = HASH_BUFFER_SIZE) -> str:
+    """Hash a file using a single reusable buffer."""
+    digest = hashlib.new(algorithm)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+
+    with open(file_path, "rb", buffering=0) as file_handle:
+        while True:
+            read = file_handle.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+
+    return digest.hexdigest()
+
+
+def _parse_frame_rate(value: Optional[str]) -> Optional[float]:
+    """Parse ffprobe rational frame rates such as ``30000/1001``."""
+    if not value:
+        return None
+    try:
+        if "/" in value:
+            numerator, denominator = value.split("/", 1)
+            if float(denominator) == 0:
+                return None
+            return round(float(numerator) / float(denominator), 3)
+        return float(value)
+    except ValueError:
+        return None
+
+
+def run_ffprobe(file_path: str, timeout: float = 60.0) -> dict[str, Any]:
+    """Run ffprobe on a file and summarise its format and streams."""
+    command = [
+        FFPROBE_BIN,
+        "-v",
+        "error",
+        "-print_format",
+        "json",
+        "-show_format",
+        "-show_streams",
+        file_path,
+    ]
+
+    try:
+        completed = subprocess.run(command, capture_output=True, timeout=timeout, check=False)
+    except FileNotFoundError as e:
+        raise MediaProbeError("ffprobe is not installed") from e
+    except subprocess.TimeoutExpired as e:
+        raise MediaProbeError(f"ffprobe timed out after {timeout}s") from e
+
+    if completed.returncode != 0:
+        stderr = completed.stderr.decode("utf-8", "replace").strip()
+        raise MediaProbeError(stderr or f"ffprobe exited with code {completed.returncode}")
+
+    try:
+        data = json.loads(completed.stdout or b"{}")
+    except json.JSONDecodeError as e:
+        raise MediaProbeError(f"Invalid ffprobe output: {e}") from e
+
+    return summarize_probe(data)
+
+
+def summarize_probe(data: dict[str, Any]) -> dict[str, Any]:
+    """Reduce raw ffprobe JSON to the fields the video engine reports."""
+    format_info = data.get("format", {})
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), {})
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), {})
+
+    def as_float(value: Any) -> Optional[float]:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def as_int(value: Any) -> Optional[int]:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    width, height = as_int(video.get("width")), as_int(video.get("height"))
+    return {
+        "duration": as_float(format_info.get("duration") or video.get("duration")),
+        "bitrate": as_int(format_info.get("bit_rate")),
+        "container": format_info.get("format_name"),
+        "resolution": f"{width}x{height}" if width and height else None,
+        "width": width,
+        "height": height,
+        "fps": _parse_frame_rate(video.get("avg_frame_rate") or video.get("r_frame_rate")),
+        "codec": video.get("codec_name"),
+        "pixel_format": video.get("pix_fmt"),
+        "frame_count": as_int(video.get("nb_frames")),
+        "audio_codec": audio.get("codec_name"),
+        "audio_sample_rate": as_int(audio.get("sample_rate")),
+        "audio_channels": as_int(audio.get("channels")),
+        "stream_count": len(streams),
+    }
+
+
+class MediaMetadataCache:
+    """Metadata cache keyed on (path, size, mtime).
+
+    An in-memory LRU fronts an optional SQLite store so cached probes and
+    hashes survive restarts. Any change to a file's size or modification
+    time produces a new key, so stale entries are simply never read again.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 10000):
+        self.memory = LRUCache(max_entries=max_entries)
+        self.store: Optional[SQLiteCache] = None
+        db_path = db_path or os.getenv("VIDEO_METADATA_CACHE_DB")
+        if db_path:
+            try:
+                self.store = SQLiteCache(db_path, table="media_metadata", max_entries=max_entries * 10)
+            except Exception as e:
+                logger.error("Could not open media metadata cache at %s: %s", db_path, e)
+
+    @staticmethod
+    def key_for(file_path: str, stat_result: os.stat_result) -> str:
+        return f"{os.path.realpath(file_path)}|{stat_result.st_size}|{stat_result.st_mtime_ns}"
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        entry = self.memory.get(key)
+        if entry is None and self.store is not None:
+            entry = self.store.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: dict[str, Any]) -> None:
+        self.memory.set(key, entry)
+        if self.store is not None:
+            try:
+                self.store.set(key, entry)
+            except Exception as e:
+                logger.error("Error persisting media metadata: %s", e)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "memory": self.memory.stats(),
+            "persistent": self.store.stats() if self.store else None,
+        }
+
+
+class MediaProbe:
+    """Probes and hashes media files through a shared metadata cache."""
+
+    def __init__(
+        self,
+        cache: Optional[MediaMetadataCache] = None,
+        max_workers: Optional[int] = None,
+        probe_timeout: float = 60.0,
+        probe_retry_seconds: float = PROBE_RETRY_SECONDS,
+    ):
+        self.cache = cache or MediaMetadataCache()
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) * 2)
+        self.probe_timeout = probe_timeout
+        self.probe_retry_seconds = probe_retry_seconds
+        self.hashes_computed = 0
+        self.probes_run = 0
+
+    def probe(self, file_path: str, include_hash: bool = True) -> dict[str, Any]:
+        """Return cached or freshly computed metadata for ``file_path``.
+
+        The result always contains ``file_size`` and ``modified_ns``; it has
+        ``file_hash`` when ``include_hash`` is set and ``metadata`` when
+        ffprobe is available. Only the missing parts are computed. A failed
+        probe is reported as ``probe_error`` and retried once
+        ``probe_retry_seconds`` have passed.
+        """
+        stat_result = Path(file_path).stat()
+        key = self.cache.key_for(file_path, stat_result)
+        entry = dict(self.cache.get(key) or {})
+        updated = not entry
+
+        entry.setdefault("file_size", stat_result.st_size)
+        entry.setdefault("modified_ns", stat_result.st_mtime_ns)
+
+        if include_hash and "file_hash" not in entry:
+            entry["file_hash"] = hash_file(file_path)
+            self.hashes_computed += 1
+            updated = True
+
+        if self._needs_probe(entry) and ffprobe_available():
+            try:
+                entry["metadata"] = run_ffprobe(file_path, self.probe_timeout)
+                entry.pop("probe_error", None)
+                entry.pop("probe_failed_at", None)
+                self.probes_run += 1
+            except MediaProbeError as e:
+                # Timeouts and I/O errors can be transient, so the failure is
+                # only remembered briefly to avoid re-probing on every call
+                logger.warning("ffprobe failed for %s: %s", file_path, e)
+                entry["metadata"] = None
+                entry["probe_error"] = str(e)
+                entry["probe_failed_at"] = time.time()
+            updated = True
+
+        if updated:
+            self.cache.set(key, entry)
+        return entry
+
+    def _needs_probe(self, entry: dict[str, Any]) -> bool:
+        if "metadata" not in entry:
+            return True
+        if "probe_error" not in entry:
+            return False
+        # Wall-clock time, since entries are persisted across restarts
+        return time.time() - entry.get("probe_failed_at", 0.0) >= self.probe_retry_seconds
+
+    def probe_many(self, file_paths: list[str], include_hash: bool = True) -> dict[str, Any]:
+        """Probe files in parallel; failures map to an ``{"error": ...}`` entry."""
+
+        def probe_one(file_path: str) -> dict[str, Any]:
+            try:
+                return self.probe(file_path, include_hash)
+            except Exception as e:
+                return {"error": str(e)}
+
+        unique_paths = list(dict.fromkeys(file_paths))
+        if len(unique_paths) <= 1:
+            return {path: probe_one(path) for path in unique_paths}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_paths))) as executor:
+            return dict(zip(unique_paths, executor.map(probe_one, unique_paths)))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ffprobe_available": ffprobe_available(),
+            "hashes_computed": self.hashes_computed,
+            "probes_run": self.probes_run,
+            "cache": self.cache.stats(),
+        }
@@ -4,9 +4,15 @@ import hashlib
 import logging
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
+
+from backend.engines import frame_pipeline
+from backend.engines.frame_pipeline import FramePipeline
+from backend.engines.media_probe import MediaProbe, ffmpeg_available, hash_file
+from backend.utils.lru_cache import LRUCache
 
 # Logger setup
 logger = logging.getLogger(__name__)
@@ -15,7 +21,7 @@ logger = logging.getLogger(__name__)
 class VideoProcessor:
     """Handles video processing operations."""
 
-    def __init__(self):
+    def __init__(self, probe: Optional[MediaProbe] = None):
         self.supported_formats = [
             ".mp4",
             ".avi",
@@ -28,6 +34,7 @@ class VideoProcessor:
         ]
         self.max_file_size = 500 * 1024 * 1024  # 500MB limit
         self.temp_dir = tempfile.gettempdir()
+        self.probe = probe or MediaProbe()
 
     def validate_video_file(self, file_path: str) -> dict[str, Any]:
         """Validate video file format and size."""
@@ -45,9 +52,7 @@ class VideoProcessor:
             if path.suffix.lower() not in self.supported_formats:
                 return {
                     "valid": False,
-                    "error": f"Unsupported format. Supported: {
-                        ', '.join(self.supported_formats)
-                    }",
+                    "error": f"Unsupported format. Supported: {', '.join(self.supported_formats)}",
                 }
 
             # Check file size
@@ -69,7 +74,7 @@ class VideoProcessor:
             return {"valid": False, "error": f"Validation failed: {validation_error}"}
 
     def get_video_info(self, file_path: str) -> dict[str, Any]:
-        """Get basic video information without external dependencies."""
+        """Get video information, using ffprobe for stream metadata when available."""
         try:
             validation = self.validate_video_file(file_path)
             if not validation["valid"]:
@@ -78,6 +83,9 @@ class VideoProcessor:
             path = Path(file_path)
             file_stats = path.stat()
 
+            # Hash and metadata come from the probe cache unless the file changed
+            probed = self.probe.probe(file_path)
+
             # Basic file information
             info = {
                 "filename": path.name,
@@ -85,24 +93,23 @@ class VideoProcessor:
                 "format": path.suffix.lower(),
                 "created_time": datetime.fromtimestamp(file_stats.st_ctime).isoformat(),
                 "modified_time": datetime.fromtimestamp(file_stats.st_mtime).isoformat(),
-                "file_hash": self._calculate_file_hash(file_path),
+                "file_hash": probed.get("file_hash", "unknown"),
             }
 
-            # Try to get additional metadata if possible
-            try:
-                # This would normally use ffprobe or similar, but we'll provide
-                # basic info
-                info.update(
-                    {
-                        "duration": "unknown",
-                        "resolution": "unknown",
-                        "fps": "unknown",
-                        "codec": "unknown",
-                        "bitrate": "unknown",
-                    }
-                )
-            except Exception as metadata_error:
-                logger.warning("Could not extract detailed video metadata: %s", metadata_error)
+            metadata = probed.get("metadata") or {}
+            info.update(
+                {
+                    "duration": metadata.get("duration") or "unknown",
+                    "resolution": metadata.get("resolution") or "unknown",
+                    "fps": metadata.get("fps") or "unknown",
+                    "codec": metadata.get("codec") or "unknown",
+                    "bitrate": metadata.get("bitrate") or "unknown",
+                }
+            )
+            if metadata:
+                info["metadata"] = metadata
+            elif probed.get("probe_error"):
+                logger.warning("Could not extract detailed video metadata: %s", probed["probe_error"])
 
             return {"valid": True, "info": info}
         except Exception as info_error:
@@ -115,12 +122,7 @@ class VideoProcessor:
     def _calculate_file_hash(self, file_path: str) -> str:
         """Calculate SHA-256 hash of file."""
         try:
-            hash_sha256 = hashlib.sha256()
-            with open(file_path, "rb") as file_handle:
-                # Read file in chunks to handle large files
-                for chunk in iter(lambda: file_handle.read(4096), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+            return hash_file(file_path)
         except Exception as hash_error:
             logger.error("Error calculating file hash: %s", hash_error)
             return "unknown"
@@ -128,19 +130,20 @@ class VideoProcessor:
     def create_thumbnail(
         self, file_path: str, output_path: Optional[str] = None, timestamp: float = 1.0
     ) -> dict[str, Any]:
-        """Create thumbnail from video (placeholder implementation)."""
+        """Create a thumbnail from the keyframe nearest ``timestamp`` using ffmpeg."""
         try:
             validation = self.validate_video_file(file_path)
             if not validation["valid"]:
                 return validation
 
-            # In a real implementation, this would use ffmpeg or similar
-            # For now, we'll return a placeholder response
-
             if not output_path:
                 path = Path(file_path)
                 output_path = str(path.parent / f"{path.stem}_thumbnail.jpg")
 
+            if ffmpeg_available():
+                frame_pipeline.create_thumbnail(file_path, output_path, timestamp)
+                return {"success": True, "output_path": output_path, "timestamp": timestamp}
+
             return {
                 "success": False,
                 "message": "Thumbnail generation requires ffmpeg or similar video processing library",
@@ -158,7 +161,7 @@ class VideoProcessor:
     def extract_frames(
         self, file_path: str, output_dir: Optional[str] = None, frame_count: int = 10
     ) -> dict[str, Any]:
-        """Extract frames from video (placeholder implementation)."""
+        """Extract evenly spaced keyframes from video in a single ffmpeg pass."""
         try:
             validation = self.validate_video_file(file_path)
             if not validation["valid"]:
@@ -170,6 +173,19 @@ class VideoProcessor:
             # Create output directory if it doesn't exist
             os.makedirs(output_dir, exist_ok=True)
 
+            if ffmpeg_available():
+                frames = list(
+                    frame_pipeline.iter_frames(
+                        file_path, output_dir, frame_count, self._duration(file_path)
+                    )
+                )
+                return {
+                    "success": True,
+                    "output_dir": output_dir,
+                    "requested_frames": frame_count,
+                    "frames": frames,
+                }
+
             return {
                 "success": False,
                 "message": "Frame extraction requires ffmpeg or similar video processing library",
@@ -184,12 +200,17 @@ class VideoProcessor:
                 "error": f"Frame extraction failed: {frame_error}",
             }
 
+    def _duration(self, file_path: str) -> Optional[float]:
+        """Duration from the probe cache, without hashing the file."""
+        metadata = self.probe.probe(file_path, include_hash=False).get("metadata") or {}
+        return metadata.get("duration")
+
 
 class VideoAnalyzer:
     """Analyzes video content for various properties."""
 
-    def __init__(self):
-        self.processor = VideoProcessor()
+    def __init__(self, processor: Optional[VideoProcessor] = None):
+        self.processor = processor or VideoProcessor()
 
     def analyze_video(self, file_path: str, analysis_type: str = "basic") -> dict[str, Any]:
         """Analyze video content."""
@@ -446,10 +467,13 @@ class VideoAnalyzer:
 class VideoEngine:
     """Main video processing engine."""
 
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
         self.processor = VideoProcessor()
-        self.analyzer = VideoAnalyzer()
-        self.cache = {}  # Simple in-memory cache
+        # Share one processor so analysis reuses the same probe cache
+        self.analyzer = VideoAnalyzer(self.processor)
+        self.cache = LRUCache(max_entries=50)
+        self.max_workers = max_workers or self.processor.probe.max_workers
+        self.frame_pipeline = FramePipeline()
 
     def process_video(
         self, file_path: str, operations: Optional[list[str]] = None
@@ -459,13 +483,19 @@ class VideoEngine:
             if operations is None:
                 operations = ["validate", "analyze"]
 
-            # Create cache key
-            cache_key = hashlib.md5(f"{file_path}_{str(operations)}".encode()).hexdigest()
+            # Create cache key; size and mtime invalidate results for changed files
+            try:
+                file_stats = os.stat(file_path)
+                version = f"{file_stats.st_size}_{file_stats.st_mtime_ns}"
+            except (OSError, TypeError, ValueError):
+                version = ""
+            cache_key = hashlib.md5(f"{file_path}_{version}_{str(operations)}".encode()).hexdigest()
 
             # Check cache
-            if cache_key in self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
                 logger.info("Returning cached video processing result")
-                return self.cache[cache_key]
+                return cached
 
             result: dict[str, Any] = {
                 "timestamp": datetime.utcnow().isoformat(),
@@ -490,9 +520,7 @@ class VideoEngine:
                 else:
                     result["results"][operation] = {"error": f"Unknown operation: {operation}"}
 
-            # Cache result (limit cache size)
-            if len(self.cache) < 50:
-                self.cache[cache_key] = result
+            self.cache.set(cache_key, result)
 
             result["success"] = True
             return result
@@ -508,33 +536,94 @@ class VideoEngine:
     def batch_process(
         self, file_paths: list[str], operations: Optional[list[str]] = None
     ) -> list[dict[str, Any]]:
-        """Process multiple videos."""
-        results = []
+        """Process multiple videos in parallel, returning results in input order.
 
-        for i, file_path in enumerate(file_paths):
+        Work is dominated by file reads and ffprobe subprocesses, so a thread
+        pool keeps several probes in flight without blocking on each one.
+        """
+
+        def process_one(indexed_path: tuple[int, str]) -> dict[str, Any]:
+            i, file_path = indexed_path
             try:
-                result = self.process_video(file_path, operations)
+                # Copy so the batch index is not written into the cached result
+                result = dict(self.process_video(file_path, operations))
                 result["batch_index"] = i
-                results.append(result)
+                return result
 
             except Exception as batch_error:
                 logger.error("Error processing file %s: %s", file_path, batch_error)
-                results.append(
-                    {
-                        "success": False,
-                        "error": f"Processing failed: {batch_error}",
-                        "file_path": file_path,
-                    }
+                return {
+                    "success": False,
+                    "error": f"Processing failed: {batch_error}",
+                    "file_path": file_path,
+                }
+
+        if len(file_paths) <= 1:
+            return [process_one(item) for item in enumerate(file_paths)]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(file_paths))) as executor:
+            return list(executor.map(process_one, enumerate(file_paths)))
+
+    def iter_batch_extract(
+        self,
+        file_paths: list[str],
+        kind: str = "frames",
+        output_dir: Optional[str] = None,
+        frame_count: int = 10,
+    ) -> Iterator[dict[str, Any]]:
+        """Extract frames or thumbnails for many videos, yielding as each finishes.
+
+        Jobs run on the frame pipeline's decoder pool; results carry their
+        ``batch_index`` since they arrive in completion order.
+        """
+        if kind not in ("frames", "thumbnail"):
+            raise ValueError(f"Unknown extraction kind: {kind}")
+
+        jobs = []
+        batch_indexes = []
+        for i, file_path in enumerate(file_paths):
+            validation = self.processor.validate_video_file(file_path)
+            if not validation["valid"]:
+                yield {
+                    "success": False,
+                    "error": validation["error"],
+                    "file_path": file_path,
+                    "batch_index": i,
+                }
+                continue
+
+            path = Path(file_path)
+            target_dir = output_dir or (
+                os.path.join(self.processor.temp_dir, "video_frames")
+                if kind == "frames"
+                else str(path.parent)
+            )
+            job: dict[str, Any] = {"kind": kind, "file_path": file_path}
+            if kind == "frames":
+                job.update(
+                    output_dir=target_dir,
+                    frame_count=frame_count,
+                    duration=self.processor._duration(file_path),
                 )
+            else:
+                job["output_path"] = os.path.join(target_dir, f"{path.stem}_thumbnail.jpg")
+            jobs.append(job)
+            batch_indexes.append(i)
 
-        return results
+        for job_index, result in self.frame_pipeline.run(jobs):
+            result["batch_index"] = batch_indexes[job_index]
+            yield result
 
     def get_stats(self) -> dict[str, Any]:
         """Get engine statistics."""
         return {
             "cache_size": len(self.cache),
+            "cache": self.cache.stats(),
             "supported_formats": self.processor.supported_formats,
             "max_file_size_mb": self.processor.max_file_size // (1024 * 1024),
+            "max_workers": self.max_workers,
+            "probe": self.processor.probe.stats(),
+            "frame_pipeline": self.frame_pipeline.stats(),
             "engine_status": "active",
             "timestamp": datetime.utcnow().isoformat(),
         }
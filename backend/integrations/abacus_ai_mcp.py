@@ -18,15 +18,21 @@ Version: 1.0.0
 """
 
 import asyncio
+import itertools
+import json
 import logging
 import os
 import sys
+import time
+import urllib.error
+import urllib.request
 import uuid
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
 
+from backend.integrations.conversation_store import ChatMessage, ConversationStore
 from backend.integrations.mcp_protocol import (MCPCapability, MCPMessage, MCPPrompt,
                                                MCPResource, MCPResourceType, MCPServer,
                                                MCPTool)
@@ -88,18 +94,39 @@ class AbacusAIConfig:
     max_tokens: int = 4096
     temperature: float = 0.7
     timeout: int = 30
-
-
-@dataclass
-class ChatMessage:
-    """Chat message structure."""
-
-    role: str  # system, user, assistant
-    content: str
-    timestamp: Optional[datetime] = None
-    model_used: Optional[str] = None
-    tokens_used: Optional[int] = None
-    cost: Optional[float] = None
+    max_concurrent_requests: int = 8  # Upstream requests in flight, batch or not
+    model_rate_limits: dict[str, int] = field(default_factory=dict)  # model -> requests/minute
+    default_model_rate_limit: Optional[int] = None
+    max_conversations: int = 1000  # Kept in memory; older ones are dropped or spilled
+    conversation_token_budget: int = 8000
+    conversation_idle_seconds: Optional[float] = None
+    conversation_db_path: Optional[str] = None  # SQLite file for spilled conversations
+
+
+class ModelRateLimiter:
+    """Async token bucket for one model's requests-per-minute limit"""
+
+    def __init__(self, rate_per_minute: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(max(1, rate_per_minute))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # The lock queues waiters so tokens go out in arrival order
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                delay = (1 - self.tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+                self.updated = time.monotonic()
+                self.tokens = 1.0
+            self.tokens -= 1
 
 
 @dataclass
@@ -136,7 +163,28 @@ class AbacusAIMCPServer(MCPServer):
         self.session: Optional[aiohttp.ClientSession] = None
         self.use_aiohttp = aiohttp_available
         self.model_metrics: dict[str, ModelMetrics] = {}
-        self.active_conversations: dict[str, list[ChatMessage]] = {}
+        self.active_conversations = ConversationStore(
+            token_budget=config.conversation_token_budget,
+            max_items=config.max_conversations,
+            idle_ttl=config.conversation_idle_seconds,
+            db_path=config.conversation_db_path,
+        )
+
+        # Every upstream request takes a slot; per-model limiters are created on first use
+        self._request_slots = asyncio.Semaphore(max(1, config.max_concurrent_requests))
+        self._rate_limiters: dict[str, ModelRateLimiter] = {}
+        self.batch_stats = {
+            "batches": 0,
+            "requests": 0,
+            "failed": 0,
+            "total_seconds": 0.0,
+            "peak_upstream_in_flight": 0,
+            "last_batch": None,
+        }
+        self._upstream_in_flight = 0
+        # Upstream peak seen by each running batch, by batch id
+        self._batch_peaks: dict[int, int] = {}
+        self._batch_ids = itertools.count()
 
         # Register tools
         self._register_tools()
@@ -364,19 +412,26 @@ class AbacusAIMCPServer(MCPServer):
             )
         )
 
+    def _request_headers(self) -> dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.config.api_key}",
+            "Content-Type": "application/json",
+            "User-Agent": "Trae.AI-MCP/1.0.0",
+        }
+
+    def _ensure_session(self) -> Optional["aiohttp.ClientSession"]:
+        """Shared pooled session, created on first use"""
+        if self.session is None and self.use_aiohttp and aiohttp_available:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=max(1, self.config.max_concurrent_requests)),
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+                headers=self._request_headers(),
+            )
+        return self.session
+
     async def start(self):
         """Start the MCP server and initialize HTTP session."""
-        if self.use_aiohttp and aiohttp_available:
-            import aiohttp as aiohttp_module
-
-            self.session = aiohttp_module.ClientSession(
-                timeout=aiohttp_module.ClientTimeout(total=self.config.timeout),
-                headers={
-                    "Authorization": f"Bearer {self.config.api_key}",
-                    "Content-Type": "application/json",
-                    "User-Agent": "Trae.AI-MCP/1.0.0",
-                },
-            )
+        self._ensure_session()
         await super().start()
         self.logger.info("Abacus.AI MCP Server started successfully")
 
@@ -384,9 +439,64 @@ class AbacusAIMCPServer(MCPServer):
         """Stop the server and cleanup resources."""
         if self.session and self.use_aiohttp:
             await self.session.close()
+            self.session = None
+        self.active_conversations.flush()
         await super().stop()
         self.logger.info("Abacus.AI MCP Server stopped")
 
+    def _rate_limiter(self, model: str) -> Optional[ModelRateLimiter]:
+        limit = self.config.model_rate_limits.get(model, self.config.default_model_rate_limit)
+        if not limit:
+            return None
+        limiter = self._rate_limiters.get(model)
+        if limiter is None:
+            limiter = self._rate_limiters[model] = ModelRateLimiter(limit)
+        return limiter
+
+    async def _post_chat_completion(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        """POST a chat completion, returning (status, parsed JSON or error text)
+
+        Waits for the model's rate limit and a request slot. Without aiohttp
+        the blocking urllib call runs on the server's thread pool.
+        """
+        limiter = self._rate_limiter(payload.get("model") or self.config.default_model.value)
+        if limiter is not None:
+            await limiter.acquire()
+
+        async with self._request_slots:
+            self._upstream_in_flight += 1
+            self.batch_stats["peak_upstream_in_flight"] = max(
+                self.batch_stats["peak_upstream_in_flight"], self._upstream_in_flight
+            )
+            for batch_id, peak in self._batch_peaks.items():
+                self._batch_peaks[batch_id] = max(peak, self._upstream_in_flight)
+            try:
+                session = self._ensure_session()
+                if session is not None:
+                    async with session.post(
+                        f"{self.config.base_url}/v1/chat/completions", json=payload
+                    ) as response:
+                        if response.status == 200:
+                            return 200, await response.json()
+                        return response.status, await response.text()
+
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, self._post_blocking, payload)
+            finally:
+                self._upstream_in_flight -= 1
+
+    def _post_blocking(self, payload: dict[str, Any]) -> tuple[int, Any]:
+        request = urllib.request.Request(
+            f"{self.config.base_url}/v1/chat/completions",
+            data=json.dumps(payload).encode("utf-8"),
+            headers=self._request_headers(),
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.config.timeout) as response:
+                return 200, json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode("utf-8")
+
     async def _handle_chat_completion(self, client_id: str, message: MCPMessage) -> MCPMessage:
         """Handle chat completion requests."""
         try:
@@ -418,70 +528,33 @@ class AbacusAIMCPServer(MCPServer):
                 payload["model"] = model
 
             # Make API request
-            if self.use_aiohttp and self.session:
-                async with self.session.post(
-                    f"{self.config.base_url}/v1/chat/completions", json=payload
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                    else:
-                        error_text = await response.text()
-                        return MCPMessage(
-                            id=message.id,
-                            error={
-                                "code": response.status,
-                                "message": f"API request failed: {error_text}",
-                            },
-                        )
-            else:
-                # Fallback to urllib for synchronous requests
-                import json as json_lib
-                import urllib.request
-
-                req_data = json_lib.dumps(payload).encode("utf-8")
-                request = urllib.request.Request(
-                    f"{self.config.base_url}/v1/chat/completions",
-                    data=req_data,
-                    headers={
-                        "Authorization": f"Bearer {self.config.api_key}",
-                        "Content-Type": "application/json",
-                        "User-Agent": "Trae.AI-MCP/1.0.0",
-                    },
+            started = time.perf_counter()
+            status, result = await self._post_chat_completion(payload)
+            if status != 200:
+                return MCPMessage(
+                    id=message.id,
+                    error={"code": status, "message": f"API request failed: {result}"},
                 )
-
-                try:
-                    with urllib.request.urlopen(request) as response:
-                        result = json_lib.loads(response.read().decode("utf-8"))
-                except urllib.error.HTTPError as e:
-                    error_text = e.read().decode("utf-8")
-                    return MCPMessage(
-                        id=message.id,
-                        error={
-                            "code": e.code,
-                            "message": f"API request failed: {error_text}",
-                        },
-                    )
+            latency = time.perf_counter() - started
 
             if result:
-                # Store conversation context
-                if conversation_id not in self.active_conversations:
-                    self.active_conversations[conversation_id] = []
-
-                # Add user message
+                # Store conversation context, trimmed to the token budget
                 for msg in messages:
                     if msg["role"] == "user":
-                        self.active_conversations[conversation_id].append(
+                        self.active_conversations.append(
+                            conversation_id,
                             ChatMessage(
                                 role=msg["role"],
                                 content=msg["content"],
                                 timestamp=datetime.now(),
-                            )
+                            ),
                         )
 
                 # Add assistant response
                 if "choices" in result and result["choices"]:
                     assistant_message = result["choices"][0]["message"]
-                    self.active_conversations[conversation_id].append(
+                    self.active_conversations.append(
+                        conversation_id,
                         ChatMessage(
                             role="assistant",
                             content=assistant_message["content"],
@@ -489,13 +562,13 @@ class AbacusAIMCPServer(MCPServer):
                             model_used=result.get("model"),
                             tokens_used=result.get("usage", {}).get("total_tokens"),
                             cost=result.get("cost"),
-                        )
+                        ),
                     )
 
                 # Update model metrics
                 model_used = result.get("model")
                 if model_used:
-                    self._update_model_metrics(model_used, result)
+                    self._update_model_metrics(model_used, result, latency)
 
                 return MCPMessage(
                     id=message.id,
@@ -567,23 +640,40 @@ class AbacusAIMCPServer(MCPServer):
                     error={"code": -32602, "message": "Requests array is required"},
                 )
 
-            # Process requests in batch
-            batch_results = []
-            for req in requests:
+            # Requests run concurrently, bounded by the request slots and
+            # per-model rate limits; gather keeps results in request order
+            latencies: list[float] = []
+
+            async def run(req: dict[str, Any]) -> dict[str, Any]:
+                started = time.perf_counter()
                 try:
-                    # Simulate batch processing with optimal routing
                     result = await self._process_single_request(req, routing_strategy, priority)
-                    batch_results.append({"id": req["id"], "status": "success", "result": result})
+                    return {"id": req["id"], "status": "success", "result": result}
                 except Exception as e:
-                    batch_results.append({"id": req["id"], "status": "error", "error": str(e)})
+                    return {"id": req["id"], "status": "error", "error": str(e)}
+                finally:
+                    latencies.append(time.perf_counter() - started)
+
+            batch_id = next(self._batch_ids)
+            self._batch_peaks[batch_id] = 0
+            batch_started = time.perf_counter()
+            try:
+                batch_results = await asyncio.gather(*(run(req) for req in requests))
+            finally:
+                peak = self._batch_peaks.pop(batch_id)
+            elapsed = time.perf_counter() - batch_started
+
+            failed = sum(1 for r in batch_results if r["status"] == "error")
+            stats = self._record_batch(len(requests), failed, elapsed, latencies, peak)
 
             return MCPMessage(
                 id=message.id,
                 result={
                     "batch_results": batch_results,
                     "total_requests": len(requests),
-                    "successful": len([r for r in batch_results if r["status"] == "success"]),
-                    "failed": len([r for r in batch_results if r["status"] == "error"]),
+                    "successful": len(requests) - failed,
+                    "failed": failed,
+                    "stats": stats,
                 },
             )
 
@@ -594,6 +684,37 @@ class AbacusAIMCPServer(MCPServer):
                 error={"code": -32603, "message": f"Internal error: {str(e)}"},
             )
 
+    def _record_batch(
+        self,
+        total: int,
+        failed: int,
+        elapsed: float,
+        latencies: list[float],
+        peak_in_flight: int = 0,
+    ) -> dict[str, Any]:
+        """Build one batch's latency and throughput stats and fold them into the totals
+
+        ``peak_in_flight`` is the most upstream requests in flight while this
+        batch ran; the server-lifetime peak stays in ``batch_stats``.
+        """
+        ordered = sorted(latencies) or [0.0]
+        stats = {
+            "elapsed_seconds": elapsed,
+            "throughput_rps": total / elapsed if elapsed > 0 else 0.0,
+            "avg_latency": sum(ordered) / len(ordered),
+            "p95_latency": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+            "max_latency": ordered[-1],
+            "concurrency_limit": self.config.max_concurrent_requests,
+            "peak_upstream_in_flight": peak_in_flight,
+        }
+
+        self.batch_stats["batches"] += 1
+        self.batch_stats["requests"] += total
+        self.batch_stats["failed"] += failed
+        self.batch_stats["total_seconds"] += elapsed
+        self.batch_stats["last_batch"] = stats
+        return stats
+
     async def _handle_get_model_metrics(self, client_id: str, message: MCPMessage) -> MCPMessage:
         """Handle model metrics requests."""
         try:
@@ -610,6 +731,15 @@ class AbacusAIMCPServer(MCPServer):
                 id=message.id,
                 result={
                     "metrics": metrics,
+                    "batch_stats": self.batch_stats,
+                    "conversations": self.active_conversations.stats(),
+                    "rate_limits": {
+                        model: {
+                            "rate_per_minute": limiter.rate * 60,
+                            "seconds_waited": limiter.waited,
+                        }
+                        for model, limiter in self._rate_limiters.items()
+                    },
                     "time_range": time_range,
                     "timestamp": datetime.now().isoformat(),
                 },
@@ -622,7 +752,9 @@ class AbacusAIMCPServer(MCPServer):
                 error={"code": -32603, "message": f"Internal error: {str(e)}"},
             )
 
-    def _update_model_metrics(self, model_name: str, result: dict[str, Any]):
+    def _update_model_metrics(
+        self, model_name: str, result: dict[str, Any], latency: Optional[float] = None
+    ):
         """Update model performance metrics."""
         if model_name not in self.model_metrics:
             self.model_metrics[model_name] = ModelMetrics(
@@ -639,6 +771,9 @@ class AbacusAIMCPServer(MCPServer):
         metrics.total_requests += 1
         metrics.last_used = datetime.now()
 
+        if latency is not None:
+            metrics.avg_latency += (latency - metrics.avg_latency) / metrics.total_requests
+
         if "usage" in result:
             tokens = result["usage"].get("total_tokens", 0)
             metrics.total_tokens += tokens
@@ -748,23 +883,24 @@ class AbacusAIMCPServer(MCPServer):
         self, request: dict[str, Any], routing_strategy: str, priority: str
     ) -> dict[str, Any]:
         """Process a single request in batch mode."""
-        # Simulate processing with optimal model selection
-        messages = request.get("messages", [])
-
-        # Mock response for batch processing
-        return {
-            "choices": [
-                {
-                    "message": {
-                        "role": "assistant",
-                        "content": f"Processed request {request['id']} with {routing_strategy} strategy",
-                    }
-                }
-            ],
-            "usage": {"total_tokens": 150},
-            "model": "gpt-4-turbo",
-            "cost": 0.003,
+        payload = {
+            "messages": request.get("messages", []),
+            "max_tokens": request.get("max_tokens", self.config.max_tokens),
+            "temperature": request.get("temperature", self.config.temperature),
+            "routing_strategy": routing_strategy,
         }
+        if request.get("model"):
+            payload["model"] = request["model"]
+
+        started = time.perf_counter()
+        status, result = await self._post_chat_completion(payload)
+        if status != 200:
+            raise RuntimeError(f"API request failed ({status}): {result}")
+
+        model_used = result.get("model")
+        if model_used:
+            self._update_model_metrics(model_used, result, time.perf_counter() - started)
+        return result
 
     # Override parent class methods to handle our custom tools
     async def _handle_call_tool(self, client_id: str, message: MCPMessage) -> MCPMessage:
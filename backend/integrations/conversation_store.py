@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Bounded conversation and context stores for MCP servers.
+
+Keeps recent conversations and contexts in memory with LRU eviction of idle
+entries. Evicted entries are dropped, or spilled to SQLite and reloaded
+lazily the next time they are used. Conversations also have a token budget:
+once a conversation exceeds it, its oldest non-system messages are trimmed.
+
+Author: TRAE.AI System
+Version: 1.0.0
+"""
+
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+from backend.utils.sqlite_cache import SQLiteCache
+
+
+class ChatMessage:
+    """Chat message structure.
+
+    A plain class with ``__slots__`` rather than a dataclass, since
+    ``dataclass(slots=True)`` needs Python 3.10 and stores hold many messages.
+    """
+
+    __slots__ = ("role", "content", "timestamp", "model_used", "tokens_used", "cost")
+
+    def __init__(
+        self,
+        role: str,  # system, user, assistant
+        content: str,
+        timestamp: Optional[datetime] = None,
+        model_used: Optional[str] = None,
+        tokens_used: Optional[int] = None,
+        cost: Optional[float] = None,
+    ):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp
+        self.model_used = model_used
+        self.tokens_used = tokens_used
+        self.cost = cost
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ChatMessage):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"ChatMessage({fields})"
+
+    @property
+    def token_count(self) -> int:
+        """Rough size of the message in the context window, at four characters per token
+
+        ``tokens_used`` is not used here: the API reports it for the whole
+        request, prompt included.
+        """
+        return max(1, len(self.content) // 4)
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["timestamp"] = self.timestamp.isoformat() if self.timestamp else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ChatMessage":
+        data = dict(data)
+        if data.get("timestamp"):
+            data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        return cls(**data)
+
+
+class Conversation:
+    """Messages of one conversation and their running token total."""
+
+    __slots__ = ("messages", "tokens")
+
+    def __init__(self, messages: Optional[list[ChatMessage]] = None, tokens: int = 0):
+        self.messages: list[ChatMessage] = messages if messages is not None else []
+        self.tokens = tokens
+
+
+class SpillingLRUStore:
+    """
+    Dict-like LRU store with idle expiry and optional spill to SQLite.
+
+    At most ``max_items`` entries stay in memory, and entries idle for
+    longer than ``idle_ttl`` seconds are evicted as well. With a ``db_path``,
+    evicted entries are written to SQLite and moved back into memory when
+    next read; each entry lives in exactly one of the two tiers.
+    """
+
+    def __init__(
+        self,
+        max_items: int = 1000,
+        idle_ttl: Optional[float] = None,
+        db_path: Optional[Union[str, Path]] = None,
+        table: str = "spilled_entries",
+        max_spilled: Optional[int] = 100_000,
+        dump: Callable[[Any], Any] = lambda value: value,
+        load: Callable[[Any], Any] = lambda data: data,
+    ):
+        self.max_items = max_items
+        self.idle_ttl = idle_ttl
+        self._dump = dump
+        self._load = load
+        # key -> (value, last access)
+        self._items: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self.store = SQLiteCache(db_path, table=table, max_entries=max_spilled) if db_path else None
+
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.spills = 0
+        self.drops = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._items.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._items[key] = (entry[0], time.monotonic())
+            self._items.move_to_end(key)
+            return entry[0]
+
+        if self.store is not None:
+            data = self.store.get(key)
+            if data is not None:
+                self.reloads += 1
+                self.store.delete(key)
+                value = self._load(data)
+                self._insert(key, value)
+                return value
+
+        self.misses += 1
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self.store is not None and key not in self._items:
+            self.store.delete(key)
+        self._insert(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        removed = self._items.pop(key, None) is not None
+        if self.store is not None:
+            removed = self.store.delete(key) or removed
+        if not removed:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._items:
+            return True
+        return self.store is not None and self.store.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._items) + (len(self.store) if self.store is not None else 0)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def keys(self) -> list[str]:
+        keys = list(self._items)
+        if self.store is not None:
+            keys.extend(self.store.keys())
+        return keys
+
+    def clear(self) -> None:
+        self._items.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def flush(self) -> None:
+        """Spill every in-memory entry, e.g. before shutdown"""
+        if self.store is None:
+            return
+        while self._items:
+            key, (value, _) = self._items.popitem(last=False)
+            self._spill(key, value)
+
+    def _insert(self, key: str, value: Any) -> None:
+        now = time.monotonic()
+        self._items[key] = (value, now)
+        self._items.move_to_end(key)
+
+        # Least recently used entries sit at the front
+        while self._items:
+            oldest_key, (oldest, last_access) = next(iter(self._items.items()))
+            idle = self.idle_ttl is not None and now - last_access > self.idle_ttl
+            if not idle and len(self._items) <= self.max_items:
+                break
+            del self._items[oldest_key]
+            if self.store is not None:
+                self._spill(oldest_key, oldest)
+            else:
+                self.drops += 1
+
+    def _spill(self, key: str, value: Any) -> None:
+        self.store.set(key, self._dump(value))
+        self.spills += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_memory": len(self._items),
+            "max_items": self.max_items,
+            "idle_ttl": self.idle_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "spills": self.spills,
+            "drops": self.drops,
+            "spilled": self.store.stats() if self.store is not None else None,
+        }
+
+
+_MISSING = object()
+
+
+class ConversationStore(SpillingLRUStore):
+    """Conversation store holding at most ``token_budget`` tokens per conversation."""
+
+    def __init__(self, token_budget: int = 8000, **kwargs):
+        kwargs.setdefault("table", "conversations")
+        super().__init__(dump=self._dump_conversation, load=self._load_conversation, **kwargs)
+        self.token_budget = token_budget
+        self.trimmed_messages = 0
+
+    @staticmethod
+    def _dump_conversation(conversation: Conversation) -> list[dict[str, Any]]:
+        return [message.to_dict() for message in conversation.messages]
+
+    @staticmethod
+    def _load_conversation(data: list[dict[str, Any]]) -> Conversation:
+        messages = [ChatMessage.from_dict(item) for item in data]
+        return Conversation(messages, sum(message.token_count for message in messages))
+
+    def append(self, conversation_id: str, message: ChatMessage) -> Conversation:
+        """Add a message, trimming the conversation back to its token budget"""
+        conversation = self.get(conversation_id)
+        if conversation is None:
+            conversation = Conversation()
+            self[conversation_id] = conversation
+
+        conversation.messages.append(message)
+        conversation.tokens += message.token_count
+        self._trim(conversation)
+        return conversation
+
+    def messages(self, conversation_id: str) -> list[ChatMessage]:
+        conversation = self.get(conversation_id)
+        return list(conversation.messages) if conversation is not None else []
+
+    def _trim(self, conversation: Conversation) -> None:
+        # System prompts and the newest message are kept whatever the budget
+        messages = conversation.messages
+        index = 0
+        while conversation.tokens > self.token_budget and index < len(messages) - 1:
+            if messages[index].role == "system":
+                index += 1
+                continue
+            conversation.tokens -= messages.pop(index).token_count
+            self.trimmed_messages += 1
+
+    def stats(self) -> dict[str, Any]:
+        stats = super().stats()
+        stats.update(token_budget=self.token_budget, trimmed_messages=self.trimmed_messages)
+        return stats
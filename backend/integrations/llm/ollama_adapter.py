@@ -1,6 +1,7 @@
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Handle optional dependencies with fallbacks
 try:
@@ -18,6 +19,15 @@ except ImportError:
         return ci_default if ci_default is not None else timeout
 
 
+try:
+    from backend.utils.response_cache import ResponseCache, make_cache_key
+except ImportError:
+    ResponseCache = None
+
+from backend.integrations.llm.ollama_client import (OLLAMA_NUM_PARALLEL, OllamaClient,
+                                                    OllamaGenerationError)
+
+
 log = logging.getLogger("integrations.llm.ollama")
 
 # Ollama configuration from environment variables
@@ -44,9 +54,40 @@ OLLAMA_READ_TIMEOUT = int(os.environ.get("OLLAMA_READ_TIMEOUT", "60"))
 OLLAMA_DEBUG = os.environ.get("OLLAMA_DEBUG", "false").lower() == "true"
 OLLAMA_VERBOSE = os.environ.get("OLLAMA_VERBOSE", "false").lower() == "true"
 
+# Response cache: OLLAMA_CACHE=0 disables, OLLAMA_CACHE_DB persists, OLLAMA_CACHE_TTL in seconds
+response_cache = ResponseCache.from_env("OLLAMA", "ollama_responses") if ResponseCache else None
+
+_client = None
+
+
+def get_client() -> OllamaClient:
+    """Shared pooled client; use it directly for async generation and streaming"""
+    global _client
+    if _client is None:
+        _client = OllamaClient(
+            base_url=OLLAMA_URL,
+            model=OLLAMA_MODEL,
+            num_parallel=OLLAMA_NUM_PARALLEL,
+            connect_timeout=OLLAMA_CONNECT_TIMEOUT,
+            read_timeout=OLLAMA_READ_TIMEOUT,
+        )
+    return _client
+
+
+def _options(temperature=None, max_tokens=None) -> dict:
+    """Generation options, falling back to environment defaults"""
+    return {
+        "temperature": temperature if temperature is not None else OLLAMA_TEMPERATURE,
+        "num_predict": max_tokens if max_tokens is not None else OLLAMA_MAX_TOKENS,
+        "top_p": OLLAMA_TOP_P,
+        "top_k": OLLAMA_TOP_K,
+        "repeat_penalty": OLLAMA_REPEAT_PENALTY,
+        "num_ctx": OLLAMA_CONTEXT_LENGTH,
+    }
+
 
 def is_up(timeout=None):
-    """Check if Ollama service is available"""
+    """Check if Ollama service is available; results are reused for OLLAMA_HEALTH_TTL seconds"""
     if not USE_OLLAMA:
         log.info("Ollama is disabled via USE_OLLAMA environment variable")
         return False
@@ -56,71 +97,79 @@ def is_up(timeout=None):
         return False
 
     timeout = timeout or OLLAMA_CONNECT_TIMEOUT
-    try:
-        r = requests.get(f"{OLLAMA_URL}/api/tags", timeout=pick_timeout(timeout, ci_default=2))
-        if OLLAMA_DEBUG:
-            log.debug(f"Ollama health check response: {r.status_code}")
-        return r.status_code == 200
-    except Exception as e:
-        if OLLAMA_VERBOSE:
-            log.warning(f"Ollama health check failed: {e}")
-        return False
+    up = get_client().is_up(timeout=pick_timeout(timeout, ci_default=2))
+    if OLLAMA_DEBUG:
+        log.debug(f"Ollama health check: {'up' if up else 'down'}")
+    return up
+
 
+def gen(prompt: str, temperature=None, max_tokens=None, use_cache=True):
+    """Generate text using Ollama with configurable parameters
 
-def gen(prompt: str, temperature=None, max_tokens=None):
-    """Generate text using Ollama with configurable parameters"""
+    Successful generations are cached on the normalised prompt and sampling
+    options, and concurrent identical requests share one Ollama call. Pass
+    ``use_cache=False`` for a fresh sample.
+    """
     if not USE_OLLAMA:
         log.info("Ollama is disabled, returning fallback response")
-        return f"Ollama disabled - fallback response at {
-            time.strftime('%Y-%m-%d %H:%M:%S')
-        }"
+        return f"Ollama disabled - fallback response at {time.strftime('%Y-%m-%d %H:%M:%S')}"
 
     if requests is None:
         log.warning("requests library not available, using fallback response")
         return f"Runtime showcase generated at {time.strftime('%Y-%m-%d %H:%M:%S')}."
 
-    # Use provided parameters or fall back to environment defaults
-    temp = temperature if temperature is not None else OLLAMA_TEMPERATURE
-    tokens = max_tokens if max_tokens is not None else OLLAMA_MAX_TOKENS
+    options = _options(temperature, max_tokens)
 
     try:
-        response = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={
-                "model": OLLAMA_MODEL,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temp,
-                    "num_predict": tokens,
-                    "top_p": OLLAMA_TOP_P,
-                    "top_k": OLLAMA_TOP_K,
-                    "repeat_penalty": OLLAMA_REPEAT_PENALTY,
-                    "num_ctx": OLLAMA_CONTEXT_LENGTH,
-                },
-            },
-            timeout=OLLAMA_READ_TIMEOUT,
+        if use_cache and response_cache is not None:
+            key = make_cache_key(prompt, model=OLLAMA_MODEL, **options)
+            return response_cache.get_or_compute(key, lambda: _generate(prompt, options))
+        return _generate(prompt, options)
+
+    except OllamaGenerationError as e:
+        log.error(f"Ollama generation failed with {e}")
+        return f"Generation failed - fallback response at {time.strftime('%Y-%m-%d %H:%M:%S')}"
+
+    except Exception as e:
+        log.warning(f"Ollama generation error: {e}")
+        return f"Runtime showcase generated at {time.strftime('%Y-%m-%d %H:%M:%S')}."
+
+
+def _generate(prompt: str, options: dict) -> str:
+    """Run one generation on the pooled client, raising on any failure"""
+    if OLLAMA_DEBUG:
+        log.debug(
+            f"Ollama generation request: model={OLLAMA_MODEL}, "
+            f"temp={options['temperature']}, tokens={options['num_predict']}"
         )
 
-        if OLLAMA_DEBUG:
-            log.debug(
-                f"Ollama generation request: model={OLLAMA_MODEL}, temp={temp}, tokens={tokens}"
-            )
+    generated_text = get_client().generate(prompt, options=options)
 
-        if response.status_code == 200:
-            result = response.json()
-            generated_text = result.get("response", "")
+    if OLLAMA_VERBOSE:
+        log.info(f"Ollama generation successful: {len(generated_text)} characters")
 
-            if OLLAMA_VERBOSE:
-                log.info(f"Ollama generation successful: {len(generated_text)} characters")
+    return generated_text
 
-            return generated_text
-        else:
-            log.error(f"Ollama generation failed with status {response.status_code}")
-            return f"Generation failed - fallback response at {
-                time.strftime('%Y-%m-%d %H:%M:%S')
-            }"
 
-    except Exception as e:
-        log.warning(f"Ollama generation error: {e}")
-        return f"Runtime showcase generated at {time.strftime('%Y-%m-%d %H:%M:%S')}."
+def gen_stream(prompt: str, temperature=None, max_tokens=None):
+    """Yield generated text as Ollama produces it
+
+    Raises OllamaGenerationError or the underlying HTTP error on failure;
+    nothing is cached.
+    """
+    if not USE_OLLAMA or requests is None:
+        yield gen(prompt, temperature, max_tokens, use_cache=False)
+        return
+
+    yield from get_client().stream(prompt, options=_options(temperature, max_tokens))
+
+
+def gen_many(prompts, temperature=None, max_tokens=None, use_cache=True):
+    """Generate text for many prompts, OLLAMA_NUM_PARALLEL at a time, in order"""
+    if not prompts:
+        return []
+    parallel = min(len(prompts), get_client().num_parallel)
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        return list(
+            executor.map(lambda prompt: gen(prompt, temperature, max_tokens, use_cache), prompts)
+        )
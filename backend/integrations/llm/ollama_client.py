@@ -0,0 +1,355 @@
+"""Ollama Client
+
+Keep-alive HTTP client for the Ollama API. Connections are pooled and
+reused across calls, and generation is available as a complete response or
+as a token stream, in sync and async flavours. Concurrent requests are
+capped at ``num_parallel`` so batches queue on the client rather than in
+Ollama, which serves at most ``OLLAMA_NUM_PARALLEL`` requests per model at
+once. Health checks are cached for a short interval.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Iterator, Optional
+
+# Optional imports with fallbacks
+try:
+    import aiohttp
+
+    aiohttp_available = True
+except ImportError:
+    aiohttp = None
+    aiohttp_available = False
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    requests_available = True
+except ImportError:
+    requests = None
+    HTTPAdapter = None
+    requests_available = False
+
+log = logging.getLogger("integrations.llm.ollama")
+
+# Matches the Ollama server's own per-model parallelism setting
+OLLAMA_NUM_PARALLEL = int(os.environ.get("OLLAMA_NUM_PARALLEL", "4"))
+OLLAMA_HEALTH_TTL = float(os.environ.get("OLLAMA_HEALTH_TTL", "5"))
+
+_DONE = object()
+
+
+class OllamaGenerationError(Exception):
+    """Ollama answered with a non-200 status"""
+
+
+class OllamaClient:
+    """Pooled sync/async Ollama client with bounded parallelism.
+
+    The async side uses aiohttp when available; otherwise it runs the pooled
+    ``requests.Session`` on the default executor.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:11434",
+        model: str = "llama3",
+        num_parallel: int = OLLAMA_NUM_PARALLEL,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        health_ttl: float = OLLAMA_HEALTH_TTL,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.num_parallel = max(1, num_parallel)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.health_ttl = health_ttl
+
+        self._lock = threading.Lock()
+        self._session: Any = None
+        self._slots = threading.BoundedSemaphore(self.num_parallel)
+        self._async_session: Any = None
+        self._async_slots: Optional[asyncio.Semaphore] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._health: Optional[tuple[float, bool]] = None
+
+        self.requests = 0
+        self.errors = 0
+        self.health_checks = 0
+        self.first_token_time = 0.0
+        self.streams = 0
+
+    # Sync API
+
+    @property
+    def session(self):
+        """Shared keep-alive session, created on first use"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    if not requests_available:
+                        raise RuntimeError("Ollama client requires the requests package")
+                    session = requests.Session()
+                    # Room for every parallel slot plus health checks
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.num_parallel + 1)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def is_up(self, timeout: Optional[float] = None, max_age: Optional[float] = None) -> bool:
+        """Whether the server answers, reusing a result younger than ``health_ttl``"""
+        max_age = self.health_ttl if max_age is None else max_age
+        cached = self._health
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+
+        self.health_checks += 1
+        try:
+            response = self.session.get(
+                f"{self.base_url}/api/tags", timeout=timeout or self.connect_timeout
+            )
+            up = response.status_code == 200
+        except Exception as e:
+            log.debug(f"Ollama health check failed: {e}")
+            up = False
+        self._health = (time.monotonic(), up)
+        return up
+
+    def _payload(self, prompt: str, model: Optional[str], options: Optional[dict], stream: bool):
+        return {
+            "model": model or self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": options or {},
+        }
+
+    def generate(
+        self, prompt: str, model: Optional[str] = None, options: Optional[dict] = None
+    ) -> str:
+        """Generate a complete response"""
+        with self._slots:
+            self.requests += 1
+            response = self.session.post(
+                f"{self.base_url}/api/generate",
+                json=self._payload(prompt, model, options, stream=False),
+                timeout=(self.connect_timeout, self.read_timeout),
+            )
+            if response.status_code != 200:
+                self.errors += 1
+                raise OllamaGenerationError(f"status {response.status_code}")
+            return response.json().get("response", "")
+
+    def stream(
+        self, prompt: str, model: Optional[str] = None, options: Optional[dict] = None
+    ) -> Iterator[str]:
+        """Yield response tokens as Ollama produces them"""
+        with self._slots:
+            self.requests += 1
+            self.streams += 1
+            started = time.perf_counter()
+            first = True
+            with self.session.post(
+                f"{self.base_url}/api/generate",
+                json=self._payload(prompt, model, options, stream=True),
+                timeout=(self.connect_timeout, self.read_timeout),
+                stream=True,
+            ) as response:
+                if response.status_code != 200:
+                    self.errors += 1
+                    raise OllamaGenerationError(f"status {response.status_code}")
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        self.errors += 1
+                        raise OllamaGenerationError(chunk["error"])
+                    token = chunk.get("response", "")
+                    if token:
+                        if first:
+                            self.first_token_time += time.perf_counter() - started
+                            first = False
+                        yield token
+                    if chunk.get("done"):
+                        return
+
+    def generate_many(
+        self,
+        prompts: list[str],
+        model: Optional[str] = None,
+        options: Optional[dict] = None,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """Generate responses for many prompts, ``num_parallel`` at a time, in order"""
+        with ThreadPoolExecutor(max_workers=self.num_parallel) as executor:
+            futures = [executor.submit(self.generate, prompt, model, options) for prompt in prompts]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results.append(e)
+            return results
+
+    def close(self) -> None:
+        """Release pooled connections"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    # Async API
+
+    async def _open_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._async_loop is loop:
+            return
+        # Sessions and semaphores belong to one event loop
+        if self._async_session is not None and not self._async_loop.is_closed():
+            await self._async_session.close()
+        self._async_session = None
+        self._async_slots = asyncio.Semaphore(self.num_parallel)
+        self._async_loop = loop
+        if aiohttp_available and aiohttp:
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.num_parallel + 1),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self.connect_timeout, sock_read=self.read_timeout
+                ),
+            )
+
+    async def ais_up(
+        self, timeout: Optional[float] = None, max_age: Optional[float] = None
+    ) -> bool:
+        """Async is_up, sharing the cached result"""
+        max_age = self.health_ttl if max_age is None else max_age
+        cached = self._health
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+
+        await self._open_async()
+        if self._async_session is None:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.is_up, timeout, max_age
+            )
+
+        self.health_checks += 1
+        try:
+            async with self._async_session.get(
+                f"{self.base_url}/api/tags",
+                timeout=aiohttp.ClientTimeout(total=timeout or self.connect_timeout),
+            ) as response:
+                up = response.status == 200
+        except Exception as e:
+            log.debug(f"Ollama health check failed: {e}")
+            up = False
+        self._health = (time.monotonic(), up)
+        return up
+
+    async def agenerate(
+        self, prompt: str, model: Optional[str] = None, options: Optional[dict] = None
+    ) -> str:
+        """Async generate"""
+        await self._open_async()
+        if self._async_session is None:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.generate, prompt, model, options
+            )
+
+        async with self._async_slots:
+            self.requests += 1
+            async with self._async_session.post(
+                f"{self.base_url}/api/generate",
+                json=self._payload(prompt, model, options, stream=False),
+            ) as response:
+                if response.status != 200:
+                    self.errors += 1
+                    raise OllamaGenerationError(f"status {response.status}")
+                return (await response.json()).get("response", "")
+
+    async def astream(
+        self, prompt: str, model: Optional[str] = None, options: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """Async stream of response tokens"""
+        await self._open_async()
+        if self._async_session is None:
+            loop = asyncio.get_running_loop()
+            tokens = self.stream(prompt, model, options)
+            while (token := await loop.run_in_executor(None, next, tokens, _DONE)) is not _DONE:
+                yield token
+            return
+
+        async with self._async_slots:
+            self.requests += 1
+            self.streams += 1
+            started = time.perf_counter()
+            first = True
+            async with self._async_session.post(
+                f"{self.base_url}/api/generate",
+                json=self._payload(prompt, model, options, stream=True),
+            ) as response:
+                if response.status != 200:
+                    self.errors += 1
+                    raise OllamaGenerationError(f"status {response.status}")
+                async for line in response.content:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        self.errors += 1
+                        raise OllamaGenerationError(chunk["error"])
+                    token = chunk.get("response", "")
+                    if token:
+                        if first:
+                            self.first_token_time += time.perf_counter() - started
+                            first = False
+                        yield token
+                    if chunk.get("done"):
+                        return
+
+    async def agenerate_many(
+        self,
+        prompts: list[str],
+        model: Optional[str] = None,
+        options: Optional[dict] = None,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """Async generate_many; requests beyond ``num_parallel`` wait for a slot"""
+        return await asyncio.gather(
+            *(self.agenerate(prompt, model, options) for prompt in prompts),
+            return_exceptions=return_exceptions,
+        )
+
+    async def aclose(self) -> None:
+        """Release pooled connections, sync and async"""
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+        self._async_loop = None
+        self.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "model": self.model,
+            "num_parallel": self.num_parallel,
+            "requests": self.requests,
+            "errors": self.errors,
+            "streams": self.streams,
+            "avg_time_to_first_token": (
+                self.first_token_time / self.streams if self.streams else 0.0
+            ),
+            "health_checks": self.health_checks,
+            "backend": "aiohttp" if aiohttp_available else "requests",
+        }
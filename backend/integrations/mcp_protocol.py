@@ -24,7 +24,7 @@ import os
 import sys
 import uuid
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from enum import Enum
 from typing import Any, Callable, Optional, Union
@@ -37,6 +37,8 @@ except ImportError:
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+from backend.integrations.conversation_store import SpillingLRUStore
+
 try:
     JSONSCHEMA_AVAILABLE = True
 except ImportError:
@@ -203,6 +205,21 @@ class MCPContext:
     expires_at: Optional[datetime] = None
     metadata: Optional[dict[str, Any]] = None
 
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        for key in ("created_at", "updated_at", "expires_at"):
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MCPContext":
+        data = dict(data)
+        for key in ("created_at", "updated_at", "expires_at"):
+            if data.get(key):
+                data[key] = datetime.fromisoformat(data[key])
+        return cls(**data)
+
 
 @dataclass
 class MCPServerInfo:
@@ -260,8 +277,15 @@ class MCPServer:
         self.resources: dict[str, MCPResource] = {}
         self.prompts: dict[str, MCPPrompt] = {}
 
-        # Context storage
-        self.contexts: dict[str, MCPContext] = {}
+        # Context storage: least recently used contexts beyond MCP_MAX_CONTEXTS are
+        # dropped, or spilled to MCP_CONTEXT_DB when set and reloaded on access
+        self.contexts = SpillingLRUStore(
+            max_items=int(os.getenv("MCP_MAX_CONTEXTS", "1000")),
+            db_path=os.getenv("MCP_CONTEXT_DB"),
+            table="mcp_contexts",
+            dump=MCPContext.to_dict,
+            load=MCPContext.from_dict,
+        )
 
         # Client connections
         self.clients: dict[str, Any] = {}
@@ -317,6 +341,7 @@ class MCPServer:
         if self.server:
             self.server.close()
             await self.server.wait_closed()
+        self.contexts.flush()
         self.executor.shutdown(wait=True)
         self.logger.info("MCP Server stopped")
 
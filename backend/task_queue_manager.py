@@ -1,9 +1,58 @@
 import asyncio
+import functools
+import heapq
+import itertools
+import json
 import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Optional
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+# Named priorities used by the task_queue table; higher runs first
+PRIORITY_LEVELS = {"low": -1, "medium": 0, "high": 1, "critical": 2}
+
+# Same layout as the fallback task_queue table in backend/core/database.py;
+# an existing table created from schema.sql is migrated by TaskStore
+TASK_QUEUE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS task_queue (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_id TEXT UNIQUE NOT NULL,
+        task_type TEXT NOT NULL DEFAULT 'system',
+        priority TEXT NOT NULL DEFAULT 'medium',
+        status TEXT NOT NULL DEFAULT 'pending',
+        agent_id TEXT,
+        payload TEXT,
+        result TEXT,
+        error_message TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        started_at TIMESTAMP,
+        completed_at TIMESTAMP,
+        retry_count INTEGER DEFAULT 0,
+        max_retries INTEGER DEFAULT 3
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_task_status ON task_queue(status);
+    CREATE INDEX IF NOT EXISTS idx_task_type ON task_queue(task_type);
+"""
+
+# Columns TaskStore needs on top of either task_queue layout. assigned_worker
+# already exists in schema.sql; the lease lets several processes share one table.
+TASK_QUEUE_COLUMNS = {
+    "agent_id": "TEXT",
+    "assigned_worker": "TEXT",
+    "lease_expires_at": "REAL",
+}
 
 
 class TaskStatus(Enum):
@@ -16,16 +65,107 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"
 
 
+class ExecutionClass(Enum):
+    """Where a task handler runs"""
+
+    ASYNC = "async"  # coroutine on the event loop
+    THREAD = "thread"  # blocking I/O on the thread pool
+    PROCESS = "process"  # CPU-bound work on the process pool
+
+
+@dataclass
+class HandlerSpec:
+    """A registered handler and its execution limits"""
+
+    handler: Callable[[dict[str, Any]], Any]
+    execution: ExecutionClass
+    concurrency: Optional[int] = None
+    timeout: Optional[float] = None
+
+
+class TaskTypeMetrics:
+    """Queue-wait and execution-time totals for one task type"""
+
+    __slots__ = ("count", "wait_total", "wait_max", "exec_total", "exec_max", "timeouts", "running")
+
+    def __init__(self):
+        self.count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.exec_total = 0.0
+        self.exec_max = 0.0
+        self.timeouts = 0
+        self.running = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "executed": self.count,
+            "running": self.running,
+            "avg_queue_wait": self.wait_total / self.count if self.count else 0.0,
+            "max_queue_wait": self.wait_max,
+            "avg_execution_time": self.exec_total / self.count if self.count else 0.0,
+            "max_execution_time": self.exec_max,
+            "timeouts": self.timeouts,
+        }
+
+
+def parse_priority(priority: Union[int, str, None]) -> int:
+    """Convert a numeric or named priority to an integer"""
+    if isinstance(priority, int):
+        return priority
+    if priority is None:
+        return 0
+    try:
+        return int(priority)
+    except ValueError:
+        return PRIORITY_LEVELS.get(str(priority).lower(), 0)
+
+
+def priority_name(priority: int) -> str:
+    """Convert an integer priority to the task_queue name, clamping to the named range"""
+    levels = sorted(PRIORITY_LEVELS.items(), key=lambda item: item[1])
+    for name, level in reversed(levels):
+        if priority >= level:
+            return name
+    return levels[0][0]
+
+
 class Task:
     """Task representation"""
 
-    def __init__(self, task_id: str, task_type: str, data: dict[str, Any], priority: int = 0):
+    __slots__ = (
+        "task_id",
+        "task_type",
+        "data",
+        "priority",
+        "agent_id",
+        "status",
+        "created_at",
+        "enqueued_at",
+        "started_at",
+        "completed_at",
+        "result",
+        "error",
+        "retry_count",
+        "max_retries",
+    )
+
+    def __init__(
+        self,
+        task_id: str,
+        task_type: str,
+        data: dict[str, Any],
+        priority: int = 0,
+        agent_id: Optional[str] = None,
+    ):
         self.task_id = task_id
         self.task_type = task_type
         self.data = data
         self.priority = priority
+        self.agent_id = agent_id
         self.status = TaskStatus.PENDING
         self.created_at = datetime.now()
+        self.enqueued_at = time.time()
         self.started_at = None
         self.completed_at = None
         self.result = None
@@ -34,21 +174,271 @@ class Task:
         self.max_retries = 3
 
 
+class TaskStore:
+    """Write-through persistence of tasks to the task_queue table
+
+    Works against both the fallback layout and the ``schema.sql`` layout of
+    ``task_queue``, adding any missing columns. Unfinished rows written by a
+    store carry its ``owner`` and a lease expiry; another store only takes a
+    row over once that lease has lapsed.
+    """
+
+    def __init__(
+        self, db_path: Union[str, Path], owner: Optional[str] = None, lease_ttl: float = 30.0
+    ):
+        self.db_path = str(db_path)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_ttl = lease_ttl
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(TASK_QUEUE_SCHEMA)
+        self._integer_priority = self._migrate()
+
+    def _migrate(self) -> bool:
+        """Add missing columns; returns whether ``priority`` is an INTEGER column"""
+        columns = {
+            row["name"]: (row["type"] or "").upper()
+            for row in self._conn.execute("PRAGMA table_info(task_queue)")
+        }
+        for name, column_type in TASK_QUEUE_COLUMNS.items():
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE task_queue ADD COLUMN {name} {column_type}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_agent_id ON task_queue(agent_id)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_task_queue_lease "
+            "ON task_queue(status, lease_expires_at)"
+        )
+        return "INT" in columns.get("priority", "")
+
+    def _lease(self, task: Task) -> Optional[float]:
+        if task.status in (TaskStatus.PENDING, TaskStatus.RUNNING):
+            return time.time() + self.lease_ttl
+        return None
+
+    def save(self, task: Task) -> None:
+        """Insert or update the row for ``task``"""
+        row = (
+            task.task_id,
+            task.task_type,
+            task.priority if self._integer_priority else priority_name(task.priority),
+            task.status.value,
+            task.agent_id,
+            json.dumps(task.data, default=str),
+            json.dumps(task.result, default=str) if task.result is not None else None,
+            task.error,
+            task.created_at.isoformat(),
+            datetime.now().isoformat(),
+            task.started_at.isoformat() if task.started_at else None,
+            task.completed_at.isoformat() if task.completed_at else None,
+            task.retry_count,
+            task.max_retries,
+            self.owner,
+            self._lease(task),
+        )
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO task_queue (task_id, task_type, priority, status, agent_id, payload,
+                    result, error_message, created_at, updated_at, started_at, completed_at,
+                    retry_count, max_retries, assigned_worker, lease_expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(task_id) DO UPDATE SET
+                    status = excluded.status,
+                    result = excluded.result,
+                    error_message = excluded.error_message,
+                    updated_at = excluded.updated_at,
+                    started_at = excluded.started_at,
+                    completed_at = excluded.completed_at,
+                    retry_count = excluded.retry_count,
+                    assigned_worker = excluded.assigned_worker,
+                    lease_expires_at = excluded.lease_expires_at
+                """,
+                row,
+            )
+
+    def claim(self, task_id: str) -> bool:
+        """Take ``task_id`` for running unless another owner holds a live lease"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE task_queue SET assigned_worker = ?, lease_expires_at = ?
+                WHERE task_id = ? AND status IN ('pending', 'running')
+                    AND (assigned_worker = ? OR lease_expires_at IS NULL OR lease_expires_at < ?)
+                """,
+                (self.owner, now + self.lease_ttl, task_id, self.owner, now),
+            )
+            if cursor.rowcount:
+                return True
+            # A row that was never written (a failed save) is still ours
+            exists = self._conn.execute(
+                "SELECT 1 FROM task_queue WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return exists is None
+
+    def renew(self) -> int:
+        """Extend the lease on every unfinished row this store owns"""
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE task_queue SET lease_expires_at = ?
+                WHERE assigned_worker = ? AND status IN ('pending', 'running')
+                """,
+                (time.time() + self.lease_ttl, self.owner),
+            )
+        return cursor.rowcount
+
+    def load(self, task_id: str) -> Optional[Task]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM task_queue WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return self._row_to_task(row) if row else None
+
+    def reclaim_expired(self) -> list[Task]:
+        """Take over unfinished rows whose owner's lease has lapsed
+
+        Rows without a lease were not written by a TaskStore and belong to
+        other users of the table, so they are left alone.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    """
+                    SELECT * FROM task_queue
+                    WHERE status IN ('pending', 'running')
+                        AND lease_expires_at IS NOT NULL AND lease_expires_at < ?
+                    ORDER BY id
+                    """,
+                    (now,),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE task_queue SET assigned_worker = ?, lease_expires_at = ? WHERE task_id = ?",
+                    [(self.owner, now + self.lease_ttl, row["task_id"]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [self._row_to_task(row) for row in rows]
+
+    def count_by_status(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM task_queue GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _row_to_task(row: sqlite3.Row) -> Task:
+        def parse_time(value: Optional[str]) -> Optional[datetime]:
+            if not value:
+                return None
+            try:
+                return datetime.fromisoformat(str(value))
+            except ValueError:
+                return None
+
+        def parse_json(value: Any) -> Any:
+            # JSON columns in schema.sql have numeric affinity, so scalars
+            # may come back already converted
+            if not isinstance(value, (str, bytes)):
+                return value
+            try:
+                return json.loads(value)
+            except ValueError:
+                return value
+
+        task = Task(
+            row["task_id"],
+            row["task_type"],
+            parse_json(row["payload"]) or {},
+            parse_priority(row["priority"]),
+            row["agent_id"],
+        )
+        task.status = TaskStatus(row["status"])
+        task.created_at = parse_time(row["created_at"]) or task.created_at
+        task.enqueued_at = task.created_at.timestamp()
+        task.started_at = parse_time(row["started_at"])
+        task.completed_at = parse_time(row["completed_at"])
+        task.result = parse_json(row["result"])
+        task.error = row["error_message"]
+        task.retry_count = row["retry_count"] or 0
+        task.max_retries = row["max_retries"] if row["max_retries"] is not None else 3
+        return task
+
+
 class TaskQueueManager:
-    """Task Queue Manager for handling asynchronous tasks"""
+    """Task Queue Manager for handling asynchronous tasks
+
+    Pending tasks are ordered by per-type heaps on priority with aging: every
+    ``aging_interval`` seconds spent waiting counts as one priority level,
+    so low-priority work cannot starve. Live tasks are indexed by id, and
+    finished tasks are kept in a bounded history. When ``db_path`` is
+    configured every state change is written to the ``task_queue`` table;
+    history evicted from memory is then still reachable by id. Unfinished
+    rows are leased to this manager and the lease is renewed while it runs,
+    so tasks left by a crashed process are requeued once their lease
+    expires, and a task is claimed in the table before it runs so two
+    processes sharing the table never run it twice.
+    """
 
     def __init__(self, config: Optional[dict[str, Any]] = None):
         self.config = config or {}
-        self.task_queue = asyncio.Queue()
-        self.active_tasks = {}
-        self.completed_tasks = []
-        self.failed_tasks = []
+        self.active_tasks: dict[str, Task] = {}
         self.task_handlers = {}
+        self.handler_specs: dict[str, HandlerSpec] = {}
         self.workers = []
         self.is_running = False
         self.max_workers = self.config.get("max_workers", 5)
+        self.aging_interval = float(self.config.get("aging_interval", 60.0))
+        self.history_size = int(self.config.get("history_size", 1000))
+        self.lease_ttl = float(self.config.get("lease_ttl", 30.0))
+        self.pool_sizes = {
+            ExecutionClass.THREAD: int(self.config.get("thread_pool_size", 8)),
+            ExecutionClass.PROCESS: int(self.config.get("process_pool_size", os.cpu_count() or 1)),
+        }
         self.logger = logging.getLogger(__name__)
 
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._in_flight = {execution: 0 for execution in ExecutionClass}
+        self._peak_in_flight = {execution: 0 for execution in ExecutionClass}
+        # Timed-out pool work that is still occupying its worker
+        self._abandoned = {execution: 0 for execution in ExecutionClass}
+        self._type_metrics: dict[str, TaskTypeMetrics] = {}
+
+        # One heap per task type, so types at their concurrency cap are
+        # skipped without touching their entries
+        self._heaps: dict[str, list[tuple[float, int, str]]] = {}
+        self._heap_entries = 0
+        self._sequence = itertools.count()
+        self._pending: dict[str, Task] = {}
+        self._history: OrderedDict[str, Task] = OrderedDict()
+        self._not_empty: Optional[asyncio.Condition] = None
+        self.completed_count = 0
+        self.failed_count = 0
+        self.cancelled_count = 0
+        self.recovered_count = 0
+        self._lease_keeper: Optional[asyncio.Task] = None
+
+        db_path = self.config.get("db_path")
+        self.store = TaskStore(db_path, lease_ttl=self.lease_ttl) if db_path else None
+        if self.store is not None:
+            self._recover()
+
     async def start(self):
         """Start the task queue manager"""
         if self.is_running:
@@ -62,6 +452,9 @@ class TaskQueueManager:
             worker = asyncio.create_task(self._worker(f"worker-{i}"))
             self.workers.append(worker)
 
+        if self.store is not None:
+            self._lease_keeper = asyncio.create_task(self._keep_leases())
+
     async def stop(self):
         """Stop the task queue manager"""
         if not self.is_running:
@@ -70,6 +463,11 @@ class TaskQueueManager:
         self.is_running = False
         self.logger.info("Stopping TaskQueueManager")
 
+        if self._lease_keeper is not None:
+            self._lease_keeper.cancel()
+            await asyncio.gather(self._lease_keeper, return_exceptions=True)
+            self._lease_keeper = None
+
         # Cancel all workers
         for worker in self.workers:
             worker.cancel()
@@ -78,39 +476,147 @@ class TaskQueueManager:
         await asyncio.gather(*self.workers, return_exceptions=True)
         self.workers.clear()
 
-    def register_handler(self, task_type: str, handler: Callable[[dict[str, Any]], Any]):
-        """Register a task handler for a specific task type"""
-        self.task_handlers[task_type] = handler
-        self.logger.info(f"Registered handler for task type: {task_type}")
+        # Pool work already started cannot be interrupted; stop waiting for it
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
+
+    def register_handler(
+        self,
+        task_type: str,
+        handler: Callable[[dict[str, Any]], Any],
+        execution: Union[ExecutionClass, str, None] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Register a task handler for a specific task type
+
+        ``execution`` defaults to ``async`` for coroutine functions and to
+        ``thread`` otherwise, so blocking handlers never run on the event
+        loop. ``process`` handlers must be picklable module-level functions.
+        ``concurrency`` caps how many tasks of this type run at once and
+        ``timeout`` bounds each run in seconds.
+        """
+        if execution is None:
+            execution = (
+                ExecutionClass.ASYNC
+                if asyncio.iscoroutinefunction(handler)
+                else ExecutionClass.THREAD
+            )
+        execution = ExecutionClass(execution)
+        if execution == ExecutionClass.ASYNC and not asyncio.iscoroutinefunction(handler):
+            raise ValueError(f"Handler for {task_type} must be a coroutine function to run async")
 
-    async def add_task(self, task_type: str, data: dict[str, Any], priority: int = 0) -> str:
+        self.task_handlers[task_type] = handler
+        self.handler_specs[task_type] = HandlerSpec(handler, execution, concurrency, timeout)
+        self.logger.info(f"Registered {execution.value} handler for task type: {task_type}")
+
+    async def add_task(
+        self,
+        task_type: str,
+        data: dict[str, Any],
+        priority: Union[int, str] = 0,
+        agent_id: Optional[str] = None,
+    ) -> str:
         """Add a task to the queue"""
         task_id = str(uuid.uuid4())
-        task = Task(task_id, task_type, data, priority)
+        task = Task(task_id, task_type, data, parse_priority(priority), agent_id)
 
-        await self.task_queue.put(task)
+        self._persist(task)
+        await self._enqueue(task)
         self.logger.info(f"Added task {task_id} of type {task_type} to queue")
 
         return task_id
 
-    async def get_task_status(self, task_id: str) -> Optional[dict[str, Any]]:
-        """Get the status of a specific task"""
-        # Check active tasks
-        if task_id in self.active_tasks:
-            task = self.active_tasks[task_id]
-            return self._task_to_dict(task)
+    async def cancel_task(self, task_id: str) -> bool:
+        """Cancel a pending task; running tasks are left to finish"""
+        task = self._pending.pop(task_id, None)
+        if task is None:
+            return False
 
-        # Check completed tasks
-        for task in self.completed_tasks:
-            if task.task_id == task_id:
-                return self._task_to_dict(task)
+        # The heap entry is skipped lazily when it reaches the top
+        task.status = TaskStatus.CANCELLED
+        task.completed_at = datetime.now()
+        self.cancelled_count += 1
+        self._finish(task)
+        return True
 
-        # Check failed tasks
-        for task in self.failed_tasks:
-            if task.task_id == task_id:
-                return self._task_to_dict(task)
-
-        return None
+    async def get_task_status(self, task_id: str) -> Optional[dict[str, Any]]:
+        """Get the status of a specific task"""
+        task = (
+            self.active_tasks.get(task_id)
+            or self._pending.get(task_id)
+            or self._history.get(task_id)
+        )
+        if task is None and self.store is not None:
+            task = self.store.load(task_id)
+
+        return self._task_to_dict(task) if task else None
+
+    def _sort_key(self, task: Task) -> float:
+        # A task's effective priority is priority + waited / aging_interval;
+        # the current time is common to every entry, so ordering by
+        # enqueued_at / aging_interval - priority never needs re-heapifying.
+        return task.enqueued_at / self.aging_interval - task.priority
+
+    def _push(self, task: Task) -> None:
+        self._pending[task.task_id] = task
+        heap = self._heaps.setdefault(task.task_type, [])
+        heapq.heappush(heap, (self._sort_key(task), next(self._sequence), task.task_id))
+        self._heap_entries += 1
+
+    async def _enqueue(self, task: Task) -> None:
+        if self._not_empty is None:
+            self._not_empty = asyncio.Condition()
+        async with self._not_empty:
+            self._push(task)
+            self._not_empty.notify()
+
+    def _at_capacity(self, task_type: str) -> bool:
+        spec = self.handler_specs.get(task_type)
+        if spec is None or spec.concurrency is None:
+            return False
+        metrics = self._type_metrics.get(task_type)
+        return metrics is not None and metrics.running >= spec.concurrency
+
+    def _pop_ready(self) -> Optional[Task]:
+        """Pop the best pending task whose type is below its concurrency cap
+
+        Compares the head of each eligible type's heap, so the cost is one
+        heap pop plus a scan over task types, however many tasks wait at a cap.
+        """
+        best_type = None
+        best_entry = None
+        for task_type, heap in list(self._heaps.items()):
+            if self._at_capacity(task_type):
+                continue
+            # Cancelled entries are dropped lazily when they reach the top
+            while heap and heap[0][2] not in self._pending:
+                heapq.heappop(heap)
+                self._heap_entries -= 1
+            if not heap:
+                del self._heaps[task_type]
+                continue
+            if best_entry is None or heap[0] < best_entry:
+                best_type, best_entry = task_type, heap[0]
+
+        if best_entry is None:
+            return None
+        heapq.heappop(self._heaps[best_type])
+        self._heap_entries -= 1
+        return self._pending.pop(best_entry[2])
+
+    async def _next_task(self) -> Optional[Task]:
+        if self._not_empty is None:
+            self._not_empty = asyncio.Condition()
+        async with self._not_empty:
+            task = self._pop_ready()
+            while task is None:
+                await asyncio.wait_for(self._not_empty.wait(), timeout=1.0)
+                task = self._pop_ready()
+            return task
 
     async def _worker(self, worker_name: str):
         """Worker coroutine to process tasks"""
@@ -119,12 +625,17 @@ class TaskQueueManager:
         while self.is_running:
             try:
                 # Get task from queue with timeout
-                task = await asyncio.wait_for(self.task_queue.get(), timeout=1.0)
+                task = await self._next_task()
+                if not self._claim(task):
+                    # Another process took the task over after our lease lapsed
+                    self.logger.info(f"Task {task.task_id} is owned elsewhere, skipping")
+                    continue
 
                 # Add to active tasks
                 self.active_tasks[task.task_id] = task
                 task.status = TaskStatus.RUNNING
                 task.started_at = datetime.now()
+                self._persist(task)
 
                 self.logger.info(f"Worker {worker_name} processing task {task.task_id}")
 
@@ -137,9 +648,10 @@ class TaskQueueManager:
                     task.completed_at = datetime.now()
                     task.result = result
 
-                    # Move to completed tasks
-                    self.completed_tasks.append(task)
+                    # Move to completed history
                     del self.active_tasks[task.task_id]
+                    self.completed_count += 1
+                    self._finish(task)
 
                     self.logger.info(f"Task {task.task_id} completed successfully")
 
@@ -147,12 +659,14 @@ class TaskQueueManager:
                     # Handle task failure
                     task.error = str(e)
                     task.retry_count += 1
+                    del self.active_tasks[task.task_id]
 
                     if task.retry_count < task.max_retries:
                         # Retry task
                         task.status = TaskStatus.PENDING
-                        await self.task_queue.put(task)
-                        del self.active_tasks[task.task_id]
+                        task.enqueued_at = time.time()
+                        self._persist(task)
+                        await self._enqueue(task)
                         self.logger.warning(
                             f"Task {task.task_id} failed, retrying ({task.retry_count}/{task.max_retries})"
                         )
@@ -161,15 +675,12 @@ class TaskQueueManager:
                         task.status = TaskStatus.FAILED
                         task.completed_at = datetime.now()
 
-                        # Move to failed tasks
-                        self.failed_tasks.append(task)
-                        del self.active_tasks[task.task_id]
+                        # Move to failed history
+                        self.failed_count += 1
+                        self._finish(task)
 
                         self.logger.error(f"Task {task.task_id} failed permanently: {str(e)}")
 
-                # Mark task as done in queue
-                self.task_queue.task_done()
-
             except asyncio.TimeoutError:
                 # No tasks available, continue
                 continue
@@ -180,9 +691,9 @@ class TaskQueueManager:
 
     async def _execute_task(self, task: Task) -> Any:
         """Execute a specific task"""
-        handler = self.task_handlers.get(task.task_type)
+        spec = self.handler_specs.get(task.task_type)
 
-        if handler is None:
+        if spec is None:
             # Default handler
             await asyncio.sleep(0.1)  # Simulate processing
             return {
@@ -190,11 +701,204 @@ class TaskQueueManager:
                 "message": f"Task {task.task_type} processed",
             }
 
-        # Execute custom handler
-        if asyncio.iscoroutinefunction(handler):
-            return await handler(task.data)
-        else:
-            return handler(task.data)
+        metrics = self._type_metrics.setdefault(task.task_type, TaskTypeMetrics())
+        wait = max(0.0, time.time() - task.enqueued_at)
+        metrics.count += 1
+        metrics.wait_total += wait
+        metrics.wait_max = max(metrics.wait_max, wait)
+        metrics.running += 1
+        self._in_flight[spec.execution] += 1
+        self._peak_in_flight[spec.execution] = max(
+            self._peak_in_flight[spec.execution], self._in_flight[spec.execution]
+        )
+        started = time.perf_counter()
+        awaitable, pool_future = self._dispatch(spec, task.data)
+        abandoned = False
+
+        try:
+            return await asyncio.wait_for(awaitable, timeout=spec.timeout)
+        except asyncio.TimeoutError:
+            metrics.timeouts += 1
+            if pool_future is not None and not pool_future.done():
+                # A running pool worker cannot be cancelled; keep counting it
+                # against the pool and the type limit until it really finishes
+                abandoned = True
+                self._abandoned[spec.execution] += 1
+                loop = asyncio.get_running_loop()
+                pool_future.add_done_callback(
+                    lambda _: self._call_in_loop(loop, self._release_abandoned, spec, metrics)
+                )
+            raise TimeoutError(f"Task timed out after {spec.timeout}s") from None
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.exec_total += elapsed
+            metrics.exec_max = max(metrics.exec_max, elapsed)
+            if not abandoned:
+                self._release_slot(spec, metrics)
+                await self._wake_deferred(spec)
+
+    def _release_slot(self, spec: HandlerSpec, metrics: TaskTypeMetrics) -> None:
+        metrics.running -= 1
+        self._in_flight[spec.execution] -= 1
+
+    def _release_abandoned(self, spec: HandlerSpec, metrics: TaskTypeMetrics) -> None:
+        """Free the slot of a timed-out pool task once its worker finishes"""
+        self._abandoned[spec.execution] -= 1
+        self._release_slot(spec, metrics)
+        asyncio.ensure_future(self._wake_deferred(spec))
+
+    @staticmethod
+    def _call_in_loop(loop: asyncio.AbstractEventLoop, callback: Callable, *args: Any) -> None:
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The loop has closed; nothing is left to wake
+            pass
+
+    async def _wake_deferred(self, spec: HandlerSpec) -> None:
+        if spec.concurrency is not None and self._not_empty is not None:
+            # Tasks deferred at the cap can run now
+            async with self._not_empty:
+                self._not_empty.notify()
+
+    def _dispatch(self, spec: HandlerSpec, data: dict[str, Any]) -> tuple[Any, Optional[Future]]:
+        """Start ``spec.handler`` in its execution class
+
+        Returns an awaitable and, for pool handlers, the executor future,
+        which keeps running in its worker after the awaitable is cancelled.
+        """
+        if spec.execution == ExecutionClass.ASYNC:
+            return spec.handler(data), None
+
+        pool_future = None
+        if spec.execution == ExecutionClass.PROCESS:
+            pool = self._get_process_pool()
+            if pool is not None:
+                pool_future = pool.submit(spec.handler, data)
+
+        if pool_future is None:
+            pool_future = self._get_thread_pool().submit(functools.partial(spec.handler, data))
+        return asyncio.wrap_future(pool_future), pool_future
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.pool_sizes[ExecutionClass.THREAD], thread_name_prefix="task-queue"
+            )
+        return self._thread_pool
+
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self._process_pool is None:
+            try:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.pool_sizes[ExecutionClass.PROCESS]
+                )
+            except (OSError, NotImplementedError) as e:
+                self.logger.warning(f"Process pool unavailable, using threads: {e}")
+                return None
+        return self._process_pool
+
+    def get_execution_metrics(self) -> dict[str, Any]:
+        """Pool saturation per execution class and timings per task type"""
+        pools = {}
+        for execution in ExecutionClass:
+            size = self.pool_sizes.get(execution)
+            in_flight = self._in_flight[execution]
+            pools[execution.value] = {
+                "size": size,
+                "in_flight": in_flight,
+                "peak_in_flight": self._peak_in_flight[execution],
+                "abandoned": self._abandoned[execution],
+                "saturation": in_flight / size if size else None,
+            }
+        return {
+            "pools": pools,
+            "task_types": {
+                task_type: metrics.to_dict() for task_type, metrics in self._type_metrics.items()
+            },
+        }
+
+    def _finish(self, task: Task) -> None:
+        """Record a terminal task, evicting the oldest history past the bound"""
+        self._persist(task)
+        self._history[task.task_id] = task
+        while len(self._history) > self.history_size:
+            # Evicted tasks remain queryable from the task_queue table
+            self._history.popitem(last=False)
+
+        # Drop cancelled heap entries once they make up most of the heap
+        if self._heap_entries > 2 * len(self._pending) + 64:
+            for task_type, heap in list(self._heaps.items()):
+                heap[:] = [entry for entry in heap if entry[2] in self._pending]
+                if heap:
+                    heapq.heapify(heap)
+                else:
+                    del self._heaps[task_type]
+            self._heap_entries = sum(len(heap) for heap in self._heaps.values())
+
+    def _persist(self, task: Task) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.save(task)
+        except Exception as e:
+            self.logger.error(f"Failed to persist task {task.task_id}: {e}")
+
+    def _claim(self, task: Task) -> bool:
+        if self.store is None:
+            return True
+        try:
+            return self.store.claim(task.task_id)
+        except Exception as e:
+            self.logger.error(f"Failed to claim task {task.task_id}: {e}")
+            return True
+
+    async def _keep_leases(self) -> None:
+        """Renew our leases and pick up tasks whose owner stopped renewing"""
+        interval = max(self.lease_ttl / 3, 0.01)
+        while True:
+            try:
+                self.store.renew()
+                if self._recover() and self._not_empty is not None:
+                    async with self._not_empty:
+                        self._not_empty.notify_all()
+            except Exception as e:
+                self.logger.error(f"Failed to renew task leases: {e}")
+            await asyncio.sleep(interval)
+
+    def _recover(self) -> int:
+        """Requeue tasks whose previous owner's lease has expired"""
+        try:
+            tasks = self.store.reclaim_expired()
+        except Exception as e:
+            self.logger.error(f"Failed to recover tasks: {e}")
+            return 0
+
+        recovered = 0
+        for task in tasks:
+            if task.task_id in self._pending or task.task_id in self.active_tasks:
+                continue
+            if task.status == TaskStatus.RUNNING:
+                # An interrupted run counts as an attempt so a task that
+                # crashes the process cannot loop forever
+                task.retry_count += 1
+                task.started_at = None
+                if task.retry_count >= task.max_retries:
+                    task.status = TaskStatus.FAILED
+                    task.error = task.error or "Interrupted by shutdown"
+                    task.completed_at = datetime.now()
+                    self.failed_count += 1
+                    self._finish(task)
+                    continue
+                task.status = TaskStatus.PENDING
+                self._persist(task)
+            self._push(task)
+            recovered += 1
+
+        if recovered:
+            self.recovered_count += recovered
+            self.logger.info(f"Recovered {recovered} unfinished tasks")
+        return recovered
 
     def _task_to_dict(self, task: Task) -> dict[str, Any]:
         """Convert task to dictionary"""
@@ -203,6 +907,7 @@ class TaskQueueManager:
             "task_type": task.task_type,
             "status": task.status.value,
             "priority": task.priority,
+            "agent_id": task.agent_id,
             "created_at": task.created_at.isoformat(),
             "started_at": task.started_at.isoformat() if task.started_at else None,
             "completed_at": (task.completed_at.isoformat() if task.completed_at else None),
@@ -218,10 +923,15 @@ class TaskQueueManager:
             "is_running": self.is_running,
             "max_workers": self.max_workers,
             "active_workers": len(self.workers),
-            "queue_size": self.task_queue.qsize(),
+            "queue_size": len(self._pending),
             "active_tasks": len(self.active_tasks),
-            "completed_tasks": len(self.completed_tasks),
-            "failed_tasks": len(self.failed_tasks),
+            "completed_tasks": self.completed_count,
+            "failed_tasks": self.failed_count,
+            "cancelled_tasks": self.cancelled_count,
+            "recovered_tasks": self.recovered_count,
+            "history_size": len(self._history),
+            "persistent": self.store is not None,
             "registered_handlers": list(self.task_handlers.keys()),
+            "execution": self.get_execution_metrics(),
             "timestamp": datetime.now().isoformat(),
         }
@@ -0,0 +1,178 @@
+"""LRU Cache
+
+This module provides a thread-safe LRU cache with lazy TTL expiry and
+optional byte-size capacity limits. Entries live in an ordered map so that
+lookups, inserts and evictions are all O(1).
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+def estimate_size(value: Any, _seen: Optional[set[int]] = None) -> int:
+    """Approximate the memory footprint of ``value`` in bytes, following containers"""
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key, seen) + estimate_size(item, seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, seen)
+    elif hasattr(value, "__dict__"):
+        size += estimate_size(vars(value), seen)
+    elif hasattr(value, "__slots__"):
+        for name in getattr(type(value), "__slots__", ()):
+            size += estimate_size(getattr(value, name, None), seen)
+    return size
+
+
+class LRUCache:
+    """Least-recently-used cache with lazy TTL expiry.
+
+    Capacity can be bounded by entry count, by approximate byte size, or
+    both. Expired entries are dropped when they are next read or when they
+    reach the cold end of the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 1000,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (estimate_size if max_bytes is not None else None)
+        # key -> (value, expires_at, size)
+        self._entries: "OrderedDict[Hashable, tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, record=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None, record: bool = True) -> Any:
+        """Get a cached value, marking it as most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if record:
+                    self.misses += 1
+                return default
+
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._discard(key)
+                self.expirations += 1
+                if record:
+                    self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            if record:
+                self.hits += 1
+            return value
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value even if its TTL has lapsed, without touching recency or stats
+
+        Expired entries stay put until they are read with ``get`` or evicted, so
+        callers can revalidate a stale value instead of refetching it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return default if entry is None else entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used entries if over capacity"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = self._sizeof(value) if self._sizeof else 0
+
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            self._enforce_limits()
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key, returning whether it was present"""
+        with self._lock:
+            return self._discard(key)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry now rather than lazily; returns the count"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (_, exp, _) in self._entries.items() if exp is not None and exp <= now]
+            for key in expired:
+                self._discard(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def _discard(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[2]
+        return True
+
+    def _enforce_limits(self) -> None:
+        now = time.monotonic()
+        while self._entries and self._over_capacity():
+            key, (_, expires_at, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            if expires_at is not None and expires_at <= now:
+                self.expirations += 1
+            else:
+                self.evictions += 1
+
+    def _over_capacity(self) -> bool:
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            return True
+        # Always keep the newest entry, even if it alone exceeds the byte budget
+        return self.max_bytes is not None and self._bytes > self.max_bytes and len(self._entries) > 1
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
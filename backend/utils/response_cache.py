@@ -0,0 +1,216 @@
+"""Response Cache
+
+This module caches LLM and AI-gateway responses keyed on the normalised
+prompt plus the model parameters that shape the output. An in-memory LRU
+fronts an optional SQLite store, both with a TTL, and concurrent requests
+for the same key share a single provider call (single-flight), whether
+they come from threads or asyncio tasks.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Union
+
+from backend.utils.lru_cache import LRUCache
+from backend.utils.sqlite_cache import SQLiteCache
+
+# Logger setup
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonical form of a prompt: NFKC, whitespace collapsed, ends trimmed"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", prompt)).strip()
+
+
+def make_cache_key(prompt: str, **params: Any) -> str:
+    """Digest of the normalised prompt and the parameters that affect the response"""
+    payload = json.dumps(
+        {"prompt": normalize_prompt(prompt), "params": params}, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_cacheable(value: Any) -> bool:
+    return value is not None
+
+
+class ResponseCache:
+    """Two-tier TTL response cache with single-flight request coalescing"""
+
+    def __init__(
+        self,
+        db_path: Optional[Union[str, Path]] = None,
+        ttl: Optional[float] = 3600.0,
+        max_entries: int = 10000,
+        table: str = "llm_responses",
+    ):
+        self.ttl = ttl
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.store: Optional[SQLiteCache] = None
+        if db_path:
+            try:
+                self.store = SQLiteCache(
+                    db_path, table=table, max_entries=max_entries * 10, ttl=ttl
+                )
+            except Exception as e:
+                logger.error(f"Could not open response cache at {db_path}: {e}")
+
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(
+        cls, prefix: str, table: str, default_ttl: float = 3600.0
+    ) -> Optional["ResponseCache"]:
+        """Build a cache from ``<prefix>_CACHE``, ``_CACHE_DB`` and ``_CACHE_TTL``
+
+        Returns None when ``<prefix>_CACHE`` is set to 0.
+        """
+        if os.getenv(f"{prefix}_CACHE", "1") != "1":
+            return None
+        return cls(
+            db_path=os.getenv(f"{prefix}_CACHE_DB"),
+            ttl=float(os.getenv(f"{prefix}_CACHE_TTL", str(default_ttl))),
+            table=table,
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached response from memory, then disk"""
+        value = self.memory.get(key)
+        if value is None and self.store is not None:
+            try:
+                value = self.store.get(key)
+            except Exception as e:
+                logger.error(f"Error reading response cache: {e}")
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serialisable response in both tiers"""
+        self.memory.set(key, value)
+        if self.store is not None:
+            try:
+                self.store.set(key, value)
+            except Exception as e:
+                logger.error(f"Error persisting response: {e}")
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        should_cache: Callable[[Any], bool] = _is_cacheable,
+    ) -> Any:
+        """Return the cached response or compute it, sharing one call per key
+
+        Threads asking for a key that is already being computed wait for
+        that result, or its exception, instead of calling the provider again.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+
+        if not leader:
+            self.coalesced += 1
+            return flight.result()
+
+        self.misses += 1
+        try:
+            value = compute()
+            if should_cache(value):
+                self.set(key, value)
+            flight.set_result(value)
+            return value
+        except BaseException as e:
+            self.errors += 1
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def aget_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] = _is_cacheable,
+    ) -> Any:
+        """Async get_or_compute; tasks for the same key await one shared call
+
+        The shared call is shielded, so a cancelled waiter does not cancel it
+        for the others and its result is still cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._tasks.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+
+        async def run() -> Any:
+            try:
+                result = await compute()
+            except BaseException:
+                self.errors += 1
+                raise
+            if should_cache(result):
+                self.set(key, result)
+            return result
+
+        def forget(done: asyncio.Task) -> None:
+            if self._tasks.get(key) is done:
+                del self._tasks[key]
+
+        task = asyncio.ensure_future(run())
+        self._tasks[key] = task
+        task.add_done_callback(forget)
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Get hit-rate and tier statistics"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "in_flight": len(self._inflight) + len(self._tasks),
+            "ttl": self.ttl,
+            "memory": self.memory.stats(),
+            "persistent": self.store.stats() if self.store else None,
+        }
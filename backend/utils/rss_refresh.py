@@ -0,0 +1,261 @@
+"""RSS Refresh Engine
+
+This module provides the asynchronous fetch layer used by the RSS manager:
+a pooled HTTP fetcher with global and per-host concurrency limits that sends
+ETag/Last-Modified conditional requests, and a deadline scheduler that
+tracks when each feed is next due for a refresh.
+"""
+
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+# Optional imports with fallbacks
+try:
+    import aiohttp
+
+    aiohttp_available = True
+except ImportError:
+    aiohttp = None
+    aiohttp_available = False
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    requests_available = True
+except ImportError:
+    requests = None
+    HTTPAdapter = None
+    requests_available = False
+
+# Logger setup
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "TRAE.AI RSS Reader/1.0"
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a single (possibly conditional) feed fetch"""
+
+    url: str
+    status: int
+    content: Optional[bytes] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and (self.not_modified or 200 <= self.status < 300)
+
+
+class AsyncFeedFetcher:
+    """Pooled asynchronous feed fetcher with per-host concurrency limits.
+
+    Uses aiohttp when available; otherwise requests are issued through a
+    pooled ``requests.Session`` on the default executor so the event loop is
+    never blocked.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        per_host_limit: int = 4,
+        timeout: int = 30,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ):
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._global_limit: Optional[asyncio.Semaphore] = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._session: Any = None
+        self._sync_session: Any = None
+
+    async def __aenter__(self) -> "AsyncFeedFetcher":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Create the underlying connection pool"""
+        self._global_limit = asyncio.Semaphore(self.max_connections)
+        self._host_limits = {}
+
+        if aiohttp_available and aiohttp:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections, limit_per_host=self.per_host_limit
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": self.user_agent},
+            )
+        elif requests_available and requests:
+            self._sync_session = requests.Session()
+            self._sync_session.headers.update({"User-Agent": self.user_agent})
+            adapter = HTTPAdapter(pool_connections=self.max_connections, pool_maxsize=self.per_host_limit)
+            self._sync_session.mount("http://", adapter)
+            self._sync_session.mount("https://", adapter)
+        else:
+            logger.error("No HTTP library available for RSS fetching")
+
+    async def close(self) -> None:
+        """Release pooled connections"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_limits[host] = semaphore
+        return semaphore
+
+    async def fetch(
+        self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> FetchResult:
+        """Fetch a feed, sending conditional headers when validators are known"""
+        if self._global_limit is None:
+            await self.open()
+
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        async with self._global_limit, self._host_limit(url):
+            started = time.monotonic()
+            try:
+                if self._session is not None:
+                    result = await self._fetch_aiohttp(url, headers)
+                elif self._sync_session is not None:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(None, self._fetch_blocking, url, headers)
+                else:
+                    result = FetchResult(url=url, status=0, error="No HTTP library available")
+            except asyncio.TimeoutError:
+                result = FetchResult(url=url, status=0, error="Request timed out", timed_out=True)
+            except Exception as e:
+                timed_out = requests_available and isinstance(e, requests.Timeout)
+                result = FetchResult(url=url, status=0, error=str(e), timed_out=timed_out)
+            result.elapsed = time.monotonic() - started
+
+        if result.not_modified:
+            # Servers may omit validators on 304; keep the ones we sent
+            result.etag = result.etag or etag
+            result.last_modified = result.last_modified or last_modified
+        return result
+
+    async def _fetch_aiohttp(self, url: str, headers: dict[str, str]) -> FetchResult:
+        async with self._session.get(url, headers=headers) as response:
+            if response.status == 304:
+                return FetchResult(
+                    url=url,
+                    status=304,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+            response.raise_for_status()
+            content = await response.read()
+            return FetchResult(
+                url=url,
+                status=response.status,
+                content=content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+
+    def _fetch_blocking(self, url: str, headers: dict[str, str]) -> FetchResult:
+        response = self._sync_session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return FetchResult(
+                url=url,
+                status=304,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        response.raise_for_status()
+        return FetchResult(
+            url=url,
+            status=response.status_code,
+            content=response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+
+class FeedRefreshScheduler:
+    """Deadline scheduler for feed refreshes.
+
+    Deadlines live in a min-heap; rescheduling a feed leaves its old heap
+    entry behind, which is skipped lazily when it surfaces.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, str]] = []
+        self._deadlines: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._deadlines
+
+    def schedule(self, url: str, interval: float, delay: Optional[float] = None) -> float:
+        """Schedule ``url`` to be due after ``delay`` (defaults to ``interval``) seconds"""
+        deadline = time.monotonic() + (interval if delay is None else delay)
+        with self._lock:
+            self._deadlines[url] = deadline
+            heapq.heappush(self._heap, (deadline, url))
+        return deadline
+
+    def unschedule(self, url: str) -> None:
+        """Stop tracking ``url``"""
+        with self._lock:
+            self._deadlines.pop(url, None)
+
+    def pop_due(self, now: Optional[float] = None) -> list[str]:
+        """Remove and return every feed whose deadline has passed"""
+        now = time.monotonic() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, url = heapq.heappop(self._heap)
+                if self._deadlines.get(url) == deadline:
+                    del self._deadlines[url]
+                    due.append(url)
+        return due
+
+    def seconds_until_next(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the earliest deadline, or None when nothing is scheduled"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - now)
@@ -0,0 +1,349 @@
+"""RSS Search Index
+
+This module provides an incremental in-memory inverted index over RSS feed
+items. Feeds are re-indexed item by item as new data arrives, queries are
+ranked with BM25, and a sorted publication timeline answers time-window
+queries without rescanning every cached item.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# Logger setup
+logger = logging.getLogger(__name__)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+INDEX_FORMAT_VERSION = 1
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Split text into lowercase word tokens, ignoring HTML markup"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(_TAG_RE.sub(" ", text).lower())
+
+
+def _published_timestamp(value: Any) -> Optional[float]:
+    """Convert an item's published field to a POSIX timestamp"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        try:
+            return value.timestamp()
+        except (OverflowError, OSError, ValueError):
+            return None
+    return None
+
+
+def _item_dict(item: Any) -> dict[str, Any]:
+    """Plain-dict copy of an item, using ``to_dict`` for compact FeedRecords"""
+    to_dict = getattr(item, "to_dict", None)
+    return to_dict() if callable(to_dict) else dict(item)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _json_object_hook(value: dict[str, Any]) -> Any:
+    if "__datetime__" in value and len(value) == 1:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+class _Document:
+    """Indexed item with its term frequencies"""
+
+    __slots__ = ("feed_url", "item", "signature", "terms", "length", "timestamp")
+
+    def __init__(self, feed_url: str, item: dict[str, Any], signature: str):
+        self.feed_url = feed_url
+        self.item = item
+        self.signature = signature
+        # Titles are weighted double so headline matches rank first
+        tokens = tokenize(item.get("title")) * 2
+        tokens += tokenize(item.get("description"))
+        tokens += tokenize(item.get("content"))
+        self.terms = Counter(tokens)
+        self.length = len(tokens)
+        self.timestamp = _published_timestamp(item.get("published"))
+
+
+class RSSSearchIndex:
+    """Incremental inverted index over RSS feed items"""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, k1: float = 1.5, b: float = 0.75):
+        self.path = Path(path) if path else None
+        self.k1 = k1
+        self.b = b
+        self._docs: dict[str, _Document] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._feed_docs: dict[str, set[str]] = {}
+        self._timeline: list[tuple[float, str]] = []
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def _doc_id(feed_url: str, item: dict[str, Any]) -> str:
+        key = item.get("guid") or item.get("link") or item.get("title") or ""
+        return f"{feed_url}\x1f{key}"
+
+    @staticmethod
+    def _signature(item: dict[str, Any]) -> str:
+        parts = (
+            item.get("title") or "",
+            item.get("description") or "",
+            item.get("content") or "",
+            str(item.get("published") or ""),
+        )
+        return hashlib.md5("\x1f".join(parts).encode("utf-8", "replace")).hexdigest()
+
+    def update_feed(self, feed_url: str, items: list[dict[str, Any]]) -> int:
+        """Bring a feed's indexed items in line with ``items``.
+
+        Only added or changed items are (re)tokenised. Returns the number of
+        documents that were added or replaced.
+        """
+        incoming: dict[str, tuple[str, dict[str, Any]]] = {}
+        for item in items:
+            incoming[self._doc_id(feed_url, item)] = (self._signature(item), item)
+
+        changed = 0
+        with self._lock:
+            current = self._feed_docs.setdefault(feed_url, set())
+
+            for doc_id in current - incoming.keys():
+                self._remove_doc(doc_id)
+
+            for doc_id, (signature, item) in incoming.items():
+                existing = self._docs.get(doc_id)
+                if existing is not None:
+                    if existing.signature == signature:
+                        existing.item = item
+                        continue
+                    self._remove_doc(doc_id)
+                self._add_doc(doc_id, _Document(feed_url, item, signature))
+                changed += 1
+
+        return changed
+
+    def remove_feed(self, feed_url: str) -> None:
+        """Drop every indexed item belonging to ``feed_url``"""
+        with self._lock:
+            for doc_id in list(self._feed_docs.get(feed_url, ())):
+                self._remove_doc(doc_id)
+            self._feed_docs.pop(feed_url, None)
+
+    def clear(self) -> None:
+        """Remove all documents"""
+        with self._lock:
+            self._docs.clear()
+            self._postings.clear()
+            self._feed_docs.clear()
+            self._timeline.clear()
+            self._total_length = 0
+
+    def _add_doc(self, doc_id: str, doc: _Document) -> None:
+        self._docs[doc_id] = doc
+        self._feed_docs.setdefault(doc.feed_url, set()).add(doc_id)
+        self._total_length += doc.length
+        for term, freq in doc.terms.items():
+            self._postings.setdefault(term, {})[doc_id] = freq
+        if doc.timestamp is not None:
+            insort(self._timeline, (doc.timestamp, doc_id))
+
+    def _remove_doc(self, doc_id: str) -> None:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+
+        self._feed_docs.get(doc.feed_url, set()).discard(doc_id)
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        if doc.timestamp is not None:
+            position = bisect_left(self._timeline, (doc.timestamp, doc_id))
+            if position < len(self._timeline) and self._timeline[position][1] == doc_id:
+                del self._timeline[position]
+
+    def search(
+        self,
+        query: str,
+        feeds: Optional[list[str]] = None,
+        limit: Optional[int] = None,
+        since: Optional[datetime] = None,
+        match_all: bool = True,
+    ) -> list[dict[str, Any]]:
+        """Return items matching ``query``, best BM25 score first"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        feed_filter = set(feeds) if feeds is not None else None
+        since_ts = _published_timestamp(since) if since else None
+
+        with self._lock:
+            postings = [self._postings.get(term, {}) for term in terms]
+            if match_all:
+                if not all(postings):
+                    return []
+                smallest = min(postings, key=len)
+                candidates = [d for d in smallest if all(d in p for p in postings)]
+            else:
+                candidates = set().union(*postings)
+
+            total_docs = len(self._docs)
+            avg_length = (self._total_length / total_docs) if total_docs else 0.0
+            idf = [
+                math.log(1 + (total_docs - len(p) + 0.5) / (len(p) + 0.5)) for p in postings
+            ]
+
+            scored = []
+            for doc_id in candidates:
+                doc = self._docs[doc_id]
+                if feed_filter is not None and doc.feed_url not in feed_filter:
+                    continue
+                if since_ts is not None and (doc.timestamp is None or doc.timestamp < since_ts):
+                    continue
+
+                norm = self.k1 * (1 - self.b + self.b * doc.length / avg_length) if avg_length else self.k1
+                score = 0.0
+                for weight, term_postings in zip(idf, postings):
+                    freq = term_postings.get(doc_id)
+                    if freq:
+                        score += weight * freq * (self.k1 + 1) / (freq + norm)
+                scored.append((score, doc_id))
+
+            scored.sort(key=lambda pair: pair[0], reverse=True)
+            if limit is not None:
+                scored = scored[:limit]
+
+            return [self._result(doc_id) for _, doc_id in scored]
+
+    def recent(
+        self,
+        since: datetime,
+        feeds: Optional[list[str]] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """Return items published after ``since``, newest first"""
+        since_ts = _published_timestamp(since)
+        if since_ts is None:
+            return []
+
+        feed_filter = set(feeds) if feeds is not None else None
+        results = []
+
+        with self._lock:
+            start = bisect_left(self._timeline, (since_ts, ""))
+            for position in range(len(self._timeline) - 1, start - 1, -1):
+                timestamp, doc_id = self._timeline[position]
+                if timestamp <= since_ts:
+                    break
+                if feed_filter is not None and self._docs[doc_id].feed_url not in feed_filter:
+                    continue
+                results.append(self._result(doc_id))
+                if limit is not None and len(results) >= limit:
+                    break
+
+        return results
+
+    def _result(self, doc_id: str) -> dict[str, Any]:
+        doc = self._docs[doc_id]
+        result = _item_dict(doc.item)
+        result["feed_url"] = doc.feed_url
+        return result
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get index statistics"""
+        with self._lock:
+            return {
+                "documents": len(self._docs),
+                "terms": len(self._postings),
+                "feeds": sum(1 for docs in self._feed_docs.values() if docs),
+            }
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> bool:
+        """Persist indexed items to disk; postings are rebuilt on load"""
+        target = Path(path) if path else self.path
+        if target is None:
+            return False
+
+        try:
+            with self._lock:
+                payload = {
+                    "version": INDEX_FORMAT_VERSION,
+                    "saved_at": datetime.now().isoformat(),
+                    "documents": [
+                        {
+                            "feed_url": doc.feed_url,
+                            "signature": doc.signature,
+                            "item": _item_dict(doc.item),
+                        }
+                        for doc in self._docs.values()
+                    ],
+                }
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = target.with_suffix(target.suffix + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, default=_json_default)
+            os.replace(temp_path, target)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving RSS search index to {target}: {e}")
+            return False
+
+    def load(self, path: Optional[Union[str, Path]] = None) -> bool:
+        """Load a previously saved index, replacing the current contents"""
+        source = Path(path) if path else self.path
+        if source is None or not source.exists():
+            return False
+
+        try:
+            with open(source, encoding="utf-8") as f:
+                payload = json.load(f, object_hook=_json_object_hook)
+
+            if payload.get("version") != INDEX_FORMAT_VERSION:
+                logger.warning(f"Ignoring RSS search index with unknown version: {source}")
+                return False
+
+            with self._lock:
+                self.clear()
+                for entry in payload.get("documents", []):
+                    item = entry["item"]
+                    doc_id = self._doc_id(entry["feed_url"], item)
+                    self._add_doc(doc_id, _Document(entry["feed_url"], item, entry["signature"]))
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading RSS search index from {source}: {e}")
+            return False
@@ -7,12 +7,17 @@ feed parsing, caching, and content extraction across the application.
 import asyncio
 import hashlib
 import logging
+import sys
 import threading
-import time
+from collections.abc import Iterator, Mapping
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+from backend.utils.lru_cache import LRUCache
+from backend.utils.rss_refresh import AsyncFeedFetcher, FeedRefreshScheduler, FetchResult
+from backend.utils.rss_search import RSSSearchIndex
 
 # Optional imports with fallbacks
 try:
@@ -86,6 +91,74 @@ class FeedItem:
             self.enclosures = []
 
 
+class FeedRecord(Mapping):
+    """Compact feed item record.
+
+    Holds the same fields as FeedItem in ``__slots__`` and implements the
+    read-only mapping protocol, so it can stand in wherever the ``asdict``
+    form of a FeedItem is read.
+    """
+
+    __slots__ = (
+        "title",
+        "link",
+        "description",
+        "published",
+        "author",
+        "categories",
+        "content",
+        "content_type",
+        "guid",
+        "enclosures",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        link: str,
+        description: str,
+        published: Optional[datetime] = None,
+        author: Optional[str] = None,
+        categories: tuple[str, ...] = (),
+        content: Optional[str] = None,
+        content_type: ContentType = ContentType.UNKNOWN,
+        guid: Optional[str] = None,
+        enclosures: tuple[dict[str, Any], ...] = (),
+    ):
+        self.title = title
+        self.link = link
+        self.description = description
+        self.published = published
+        # Authors and category terms repeat across items; share one copy
+        self.author = sys.intern(author) if author else author
+        self.categories = tuple(sys.intern(c) for c in categories)
+        self.content = content
+        self.content_type = content_type
+        self.guid = guid
+        self.enclosures = tuple(enclosures)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"FeedRecord(guid={self.guid!r}, title={self.title!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the same dict shape as ``asdict(FeedItem)``"""
+        data = {field: getattr(self, field) for field in self.__slots__}
+        data["categories"] = list(self.categories)
+        data["enclosures"] = [dict(enclosure) for enclosure in self.enclosures]
+        return data
+
+
 @dataclass
 class FeedInfo:
     """RSS feed information data structure"""
@@ -101,59 +174,20 @@ class FeedInfo:
     item_count: int = 0
     last_fetch: Optional[datetime] = None
     fetch_interval: int = 3600  # seconds
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
 
 
-class RSSCache:
+class RSSCache(LRUCache):
     """RSS feed caching system"""
 
-    def __init__(self, max_size: int = 1000, ttl: int = 3600):
+    def __init__(self, max_size: int = 1000, ttl: int = 3600, max_bytes: Optional[int] = None):
+        super().__init__(max_entries=max_size, ttl=ttl, max_bytes=max_bytes)
         self.max_size = max_size
-        self.ttl = ttl
-        self._cache: dict[str, dict[str, Any]] = {}
-        self._access_times: dict[str, float] = {}
-        self._lock = threading.RLock()
-
-    def get(self, key: str) -> Optional[Any]:
-        """Get cached item"""
-        with self._lock:
-            if key not in self._cache:
-                return None
-
-            cache_entry = self._cache[key]
-            if time.time() - cache_entry["timestamp"] > self.ttl:
-                self._remove(key)
-                return None
-
-            self._access_times[key] = time.time()
-            return cache_entry["data"]
-
-    def set(self, key: str, value: Any) -> None:
-        """Set cached item"""
-        with self._lock:
-            if len(self._cache) >= self.max_size:
-                self._evict_lru()
-
-            self._cache[key] = {"data": value, "timestamp": time.time()}
-            self._access_times[key] = time.time()
 
     def _remove(self, key: str) -> None:
         """Remove item from cache"""
-        self._cache.pop(key, None)
-        self._access_times.pop(key, None)
-
-    def _evict_lru(self) -> None:
-        """Evict least recently used item"""
-        if not self._access_times:
-            return
-
-        lru_key = min(self._access_times.keys(), key=lambda k: self._access_times[k])
-        self._remove(lru_key)
-
-    def clear(self) -> None:
-        """Clear all cached items"""
-        with self._lock:
-            self._cache.clear()
-            self._access_times.clear()
+        self.delete(key)
 
 
 class RSSParser:
@@ -165,12 +199,22 @@ class RSSParser:
             self.session = requests.Session()
             self.session.headers.update({"User-Agent": "TRAE.AI RSS Reader/1.0"})
 
-    def parse_feed(self, url: str, timeout: int = 30) -> Optional[dict[str, Any]]:
-        """Parse RSS feed from URL"""
+    def parse_feed(
+        self,
+        url: str,
+        timeout: int = 30,
+        compact: bool = False,
+        known: Optional[dict[str, FeedRecord]] = None,
+    ) -> Optional[dict[str, Any]]:
+        """Parse RSS feed from URL
+
+        With ``compact`` the items are FeedRecord objects instead of dicts, and
+        entries whose guid is in ``known`` reuse the existing record.
+        """
         try:
             if not feedparser_available or not feedparser:
                 logger.warning("feedparser not available, using fallback parser")
-                return self._fallback_parse(url, timeout)
+                return self._fallback_parse(url, timeout, compact, known)
 
             # Fetch feed content
             if self.session and requests_available and requests:
@@ -180,17 +224,41 @@ class RSSParser:
             else:
                 # Fallback to feedparser's built-in fetching
                 parsed = feedparser.parse(url)
-                return self._process_feedparser_result(parsed)
+                return self._process_feedparser_result(parsed, compact, known)
 
-            # Parse with feedparser
-            parsed = feedparser.parse(content)
-            return self._process_feedparser_result(parsed)
+            return self.parse_content(content, compact, known)
 
         except Exception as e:
             logger.error(f"Error parsing RSS feed {url}: {e}")
             return None
 
-    def _process_feedparser_result(self, parsed) -> Optional[dict[str, Any]]:
+    def parse_content(
+        self,
+        content: bytes,
+        compact: bool = False,
+        known: Optional[dict[str, FeedRecord]] = None,
+    ) -> Optional[dict[str, Any]]:
+        """Parse an already-downloaded feed body"""
+        try:
+            if feedparser_available and feedparser:
+                return self._process_feedparser_result(feedparser.parse(content), compact, known)
+
+            if bs4_available and BeautifulSoup:
+                return self._parse_with_bs4(BeautifulSoup(content, "xml"), compact, known)
+
+            logger.error("No XML parsing library available")
+            return None
+
+        except Exception as e:
+            logger.error(f"Error parsing RSS content: {e}")
+            return None
+
+    def _process_feedparser_result(
+        self,
+        parsed,
+        compact: bool = False,
+        known: Optional[dict[str, FeedRecord]] = None,
+    ) -> Optional[dict[str, Any]]:
         """Process feedparser result into standardized format"""
         if not parsed or parsed.bozo:
             return None
@@ -204,6 +272,10 @@ class RSSParser:
             "items": [],
         }
 
+        if compact:
+            feed_info["items"] = list(self.iter_items(parsed, known))
+            return feed_info
+
         for entry in parsed.entries:
             item = FeedItem(
                 title=entry.get("title", "Untitled"),
@@ -221,7 +293,48 @@ class RSSParser:
 
         return feed_info
 
-    def _fallback_parse(self, url: str, timeout: int) -> Optional[dict[str, Any]]:
+    def iter_items(
+        self, parsed, known: Optional[dict[str, FeedRecord]] = None
+    ) -> Iterator[FeedRecord]:
+        """Yield a FeedRecord per feedparser entry, deduplicated by guid.
+
+        Entries already present in ``known`` yield the existing record rather
+        than being materialised again.
+        """
+        known = known or {}
+        seen: set[str] = set()
+
+        for entry in parsed.entries:
+            guid = entry.get("id", entry.get("link"))
+            if guid:
+                if guid in seen:
+                    continue
+                seen.add(guid)
+                if guid in known:
+                    yield known[guid]
+                    continue
+
+            record = FeedRecord(
+                title=entry.get("title", "Untitled"),
+                link=entry.get("link", ""),
+                description=entry.get("description", ""),
+                published=self._parse_datetime(entry.get("published")),
+                author=entry.get("author"),
+                categories=tuple(tag.get("term", "") for tag in entry.get("tags", [])),
+                content=self._extract_content(entry),
+                guid=guid,
+                enclosures=tuple(self._extract_enclosures(entry)),
+            )
+            record.content_type = self._detect_content_type(record)
+            yield record
+
+    def _fallback_parse(
+        self,
+        url: str,
+        timeout: int,
+        compact: bool = False,
+        known: Optional[dict[str, FeedRecord]] = None,
+    ) -> Optional[dict[str, Any]]:
         """Fallback RSS parser using basic HTTP and XML parsing"""
         try:
             if not requests_available or not requests or not self.session:
@@ -234,7 +347,7 @@ class RSSParser:
             # Basic XML parsing fallback
             if bs4_available and BeautifulSoup:
                 soup = BeautifulSoup(response.content, "xml")
-                return self._parse_with_bs4(soup)
+                return self._parse_with_bs4(soup, compact, known)
             else:
                 logger.error("No XML parsing library available")
                 return None
@@ -243,7 +356,12 @@ class RSSParser:
             logger.error(f"Fallback parsing failed for {url}: {e}")
             return None
 
-    def _parse_with_bs4(self, soup) -> Optional[dict[str, Any]]:
+    def _parse_with_bs4(
+        self,
+        soup,
+        compact: bool = False,
+        known: Optional[dict[str, FeedRecord]] = None,
+    ) -> Optional[dict[str, Any]]:
         """Parse RSS using BeautifulSoup"""
         channel = soup.find("channel")
         if not channel:
@@ -257,6 +375,10 @@ class RSSParser:
             "items": [],
         }
 
+        if compact:
+            feed_info["items"] = list(self._iter_bs4_items(channel, known))
+            return feed_info
+
         for item in channel.find_all("item"):
             feed_item = FeedItem(
                 title=self._get_text(item.find("title")),
@@ -270,6 +392,32 @@ class RSSParser:
 
         return feed_info
 
+    def _iter_bs4_items(
+        self, channel, known: Optional[dict[str, FeedRecord]] = None
+    ) -> Iterator[FeedRecord]:
+        """Yield a FeedRecord per BeautifulSoup item, deduplicated by guid"""
+        known = known or {}
+        seen: set[str] = set()
+
+        for item in channel.find_all("item"):
+            guid = self._get_text(item.find("guid"))
+            if guid:
+                if guid in seen:
+                    continue
+                seen.add(guid)
+                if guid in known:
+                    yield known[guid]
+                    continue
+
+            yield FeedRecord(
+                title=self._get_text(item.find("title")),
+                link=self._get_text(item.find("link")),
+                description=self._get_text(item.find("description")),
+                published=self._parse_datetime(self._get_text(item.find("pubDate"))),
+                author=self._get_text(item.find("author")),
+                guid=guid,
+            )
+
     def _get_text(self, element) -> str:
         """Safely extract text from XML element"""
         return element.get_text().strip() if element else ""
@@ -328,7 +476,7 @@ class RSSParser:
 
         return enclosures
 
-    def _detect_content_type(self, item: FeedItem) -> ContentType:
+    def _detect_content_type(self, item: "FeedItem | FeedRecord") -> ContentType:
         """Detect content type from feed item"""
         # Check enclosures for media types
         if item.enclosures:
@@ -375,6 +523,16 @@ class RSSManager:
         self.parser = RSSParser()
         self._lock = threading.RLock()
         self._background_tasks: set[asyncio.Task[Any]] = set()
+        self.scheduler = FeedRefreshScheduler()
+        self.search_index = RSSSearchIndex()
+        self.compact_items = True
+        self._seen_guids: dict[str, set[str]] = {}
+        self._item_listeners: list[Callable[[str, list[dict[str, Any]]], None]] = []
+        self.refresh_settings: dict[str, Any] = {
+            "max_connections": 100,
+            "per_host_limit": 4,
+            "timeout": 30,
+        }
 
     def add_feed(self, url: str, fetch_interval: int = 3600) -> bool:
         """Add RSS feed to manager"""
@@ -385,7 +543,7 @@ class RSSManager:
                     return True
 
                 # Parse feed to get initial info
-                feed_data = self.parser.parse_feed(url)
+                feed_data = self.parser.parse_feed(url, compact=self.compact_items)
                 if not feed_data:
                     logger.error(f"Failed to parse feed: {url}")
                     return False
@@ -403,10 +561,10 @@ class RSSManager:
                 )
 
                 self.feeds[url] = feed_info
+                self.scheduler.schedule(url, fetch_interval)
 
-                # Cache the feed data
-                cache_key = self._get_cache_key(url)
-                self.cache.set(cache_key, feed_data)
+                # Cache and index the feed data
+                self._store_feed_data(url, feed_data)
 
                 logger.info(f"Added RSS feed: {url}")
                 return True
@@ -420,8 +578,11 @@ class RSSManager:
         with self._lock:
             if url in self.feeds:
                 del self.feeds[url]
+                self.scheduler.unschedule(url)
                 cache_key = self._get_cache_key(url)
                 self.cache._remove(cache_key)
+                self.search_index.remove_feed(url)
+                self._seen_guids.pop(url, None)
                 logger.info(f"Removed RSS feed: {url}")
                 return True
             return False
@@ -434,12 +595,14 @@ class RSSManager:
             if not force_refresh:
                 cached_data = self.cache.get(cache_key)
                 if cached_data:
-                    return cached_data.get("items", [])
+                    return self._as_dicts(cached_data.get("items", []))
 
             # Fetch fresh data
-            feed_data = self.parser.parse_feed(url)
+            feed_data = self.parser.parse_feed(
+                url, compact=self.compact_items, known=self._known_records(url)
+            )
             if feed_data:
-                self.cache.set(cache_key, feed_data)
+                self._store_feed_data(url, feed_data)
 
                 # Update feed info
                 with self._lock:
@@ -448,7 +611,7 @@ class RSSManager:
                         self.feeds[url].item_count = len(feed_data["items"])
                         self.feeds[url].status = FeedStatus.ACTIVE
 
-                return feed_data.get("items", [])
+                return self._as_dicts(feed_data.get("items", []))
             else:
                 # Update error status
                 with self._lock:
@@ -477,6 +640,13 @@ class RSSManager:
 
     def refresh_all_feeds(self) -> dict[str, bool]:
         """Refresh all feeds"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.refresh_feeds_async())
+
+        # Called from inside an event loop; callers there should await
+        # refresh_feeds_async instead, so fall back to the serial path.
         results = {}
 
         with self._lock:
@@ -492,52 +662,142 @@ class RSSManager:
 
         return results
 
-    def search_items(self, query: str, feeds: Optional[list[str]] = None) -> list[dict[str, Any]]:
-        """Search for items across feeds"""
-        results = []
-        query_lower = query.lower()
+    async def refresh_feeds_async(
+        self,
+        urls: Optional[list[str]] = None,
+        force: bool = False,
+        fetcher: Optional[AsyncFeedFetcher] = None,
+    ) -> dict[str, bool]:
+        """Refresh feeds concurrently using conditional requests"""
+        with self._lock:
+            targets = list(self.feeds.keys()) if urls is None else list(urls)
+
+        if not targets:
+            return {}
+
+        if fetcher is None:
+            async with AsyncFeedFetcher(**self.refresh_settings) as owned_fetcher:
+                return await self._refresh_with(owned_fetcher, targets, force)
+
+        return await self._refresh_with(fetcher, targets, force)
+
+    async def refresh_due_feeds_async(
+        self, fetcher: Optional[AsyncFeedFetcher] = None
+    ) -> dict[str, bool]:
+        """Refresh only the feeds whose fetch interval has elapsed"""
+        due = self.scheduler.pop_due()
+        if not due:
+            return {}
+        return await self.refresh_feeds_async(due, fetcher=fetcher)
+
+    async def run_refresh_loop(
+        self, stop_event: Optional[asyncio.Event] = None, max_idle: float = 60.0
+    ) -> None:
+        """Refresh feeds as their deadlines come due until ``stop_event`` is set"""
+        stop_event = stop_event or asyncio.Event()
+
+        async with AsyncFeedFetcher(**self.refresh_settings) as fetcher:
+            while not stop_event.is_set():
+                try:
+                    await self.refresh_due_feeds_async(fetcher)
+                except Exception as e:
+                    logger.error(f"Error in RSS refresh loop: {e}")
 
-        search_feeds = feeds or list(self.feeds.keys())
+                delay = self.scheduler.seconds_until_next()
+                delay = max_idle if delay is None else min(delay, max_idle)
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
 
-        for url in search_feeds:
-            items = self.get_feed_items(url)
-            for item in items:
-                if (
-                    query_lower in item.get("title", "").lower()
-                    or query_lower in item.get("description", "").lower()
-                    or query_lower in item.get("content", "").lower()
-                ):
-                    item["feed_url"] = url
-                    results.append(item)
+    async def _refresh_with(
+        self, fetcher: AsyncFeedFetcher, urls: list[str], force: bool
+    ) -> dict[str, bool]:
+        outcomes = await asyncio.gather(
+            *(self._refresh_one(fetcher, url, force) for url in urls), return_exceptions=True
+        )
 
+        results = {}
+        for url, outcome in zip(urls, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Error refreshing feed {url}: {outcome}")
+                results[url] = False
+            else:
+                results[url] = outcome
         return results
 
+    async def _refresh_one(self, fetcher: AsyncFeedFetcher, url: str, force: bool) -> bool:
+        """Fetch one feed, parsing the body only when it has changed"""
+        cache_key = self._get_cache_key(url)
+
+        etag = last_modified = None
+        with self._lock:
+            feed_info = self.feeds.get(url)
+            cached_data = self._last_body(url)
+            # Validators are only useful while we still hold the last body
+            if feed_info and cached_data and not force:
+                etag, last_modified = feed_info.etag, feed_info.last_modified
+
+        try:
+            result = await fetcher.fetch(url, etag=etag, last_modified=last_modified)
+
+            if result.not_modified and cached_data:
+                self.cache.set(cache_key, cached_data)
+                self._record_fetch(url, result, cached_data)
+                return len(cached_data.get("items", [])) > 0
+
+            if not result.ok or result.content is None:
+                status = FeedStatus.TIMEOUT if result.timed_out else FeedStatus.NETWORK_ERROR
+                self._record_failure(url, status, result.error or f"HTTP {result.status}")
+                return False
+
+            loop = asyncio.get_running_loop()
+            known = self._known_records(url, cached_data)
+            feed_data = await loop.run_in_executor(
+                None, self.parser.parse_content, result.content, self.compact_items, known
+            )
+            if not feed_data:
+                self._record_failure(url, FeedStatus.PARSING_ERROR, "Failed to parse feed")
+                return False
+
+            self._store_feed_data(url, feed_data)
+            self._record_fetch(url, result, feed_data)
+            return len(feed_data.get("items", [])) > 0
+
+        finally:
+            with self._lock:
+                if url in self.feeds:
+                    self.scheduler.schedule(url, self.feeds[url].fetch_interval)
+
+    def _record_fetch(self, url: str, result: FetchResult, feed_data: dict[str, Any]) -> None:
+        with self._lock:
+            if url in self.feeds:
+                feed_info = self.feeds[url]
+                feed_info.last_fetch = datetime.now()
+                feed_info.item_count = len(feed_data.get("items", []))
+                feed_info.status = FeedStatus.ACTIVE
+                feed_info.error_message = None
+                feed_info.etag = result.etag
+                feed_info.last_modified = result.last_modified
+
+    def _record_failure(self, url: str, status: FeedStatus, message: str) -> None:
+        with self._lock:
+            if url in self.feeds:
+                self.feeds[url].status = status
+                self.feeds[url].error_message = message
+
+    def search_items(
+        self, query: str, feeds: Optional[list[str]] = None, limit: Optional[int] = None
+    ) -> list[dict[str, Any]]:
+        """Search for items across feeds, best matches first"""
+        return self.search_index.search(query, feeds=feeds, limit=limit)
+
     def get_recent_items(
         self, hours: int = 24, feeds: Optional[list[str]] = None
     ) -> list[dict[str, Any]]:
-        """Get recent items from feeds"""
+        """Get recent items from feeds, newest first"""
         cutoff_time = datetime.now() - timedelta(hours=hours)
-        results = []
-
-        search_feeds = feeds or list(self.feeds.keys())
-
-        for url in search_feeds:
-            items = self.get_feed_items(url)
-            for item in items:
-                published = item.get("published")
-                if published and isinstance(published, str):
-                    try:
-                        published = datetime.fromisoformat(published.replace("Z", "+00:00"))
-                    except BaseException:
-                        continue
-
-                if published and published > cutoff_time:
-                    item["feed_url"] = url
-                    results.append(item)
-
-        # Sort by published date
-        results.sort(key=lambda x: x.get("published", ""), reverse=True)
-        return results
+        return self.search_index.recent(cutoff_time, feeds=feeds)
 
     def get_stats(self) -> dict[str, Any]:
         """Get RSS manager statistics"""
@@ -558,10 +818,79 @@ class RSSManager:
             "active_feeds": active_feeds,
             "error_feeds": error_feeds,
             "total_items": total_items,
-            "cache_size": len(self.cache._cache),
+            "cache_size": len(self.cache),
+            "cache": self.cache.stats(),
+            "scheduled_feeds": len(self.scheduler),
+            "search_index": self.search_index.get_stats(),
             "last_updated": datetime.now().isoformat(),
         }
 
+    def add_item_listener(self, callback: Callable[[str, list[dict[str, Any]]], None]) -> None:
+        """Register a callback that receives ``(feed_url, new_items)`` after each fetch"""
+        with self._lock:
+            self._item_listeners.append(callback)
+
+    def remove_item_listener(self, callback: Callable[[str, list[dict[str, Any]]], None]) -> None:
+        """Unregister a new-item callback"""
+        with self._lock:
+            if callback in self._item_listeners:
+                self._item_listeners.remove(callback)
+
+    def _store_feed_data(self, url: str, feed_data: dict[str, Any]) -> None:
+        """Cache fresh feed data, index it and push unseen items downstream"""
+        items = feed_data.get("items", [])
+        self.cache.set(self._get_cache_key(url), feed_data)
+        self.search_index.update_feed(url, items)
+
+        new_items = []
+        current: set[str] = set()
+        with self._lock:
+            seen = self._seen_guids.get(url, set())
+            for item in items:
+                guid = item.get("guid") or item.get("link")
+                if guid:
+                    current.add(guid)
+                if not guid or guid not in seen:
+                    new_items.append(item)
+            self._seen_guids[url] = current
+            listeners = list(self._item_listeners)
+
+        if new_items:
+            payload = self._as_dicts(new_items)
+            for callback in listeners:
+                try:
+                    callback(url, payload)
+                except Exception as e:
+                    logger.error(f"RSS item listener failed for {url}: {e}")
+
+    def _known_records(
+        self, url: str, cached_data: Optional[dict[str, Any]] = None
+    ) -> dict[str, FeedRecord]:
+        """Map guid to the FeedRecord already held for ``url``"""
+        if cached_data is None:
+            cached_data = self._last_body(url)
+        if not cached_data:
+            return {}
+        return {
+            item.guid: item
+            for item in cached_data.get("items", [])
+            if isinstance(item, FeedRecord) and item.guid
+        }
+
+    def _last_body(self, url: str) -> Optional[dict[str, Any]]:
+        """Last parsed body for ``url``, even past the cache TTL
+
+        The cache TTL and the default fetch interval are equal, so a due
+        refresh usually finds its entry expired but not yet evicted; it can
+        still revalidate that body. Bodies only live in the bounded cache.
+        """
+        return self.cache.get_stale(self._get_cache_key(url))
+
+    @staticmethod
+    def _as_dicts(items: list[Any]) -> list[dict[str, Any]]:
+        """Convert compact records to plain dicts at the API boundary"""
+        return [item.to_dict() if isinstance(item, FeedRecord) else item for item in items]
+
     def _get_cache_key(self, url: str) -> str:
         """Generate cache key for URL"""
         return hashlib.md5(url.encode()).hexdigest()
@@ -0,0 +1,208 @@
+"""SQLite Cache
+
+This module provides a small persistent key/value cache backed by SQLite.
+Values are stored as JSON, entries can carry a TTL, and the table is
+trimmed back to its capacity by evicting the least recently accessed rows.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# Logger setup
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCache:
+    """Persistent JSON key/value cache with LRU trimming and optional TTL"""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        table: str = "cache_entries",
+        max_entries: Optional[int] = 100_000,
+        ttl: Optional[float] = None,
+    ):
+        if not table.replace("_", "").isalnum():
+            raise ValueError(f"Invalid cache table name: {table}")
+
+        self.path = Path(path)
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                expires_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table}(accessed_at);
+            """
+        )
+        self._count = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None when missing or expired"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Get several values at once; missing and expired keys are omitted"""
+        if not keys:
+            return {}
+
+        now = time.time()
+        found: dict[str, Any] = {}
+        expired: list[str] = []
+
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value, expires_at FROM {self.table} WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, value, expires_at in rows:
+                    if expires_at is not None and expires_at <= now:
+                        expired.append(key)
+                    else:
+                        found[key] = json.loads(value)
+
+            if found:
+                self._conn.executemany(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+            if expired:
+                self._delete_keys(expired)
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serialisable value"""
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Store several values in one transaction"""
+        if not items:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        rows = [
+            (key, json.dumps(value, default=str), now, now, expires_at)
+            for key, value in items.items()
+        ]
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                existing = 0
+                keys = list(items)
+                for start in range(0, len(keys), 500):
+                    batch = keys[start : start + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    existing += self._conn.execute(
+                        f"SELECT COUNT(*) FROM {self.table} WHERE key IN ({placeholders})", batch
+                    ).fetchone()[0]
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} "
+                    "(key, value, created_at, accessed_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._count += len(rows) - existing
+            self._trim()
+
+    def keys(self) -> list[str]:
+        """Keys of all unexpired entries"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key FROM {self.table} WHERE expires_at IS NULL OR expires_at > ?",
+                (time.time(),),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def delete(self, key: str) -> bool:
+        """Remove a key, returning whether it was present"""
+        with self._lock:
+            return self._delete_keys([key]) > 0
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._count = 0
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _delete_keys(self, keys: list[str]) -> int:
+        deleted = 0
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ({placeholders})", batch
+            )
+            deleted += cursor.rowcount
+        self._count -= deleted
+        return deleted
+
+    def _trim(self) -> None:
+        if self.max_entries is None or self._count <= self.max_entries:
+            return
+
+        # Trim a little below capacity so inserts do not trim one row at a time
+        excess = self._count - self.max_entries + max(1, self.max_entries // 20)
+        cursor = self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN "
+            f"(SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)",
+            (excess,),
+        )
+        self._count -= cursor.rowcount
+        self.evictions += cursor.rowcount
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._count,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "path": str(self.path),
+        }
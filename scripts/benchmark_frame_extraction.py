@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Frame Extraction Throughput Benchmark
+
+Generates synthetic test videos with ffmpeg, then compares extracting N
+frames with one seek-and-decode invocation per frame against the single
+keyframe pass used by the frame pipeline, at several decoder caps.
+Throughput is reported in frames per second and frames per second per core.
+
+Usage:
+    python scripts/benchmark_frame_extraction.py --videos 8 --frames 20
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.engines.frame_pipeline import FramePipeline, _decoder_threads  # noqa: E402
+from backend.engines.media_probe import FFMPEG_BIN, ffmpeg_available  # noqa: E402
+
+
+def build_test_videos(directory: str, count: int, seconds: int) -> list[str]:
+    """Encode ``count`` 720p test-pattern videos with a keyframe every 2s"""
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"sample_{i}.mp4")
+        subprocess.run(
+            [
+                FFMPEG_BIN,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-y",
+                "-f",
+                "lavfi",
+                "-i",
+                f"testsrc2=size=1280x720:rate=24:duration={seconds}",
+                "-c:v",
+                "libx264",
+                "-preset",
+                "ultrafast",
+                "-g",
+                "48",
+                path,
+            ],
+            check=True,
+        )
+        paths.append(path)
+    return paths
+
+
+def per_frame_invocations(path: str, output_dir: str, frames: int, seconds: int) -> int:
+    """Baseline: one ffmpeg process per frame, as a naive extractor would do"""
+    for i in range(frames):
+        subprocess.run(
+            [
+                FFMPEG_BIN,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-y",
+                "-ss",
+                f"{i * seconds / frames:.3f}",
+                "-i",
+                path,
+                "-frames:v",
+                "1",
+                "-q:v",
+                "3",
+                os.path.join(output_dir, f"{os.path.basename(path)}_{i:04d}.jpg"),
+            ],
+            check=True,
+        )
+    return frames
+
+
+def report(label: str, frames: int, elapsed: float, cores: int) -> None:
+    fps = frames / elapsed if elapsed else 0.0
+    print(f"{label:<28}{frames:>8}{elapsed:>10.2f}{fps:>10.1f}{fps / cores:>14.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark frame extraction throughput")
+    parser.add_argument("--videos", type=int, default=8, help="Synthetic videos to generate")
+    parser.add_argument("--seconds", type=int, default=60, help="Length of each video")
+    parser.add_argument("--frames", type=int, default=20, help="Frames to extract per video")
+    args = parser.parse_args()
+
+    if not ffmpeg_available():
+        print("ffmpeg was not found on PATH (set FFMPEG_PATH); nothing to benchmark")
+        sys.exit(1)
+
+    cpu_count = os.cpu_count() or 1
+    work_dir = tempfile.mkdtemp(prefix="frame_benchmark_")
+    try:
+        videos = build_test_videos(work_dir, args.videos, args.seconds)
+        print(
+            f"{args.videos} videos x {args.seconds}s, {args.frames} frames each, "
+            f"{cpu_count} cores\n"
+        )
+        print(f"{'mode':<28}{'frames':>8}{'seconds':>10}{'fps':>10}{'fps/core':>14}")
+
+        output_dir = os.path.join(work_dir, "per_frame")
+        os.makedirs(output_dir)
+        started = time.perf_counter()
+        frames = sum(per_frame_invocations(v, output_dir, args.frames, args.seconds) for v in videos)
+        report("per-frame invocations", frames, time.perf_counter() - started, cpu_count)
+
+        decoder_caps = sorted({1, max(1, cpu_count // 2), cpu_count})
+        for max_decoders in decoder_caps:
+            output_dir = os.path.join(work_dir, f"pipeline_{max_decoders}")
+            jobs = [
+                {
+                    "kind": "frames",
+                    "file_path": video,
+                    "output_dir": output_dir,
+                    "frame_count": args.frames,
+                    "duration": float(args.seconds),
+                }
+                for video in videos
+            ]
+            pipeline = FramePipeline(max_decoders=max_decoders)
+            started = time.perf_counter()
+            frames = sum(result["frames_written"] for _, result in pipeline.run(jobs))
+            cores = min(cpu_count, max_decoders * _decoder_threads(max_decoders))
+            report(f"pipeline, {max_decoders} decoders", frames, time.perf_counter() - started, cores)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
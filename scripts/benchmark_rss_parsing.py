@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+RSS Parsing Memory Benchmark
+
+Compares the retained memory and parse time of the dict-based item path
+(FeedItem + asdict) with the compact FeedRecord path on a synthetic
+large feed, including a refresh where most entries are already known.
+
+Usage:
+    python scripts/benchmark_rss_parsing.py --items 10000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils.rss_singleton import RSSParser  # noqa: E402
+
+
+def build_parsed_feed(item_count: int, offset: int = 0) -> SimpleNamespace:
+    """Build a feedparser-shaped result with ``item_count`` podcast entries"""
+    entries = []
+    for i in range(offset, offset + item_count):
+        entries.append(
+            {
+                "id": f"urn:episode:{i}",
+                "title": f"Episode {i}: Weekly news roundup",
+                "link": f"https://example.com/episodes/{i}",
+                "description": f"<p>Discussion of this week's stories, part {i}.</p>" * 4,
+                "summary": f"Summary for episode {i}",
+                "published": "Mon, 01 Jan 2024 10:00:00 +0000",
+                "author": "Newsroom Staff",
+                "tags": [{"term": "news"}, {"term": "podcast"}, {"term": "politics"}],
+                "enclosures": [
+                    {"href": f"https://cdn.example.com/{i}.mp3", "type": "audio/mpeg", "length": 1}
+                ],
+            }
+        )
+
+    return SimpleNamespace(
+        bozo=False,
+        feed={"title": "Benchmark Feed", "description": "", "link": "https://example.com"},
+        entries=entries,
+    )
+
+
+def measure(label: str, func) -> dict:
+    """Run ``func`` and report the memory it retains and its peak usage"""
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+
+    result = func()
+
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "label": label,
+        "items": len(result["items"]),
+        "retained_mb": (current - baseline) / (1024 * 1024),
+        "peak_mb": (peak - baseline) / (1024 * 1024),
+        "seconds": elapsed,
+        "result": result,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark RSS item memory footprint")
+    parser.add_argument("--items", type=int, default=10000, help="Entries in the synthetic feed")
+    parser.add_argument(
+        "--new-items", type=int, default=50, help="New entries in the simulated refresh"
+    )
+    args = parser.parse_args()
+
+    rss_parser = RSSParser()
+    first = build_parsed_feed(args.items)
+    refreshed = build_parsed_feed(args.items, offset=args.new_items)
+
+    dict_run = measure("dict items", lambda: rss_parser._process_feedparser_result(first))
+    compact_run = measure(
+        "compact records", lambda: rss_parser._process_feedparser_result(first, compact=True)
+    )
+
+    known = {record.guid: record for record in compact_run["result"]["items"]}
+    refresh_run = measure(
+        "compact refresh",
+        lambda: rss_parser._process_feedparser_result(refreshed, compact=True, known=known),
+    )
+    dict_refresh_run = measure(
+        "dict refresh", lambda: rss_parser._process_feedparser_result(refreshed)
+    )
+
+    print(f"Synthetic feed: {args.items} items, {args.new_items} new on refresh\n")
+    print(f"{'mode':<18}{'items':>8}{'retained MB':>14}{'peak MB':>10}{'seconds':>10}")
+    for run in (dict_run, compact_run, dict_refresh_run, refresh_run):
+        print(
+            f"{run['label']:<18}{run['items']:>8}{run['retained_mb']:>14.2f}"
+            f"{run['peak_mb']:>10.2f}{run['seconds']:>10.3f}"
+        )
+
+    if compact_run["retained_mb"] > 0:
+        ratio = dict_run["retained_mb"] / compact_run["retained_mb"]
+        print(f"\nCompact records retain {ratio:.1f}x less memory than dict items")
+
+
+if __name__ == "__main__":
+    main()
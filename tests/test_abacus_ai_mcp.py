@@ -0,0 +1,163 @@
+"""
+Unit tests for the Abacus.AI MCP server.
+
+Runs batch processing and chat completions against a local stand-in for the
+chat completions endpoint, checking bounded concurrency, ordered results,
+per-model rate limits and the thread-pool fallback without aiohttp.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+
+from backend.integrations.abacus_ai_mcp import (AbacusAIConfig, AbacusAIMCPServer,  # noqa: E402
+                                                ModelRateLimiter)
+from backend.integrations.mcp_protocol import MCPMessage  # noqa: E402
+
+
+class FakeAbacusAPI:
+    """Chat completions endpoint that echoes the last message after a delay"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    async def handle(self, request):
+        body = await request.json()
+        content = body["messages"][-1]["content"]
+        if content == "fail":
+            return web.Response(status=503, text="overloaded")
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return web.json_response(
+            {
+                "choices": [{"message": {"role": "assistant", "content": content.upper()}}],
+                "model": body.get("model", "gpt-4-turbo"),
+                "usage": {"total_tokens": 10},
+                "cost": 0.001,
+            }
+        )
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.runner.cleanup()
+
+
+def batch_message(contents):
+    requests = [
+        {"id": str(i), "messages": [{"role": "user", "content": content}]}
+        for i, content in enumerate(contents)
+    ]
+    return MCPMessage(id="batch", params={"name": "batch_process", "requests": requests})
+
+
+class TestBatchProcess:
+    """Test cases for batch_process."""
+
+    def test_batch_runs_concurrently_in_order(self):
+        """Test that batches are bounded, concurrent and ordered."""
+
+        async def scenario():
+            async with FakeAbacusAPI() as api:
+                server = AbacusAIMCPServer(
+                    AbacusAIConfig(api_key="k", base_url=api.url, max_concurrent_requests=4)
+                )
+                await server.start()
+                started = time.perf_counter()
+                message = batch_message([f"item {i}" for i in range(12)] + ["fail"])
+                response = await server._handle_batch_process("c", message)
+                elapsed = time.perf_counter() - started
+                await server.stop()
+                return response.result, elapsed, api.max_active, server
+
+        result, elapsed, max_active, server = asyncio.run(scenario())
+
+        results = result["batch_results"]
+        contents = [r["result"]["choices"][0]["message"]["content"] for r in results[:12]]
+        assert contents == [f"ITEM {i}" for i in range(12)]
+        assert results[12]["status"] == "error"
+        assert result["failed"] == 1
+        assert max_active == 4
+        # 12 requests at 50 ms each, four at a time
+        assert elapsed < 0.45
+        assert result["stats"]["peak_upstream_in_flight"] == 4
+        assert result["stats"]["throughput_rps"] > 0
+        assert server.batch_stats["requests"] == 13
+        assert server.model_metrics["gpt-4-turbo"].avg_latency > 0
+
+    def test_peak_in_flight_is_per_batch(self):
+        """Test that a small batch does not report an earlier batch's peak."""
+
+        async def scenario():
+            async with FakeAbacusAPI() as api:
+                server = AbacusAIMCPServer(
+                    AbacusAIConfig(api_key="k", base_url=api.url, max_concurrent_requests=4)
+                )
+                await server.start()
+                wide = await server._handle_batch_process("c", batch_message(["a"] * 8))
+                single = await server._handle_batch_process("c", batch_message(["b"]))
+                await server.stop()
+                return wide.result, single.result, server
+
+        wide, single, server = asyncio.run(scenario())
+
+        assert wide["stats"]["peak_upstream_in_flight"] == 4
+        assert single["stats"]["peak_upstream_in_flight"] == 1
+        assert server.batch_stats["peak_upstream_in_flight"] == 4
+
+    def test_model_rate_limit_spaces_requests(self):
+        """Test that a model's token bucket delays requests beyond its rate."""
+
+        async def scenario():
+            limiter = ModelRateLimiter(1200)  # 20 per second
+            limiter.tokens = 0
+            started = time.perf_counter()
+            for _ in range(3):
+                await limiter.acquire()
+            return time.perf_counter() - started
+
+        assert asyncio.run(scenario()) == pytest.approx(0.15, abs=0.05)
+
+    def test_urllib_fallback_runs_off_the_loop(self):
+        """Test that without aiohttp requests run concurrently on the thread pool."""
+
+        async def scenario():
+            async with FakeAbacusAPI(delay=0.2) as api:
+                server = AbacusAIMCPServer(AbacusAIConfig(api_key="k", base_url=api.url))
+                server.use_aiohttp = False
+                messages = [
+                    MCPMessage(id=str(i), params={"messages": [{"role": "user", "content": "hi"}]})
+                    for i in range(4)
+                ]
+                started = time.perf_counter()
+                responses = await asyncio.gather(
+                    *(server._handle_chat_completion("c", message) for message in messages)
+                )
+                elapsed = time.perf_counter() - started
+                await server.stop()
+                return responses, elapsed
+
+        responses, elapsed = asyncio.run(scenario())
+
+        for response in responses:
+            assert response.result["response"]["choices"][0]["message"]["content"] == "HI"
+        assert elapsed < 0.6
@@ -0,0 +1,148 @@
+"""
+Unit tests for the analytics metric store and summaries.
+
+Checks time-range and tag queries on the columnar store, ring-buffer and
+retention limits, and that summaries match straightforward statistics with
+and without NumPy.
+"""
+
+import random
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import analytics
+from app.analytics import AnalyticsProcessor, MetricStore
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def filled_store(**kwargs):
+    store = MetricStore(**kwargs)
+    for i in range(100):
+        region = "eu" if i % 2 else "us"
+        store.add_point(
+            "latency",
+            i,
+            tags={"region": region, "host": f"h{i % 4}"},
+            timestamp=BASE + timedelta(seconds=i),
+        )
+    return store
+
+
+class TestMetricStore:
+    """Test cases for MetricStore."""
+
+    def test_time_range_and_tag_queries(self):
+        """Test that range and tag filters return the same points as a linear scan."""
+        store = filled_store()
+        start, end = BASE + timedelta(seconds=10), BASE + timedelta(seconds=19)
+
+        points = store.get_points("latency", start, end)
+        assert [p.value for p in points] == list(range(10, 20))
+
+        eu = store.get_points("latency", start, end, tags={"region": "eu"})
+        assert [p.value for p in eu] == [11, 13, 15, 17, 19]
+        assert all(p.tags["region"] == "eu" for p in eu)
+
+        h1 = store.get_points("latency", tags={"region": "eu", "host": "h1"})
+        assert [p.value for p in h1] == list(range(1, 100, 4))
+        assert store.get_points("latency", tags={"region": "eu", "host": "h0"}) == []
+        assert store.get_points("missing") == []
+
+    def test_late_points_stay_in_time_order(self):
+        """Test that out-of-order points are inserted at their timestamp."""
+        store = MetricStore()
+        for offset in (0, 2, 1, 3):
+            store.add_point("cpu", offset, timestamp=BASE + timedelta(seconds=offset))
+
+        timestamps, values = store.get_values("cpu")
+        assert list(values) == [0, 1, 2, 3]
+        assert list(timestamps) == sorted(timestamps)
+
+    def test_ring_buffer_and_retention(self):
+        """Test that metrics keep at most max_points and drop points past retention."""
+        store = MetricStore(retention_hours=1, max_points_per_metric=10)
+        now = datetime.now()
+        old = now - timedelta(minutes=90)
+        for i in range(25):
+            store.add_point("cpu", i, timestamp=old + timedelta(seconds=i))
+        store.add_point("cpu", 99, timestamp=now)
+
+        assert list(store.get_values("cpu")[1]) == list(range(16, 25)) + [99]
+
+        store._cleanup_old_data()
+        assert list(store.get_values("cpu")[1]) == [99]
+        assert len(store.series[0].timestamps) < 10  # expired prefix compacted
+
+    def test_point_cap_spans_tag_sets(self):
+        """Test that many tag sets share one metric's cap and empty series are dropped."""
+        store = MetricStore(retention_hours=1, max_points_per_metric=100)
+        now = datetime.now()
+        for i in range(5000):
+            store.add_point("requests", i, tags={"user": f"u{i}"}, timestamp=now)
+
+        assert len(store.get_values("requests")[1]) == 100
+        assert len(store.series) == 100
+        assert len(store._tag_index) == 100
+        assert [p.value for p in store.get_points("requests", tags={"user": "u4999"})] == [4999]
+        assert store.get_points("requests", tags={"user": "u0"}) == []
+
+        old = now - timedelta(hours=2)
+        for i in range(50):
+            store.add_point("requests", i, tags={"user": f"old{i}"}, timestamp=old)
+        store._cleanup_old_data()
+
+        assert len(store.series) == 50
+        assert len(store._tag_index) == 50
+        assert len(store._arrivals["requests"]) == 50
+
+        store.add_point("stale", 1, timestamp=old)
+        store._cleanup_old_data()
+        assert store.get_metric_names() == ["requests"]
+
+
+class TestSummary:
+    """Test cases for AnalyticsProcessor.calculate_summary."""
+
+    @pytest.fixture(params=[True, False], ids=["numpy", "pure-python"])
+    def processor(self, request, monkeypatch):
+        if request.param and not analytics.numpy_available:
+            pytest.skip("numpy not installed")
+        monkeypatch.setattr(analytics, "numpy_available", request.param)
+
+        store = MetricStore()
+        rng = random.Random(7)
+        self.values = [rng.expovariate(0.01) for _ in range(1001)]
+        for i, value in enumerate(self.values):
+            store.add_point("latency", value, timestamp=BASE + timedelta(seconds=i))
+        return AnalyticsProcessor(store)
+
+    def test_summary_matches_reference_statistics(self, processor):
+        """Test that every summary field matches the statistics module."""
+        summary = processor.calculate_summary("latency")
+        ordered = sorted(self.values)
+
+        assert summary.count == 1001
+        assert summary.sum == pytest.approx(sum(self.values))
+        assert summary.min == ordered[0] and summary.max == ordered[-1]
+        assert summary.average == pytest.approx(statistics.mean(self.values))
+        assert summary.median == statistics.median(self.values)
+        assert summary.std_dev == pytest.approx(statistics.stdev(self.values))
+        assert summary.percentiles == {
+            "p50": statistics.median(self.values),
+            "p90": ordered[900],
+            "p95": ordered[950],
+            "p99": ordered[990],
+        }
+        assert summary.time_range == (BASE, BASE + timedelta(seconds=1000))
+
+    def test_summary_of_time_window(self, processor):
+        """Test that summaries only cover the requested window."""
+        summary = processor.calculate_summary(
+            "latency", BASE + timedelta(seconds=100), BASE + timedelta(seconds=199)
+        )
+        assert summary.count == 100
+        assert summary.max == max(self.values[100:200])
+        assert processor.calculate_summary("latency", end_time=BASE - timedelta(hours=1)) is None
@@ -0,0 +1,303 @@
+"""
+Unit tests for API validation in the API discovery engine.
+
+Validates APIs against a local aiohttp server, checking per-host concurrency
+limits, capped body reads, cached results and the requests fallback.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+
+from backend.agents import api_discovery_engine  # noqa: E402
+from backend.agents.api_discovery_engine import (APICategory, APIDiscoveryConfig,  # noqa: E402
+                                                 APIDiscoveryEngine, APIInfo, APIStatus)
+
+
+class FakeAPIHost:
+    """Local host serving API-like, slow and endless endpoints"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+
+    async def api(self, request):
+        self.requests += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return web.json_response(
+            {"message": "API documentation at /docs"}, headers={"X-RateLimit-Limit": "60"}
+        )
+
+    async def endless(self, request):
+        response = web.StreamResponse(headers={"Content-Type": "text/html"})
+        await response.prepare(request)
+        await response.write(b"<html>endpoint reference " + b" " * 1024)
+        try:
+            for _ in range(10000):
+                await response.write(b"x" * 65536)
+                await asyncio.sleep(0.01)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        return response
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/api/{name}", self.api)
+        app.router.add_get("/endless", self.endless)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+def make_api(base_url, name="test"):
+    return APIInfo(name=name, base_url=base_url, category=APICategory.OTHER, description="")
+
+
+def names(apis):
+    return sorted(api.name for api in apis)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = APIDiscoveryEngine(
+        APIDiscoveryConfig(
+            concurrent_validations=50,
+            max_validations_per_host=3,
+            validation_body_bytes=4096,
+            timeout=10,
+        )
+    )
+    yield engine
+    engine.cleanup()
+
+
+class TestValidateAPIs:
+    """Test cases for APIDiscoveryEngine.validate_apis."""
+
+    def test_concurrent_validation_respects_per_host_limit(self, engine):
+        """Test that checks run concurrently but never over the per-host limit."""
+
+        async def scenario():
+            async with FakeAPIHost(delay=0.05) as host:
+                apis = [make_api(f"{host.url}/api/{i}", f"api{i}") for i in range(30)]
+                started = time.perf_counter()
+                validated = await engine.validate_apis(apis)
+                return host, validated, time.perf_counter() - started
+
+        host, validated, elapsed = asyncio.run(scenario())
+
+        assert len(validated) == 30
+        assert all(api.status == APIStatus.VALIDATED for api in validated)
+        assert validated[0].validation_score == pytest.approx(1.0)
+        assert host.max_active == 3
+        # Serial checks would take 30 * 0.05s
+        assert elapsed < 1.2
+
+    def test_body_read_is_capped(self, engine):
+        """Test that validation reads only a prefix of an endless body."""
+
+        async def scenario():
+            async with FakeAPIHost() as host:
+                started = time.perf_counter()
+                api = await engine._validate_api(make_api(f"{host.url}/endless"))
+                return api, time.perf_counter() - started
+
+        api, elapsed = asyncio.run(scenario())
+
+        # Reachable and mentions endpoints, but neither JSON nor API headers
+        assert api.validation_score == pytest.approx(0.6)
+        assert api.status == APIStatus.FAILED
+        assert elapsed < 2
+
+    def test_results_are_cached_by_base_url(self, engine):
+        """Test that duplicates and repeat runs reuse one validation."""
+
+        async def scenario():
+            async with FakeAPIHost(delay=0) as host:
+                url = f"{host.url}/api/cached"
+                first = await engine.validate_apis([make_api(url, "a"), make_api(url + "/", "b")])
+                second = await engine.validate_apis([make_api(url, "c")])
+                return host, first, second
+
+        host, first, second = asyncio.run(scenario())
+
+        assert host.requests == 1
+        assert [api.name for api in first] == ["a", "b"]
+        assert second[0].status == APIStatus.VALIDATED
+        assert engine.validation_stats == {"checked": 1, "cached": 1, "errors": 0}
+
+    def test_requests_fallback(self, engine, monkeypatch):
+        """Test that validation works through requests when aiohttp is missing."""
+        pytest.importorskip("requests")
+        monkeypatch.setattr(api_discovery_engine, "aiohttp_available", False)
+
+        async def scenario():
+            async with FakeAPIHost(delay=0) as host:
+                return await engine.validate_apis([make_api(f"{host.url}/api/fallback")])
+
+        validated = asyncio.run(scenario())
+
+        assert validated[0].validation_score == pytest.approx(1.0)
+
+
+class TestCatalog:
+    """Test cases for concurrent discovery and the API catalog."""
+
+    def test_sources_are_discovered_concurrently(self, engine, monkeypatch):
+        """Test that all sources are queried at once and keyed by source name."""
+
+        async def discover(source_name, source_config):
+            await asyncio.sleep(0.2)
+            if source_name == "programmableweb":
+                raise RuntimeError("source down")
+            return [make_api(f"https://{source_name}.example", source_name)]
+
+        monkeypatch.setattr(engine, "_discover_from_source", discover)
+
+        started = time.perf_counter()
+        results = asyncio.run(engine.discover_apis_from_all_sources())
+
+        assert time.perf_counter() - started < 0.5
+        assert list(results) == list(engine.api_sources)
+        assert results["programmableweb"] == []
+        assert results["publicapis"][0].name == "publicapis"
+
+    def test_catalog_writes_only_changed_rows(self, engine):
+        """Test that re-saving unchanged APIs writes nothing and changes upsert in place."""
+        weather = make_api("https://weather.example", "Weather")
+        weather.category = APICategory.WEATHER
+        weather.tags = {"forecast"}
+        news = make_api("https://news.example", "News")
+        news.is_free = False
+
+        assert engine.save_discovered_apis([weather, news]) == 2
+        assert engine.save_discovered_apis([weather, news]) == 0
+
+        weather.validation_score = 0.9
+        weather.status = APIStatus.VALIDATED
+        assert engine.save_discovered_apis([weather, news]) == 1
+        assert len(engine.catalog) == 2
+
+        loaded = {api.name: api for api in engine.load_discovered_apis()}
+        assert loaded["Weather"].validation_score == 0.9
+        assert loaded["Weather"].tags == {"forecast"}
+
+    def test_indexed_queries_and_search(self, engine):
+        """Test category, free, status and full-text queries against the catalog."""
+        apis = []
+        for name, category, description, free in (
+            ("OpenWeather", APICategory.WEATHER, "Current weather and forecasts", True),
+            ("StormWatch", APICategory.WEATHER, "Severe storm alerts", False),
+            ("Headlines", APICategory.NEWS, "Breaking news feed", True),
+        ):
+            api = make_api(f"https://{name.lower()}.example", name)
+            api.category, api.description, api.is_free = category, description, free
+            apis.append(api)
+        apis[0].status = APIStatus.VALIDATED
+        apis[2].tags = {"journalism"}
+        engine.save_discovered_apis(apis)
+
+        assert names(engine.get_apis_by_category(APICategory.WEATHER)) == [
+            "OpenWeather",
+            "StormWatch",
+        ]
+        assert names(engine.get_free_apis()) == ["Headlines", "OpenWeather"]
+        assert names(engine.get_validated_apis()) == ["OpenWeather"]
+
+        # FTS5 index, then the LIKE fallback
+        for full_text in (engine.catalog.full_text, False):
+            engine.catalog.full_text = full_text
+            assert names(engine.search_apis("forecast")) == ["OpenWeather"]
+            assert names(engine.search_apis("storm")) == ["StormWatch"]
+            assert names(engine.search_apis("journal")) == ["Headlines"]
+            assert engine.search_apis("") == []
+
+    def test_full_discovery_syncs_catalog_with_current_run(self, engine, monkeypatch):
+        """Test that failed APIs overwrite validations and undiscovered ones are dropped."""
+        engine.config.generate_integration_code = False
+        run = {}
+
+        async def discover():
+            return {"publicapis": [make_api(f"https://{name}.example", name) for name in run]}
+
+        async def validate(apis):
+            for api in apis:
+                api.status = run[api.name]
+                api.validation_score = 1.0 if api.status == APIStatus.VALIDATED else 0.1
+            return [api for api in apis if api.status == APIStatus.VALIDATED]
+
+        monkeypatch.setattr(engine, "discover_apis_from_all_sources", discover)
+        monkeypatch.setattr(engine, "validate_apis", validate)
+
+        run.update(alpha=APIStatus.VALIDATED, beta=APIStatus.VALIDATED)
+        asyncio.run(engine.run_full_discovery())
+
+        run.clear()
+        run.update(alpha=APIStatus.FAILED, gamma=APIStatus.VALIDATED)
+        results = asyncio.run(engine.run_full_discovery())
+
+        assert results["catalog_removed"] == 1
+        assert results["validated_count"] == 1
+        assert names(engine.get_validated_apis()) == ["gamma"]
+        assert names(engine.get_free_apis()) == ["gamma"]
+        assert {api.name: api.status for api in engine.load_discovered_apis()} == {
+            "alpha": APIStatus.FAILED,
+            "gamma": APIStatus.VALIDATED,
+        }
+
+    def test_failed_source_keeps_its_catalog_rows(self, engine, monkeypatch):
+        """Test that a source outage prunes nothing of that source."""
+        engine.config.validate_endpoints = False
+        engine.config.generate_integration_code = False
+        down = set()
+
+        async def discover(source_name, source_config):
+            if source_name in down:
+                raise ConnectionError("source down")
+            return [make_api(f"https://{source_name}.example", source_name)]
+
+        monkeypatch.setattr(engine, "_discover_from_source", discover)
+
+        asyncio.run(engine.run_full_discovery())
+        down.add("publicapis")
+        results = asyncio.run(engine.run_full_discovery())
+
+        assert engine.failed_sources == {"publicapis"}
+        assert results["catalog_removed"] == 0
+        assert "publicapis" in names(engine.load_discovered_apis())
+
+    def test_network_error_keeps_stored_validation(self, engine):
+        """Test that an uncached network error does not downgrade an earlier result."""
+
+        async def scenario():
+            async with FakeAPIHost(delay=0) as host:
+                api = await engine._validate_api(make_api(f"{host.url}/api/flaky"))
+            engine.save_discovered_apis([api])
+            engine.validation_cache.clear()
+            # The host is gone, so this check fails with a connection error
+            return await engine._validate_api(make_api(api.base_url))
+
+        api = asyncio.run(scenario())
+
+        assert engine.validation_stats["errors"] == 1
+        assert api.status == APIStatus.VALIDATED
+        assert api.validation_score == pytest.approx(1.0)
+        assert api.last_validated is not None
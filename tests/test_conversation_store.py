@@ -0,0 +1,102 @@
+"""
+Unit tests for the bounded conversation and context stores.
+
+Covers LRU and idle eviction, spilling to SQLite with lazy reload, and
+trimming conversations to their token budget.
+"""
+
+import time
+
+from backend.integrations.conversation_store import (ChatMessage, ConversationStore,
+                                                     SpillingLRUStore)
+
+
+class TestSpillingLRUStore:
+    """Test cases for SpillingLRUStore."""
+
+    def test_least_recently_used_entries_are_dropped(self):
+        """Test that entries beyond max_items are dropped oldest first without a db."""
+        store = SpillingLRUStore(max_items=2)
+        store["a"] = 1
+        store["b"] = 2
+        assert store["a"] == 1  # b is now least recently used
+        store["c"] = 3
+
+        assert "b" not in store
+        assert sorted(store.keys()) == ["a", "c"]
+        assert store.stats()["drops"] == 1
+
+    def test_evicted_entries_spill_and_reload(self, tmp_path):
+        """Test that evicted entries move to SQLite and back into memory on access."""
+        store = SpillingLRUStore(max_items=2, db_path=tmp_path / "spill.db")
+        for key in "abc":
+            store[key] = {"value": key}
+
+        assert len(store) == 3
+        assert store.stats()["in_memory"] == 2
+        assert store["a"] == {"value": "a"}
+        stats = store.stats()
+        assert stats["reloads"] == 1
+        assert stats["spills"] == 2  # a, then b to make room for it
+        assert stats["in_memory"] == 2
+        assert stats["spilled"]["entries"] == 1
+
+        del store["b"]
+        assert "b" not in store
+        assert len(store) == 2
+
+    def test_idle_entries_are_evicted(self):
+        """Test that entries idle beyond idle_ttl are evicted on the next insert."""
+        store = SpillingLRUStore(max_items=10, idle_ttl=0.05)
+        store["old"] = 1
+        time.sleep(0.1)
+        store["new"] = 2
+
+        assert store.keys() == ["new"]
+
+    def test_flush_persists_everything(self, tmp_path):
+        """Test that flush spills memory so a new store can reload it."""
+        db_path = tmp_path / "spill.db"
+        store = SpillingLRUStore(max_items=10, db_path=db_path)
+        store["a"] = [1, 2]
+        store.flush()
+
+        reopened = SpillingLRUStore(max_items=10, db_path=db_path)
+        assert reopened.get("a") == [1, 2]
+
+
+class TestConversationStore:
+    """Test cases for ConversationStore."""
+
+    def test_token_budget_trims_oldest_messages(self):
+        """Test that the oldest non-system messages are trimmed to fit the budget."""
+        store = ConversationStore(token_budget=10)
+        store.append("c1", ChatMessage(role="system", content="s" * 8))  # 2 tokens
+        for i in range(5):
+            store.append("c1", ChatMessage(role="user", content=str(i) * 12))  # 3 tokens
+
+        messages = store.messages("c1")
+        assert [m.role for m in messages] == ["system", "user", "user"]
+        assert messages[-1].content == "4" * 12
+        assert store.get("c1").tokens == 8
+        assert store.stats()["trimmed_messages"] == 3
+
+    def test_conversations_round_trip_through_sqlite(self, tmp_path):
+        """Test that spilled conversations reload with their messages and token count."""
+        store = ConversationStore(max_items=1, db_path=tmp_path / "conversations.db")
+        store.append("c1", ChatMessage(role="user", content="hello there"))
+        store.append("c2", ChatMessage(role="user", content="second conversation"))
+
+        conversation = store.get("c1")
+        assert conversation.messages[0].content == "hello there"
+        assert conversation.messages[0].timestamp is None
+        assert conversation.tokens == conversation.messages[0].token_count
+        assert store.stats()["reloads"] == 1
+
+    def test_messages_are_slotted_and_round_trip(self):
+        """Test that messages carry no instance dict and survive to_dict/from_dict."""
+        message = ChatMessage(role="assistant", content="hi", model_used="m", tokens_used=3)
+
+        assert not hasattr(message, "__dict__")
+        assert ChatMessage.from_dict(message.to_dict()) == message
+        assert message.to_dict()["timestamp"] is None
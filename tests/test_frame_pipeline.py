@@ -0,0 +1,162 @@
+"""
+Unit tests for the frame extraction pipeline.
+
+Tests the single-pass ffmpeg command and streaming of frames as they are
+written, using a small script in place of the ffmpeg binary.
+"""
+
+import os
+import stat
+import threading
+
+import pytest
+
+from backend.engines import frame_pipeline
+from backend.engines.frame_pipeline import (FrameExtractionError, FramePipeline,
+                                            build_frames_command, iter_frames)
+
+FAKE_FFMPEG = """#!/bin/sh
+# Writes three frames to the output pattern (the last argument)
+for last; do :; done
+for i in 1 2 3; do
+    printf 'jpeg' > "$(printf "$last" "$i")"
+done
+exit ${FAKE_FFMPEG_EXIT:-0}
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    path = tmp_path / "ffmpeg"
+    path.write_text(FAKE_FFMPEG)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(frame_pipeline, "FFMPEG_BIN", str(path))
+    return path
+
+
+class TestFramesCommand:
+    """Test cases for build_frames_command."""
+
+    def test_single_keyframe_pass(self):
+        """Test that all frames come from one keyframe-only decode."""
+        command = build_frames_command("in.mp4", "out_%04d.jpg", 10, duration=100.0, width=320)
+
+        assert command[command.index("-skip_frame") + 1] == "nokey"
+        assert command[command.index("-frames:v") + 1] == "10"
+        assert "gte(t-prev_selected_t\\,10.000)" in command[command.index("-vf") + 1]
+        assert command[-1] == "out_%04d.jpg"
+
+
+class TestFrameStreaming:
+    """Test cases for iter_frames and FramePipeline."""
+
+    def test_streams_frames_in_order(self, fake_ffmpeg, tmp_path):
+        """Test that every written frame is yielded once, in order."""
+        frames = list(iter_frames(str(tmp_path / "clip.mp4"), str(tmp_path / "out"), 3))
+
+        assert [os.path.basename(f) for f in frames] == [
+            "clip_frame_0001.jpg",
+            "clip_frame_0002.jpg",
+            "clip_frame_0003.jpg",
+        ]
+        assert os.path.dirname(os.path.dirname(frames[0])) == str(tmp_path / "out")
+
+    def test_runs_never_share_frames(self, fake_ffmpeg, tmp_path):
+        """Test that stale frames and same-stem inputs are kept apart per run."""
+        out = tmp_path / "out"
+        out.mkdir()
+        (out / "clip_frame_0001.jpg").write_text("stale")
+
+        first = list(iter_frames(str(tmp_path / "a" / "clip.mp4"), str(out), 3))
+        second = list(iter_frames(str(tmp_path / "b" / "clip.mp4"), str(out), 3))
+
+        assert len(set(first) | set(second)) == 6
+        assert len({os.path.dirname(f) for f in first + second}) == 2
+        assert (out / "clip_frame_0001.jpg").read_text() == "stale"
+
+    def test_failed_decoder_raises(self, fake_ffmpeg, tmp_path, monkeypatch):
+        """Test that a non-zero ffmpeg exit surfaces as an error."""
+        monkeypatch.setenv("FAKE_FFMPEG_EXIT", "1")
+
+        with pytest.raises(FrameExtractionError):
+            list(iter_frames(str(tmp_path / "clip.mp4"), str(tmp_path / "out"), 5))
+        assert os.listdir(tmp_path / "out") == []
+
+    def test_pipeline_reports_job_indexes(self, fake_ffmpeg, tmp_path):
+        """Test that batch results map back to their jobs and count frames."""
+        jobs = [
+            {"kind": "frames", "file_path": str(tmp_path / f"clip{i}.mp4"), "output_dir": str(tmp_path)}
+            for i in range(3)
+        ]
+        pipeline = FramePipeline(max_decoders=1)
+
+        results = dict(pipeline.run(jobs))
+
+        assert sorted(results) == [0, 1, 2]
+        assert results[1]["file_path"] == jobs[1]["file_path"]
+        assert pipeline.stats()["frames_written"] == 9
+
+    def test_pipelines_share_one_decoder_pool(self, fake_ffmpeg, tmp_path):
+        """Test that concurrent batches draw from the same capped pool."""
+        jobs = [
+            {"kind": "frames", "file_path": str(tmp_path / f"clip{i}.mp4"), "output_dir": str(tmp_path)}
+            for i in range(2)
+        ]
+
+        first = dict(FramePipeline(max_decoders=2).run(jobs))
+        pool = frame_pipeline._executor
+        second = dict(FramePipeline(max_decoders=3).run(jobs))
+
+        assert all(result["success"] for result in [*first.values(), *second.values()])
+        assert frame_pipeline._executor is pool
+
+    def test_pooled_and_direct_decoders_share_one_budget(self, tmp_path, monkeypatch):
+        """Test that pool jobs wait for slots held by decoders started elsewhere."""
+        log = tmp_path / "decoders.log"
+        script = tmp_path / "ffmpeg"
+        script.write_text(
+            "#!/bin/sh\n"
+            f"echo start $(date +%s.%N) >> {log}\n"
+            "sleep 0.2\n"
+            "for last; do :; done\n"
+            "printf 'jpeg' > \"$(printf \"$last\" 1)\"\n"
+            f"echo end $(date +%s.%N) >> {log}\n"
+        )
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setattr(frame_pipeline, "FFMPEG_BIN", str(script))
+        monkeypatch.setattr(frame_pipeline, "_decoder_slots", threading.BoundedSemaphore(2))
+        # Workers forked by earlier tests still hold their ffmpeg path
+        if frame_pipeline._executor is not None:
+            frame_pipeline._discard_executor(frame_pipeline._executor)
+        jobs = [
+            {
+                "kind": "frames",
+                "file_path": str(tmp_path / f"clip{i}.mp4"),
+                "output_dir": str(tmp_path),
+                "frame_count": 1,
+            }
+            for i in range(3)
+        ]
+
+        # A direct decode holds one of the two slots for the whole batch
+        with frame_pipeline._decoder_slots:
+            results = dict(FramePipeline(max_decoders=4).run(jobs))
+
+        assert all(result["success"] for result in results.values())
+        running = peak = 0
+        events = sorted(line.split()[::-1] for line in log.read_text().splitlines())
+        for _, kind in events:
+            running += 1 if kind == "start" else -1
+            peak = max(peak, running)
+        assert peak == 1
+        assert frame_pipeline._decoder_slots.acquire(blocking=False)
+
+    def test_decoders_run_under_nice(self, fake_ffmpeg, monkeypatch):
+        """Test that decoders are niced through the command, not preexec_fn."""
+        monkeypatch.setattr(frame_pipeline, "DECODER_NICENESS", 10)
+        command = frame_pipeline._decoder_command([str(fake_ffmpeg), "-i", "in.mp4"])
+
+        if frame_pipeline.NICE_BIN:
+            assert command[:3] == [frame_pipeline.NICE_BIN, "-n", "10"]
+        assert command[-3:] == [str(fake_ffmpeg), "-i", "in.mp4"]
+        assert frame_pipeline._decoder_command(["missing-ffmpeg"]) == ["missing-ffmpeg"]
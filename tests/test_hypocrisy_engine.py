@@ -0,0 +1,141 @@
+"""
+Unit tests for the hypocrisy engine.
+
+Tests that feature-based contradiction detection agrees with the pairwise
+sentence checks it replaces, and covers pooled batch analysis and caching.
+"""
+
+import random
+import re
+
+from backend.engines import hypocrisy_engine
+from backend.engines.hypocrisy_engine import (CancellationToken, HypocrisyAnalyzer,
+                                              HypocrisyEngine)
+
+VOCABULARY = (
+    "i never always support oppose against good bad we should not must do "
+    "yes no will the tax plan endorse dont love hate agree favor"
+).split()
+
+
+def pairwise_contradictions(analyzer, text):
+    """Reference implementation: compare every sentence pair."""
+    sentences = re.split(r"[.!?]+", text)
+    found = []
+    for i, sentence1 in enumerate(sentences):
+        for j in range(i + 1, len(sentences)):
+            contradiction = analyzer._check_sentence_contradiction(sentence1, sentences[j])
+            if contradiction:
+                found.append({**contradiction, "positions": [i, j]})
+    return found
+
+
+class TestContradictionDetection:
+    """Test cases for HypocrisyAnalyzer._detect_contradictions."""
+
+    def test_matches_pairwise_reference(self):
+        """Test that counts, severity and top pairs match the pairwise scan."""
+        analyzer = HypocrisyAnalyzer()
+        rng = random.Random(7)
+
+        for _ in range(200):
+            text = ". ".join(
+                " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(0, 6)))
+                for _ in range(rng.randint(0, 25))
+            )
+            text = analyzer._normalize_text(text)
+
+            expected = pairwise_contradictions(analyzer, text)
+            result = analyzer._detect_contradictions(text)
+
+            assert result["count"] == len(expected)
+            assert result["severity"] == analyzer._assess_contradiction_severity(expected)
+            assert [c["positions"] for c in result["contradictions"]] == [
+                c["positions"] for c in expected[:5]
+            ]
+            assert [c["type"] for c in result["contradictions"]] == [
+                c["type"] for c in expected[:5]
+            ]
+
+    def test_simple_negation(self):
+        """Test that a direct negation pair is reported."""
+        analyzer = HypocrisyAnalyzer()
+        result = analyzer.analyze_text("We will never raise taxes. We always raise taxes.")
+
+        contradictions = result["analysis"]["contradictions"]
+        assert contradictions["found"]
+        assert contradictions["contradictions"][0]["type"] == "direct_negation"
+
+
+class TestHypocrisyEngineBatch:
+    """Test cases for HypocrisyEngine batch analysis and caching."""
+
+    TEXTS = [
+        "We will never raise taxes. We always raise taxes.",
+        "I support the plan. I oppose the plan.",
+        "The weather is fine today.",
+        "We must act. We should not act.",
+    ]
+
+    def test_batch_results_in_input_order(self):
+        """Test that pooled batches return results in input order."""
+        engine = HypocrisyEngine(parallel_min_texts=0)
+        results = engine.batch_analyze(self.TEXTS, max_workers=2, chunk_size=1)
+
+        assert [r["context"]["batch_index"] for r in results] == [0, 1, 2, 3]
+        assert results[0]["analysis"]["contradictions"]["found"]
+        assert not results[2]["analysis"]["contradictions"]["found"]
+
+    def test_cache_key_is_stable(self):
+        """Test that cache keys do not depend on process hash seeds."""
+        key = HypocrisyEngine._cache_key("text", {"b": 1, "a": 2})
+
+        assert key == HypocrisyEngine._cache_key("text", {"a": 2, "b": 1})
+        assert len(key) == 64
+
+    def test_persistent_cache_survives_restart(self, tmp_path):
+        """Test that results persisted to SQLite are reused by a new engine."""
+        path = tmp_path / "hypocrisy.db"
+        HypocrisyEngine(cache_path=str(path)).batch_analyze(self.TEXTS, max_workers=1)
+
+        restarted = HypocrisyEngine(cache_path=str(path))
+        results = restarted.batch_analyze(self.TEXTS, max_workers=1)
+
+        assert restarted.store.stats()["hits"] == len(self.TEXTS)
+        assert results[3]["context"]["batch_index"] == 3
+
+    def test_cancellation_stops_batch(self):
+        """Test that cancelling the token stops yielding further results."""
+        engine = HypocrisyEngine()
+        token = CancellationToken()
+        seen = []
+
+        for index, _ in engine.iter_batch_analyze(
+            self.TEXTS, max_workers=1, chunk_size=1, cancel_token=token
+        ):
+            seen.append(index)
+            token.cancel()
+
+        assert seen == [0]
+
+    def test_batches_share_one_pool(self):
+        """Test that the process pool is created once and reused across calls."""
+        engine = HypocrisyEngine(parallel_min_texts=0)
+
+        engine.batch_analyze(self.TEXTS, max_workers=2, chunk_size=1)
+        pool = hypocrisy_engine._executors[2]
+        engine.clear_cache()
+        results = engine.batch_analyze(self.TEXTS, max_workers=2, chunk_size=1)
+
+        assert hypocrisy_engine._executors[2] is pool
+        assert all("error" not in result for result in results)
+
+    def test_small_batch_stays_in_process(self, monkeypatch):
+        """Test that batches below the threshold never start worker processes."""
+        monkeypatch.setattr(hypocrisy_engine, "_executors", {})
+        engine = HypocrisyEngine()
+
+        results = engine.batch_analyze(self.TEXTS, max_workers=4, chunk_size=1)
+
+        assert len(results) == len(self.TEXTS)
+        assert hypocrisy_engine._executors == {}
@@ -0,0 +1,90 @@
+"""
+Unit tests for the shared LRU cache.
+
+Tests eviction order, lazy TTL expiry, byte budgets and statistics.
+"""
+
+import time
+
+from backend.utils.lru_cache import LRUCache
+from backend.utils.rss_singleton import RSSCache
+
+
+class TestLRUCache:
+    """Test cases for the LRUCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the coldest entry is evicted first."""
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "b" not in cache
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_lazy_ttl_expiry(self):
+        """Test that expired entries are dropped on access."""
+        cache = LRUCache(ttl=0.01)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=60)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        stats = cache.stats()
+        assert stats["expirations"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_stale_read_keeps_expired_entry(self):
+        """Test that get_stale returns expired values without dropping them."""
+        cache = LRUCache(ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+
+        assert cache.get_stale("a") == 1
+        assert cache.get_stale("missing", 0) == 0
+        assert len(cache) == 1
+        assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+        assert cache.get("a") is None
+
+    def test_byte_budget(self):
+        """Test that the byte budget evicts old entries but keeps the newest."""
+        cache = LRUCache(max_entries=None, max_bytes=100, sizeof=len)
+        cache.set("a", "x" * 60)
+        cache.set("b", "y" * 60)
+
+        assert "a" not in cache
+        assert cache.stats()["bytes"] == 60
+
+        cache.set("c", "z" * 500)
+        assert len(cache) == 1
+        assert cache.get("c") is not None
+
+    def test_overwrite_updates_size(self):
+        """Test that replacing a key does not double count its size."""
+        cache = LRUCache(max_bytes=1000, sizeof=len)
+        cache.set("a", "x" * 10)
+        cache.set("a", "x" * 20)
+
+        assert len(cache) == 1
+        assert cache.stats()["bytes"] == 20
+
+
+class TestRSSCache:
+    """Test cases for the RSSCache wrapper."""
+
+    def test_rss_cache_api(self):
+        """Test that RSSCache keeps its historical interface."""
+        cache = RSSCache(max_size=1)
+        cache.set("a", {"items": []})
+        cache.set("b", {"items": [1]})
+        cache._remove("b")
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert cache.max_size == 1
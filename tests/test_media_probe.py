@@ -0,0 +1,148 @@
+"""
+Unit tests for media probing.
+
+Tests buffered hashing, ffprobe output parsing and the (path, size, mtime)
+metadata cache.
+"""
+
+import hashlib
+import os
+import time
+
+from backend.engines import media_probe
+from backend.engines.media_probe import (MediaMetadataCache, MediaProbe, MediaProbeError,
+                                         hash_file, summarize_probe)
+
+
+class TestHashing:
+    """Test cases for hash_file."""
+
+    def test_matches_hashlib(self, tmp_path):
+        """Test that buffered hashing matches a one-shot digest."""
+        data = os.urandom(300_000)
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(data)
+
+        assert hash_file(str(path), buffer_size=4096) == hashlib.sha256(data).hexdigest()
+
+
+class TestProbeParsing:
+    """Test cases for summarize_probe."""
+
+    def test_summarizes_streams(self):
+        """Test that format and stream fields are reduced to engine fields."""
+        summary = summarize_probe(
+            {
+                "format": {"duration": "12.5", "bit_rate": "800000", "format_name": "mov,mp4"},
+                "streams": [
+                    {"codec_type": "audio", "codec_name": "aac", "channels": 2},
+                    {
+                        "codec_type": "video",
+                        "codec_name": "h264",
+                        "width": 1920,
+                        "height": 1080,
+                        "avg_frame_rate": "30000/1001",
+                    },
+                ],
+            }
+        )
+
+        assert summary["duration"] == 12.5
+        assert summary["bitrate"] == 800000
+        assert summary["resolution"] == "1920x1080"
+        assert summary["fps"] == 29.97
+        assert summary["codec"] == "h264"
+        assert summary["audio_channels"] == 2
+
+    def test_handles_missing_streams(self):
+        """Test that empty probe output produces empty fields."""
+        summary = summarize_probe({})
+
+        assert summary["resolution"] is None
+        assert summary["fps"] is None
+        assert summary["stream_count"] == 0
+
+
+class TestMetadataCache:
+    """Test cases for MediaProbe caching."""
+
+    def test_unchanged_file_is_hashed_once(self, tmp_path):
+        """Test that repeated probes reuse the cached hash."""
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(b"frame data")
+        probe = MediaProbe()
+
+        first = probe.probe(str(path))
+        second = probe.probe(str(path))
+
+        assert first["file_hash"] == second["file_hash"]
+        assert probe.hashes_computed == 1
+
+    def test_modified_file_is_rehashed(self, tmp_path):
+        """Test that a size or mtime change invalidates the cache entry."""
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(b"frame data")
+        probe = MediaProbe()
+        first = probe.probe(str(path))
+
+        path.write_bytes(b"new frame data")
+        second = probe.probe(str(path))
+
+        assert first["file_hash"] != second["file_hash"]
+        assert probe.hashes_computed == 2
+
+    def test_persistent_cache_survives_restart(self, tmp_path):
+        """Test that hashes persisted to SQLite are reused by a new probe."""
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(b"frame data")
+        db_path = str(tmp_path / "media.db")
+        MediaProbe(MediaMetadataCache(db_path)).probe(str(path))
+
+        restarted = MediaProbe(MediaMetadataCache(db_path))
+        restarted.probe(str(path))
+
+        assert restarted.hashes_computed == 0
+
+    def test_probe_many_reports_errors(self, tmp_path):
+        """Test that parallel probing maps missing files to errors."""
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"clip{i}.mp4"
+            path.write_bytes(bytes([i]) * 100)
+            paths.append(str(path))
+        paths.append(str(tmp_path / "missing.mp4"))
+
+        results = MediaProbe(max_workers=3).probe_many(paths)
+
+        assert list(results) == paths
+        assert all("file_hash" in results[p] for p in paths[:4])
+        assert "error" in results[paths[4]]
+
+    def test_probe_failure_is_retried_after_a_while(self, tmp_path, monkeypatch):
+        """Test that ffprobe failures are cached only briefly and the hash is kept."""
+        path = tmp_path / "clip.mp4"
+        path.write_bytes(b"frame data")
+        outcomes = [MediaProbeError("ffprobe timed out after 60s"), {"duration": 1.5}]
+        calls = []
+
+        def fake_ffprobe(file_path, timeout):
+            calls.append(file_path)
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(media_probe, "ffprobe_available", lambda: True)
+        monkeypatch.setattr(media_probe, "run_ffprobe", fake_ffprobe)
+        probe = MediaProbe(probe_retry_seconds=0.05)
+
+        failed = probe.probe(str(path))
+        cached = probe.probe(str(path))
+        time.sleep(0.1)
+        retried = probe.probe(str(path))
+
+        assert failed["probe_error"] == cached["probe_error"] == "ffprobe timed out after 60s"
+        assert len(calls) == 2
+        assert retried["metadata"] == {"duration": 1.5}
+        assert "probe_error" not in retried
+        assert probe.hashes_computed == 1
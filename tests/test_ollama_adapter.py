@@ -0,0 +1,112 @@
+"""
+Unit tests for the Ollama adapter.
+
+Replaces the pooled client with an in-memory stub to check response caching
+in gen, fallbacks on failure, ordered parallel gen_many and streaming.
+"""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from backend.integrations.llm import ollama_adapter  # noqa: E402
+from backend.integrations.llm.ollama_client import OllamaGenerationError  # noqa: E402
+from backend.utils.response_cache import ResponseCache  # noqa: E402
+
+
+class StubClient:
+    """Client that reverses prompts and records how it was called."""
+
+    num_parallel = 2
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, options=None):
+        with self.lock:
+            self.prompts.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if prompt == "fail":
+                raise OllamaGenerationError("HTTP 500")
+            return prompt[::-1]
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def stream(self, prompt, options=None):
+        self.prompts.append(prompt)
+        yield from prompt.split()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    stub = StubClient()
+    monkeypatch.setattr(ollama_adapter, "get_client", lambda: stub)
+    monkeypatch.setattr(ollama_adapter, "USE_OLLAMA", True)
+    monkeypatch.setattr(ollama_adapter, "response_cache", ResponseCache())
+    return stub
+
+
+class TestGen:
+    """Test cases for gen and its response cache."""
+
+    def test_repeated_prompt_is_served_from_cache(self, client):
+        """Test that identical prompts and options reach Ollama once."""
+        assert ollama_adapter.gen("hello") == "olleh"
+        assert ollama_adapter.gen("hello") == "olleh"
+        ollama_adapter.gen("hello", temperature=0.1)
+        ollama_adapter.gen("hello", use_cache=False)
+
+        assert client.prompts == ["hello", "hello", "hello"]
+        assert ollama_adapter.response_cache.stats()["hits"] == 1
+
+    def test_failures_fall_back_and_are_not_cached(self, client):
+        """Test that a failed generation returns a fallback and is retried next time."""
+        first = ollama_adapter.gen("fail")
+        second = ollama_adapter.gen("fail")
+
+        assert first.startswith("Generation failed - fallback response at ")
+        assert second.startswith("Generation failed - fallback response at ")
+        assert client.prompts == ["fail", "fail"]
+
+    def test_disabled_returns_fallback(self, client, monkeypatch):
+        """Test that USE_OLLAMA=0 never touches the client."""
+        monkeypatch.setattr(ollama_adapter, "USE_OLLAMA", False)
+
+        assert ollama_adapter.gen("hello").startswith("Ollama disabled - fallback response at ")
+        assert list(ollama_adapter.gen_stream("hello"))[0].startswith("Ollama disabled")
+        assert client.prompts == []
+
+
+class TestBatchAndStream:
+    """Test cases for gen_many and gen_stream."""
+
+    def test_gen_many_keeps_order_and_parallel_limit(self, client):
+        """Test that results follow prompt order with at most num_parallel in flight."""
+        client.delay = 0.05
+        prompts = ["one", "two", "three", "four", "two"]
+
+        results = ollama_adapter.gen_many(prompts)
+
+        assert results == ["eno", "owt", "eerht", "ruof", "owt"]
+        assert client.max_active == 2
+        assert sorted(client.prompts) == ["four", "one", "three", "two"]
+        assert ollama_adapter.gen_many([]) == []
+
+    def test_gen_stream_yields_chunks_uncached(self, client):
+        """Test that streaming passes client chunks through and skips the cache."""
+        assert list(ollama_adapter.gen_stream("a b c")) == ["a", "b", "c"]
+        assert list(ollama_adapter.gen_stream("a b c")) == ["a", "b", "c"]
+
+        assert client.prompts == ["a b c", "a b c"]
+        assert ollama_adapter.response_cache.stats()["misses"] == 0
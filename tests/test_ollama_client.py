@@ -0,0 +1,178 @@
+"""
+Unit tests for the pooled Ollama client.
+
+Runs the client against a small local server speaking the Ollama generate
+and tags endpoints, checking connection reuse, token streaming, bounded
+parallelism and cached health checks.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from backend.integrations.llm.ollama_client import OllamaClient, OllamaGenerationError  # noqa: E402
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.server.record(self)
+        self.send_json(200, {"models": []})
+
+    def do_POST(self):
+        server = self.server
+        server.record(self)
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if request["prompt"] == "fail":
+            self.send_json(500, {"error": "boom"})
+            return
+
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            words = request["prompt"].split()
+            if not request["stream"]:
+                self.send_json(200, {"response": " ".join(reversed(words)), "done": True})
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for word in reversed(words):
+                self.write_chunk({"response": word + " ", "done": False})
+            self.write_chunk({"response": "", "done": True})
+            self.wfile.write(b"0\r\n\r\n")
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def write_chunk(self, body):
+        line = json.dumps(body).encode() + b"\n"
+        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay=0.0):
+        super().__init__(("127.0.0.1", 0), FakeOllamaHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+        self.connections = set()
+
+    def record(self, handler):
+        with self.lock:
+            self.requests += 1
+            self.connections.add(handler.client_address)
+
+
+@pytest.fixture
+def server():
+    server = FakeOllamaServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def client_for(server, **kwargs):
+    return OllamaClient(base_url=f"http://127.0.0.1:{server.server_port}", **kwargs)
+
+
+class TestSyncClient:
+    """Test cases for the sync API."""
+
+    def test_requests_reuse_connection(self, server):
+        """Test that sequential requests share one keep-alive connection."""
+        client = client_for(server)
+        results = [client.generate(f"hello {i}") for i in range(5)]
+
+        assert results[0] == "0 hello"
+        assert len(server.connections) == 1
+        client.close()
+
+    def test_stream_yields_tokens(self, server):
+        """Test that streamed tokens arrive in order."""
+        client = client_for(server)
+
+        assert list(client.stream("one two three")) == ["three ", "two ", "one "]
+        assert client.stats()["streams"] == 1
+        client.close()
+
+    def test_generate_many_respects_parallelism(self, server):
+        """Test that batches never exceed num_parallel requests in flight."""
+        server.delay = 0.05
+        client = client_for(server, num_parallel=2)
+
+        results = client.generate_many([f"p {i}" for i in range(8)])
+
+        assert results == [f"{i} p" for i in range(8)]
+        assert server.max_active == 2
+        client.close()
+
+    def test_errors_raise(self, server):
+        """Test that non-200 responses raise OllamaGenerationError."""
+        client = client_for(server)
+
+        with pytest.raises(OllamaGenerationError):
+            client.generate("fail")
+        assert client.generate_many(["fail", "ok"], return_exceptions=True)[1] == "ok"
+        client.close()
+
+    def test_is_up_is_cached(self, server):
+        """Test that health checks are reused within the TTL."""
+        client = client_for(server, health_ttl=60)
+
+        assert all(client.is_up() for _ in range(10))
+        assert client.health_checks == 1
+        assert not OllamaClient(base_url="http://127.0.0.1:9", connect_timeout=0.5).is_up()
+        client.close()
+
+
+class TestAsyncClient:
+    """Test cases for the async API."""
+
+    def test_async_batch_and_stream(self, server):
+        """Test async batching, streaming and health checks."""
+        server.delay = 0.05
+        client = client_for(server, num_parallel=3)
+
+        async def scenario():
+            results = await client.agenerate_many([f"a {i}" for i in range(9)])
+            tokens = [token async for token in client.astream("x y")]
+            up = await client.ais_up()
+            await client.aclose()
+            return results, tokens, up
+
+        results, tokens, up = asyncio.run(scenario())
+
+        assert results == [f"{i} a" for i in range(9)]
+        assert tokens == ["y ", "x "]
+        assert up
+        assert server.max_active == 3
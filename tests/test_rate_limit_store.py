@@ -0,0 +1,96 @@
+"""
+Unit tests for rate limit stores.
+
+Tests the sliding-window counter and token bucket, bounded in-process
+state, SQLite state shared between workers, and the Redis script when a
+local Redis stand-in is available.
+"""
+
+import multiprocessing
+
+import pytest
+
+from app.rate_limit_store import (SLIDING_WINDOW, TOKEN_BUCKET, MemoryRateLimitStore,
+                                  RedisRateLimitStore, SQLiteRateLimitStore)
+
+
+def allowed_count(store, key, algorithm, limit, window, now, hits):
+    return sum(store.hit(key, algorithm, limit, window, now=now).allowed for _ in range(hits))
+
+
+def sqlite_worker(path, results):
+    store = SQLiteRateLimitStore(path)
+    results.put(allowed_count(store, "shared", SLIDING_WINDOW, 50, 60, 1000.0, 40))
+
+
+class TestAlgorithms:
+    """Test cases shared by every store."""
+
+    @pytest.fixture(params=["memory", "sqlite"])
+    def store(self, request, tmp_path):
+        if request.param == "memory":
+            return MemoryRateLimitStore()
+        return SQLiteRateLimitStore(tmp_path / "limits.db")
+
+    def test_sliding_window_weights_previous_window(self, store):
+        """Test that the previous window's count decays across the next one."""
+        assert allowed_count(store, "ip", SLIDING_WINDOW, 10, 60, 30.0, 12) == 10
+
+        # Half of the previous window still overlaps: 10 * 0.5 = 5 slots used
+        assert allowed_count(store, "ip", SLIDING_WINDOW, 10, 60, 90.0, 12) == 5
+
+    def test_token_bucket_refills(self, store):
+        """Test that tokens refill evenly over the window."""
+        assert allowed_count(store, "ip", TOKEN_BUCKET, 10, 10, 0.0, 15) == 10
+        assert allowed_count(store, "ip", TOKEN_BUCKET, 10, 10, 3.0, 15) == 3
+
+    def test_block_after_exceeding(self, store):
+        """Test that exceeding a limit blocks the key for block_seconds."""
+        for _ in range(3):
+            store.hit("ip", SLIDING_WINDOW, 2, 10, block_seconds=100, now=0.0)
+
+        decision = store.hit("ip", SLIDING_WINDOW, 2, 10, block_seconds=100, now=50.0)
+        assert not decision.allowed
+        assert decision.retry_after == pytest.approx(50.0)
+        assert store.hit("ip", SLIDING_WINDOW, 2, 10, block_seconds=100, now=101.0).allowed
+
+
+class TestStores:
+    """Test cases for store-specific behaviour."""
+
+    def test_memory_store_is_bounded(self):
+        """Test that idle and excess keys are evicted."""
+        store = MemoryRateLimitStore(max_keys=100)
+        for i in range(1000):
+            store.hit(f"ip-{i}", SLIDING_WINDOW, 5, 10, now=float(i))
+
+        assert len(store) <= 100
+
+    def test_sqlite_store_is_shared_across_processes(self, tmp_path):
+        """Test that worker processes draw from one limit."""
+        path = str(tmp_path / "limits.db")
+        SQLiteRateLimitStore(path)
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=sqlite_worker, args=(path, results)) for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        assert sum(results.get(timeout=5) for _ in workers) == 50
+
+    def test_redis_store_matches_memory_store(self):
+        """Test the Lua script against the in-process implementation."""
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        redis_store = RedisRateLimitStore(client=fakeredis.FakeRedis())
+        memory_store = MemoryRateLimitStore()
+
+        for algorithm in (SLIDING_WINDOW, TOKEN_BUCKET):
+            for now in (0.0, 5.0, 31.0, 65.0, 200.0):
+                expected = [memory_store.hit(algorithm, algorithm, 10, 60, 5, now) for _ in range(12)]
+                actual = [redis_store.hit(algorithm, algorithm, 10, 60, 5, now) for _ in range(12)]
+                assert [d.allowed for d in actual] == [d.allowed for d in expected]
+                assert [d.remaining for d in actual] == [d.remaining for d in expected]
@@ -0,0 +1,80 @@
+"""
+Unit tests for the response cache.
+
+Tests prompt normalisation, persistence across instances, TTL expiry and
+single-flight coalescing of concurrent identical requests.
+"""
+
+import threading
+import time
+
+import pytest
+
+from backend.utils.response_cache import ResponseCache, make_cache_key
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache."""
+
+    def test_key_ignores_whitespace_but_not_parameters(self):
+        """Test that keys depend on prompt content and model parameters."""
+        key = make_cache_key("Write a  title\n", model="llama3", temperature=0.8)
+
+        assert key == make_cache_key(" Write a title", temperature=0.8, model="llama3")
+        assert key != make_cache_key("Write a title", model="llama3", temperature=0.2)
+        assert key != make_cache_key("Write a Title", model="llama3", temperature=0.8)
+
+    def test_responses_persist_across_instances(self, tmp_path):
+        """Test that the SQLite tier serves a fresh process's lookups."""
+        db_path = tmp_path / "responses.db"
+        ResponseCache(db_path=db_path).get_or_compute("k", lambda: "stored")
+
+        cache = ResponseCache(db_path=db_path)
+        assert cache.get_or_compute("k", lambda: pytest.fail("recomputed")) == "stored"
+        assert cache.stats()["hits"] == 1
+
+    def test_entries_expire(self, tmp_path):
+        """Test that responses older than the TTL are recomputed."""
+        cache = ResponseCache(db_path=tmp_path / "responses.db", ttl=0.05)
+        cache.get_or_compute("k", lambda: "old")
+        time.sleep(0.1)
+
+        assert cache.get_or_compute("k", lambda: "new") == "new"
+
+    def test_concurrent_threads_share_one_call(self):
+        """Test that threads asking for the same key wait for one computation."""
+        cache = ResponseCache()
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "shared"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == ["shared"] * 8
+        assert len(calls) == 1
+        assert cache.stats()["coalesced"] == 7
+
+    def test_failures_propagate_and_are_not_cached(self):
+        """Test that an exception reaches the caller and the next call retries."""
+        cache = ResponseCache()
+
+        def fail():
+            raise RuntimeError("provider down")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_compute("k", fail)
+        assert cache.get_or_compute("k", lambda: "ok") == "ok"
@@ -0,0 +1,44 @@
+"""
+Unit tests for compact RSS item parsing.
+
+Tests FeedRecord compatibility and guid deduplication across refreshes.
+"""
+
+from types import SimpleNamespace
+
+from backend.utils.rss_singleton import FeedRecord, RSSParser
+
+
+def parsed_feed(guids):
+    return SimpleNamespace(
+        bozo=False,
+        feed={"title": "Feed"},
+        entries=[{"id": guid, "title": f"Title {guid}", "link": f"http://x/{guid}"} for guid in guids],
+    )
+
+
+class TestCompactParsing:
+    """Test cases for the compact parse mode."""
+
+    def test_record_matches_dict_shape(self):
+        """Test that compact records convert to the legacy dict layout."""
+        parser = RSSParser()
+        legacy = parser._process_feedparser_result(parsed_feed(["a"]))["items"][0]
+        record = parser._process_feedparser_result(parsed_feed(["a"]), compact=True)["items"][0]
+
+        assert isinstance(record, FeedRecord)
+        assert record.to_dict() == legacy
+        assert record["title"] == "Title a"
+        assert record.get("missing") is None
+
+    def test_known_guids_reuse_records(self):
+        """Test that known items are reused and duplicates are dropped."""
+        parser = RSSParser()
+        first = list(parser.iter_items(parsed_feed(["a", "b", "b"])))
+        known = {record.guid: record for record in first}
+
+        second = list(parser.iter_items(parsed_feed(["c", "a", "b"]), known))
+
+        assert [r.guid for r in first] == ["a", "b"]
+        assert [r.guid for r in second] == ["c", "a", "b"]
+        assert second[1] is known["a"]
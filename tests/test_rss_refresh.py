@@ -0,0 +1,155 @@
+"""
+Unit tests for the RSS refresh engine.
+
+Tests the deadline scheduler and the conditional-GET refresh path of the
+RSS manager using an in-memory fetcher.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.utils.rss_refresh import FeedRefreshScheduler, FetchResult
+from backend.utils.rss_singleton import FeedInfo, FeedRecord, RSSManager
+
+
+class FakeFetcher:
+    """Fetcher that answers 304 whenever the caller's ETag matches."""
+
+    def __init__(self, etag="v1"):
+        self.etag = etag
+        self.calls = []
+
+    async def fetch(self, url, etag=None, last_modified=None):
+        self.calls.append((url, etag))
+        if etag == self.etag:
+            return FetchResult(url=url, status=304, etag=etag)
+        return FetchResult(url=url, status=200, content=b"<rss/>", etag=self.etag)
+
+
+class TestFeedRefreshScheduler:
+    """Test cases for the FeedRefreshScheduler."""
+
+    def test_pop_due_returns_only_expired(self):
+        """Test that only feeds past their deadline are returned."""
+        scheduler = FeedRefreshScheduler()
+        scheduler.schedule("a", 3600, delay=0)
+        scheduler.schedule("b", 3600)
+
+        assert scheduler.pop_due() == ["a"]
+        assert "a" not in scheduler
+        assert "b" in scheduler
+
+    def test_reschedule_supersedes_old_deadline(self):
+        """Test that rescheduling a feed discards its earlier deadline."""
+        scheduler = FeedRefreshScheduler()
+        scheduler.schedule("a", 3600, delay=0)
+        scheduler.schedule("a", 3600)
+
+        assert scheduler.pop_due() == []
+        assert len(scheduler) == 1
+        assert scheduler.seconds_until_next() > 3500
+
+    def test_unschedule(self):
+        """Test that unscheduled feeds never come due."""
+        scheduler = FeedRefreshScheduler()
+        scheduler.schedule("a", 3600, delay=0)
+        scheduler.unschedule("a")
+
+        assert scheduler.pop_due(now=time.monotonic() + 10) == []
+        assert scheduler.seconds_until_next() is None
+
+
+class TestConditionalRefresh:
+    """Test cases for RSSManager.refresh_feeds_async."""
+
+    @pytest.fixture
+    def manager(self, monkeypatch):
+        """Create a manager holding a single feed with a stubbed parser."""
+        manager = RSSManager()
+        manager.feeds.clear()
+        manager.clear_cache()
+        manager.feeds["http://example.com/feed"] = FeedInfo(
+            url="http://example.com/feed", title="Example", description="", link=""
+        )
+
+        self.parse_calls = 0
+
+        def parse_content(content, compact=False, known=None):
+            self.parse_calls += 1
+            return {"title": "Example", "items": [{"title": "Item"}]}
+
+        monkeypatch.setattr(manager.parser, "parse_content", parse_content)
+        yield manager
+        manager.feeds.clear()
+        manager.clear_cache()
+
+    def test_not_modified_skips_parsing(self, manager):
+        """Test that a 304 response reuses the cached body without parsing."""
+        fetcher = FakeFetcher()
+
+        first = asyncio.run(manager.refresh_feeds_async(fetcher=fetcher))
+        second = asyncio.run(manager.refresh_feeds_async(fetcher=fetcher))
+
+        assert first == {"http://example.com/feed": True}
+        assert second == {"http://example.com/feed": True}
+        assert fetcher.calls == [
+            ("http://example.com/feed", None),
+            ("http://example.com/feed", "v1"),
+        ]
+        assert self.parse_calls == 1
+
+    def test_validators_outlive_cache_ttl(self, manager, monkeypatch):
+        """Test that a refresh after the cache TTL still sends the ETag."""
+        monkeypatch.setattr(manager.cache, "ttl", 0.05)
+        fetcher = FakeFetcher()
+
+        asyncio.run(manager.refresh_feeds_async(fetcher=fetcher))
+        time.sleep(0.1)
+
+        second = asyncio.run(manager.refresh_feeds_async(fetcher=fetcher))
+
+        assert second == {"http://example.com/feed": True}
+        assert [etag for _, etag in fetcher.calls] == [None, "v1"]
+        assert self.parse_calls == 1
+        assert manager.get_feed_items("http://example.com/feed") == [{"title": "Item"}]
+
+    def test_known_records_outlive_cache_ttl(self, manager, monkeypatch):
+        """Test that guid reuse still sees the last items after the cache TTL."""
+        monkeypatch.setattr(manager.cache, "ttl", 0.05)
+        record = FeedRecord(title="Item", link="http://example.com/1", description="", guid="1")
+        manager._store_feed_data("http://example.com/feed", {"title": "Example", "items": [record]})
+        time.sleep(0.1)
+
+        assert manager._known_records("http://example.com/feed") == {"1": record}
+
+    def test_evicted_body_drops_validators(self, manager):
+        """Test that bodies are only held by the bounded cache."""
+        fetcher = FakeFetcher()
+
+        asyncio.run(manager.refresh_feeds_async(fetcher=fetcher))
+        manager.cache.delete(manager._get_cache_key("http://example.com/feed"))
+        asyncio.run(manager.refresh_feeds_async(fetcher=fetcher))
+
+        assert [etag for _, etag in fetcher.calls] == [None, None]
+        assert self.parse_calls == 2
+
+    def test_refresh_reschedules_feed(self, manager):
+        """Test that refreshed feeds are scheduled for their next interval."""
+        asyncio.run(manager.refresh_feeds_async(fetcher=FakeFetcher()))
+
+        assert "http://example.com/feed" in manager.scheduler
+        assert manager.scheduler.pop_due() == []
+
+    def test_network_error_marks_feed(self, manager):
+        """Test that failed fetches record a network error status."""
+
+        class FailingFetcher:
+            async def fetch(self, url, etag=None, last_modified=None):
+                return FetchResult(url=url, status=0, error="boom")
+
+        results = asyncio.run(manager.refresh_feeds_async(fetcher=FailingFetcher()))
+
+        assert results == {"http://example.com/feed": False}
+        assert manager.feeds["http://example.com/feed"].error_message == "boom"
@@ -0,0 +1,111 @@
+"""
+Unit tests for the RSS search index.
+
+Tests incremental indexing, ranked queries, time windows and persistence.
+"""
+
+from datetime import datetime, timedelta
+
+from backend.utils.rss_search import RSSSearchIndex, tokenize
+from backend.utils.rss_singleton import FeedRecord
+
+
+def make_item(guid, title, description="", hours_ago=1):
+    return {
+        "guid": guid,
+        "title": title,
+        "link": f"http://example.com/{guid}",
+        "description": description,
+        "content": None,
+        "published": datetime.now() - timedelta(hours=hours_ago),
+    }
+
+
+class TestTokenize:
+    """Test cases for tokenize."""
+
+    def test_strips_markup_and_lowercases(self):
+        """Test that HTML tags are dropped and tokens are lowercased."""
+        assert tokenize("<p>Senate <b>Votes</b></p>") == ["senate", "votes"]
+        assert tokenize(None) == []
+
+
+class TestRSSSearchIndex:
+    """Test cases for the RSSSearchIndex."""
+
+    def test_ranked_multi_term_search(self):
+        """Test that title matches outrank body matches."""
+        index = RSSSearchIndex()
+        index.update_feed(
+            "feed",
+            [
+                make_item("1", "Budget vote delayed", "The senate budget debate"),
+                make_item("2", "Weather report", "Senate budget mentioned briefly"),
+                make_item("3", "Sports roundup"),
+            ],
+        )
+
+        results = index.search("senate budget")
+
+        assert [r["guid"] for r in results] == ["1", "2"]
+        assert results[0]["feed_url"] == "feed"
+        assert index.search("budget", feeds=["other"]) == []
+
+    def test_incremental_update_only_reindexes_changes(self):
+        """Test that unchanged items are not re-tokenised."""
+        index = RSSSearchIndex()
+        items = [make_item("1", "Alpha"), make_item("2", "Beta")]
+
+        assert index.update_feed("feed", items) == 2
+        assert index.update_feed("feed", items) == 0
+        assert index.update_feed("feed", [items[0], make_item("3", "Gamma")]) == 1
+        assert index.search("beta") == []
+        assert len(index) == 2
+
+    def test_compact_records_return_dict_shape(self):
+        """Test that FeedRecord items come back in the same shape as dict items."""
+        record = FeedRecord(
+            title="Budget vote",
+            link="http://example.com/1",
+            description="",
+            guid="1",
+            categories=("politics",),
+            enclosures=({"url": "http://example.com/1.mp3"},),
+        )
+        index = RSSSearchIndex()
+        index.update_feed("feed", [record])
+
+        result = index.search("budget")[0]
+
+        assert result == dict(record.to_dict(), feed_url="feed")
+        assert result["categories"] == ["politics"]
+        assert result["enclosures"] == [{"url": "http://example.com/1.mp3"}]
+
+    def test_recent_window(self):
+        """Test that time-window queries return newest items first."""
+        index = RSSSearchIndex()
+        index.update_feed(
+            "feed",
+            [
+                make_item("old", "Old", hours_ago=48),
+                make_item("a", "A", hours_ago=2),
+                make_item("b", "B", hours_ago=1),
+            ],
+        )
+
+        recent = index.recent(datetime.now() - timedelta(hours=24))
+
+        assert [r["guid"] for r in recent] == ["b", "a"]
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved index can be reloaded."""
+        path = tmp_path / "index.json"
+        index = RSSSearchIndex(path)
+        index.update_feed("feed", [make_item("1", "Persistent headline")])
+        assert index.save()
+
+        restored = RSSSearchIndex(path)
+        assert restored.load()
+        results = restored.search("headline")
+        assert len(results) == 1
+        assert isinstance(results[0]["published"], datetime)
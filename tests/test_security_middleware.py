@@ -0,0 +1,144 @@
+"""
+Unit tests for the security middleware.
+
+Tests the compiled route-security matcher against ordered pattern matching,
+the verified-token cache in JWTManager and rate limit checks.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.rate_limit_store import MemoryRateLimitStore, SQLiteRateLimitStore
+from app.security_middleware import (JWTManager, RateLimiter, RateLimitRule, RateLimitType,
+                                     RouteSecurityMatcher, SecurityConfig, SecurityLevel,
+                                     SecurityMiddleware)
+
+
+class TestRouteSecurityMatcher:
+    """Test cases for RouteSecurityMatcher."""
+
+    ROUTES = {
+        "/api/admin/users": SecurityLevel.SYSTEM,
+        "/api/admin/*": SecurityLevel.ADMIN,
+        "/api/public/status": SecurityLevel.ADMIN,
+        "/api/*/health": SecurityLevel.PUBLIC,
+        "/api/public/*": SecurityLevel.PUBLIC,
+    }
+
+    def test_first_matching_pattern_wins(self):
+        """Test that results follow the order patterns were declared in."""
+        matcher = RouteSecurityMatcher(self.ROUTES)
+
+        assert matcher.match("/api/admin/users") == SecurityLevel.SYSTEM
+        assert matcher.match("/api/admin/health") == SecurityLevel.ADMIN
+        assert matcher.match("/api/public/status") == SecurityLevel.ADMIN
+        assert matcher.match("/api/public/x/health") == SecurityLevel.PUBLIC
+        assert matcher.match("/api/other") is None
+
+    def test_pattern_characters_are_literal(self):
+        """Test that only ``*`` is treated as a wildcard."""
+        matcher = RouteSecurityMatcher({"/api/v1.0/*": SecurityLevel.ADMIN})
+
+        assert matcher.match("/api/v1.0/items") == SecurityLevel.ADMIN
+        assert matcher.match("/api/v1x0/items") is None
+
+    def test_middleware_recompiles_on_update(self):
+        """Test that added routes take effect immediately."""
+        middleware = SecurityMiddleware(SecurityConfig(jwt_secret="secret"))
+        middleware.set_endpoint_security("/api/reports/*", SecurityLevel.ADMIN)
+
+        assert middleware._get_required_security_level("/api/reports/1") == SecurityLevel.ADMIN
+        assert middleware._get_required_security_level("/docs") == SecurityLevel.PUBLIC
+
+    def test_routes_cannot_bypass_matcher(self):
+        """Test that the route table is read-only and reassigning it recompiles."""
+        middleware = SecurityMiddleware(SecurityConfig(jwt_secret="secret"))
+
+        with pytest.raises(TypeError):
+            middleware.endpoint_security["/api/reports/*"] = SecurityLevel.ADMIN
+
+        middleware.endpoint_security = {
+            **middleware.endpoint_security,
+            "/api/reports/*": SecurityLevel.ADMIN,
+        }
+        assert middleware._get_required_security_level("/api/reports/1") == SecurityLevel.ADMIN
+        assert list(middleware.endpoint_security)[-1] == "/api/reports/*"
+
+
+class TestTokenCache:
+    """Test cases for the verified-token cache."""
+
+    def test_repeat_verification_hits_cache(self):
+        """Test that a verified token is served from the cache."""
+        manager = JWTManager("secret")
+        token = manager.create_token("u1", "alice", ["user"])
+
+        first = manager.verify_token(token)
+        second = manager.verify_token(token)
+
+        assert first is second
+        assert manager.get_cache_stats()["hits"] == 1
+
+    def test_invalid_tokens_are_not_cached(self):
+        """Test that tokens with a bad signature are rejected every time."""
+        manager = JWTManager("secret")
+        forged = JWTManager("other").create_token("u1", "alice", ["admin"])
+
+        assert manager.verify_token(forged) is None
+        assert manager.verify_token(forged) is None
+        assert manager.get_cache_stats()["cached_tokens"] == 0
+
+    def test_expired_tokens_leave_cache(self, monkeypatch):
+        """Test that a cached token stops verifying once it expires."""
+        manager = JWTManager("secret")
+        token = manager.create_token("u1", "alice", ["user"], expiry_hours=1)
+        manager.verify_token(token)
+
+        later = time.time() + 2 * 3600
+        monkeypatch.setattr(time, "time", lambda: later)
+
+        assert manager.verify_token(token) is None
+        assert manager.get_cache_stats()["cached_tokens"] == 0
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used tokens are evicted."""
+        manager = JWTManager("secret", cache_size=2)
+        tokens = [manager.create_token(f"u{i}", f"user{i}", []) for i in range(3)]
+        for token in tokens:
+            manager.verify_token(token)
+
+        assert manager.get_cache_stats()["cached_tokens"] == 2
+
+
+class TestRateLimitChecks:
+    """Test cases for rate limit rules and async checks."""
+
+    def test_rule_requires_positive_limit_and_window(self):
+        """Test that rules which could divide by zero are rejected."""
+        with pytest.raises(ValueError):
+            RateLimitRule(0, 60, RateLimitType.PER_IP)
+        with pytest.raises(ValueError):
+            RateLimitRule(10, 0, RateLimitType.PER_IP)
+
+    def test_blocking_store_runs_off_event_loop(self, tmp_path):
+        """Test that SQLite checks run in a worker thread and memory checks inline."""
+        rule = RateLimitRule(2, 60, RateLimitType.PER_IP)
+
+        async def check(store):
+            limiter = RateLimiter(store)
+            threads = []
+            check = limiter.check
+            limiter.check = lambda *args: threads.append(threading.get_ident()) or check(*args)
+            allowed = [await limiter.is_allowed_async("ip", rule) for _ in range(3)]
+            return allowed, threads
+
+        allowed, threads = asyncio.run(check(SQLiteRateLimitStore(tmp_path / "limits.db")))
+        assert allowed == [True, True, False]
+        assert threading.get_ident() not in threads
+
+        allowed, threads = asyncio.run(check(MemoryRateLimitStore()))
+        assert allowed == [True, True, False]
+        assert set(threads) == {threading.get_ident()}
@@ -0,0 +1,193 @@
+"""
+Unit tests for the system orchestrator's startup and supervision.
+
+Components are small Python processes started with ``command``, covering
+dependency waves, cycle detection, restart backoff, readiness failures,
+rollback of a failed startup and restarts by the supervisor and self-healing.
+"""
+
+import asyncio
+import importlib
+import signal
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("psutil")
+pytest.importorskip("yaml")
+pytest.importorskip("requests")
+
+RUNS = [sys.executable, "-c", "import time; time.sleep(60)"]
+FAILS = [sys.executable, "-c", "import sys; sys.exit(3)"]
+
+
+@pytest.fixture
+def orchestrator_module(tmp_path, monkeypatch):
+    # The module logs to a file in the working directory
+    monkeypatch.chdir(tmp_path)
+    return importlib.import_module("scripts.system_orchestrator")
+
+
+@pytest.fixture
+def orchestrator(orchestrator_module, monkeypatch):
+    monkeypatch.setattr(signal, "signal", lambda *args: None)
+    orchestrator = orchestrator_module.ConservativeResearchOrchestrator()
+    orchestrator.components = {}
+    orchestrator.config["system"].update(
+        startup_grace_period=0.2,
+        startup_timeout=5,
+        shutdown_timeout=2,
+        restart_backoff_base=0.01,
+        restart_backoff_max=0.04,
+    )
+    return orchestrator
+
+
+def add_component(orchestrator, module, name, command=RUNS, dependencies=()):
+    orchestrator.components[name] = module.SystemComponent(
+        name=name,
+        component_type=module.ComponentType(name),
+        status=module.SystemStatus.STARTING,
+        health_score=1.0,
+        last_check=datetime.now(),
+        dependencies=list(dependencies),
+        config={"command": list(command)},
+    )
+    return orchestrator.components[name]
+
+
+class TestStartupWaves:
+    """Test cases for dependency ordering."""
+
+    def test_waves_follow_dependencies(self, orchestrator, orchestrator_module):
+        """Test that each wave depends only on earlier waves."""
+        add_component(orchestrator, orchestrator_module, "evidence_database")
+        add_component(
+            orchestrator, orchestrator_module, "news_scraper", dependencies=["evidence_database"]
+        )
+        add_component(
+            orchestrator,
+            orchestrator_module,
+            "research_agent",
+            dependencies=["evidence_database", "disabled"],
+        )
+        add_component(
+            orchestrator,
+            orchestrator_module,
+            "content_generator",
+            dependencies=["news_scraper", "research_agent"],
+        )
+
+        assert orchestrator._calculate_startup_waves() == [
+            ["evidence_database"],
+            ["news_scraper", "research_agent"],
+            ["content_generator"],
+        ]
+
+    def test_cycle_is_rejected(self, orchestrator, orchestrator_module):
+        """Test that a dependency cycle raises instead of starting anything."""
+        add_component(
+            orchestrator, orchestrator_module, "news_scraper", dependencies=["research_agent"]
+        )
+        add_component(
+            orchestrator, orchestrator_module, "research_agent", dependencies=["news_scraper"]
+        )
+        add_component(orchestrator, orchestrator_module, "evidence_database")
+
+        with pytest.raises(ValueError, match="news_scraper, research_agent"):
+            orchestrator._calculate_startup_waves()
+
+
+class TestRestartBackoff:
+    """Test cases for _restart_delay."""
+
+    def test_delay_doubles_up_to_cap_and_resets(self, orchestrator, orchestrator_module):
+        """Test exponential growth, the cap, and the reset after a stable run."""
+        component = add_component(orchestrator, orchestrator_module, "qa_generator")
+        orchestrator.config["system"].update(
+            restart_backoff_base=1.0, restart_backoff_max=5.0, restart_backoff_reset=600
+        )
+
+        delays = [orchestrator._restart_delay(component) for _ in range(5)]
+        assert delays == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+        component.started_at = time.monotonic() - 601
+        assert orchestrator._restart_delay(component) == 1.0
+
+
+class TestProcessLifecycle:
+    """Test cases for starting, rolling back and supervising processes."""
+
+    def test_exiting_process_fails_readiness(self, orchestrator, orchestrator_module):
+        """Test that a process that exits during its grace period is not ready."""
+        component = add_component(orchestrator, orchestrator_module, "qa_generator", FAILS)
+
+        assert not asyncio.run(orchestrator._start_component("qa_generator"))
+        assert component.status == orchestrator_module.SystemStatus.ERROR
+        assert component.process.returncode == 3
+
+    def test_failed_wave_stops_started_components(self, orchestrator, orchestrator_module):
+        """Test that components from earlier waves are stopped when a later one fails."""
+        database = add_component(orchestrator, orchestrator_module, "evidence_database")
+        add_component(
+            orchestrator,
+            orchestrator_module,
+            "news_scraper",
+            FAILS,
+            dependencies=["evidence_database"],
+        )
+
+        async def passes():
+            return True
+
+        orchestrator._pre_startup_checks = passes
+
+        assert not asyncio.run(orchestrator.start_system())
+        assert orchestrator.system_status == orchestrator_module.SystemStatus.ERROR
+        assert database.process.returncode is not None
+        assert database.status == orchestrator_module.SystemStatus.STOPPED
+        assert database.supervisor is None
+
+    def test_supervisor_restarts_exited_process(self, orchestrator, orchestrator_module):
+        """Test that an unexpected exit is restarted after its backoff."""
+        exits_later = [sys.executable, "-c", "import time; time.sleep(0.4)"]
+        component = add_component(orchestrator, orchestrator_module, "qa_generator", exits_later)
+
+        async def scenario():
+            assert await orchestrator._start_component("qa_generator")
+            first = component.process
+            deadline = time.monotonic() + 5
+            running = orchestrator_module.SystemStatus.RUNNING
+            while component.process is first or component.status != running:
+                assert time.monotonic() < deadline
+                await asyncio.sleep(0.05)
+            await orchestrator._stop_component("qa_generator")
+            return first
+
+        first = asyncio.run(scenario())
+        assert first.returncode == 0
+        assert component.restart_count >= 1
+        assert component.error_count >= 1
+
+    def test_self_healing_keeps_and_cancels_restart_task(self, orchestrator, orchestrator_module):
+        """Test that the restart task is stored on the component and cancelled on stop."""
+        component = add_component(orchestrator, orchestrator_module, "qa_generator")
+        orchestrator.config["system"].update(restart_backoff_base=30, restart_backoff_max=30)
+
+        async def scenario():
+            component.status = orchestrator_module.SystemStatus.CRITICAL
+            await orchestrator._perform_self_healing()
+            restarter = component.restarter
+            await asyncio.sleep(0)
+            await orchestrator._perform_self_healing()
+            assert component.restarter is restarter
+
+            await orchestrator._stop_component("qa_generator")
+            await asyncio.gather(restarter, return_exceptions=True)
+            return restarter
+
+        restarter = asyncio.run(scenario())
+        assert restarter.cancelled()
+        assert component.restarter is None
@@ -0,0 +1,324 @@
+"""
+Unit tests for the task queue manager.
+
+Tests priority ordering with aging, execution classes and their limits,
+bounded history with lookups that fall back to the task_queue table, and
+recovery of unfinished tasks.
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from backend.task_queue_manager import (
+    ExecutionClass,
+    Task,
+    TaskQueueManager,
+    TaskStatus,
+    TaskTypeMetrics,
+)
+
+SCHEMA_SQL = Path(__file__).resolve().parent.parent / "schema.sql"
+
+
+async def drain(manager, expected):
+    """Run workers until ``expected`` tasks have finished."""
+    await manager.start()
+    deadline = time.monotonic() + 5
+    while manager.completed_count + manager.failed_count < expected:
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+    await manager.stop()
+
+
+def process_id(data):
+    """Process-pool handler; must be importable to be pickled."""
+    return os.getpid()
+
+
+class TestPriorityQueue:
+    """Test cases for heap ordering."""
+
+    def test_higher_priority_runs_first(self):
+        """Test that tasks run by priority, then by age."""
+        order = []
+        manager = TaskQueueManager({"max_workers": 1})
+        manager.register_handler("job", lambda data: order.append(data["name"]))
+
+        async def scenario():
+            await manager.add_task("job", {"name": "low"}, priority="low")
+            await manager.add_task("job", {"name": "high"}, priority=5)
+            await manager.add_task("job", {"name": "medium"})
+            await drain(manager, 3)
+
+        asyncio.run(scenario())
+        assert order == ["high", "medium", "low"]
+
+    def test_aging_lifts_waiting_tasks(self):
+        """Test that a long wait outranks a small priority gap."""
+        manager = TaskQueueManager({"aging_interval": 10})
+        waiting = Task("waiting", "job", {}, priority=0)
+        waiting.enqueued_at -= 30
+        manager._push(Task("fresh", "job", {}, priority=2))
+        manager._push(waiting)
+
+        assert manager._pop_ready().task_id == "waiting"
+        assert manager._pop_ready().task_id == "fresh"
+
+    def test_cancelled_task_is_skipped(self):
+        """Test that cancelled tasks never reach a worker."""
+        ran = []
+        manager = TaskQueueManager({"max_workers": 1})
+        manager.register_handler("job", lambda data: ran.append(data["n"]))
+
+        async def scenario():
+            cancelled = await manager.add_task("job", {"n": 1})
+            await manager.add_task("job", {"n": 2})
+            assert await manager.cancel_task(cancelled)
+            await drain(manager, 1)
+            return await manager.get_task_status(cancelled)
+
+        status = asyncio.run(scenario())
+        assert ran == [2]
+        assert status["status"] == TaskStatus.CANCELLED.value
+
+    def test_capped_type_is_skipped_without_scanning(self):
+        """Test that tasks waiting at a type's cap are not popped to reach others."""
+        manager = TaskQueueManager()
+        manager.register_handler("video", lambda data: None, concurrency=1)
+        manager._type_metrics["video"] = TaskTypeMetrics()
+        manager._type_metrics["video"].running = 1
+        for n in range(50_000):
+            manager._push(Task(f"video-{n}", "video", {}, priority=2))
+        manager._push(Task("job", "job", {}))
+
+        started = time.perf_counter()
+        assert manager._pop_ready().task_id == "job"
+        assert manager._pop_ready() is None
+        assert time.perf_counter() - started < 0.01
+        assert len(manager._heaps["video"]) == 50_000
+
+
+class TestExecutionClasses:
+    """Test cases for handler execution classes and limits."""
+
+    def test_blocking_handler_runs_off_loop(self):
+        """Test that a thread handler does not stall async handlers."""
+        finished = []
+        manager = TaskQueueManager({"max_workers": 2})
+        manager.register_handler("blocking", lambda data: time.sleep(0.3) or finished.append("blocking"))
+
+        async def quick(data):
+            finished.append("quick")
+
+        manager.register_handler("quick", quick)
+
+        async def scenario():
+            await manager.add_task("blocking", {}, priority=1)
+            await manager.add_task("quick", {})
+            await drain(manager, 2)
+
+        asyncio.run(scenario())
+        assert finished == ["quick", "blocking"]
+        assert manager.handler_specs["blocking"].execution == ExecutionClass.THREAD
+
+    def test_process_handler_runs_in_worker_process(self):
+        """Test that process handlers execute outside this process."""
+        manager = TaskQueueManager({"max_workers": 1, "process_pool_size": 1})
+        manager.register_handler("cpu", process_id, execution="process")
+
+        async def scenario():
+            task_id = await manager.add_task("cpu", {})
+            await drain(manager, 1)
+            return await manager.get_task_status(task_id)
+
+        status = asyncio.run(scenario())
+        assert status["status"] == "completed"
+        assert status["result"] != os.getpid()
+
+    def test_concurrency_limit_and_timeout(self):
+        """Test per-type caps, timeouts and the reported metrics."""
+        running = []
+        peak = []
+
+        async def limited(data):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.05)
+            running.pop()
+
+        async def slow(data):
+            await asyncio.sleep(5)
+
+        manager = TaskQueueManager({"max_workers": 4})
+        manager.register_handler("limited", limited, concurrency=1)
+        manager.register_handler("slow", slow, timeout=0.05)
+
+        async def scenario():
+            for _ in range(4):
+                await manager.add_task("limited", {})
+            slow_id = await manager.add_task("slow", {})
+            manager._pending[slow_id].max_retries = 1
+            await drain(manager, 5)
+
+        asyncio.run(scenario())
+        metrics = manager.get_status()["execution"]
+        assert max(peak) == 1
+        assert manager.failed_count == 1
+        assert metrics["task_types"]["slow"]["timeouts"] == 1
+        assert metrics["task_types"]["limited"]["executed"] == 4
+        assert metrics["pools"]["async"]["peak_in_flight"] >= 2
+
+    def test_timed_out_pool_work_holds_its_slot(self):
+        """Test that a timed-out thread task counts as running until its worker ends."""
+        starts = []
+
+        def blocking(data):
+            starts.append(time.monotonic())
+            time.sleep(0.3)
+
+        manager = TaskQueueManager({"max_workers": 2})
+        manager.register_handler(
+            "blocking", blocking, ExecutionClass.THREAD, concurrency=1, timeout=0.05
+        )
+
+        async def scenario():
+            for _ in range(2):
+                task_id = await manager.add_task("blocking", {})
+                manager._pending[task_id].max_retries = 1
+            await manager.start()
+            await asyncio.sleep(0.15)
+            during = manager.get_execution_metrics()
+            await drain(manager, 2)
+            await asyncio.sleep(0.4)
+            return during, manager.get_execution_metrics()
+
+        during, after = asyncio.run(scenario())
+        assert during["pools"]["thread"]["in_flight"] == 1
+        assert during["pools"]["thread"]["abandoned"] == 1
+        assert during["task_types"]["blocking"]["running"] == 1
+        # The second task waited for the abandoned worker, not just the timeout
+        assert starts[1] - starts[0] >= 0.28
+        assert after["pools"]["thread"]["in_flight"] == 0
+        assert after["task_types"]["blocking"]["running"] == 0
+
+
+class TestDurableHistory:
+    """Test cases for bounded history and persistence."""
+
+    def test_evicted_history_is_loaded_from_table(self, tmp_path):
+        """Test that tasks dropped from memory are still found by id."""
+        manager = TaskQueueManager({"db_path": str(tmp_path / "tasks.db"), "history_size": 2})
+        manager.register_handler("job", lambda data: data["n"] * 2)
+
+        async def scenario():
+            ids = [await manager.add_task("job", {"n": n}) for n in range(5)]
+            await drain(manager, 5)
+            return ids, await manager.get_task_status(ids[0])
+
+        ids, status = asyncio.run(scenario())
+        assert len(manager._history) == 2
+        assert ids[0] not in manager._history
+        assert status["status"] == "completed"
+        assert status["result"] == 0
+
+    def test_unfinished_tasks_are_recovered(self, tmp_path):
+        """Test that pending and interrupted tasks are requeued on restart."""
+        db_path = str(tmp_path / "tasks.db")
+        crashed = TaskQueueManager({"db_path": db_path, "lease_ttl": 0.01})
+
+        async def enqueue():
+            pending = await crashed.add_task("job", {"n": 1})
+            running = await crashed.add_task("job", {"n": 2})
+            task = crashed._pop_ready()
+            task.status = TaskStatus.RUNNING
+            crashed._persist(task)
+            return pending, running
+
+        asyncio.run(enqueue())
+        time.sleep(0.05)
+
+        restarted = TaskQueueManager({"db_path": db_path})
+        restarted.register_handler("job", lambda data: data["n"])
+        asyncio.run(drain(restarted, 2))
+
+        assert restarted.recovered_count == 2
+        assert restarted.completed_count == 2
+        assert restarted.store.count_by_status() == {"completed": 2}
+
+    def test_priority_is_stored_by_name(self, tmp_path):
+        """Test that priorities are written as task_queue names and read back."""
+        manager = TaskQueueManager({"db_path": str(tmp_path / "tasks.db")})
+
+        async def scenario():
+            return [await manager.add_task("job", {}, priority=p) for p in ("high", -1, 7)]
+
+        ids = asyncio.run(scenario())
+        rows = dict(
+            manager.store._conn.execute("SELECT task_id, priority FROM task_queue").fetchall()
+        )
+        assert [rows[task_id] for task_id in ids] == ["high", "low", "critical"]
+
+        assert manager.store.load(ids[0]).priority == 1
+
+    def test_live_lease_is_not_reclaimed(self, tmp_path):
+        """Test that a second process leaves another owner's live tasks alone."""
+        db_path = str(tmp_path / "tasks.db")
+        first = TaskQueueManager({"db_path": db_path})
+        task_id = asyncio.run(first.add_task("job", {}))
+
+        second = TaskQueueManager({"db_path": db_path})
+        assert second.recovered_count == 0
+        assert task_id not in second._pending
+
+    def test_expired_task_runs_once(self, tmp_path):
+        """Test that a task taken over after its lease lapsed is not run by its old owner."""
+        db_path = str(tmp_path / "tasks.db")
+        stalled = TaskQueueManager({"db_path": db_path, "lease_ttl": 0.01})
+        task_id = asyncio.run(stalled.add_task("job", {}))
+        time.sleep(0.05)
+
+        runs = []
+        taker = TaskQueueManager({"db_path": db_path})
+        taker.register_handler("job", lambda data: runs.append("taker"))
+        asyncio.run(drain(taker, 1))
+
+        assert taker.recovered_count == 1
+        assert not stalled._claim(stalled._pop_ready())
+        assert runs == ["taker"]
+        assert taker.store.load(task_id).status == TaskStatus.COMPLETED
+
+    def test_schema_sql_table_is_migrated(self, tmp_path):
+        """Test that the schema.sql task_queue layout is usable and its rows untouched."""
+        db_path = str(tmp_path / "tasks.db")
+        conn = sqlite3.connect(db_path)
+        for statement in SCHEMA_SQL.read_text().split(";"):
+            if "EXISTS task_queue" in statement or "ON task_queue(" in statement:
+                conn.execute(statement)
+        conn.execute(
+            "INSERT INTO task_queue (task_id, task_type, payload) VALUES ('foreign', 'other', '{}')"
+        )
+        conn.commit()
+        conn.close()
+
+        manager = TaskQueueManager({"db_path": db_path})
+        manager.register_handler("job", lambda data: data["n"])
+
+        async def scenario():
+            task_id = await manager.add_task("job", {"n": 4}, priority="high")
+            await drain(manager, 1)
+            return task_id
+
+        task_id = asyncio.run(scenario())
+        rows = {
+            row[0]: row[1:]
+            for row in manager.store._conn.execute(
+                "SELECT task_id, priority, status FROM task_queue"
+            )
+        }
+        assert rows[task_id] == (1, "completed")
+        assert rows["foreign"] == (5, "pending")
+        assert manager.store.load(task_id).result == 4
+        assert manager.recovered_count == 0
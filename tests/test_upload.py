@@ -0,0 +1,220 @@
+"""
+Unit tests for the upload service.
+
+Covers streamed single-request uploads, the incremental size limit,
+content-addressed deduplication, resumable multi-part uploads and the
+metadata index.
+"""
+
+import asyncio
+import hashlib
+import io
+
+import pytest
+
+from backend.api import upload
+from backend.api.upload import HTTPException, UploadFile, UploadService
+
+
+class ChunkedBody:
+    """Async request body that records the largest read it served"""
+
+    def __init__(self, data: bytes):
+        self.buffer = io.BytesIO(data)
+        self.largest_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = self.buffer.read(size)
+        self.largest_read = max(self.largest_read, len(chunk))
+        return chunk
+
+
+def make_upload(data: bytes, filename: str = "master.txt") -> UploadFile:
+    return UploadFile(filename=filename, content_type="text/plain", file=ChunkedBody(data))
+
+
+@pytest.fixture(autouse=True)
+def upload_dirs(tmp_path, monkeypatch):
+    for name, path in (
+        ("UPLOAD_DIR", tmp_path),
+        ("BLOB_DIR", tmp_path / ".blobs"),
+        ("PARTIAL_DIR", tmp_path / ".partial"),
+    ):
+        path.mkdir(exist_ok=True)
+        monkeypatch.setattr(upload, name, path)
+    monkeypatch.setattr(upload, "UPLOAD_INDEX_DB", tmp_path / ".index.db")
+    monkeypatch.setattr(upload, "UPLOAD_CHUNK_SIZE", 1024)
+    monkeypatch.setattr(upload, "MAX_FILE_SIZE", 64 * 1024)
+    return tmp_path
+
+
+class TestStreamingUpload:
+    """Test cases for single-request uploads."""
+
+    def test_upload_streams_and_hashes_in_chunks(self, upload_dirs):
+        """Test that the body is read in chunks and hashed while written."""
+        data = bytes(range(256)) * 100
+        file = make_upload(data)
+
+        response = asyncio.run(UploadService.upload_file(file))
+
+        info = response.file_info
+        assert info.size == len(data)
+        assert info.file_hash == hashlib.sha256(data).hexdigest()
+        assert file.file.largest_read == 1024
+        assert (upload_dirs / info.filename).read_bytes() == data
+        assert not list((upload_dirs / ".partial").iterdir())
+
+    def test_oversized_upload_is_rejected_while_streaming(self, upload_dirs):
+        """Test that uploads past MAX_FILE_SIZE fail with 413 and leave nothing behind."""
+        file = make_upload(b"x" * (100 * 1024))
+
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(UploadService.upload_file(file))
+
+        assert exc.value.status_code == 413
+        # Stopped right after crossing the limit rather than reading everything
+        assert file.file.buffer.tell() == 65 * 1024
+        assert [p for p in upload_dirs.rglob("*") if p.is_file()] == []
+
+    def test_identical_content_shares_one_blob(self, upload_dirs):
+        """Test that duplicate uploads link to one blob until the last is deleted."""
+        first = asyncio.run(UploadService.upload_file(make_upload(b"same bytes"))).file_info
+        second = asyncio.run(UploadService.upload_file(make_upload(b"same bytes"))).file_info
+
+        blobs = list((upload_dirs / ".blobs").iterdir())
+        assert [blob.name for blob in blobs] == [first.file_hash]
+        assert first.file_id != second.file_id
+        assert UploadService.list_files().total == 2
+
+        UploadService.delete_file(first.file_id)
+        assert blobs[0].exists()
+        UploadService.delete_file(second.file_id)
+        assert not blobs[0].exists()
+
+
+class TestResumableUpload:
+    """Test cases for multi-part uploads."""
+
+    def test_parts_resume_from_reported_offset(self, upload_dirs):
+        """Test that parts append at the stored offset and complete into a file."""
+        data = b"abcdefgh" * 1000
+        session = UploadService.start_upload("master.txt", total_size=len(data))
+
+        asyncio.run(UploadService.upload_part(session.upload_id, 0, make_upload(data[:3000])))
+
+        # A retried part at a stale offset is refused
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(UploadService.upload_part(session.upload_id, 0, make_upload(data)))
+        assert exc.value.status_code == 409
+
+        # Simulate a restart losing the in-memory hash state
+        UploadService._hashers.clear()
+        offset = UploadService.get_upload_status(session.upload_id).offset
+        assert offset == 3000
+        asyncio.run(
+            UploadService.upload_part(session.upload_id, offset, make_upload(data[offset:]))
+        )
+
+        response = UploadService.complete_upload(
+            session.upload_id, expected_hash=hashlib.sha256(data).hexdigest()
+        )
+        assert response.file_info.size == len(data)
+        assert (upload_dirs / response.file_info.filename).read_bytes() == data
+        assert not list((upload_dirs / ".partial").iterdir())
+
+    def test_concurrent_part_for_same_upload_is_refused(self, upload_dirs):
+        """Test that a retried part is refused while the original is still streaming."""
+        data = b"0123456789" * 500
+        session = UploadService.start_upload("master.txt", total_size=len(data))
+
+        class SlowBody(ChunkedBody):
+            async def read(self, size: int = -1) -> bytes:
+                await asyncio.sleep(0.01)
+                return await super().read(size)
+
+        async def scenario():
+            original = asyncio.create_task(
+                UploadService.upload_part(
+                    session.upload_id, 0, UploadFile("master.txt", "text/plain", SlowBody(data))
+                )
+            )
+            # Let it start streaming but not yet write its first chunk
+            await asyncio.sleep(0)
+            with pytest.raises(HTTPException) as exc:
+                await UploadService.upload_part(session.upload_id, 0, make_upload(data))
+            assert exc.value.status_code == 409
+            return await original
+
+        assert asyncio.run(scenario()).offset == len(data)
+        response = UploadService.complete_upload(
+            session.upload_id, expected_hash=hashlib.sha256(data).hexdigest()
+        )
+        assert (upload_dirs / response.file_info.filename).read_bytes() == data
+
+    def test_incomplete_upload_cannot_complete(self):
+        """Test that completing before total_size bytes arrive is refused."""
+        session = UploadService.start_upload("master.txt", total_size=10)
+        asyncio.run(UploadService.upload_part(session.upload_id, 0, make_upload(b"12345")))
+
+        with pytest.raises(HTTPException) as exc:
+            UploadService.complete_upload(session.upload_id)
+        assert exc.value.status_code == 409
+
+        UploadService.abort_upload(session.upload_id)
+        with pytest.raises(HTTPException):
+            UploadService.get_upload_status(session.upload_id)
+
+
+class TestUploadIndex:
+    """Test cases for the upload metadata index."""
+
+    def upload(self, data: bytes, filename: str = "master.txt"):
+        return asyncio.run(UploadService.upload_file(make_upload(data, filename))).file_info
+
+    def test_lookups_use_cached_metadata(self, upload_dirs, monkeypatch):
+        """Test that file info comes from the index without re-hashing the file."""
+        info = self.upload(b"indexed content")
+        monkeypatch.setattr(UploadService, "_calculate_file_hash", None)
+
+        found = UploadService.get_file_info(info.file_id)
+        assert found.file_hash == info.file_hash
+        assert found.original_filename == "master.txt"
+        assert UploadService.get_file_path(info.file_id) == upload_dirs / info.filename
+
+        with pytest.raises(HTTPException) as exc:
+            UploadService.get_file_info("missing")
+        assert exc.value.status_code == 404
+
+    def test_keyset_pagination_walks_every_file_once(self):
+        """Test that following next_cursor lists each file once, newest first."""
+        uploaded = [self.upload(f"file {i}".encode()).file_id for i in range(7)]
+
+        seen, cursor = [], None
+        while True:
+            page = UploadService.list_files(limit=3, cursor=cursor)
+            seen.extend(info.file_id for info in page.files)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert page.total == 7
+        assert seen == uploaded[::-1]
+        assert [f.file_id for f in UploadService.list_files(limit=2, offset=2).files] == seen[2:4]
+
+    def test_reconcile_rebuilds_index_from_disk(self, upload_dirs):
+        """Test that reconcile adds unindexed files and drops records of missing ones."""
+        kept = self.upload(b"kept")
+        gone = self.upload(b"gone")
+        (upload_dirs / gone.filename).unlink()
+        (upload_dirs / "legacy_report.pdf").write_bytes(b"from before the index")
+
+        stats = upload.reconcile_upload_index()
+
+        assert stats == {"added": 1, "removed": 1, "updated": 0}
+        legacy = UploadService.get_file_info("legacy")
+        assert legacy.original_filename == "report.pdf"
+        assert legacy.content_type == "application/pdf"
+        assert legacy.file_hash == hashlib.sha256(b"from before the index").hexdigest()
+        assert UploadService.get_file_info(kept.file_id).file_hash == kept.file_hash
+        assert UploadService.list_files().total == 2
@@ -0,0 +1,111 @@
+"""
+Unit tests for the video engine.
+
+Covers ordered parallel batch processing without leaking batch positions into
+cached results, and batch frame extraction for invalid and valid inputs
+using a small script in place of the ffmpeg binary.
+"""
+
+import os
+import stat
+
+import pytest
+
+from backend.engines import frame_pipeline, media_probe
+from backend.engines.video_engine import VideoEngine
+
+FAKE_FFMPEG = """#!/bin/sh
+# Writes two frames to the output pattern (the last argument)
+for last; do :; done
+for i in 1 2; do
+    printf 'jpeg' > "$(printf "$last" "$i")"
+done
+"""
+
+
+@pytest.fixture
+def no_ffprobe(monkeypatch):
+    monkeypatch.setattr(media_probe, "ffprobe_available", lambda: False)
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    path = tmp_path / "ffmpeg"
+    path.write_text(FAKE_FFMPEG)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(frame_pipeline, "FFMPEG_BIN", str(path))
+    return path
+
+
+def make_videos(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"clip{i}.mp4"
+        path.write_bytes(bytes([i]) * (100 + i))
+        paths.append(str(path))
+    return paths
+
+
+class TestBatchProcess:
+    """Test cases for VideoEngine.batch_process."""
+
+    def test_results_follow_input_order(self, tmp_path, no_ffprobe):
+        """Test that threaded processing returns results in input order."""
+        paths = make_videos(tmp_path, 6)
+        engine = VideoEngine(max_workers=3)
+
+        results = engine.batch_process(paths, ["validate", "info"])
+
+        assert [r["batch_index"] for r in results] == list(range(6))
+        assert [r["file_path"] for r in results] == paths
+        assert [r["results"]["info"]["info"]["file_size"] for r in results] == [
+            100 + i for i in range(6)
+        ]
+
+    def test_batch_index_stays_out_of_cache(self, tmp_path, no_ffprobe):
+        """Test that cached results are shared without each batch's position."""
+        paths = make_videos(tmp_path, 2)
+        engine = VideoEngine(max_workers=2)
+
+        first = engine.batch_process(paths, ["validate"])
+        second = engine.batch_process(list(reversed(paths)), ["validate"])
+
+        assert engine.cache.stats()["hits"] == 2
+        assert (first[0]["batch_index"], second[1]["batch_index"]) == (0, 1)
+        assert second[0]["file_path"] == paths[1] and second[0]["batch_index"] == 0
+        assert "batch_index" not in engine.process_video(paths[0], ["validate"])
+
+
+class TestBatchExtract:
+    """Test cases for VideoEngine.iter_batch_extract."""
+
+    def test_invalid_and_valid_inputs(self, tmp_path, no_ffprobe, fake_ffmpeg):
+        """Test that invalid files are reported and valid ones decoded, by batch index."""
+        valid = make_videos(tmp_path, 2)
+        (tmp_path / "notes.txt").write_text("not a video")
+        paths = [valid[0], str(tmp_path / "missing.mp4"), str(tmp_path / "notes.txt"), valid[1]]
+        engine = VideoEngine()
+
+        results = {
+            r["batch_index"]: r
+            for r in engine.iter_batch_extract(paths, output_dir=str(tmp_path / "out"))
+        }
+
+        assert sorted(results) == [0, 1, 2, 3]
+        assert results[1] == {
+            "success": False,
+            "error": "File does not exist",
+            "file_path": paths[1],
+            "batch_index": 1,
+        }
+        assert results[2]["error"].startswith("Unsupported format")
+        for index in (0, 3):
+            assert results[index]["success"]
+            assert results[index]["file_path"] == paths[index]
+            assert results[index]["frames_written"] == 2
+            assert all(os.path.exists(frame) for frame in results[index]["frames"])
+
+    def test_unknown_kind_is_rejected(self, tmp_path):
+        """Test that an unsupported extraction kind raises."""
+        with pytest.raises(ValueError):
+            next(VideoEngine().iter_batch_extract(make_videos(tmp_path, 1), kind="audio"))
@@ -0,0 +1,357 @@
+"""
+Unit tests for the WebSocket pub/sub bridges.
+
+Tests that topic and user messages published by one manager reach sockets
+held by another exactly once, over the Unix socket broker and Redis.
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.websocket_bridge import RedisBridge, UnixSocketBridge
+from app.websocket_manager import MessageType, WebSocketManager, WebSocketMessage
+
+
+class FakeWebSocket:
+    """Records sent frames"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, data):
+        self.sent.append(json.loads(data))
+
+
+def make_message(n: int = 0) -> WebSocketMessage:
+    return WebSocketMessage(
+        id=str(uuid.uuid4()),
+        type=MessageType.NOTIFICATION,
+        payload={"n": n},
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+async def wait_for(predicate, timeout: float = 2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def start_worker(bridge, user_id=None, topic="dashboard"):
+    manager = WebSocketManager(bridge=bridge)
+    await manager.start()
+    ws = FakeWebSocket()
+    connection_id = await manager.add_connection(ws, user_id=user_id)
+    await manager.subscribe(connection_id, topic)
+    return manager, ws
+
+
+class TestUnixSocketBridge:
+    """Test cases for the local broker bridge."""
+
+    def test_topic_reaches_other_worker_once(self, tmp_path):
+        """Test that each worker's sockets get a published message once."""
+
+        async def scenario():
+            path = tmp_path / "bridge.sock"
+            a, ws_a = await start_worker(UnixSocketBridge(path))
+            b, ws_b = await start_worker(UnixSocketBridge(path))
+
+            for n in range(100):
+                await a.publish_to_topic("dashboard", make_message(n))
+            await wait_for(lambda: len(ws_b.sent) == 100)
+            await asyncio.sleep(0.05)
+
+            assert [m["payload"]["n"] for m in ws_a.sent] == list(range(100))
+            assert [m["payload"]["n"] for m in ws_b.sent] == list(range(100))
+            # Everything published in one tick travels as one frame
+            assert a.bridge.stats()["batches_sent"] == 1
+            assert a.bridge.is_broker and not b.bridge.is_broker
+
+            await b.stop()
+            await a.stop()
+
+        asyncio.run(scenario())
+
+    def test_send_to_user_on_other_worker(self, tmp_path):
+        """Test that user messages reach the worker holding the user's socket."""
+
+        async def scenario():
+            path = tmp_path / "bridge.sock"
+            a, _ = await start_worker(UnixSocketBridge(path))
+            b, ws_b = await start_worker(UnixSocketBridge(path), user_id="alice")
+
+            assert await a.send_to_user("alice", make_message(1)) == 0
+            await wait_for(lambda: len(ws_b.sent) == 1)
+
+            await b.stop()
+            await a.stop()
+
+        asyncio.run(scenario())
+
+    def test_clients_elect_new_broker(self, tmp_path):
+        """Test that remaining workers keep relaying after the broker exits."""
+
+        async def scenario():
+            path = tmp_path / "bridge.sock"
+            broker, _ = await start_worker(UnixSocketBridge(path))
+            b, _ = await start_worker(UnixSocketBridge(path))
+            c, ws_c = await start_worker(UnixSocketBridge(path))
+
+            await broker.stop()
+            await wait_for(lambda: b.bridge.is_broker or c.bridge.is_broker)
+            await wait_for(lambda: b.bridge._writer is not None and c.bridge._writer is not None)
+
+            await b.publish_to_topic("dashboard", make_message(5))
+            await wait_for(lambda: len(ws_c.sent) == 1)
+
+            await c.stop()
+            await b.stop()
+
+        asyncio.run(scenario())
+
+    def test_unrelayed_batches_are_resent_after_reconnect(self, tmp_path):
+        """Test that messages the broker never relayed arrive once after failover."""
+
+        async def scenario():
+            path = tmp_path / "bridge.sock"
+            bridge = UnixSocketBridge(path)
+
+            async def swallow(reader, writer):
+                # Accepts frames but relays nothing, like a broker about to crash
+                bridge._peers.add(writer)
+                while await reader.readline():
+                    pass
+
+            bridge._serve_peer = swallow
+            broker, _ = await start_worker(bridge)
+            b, ws_b = await start_worker(UnixSocketBridge(path))
+            c, ws_c = await start_worker(UnixSocketBridge(path))
+
+            await b.publish_to_topic("dashboard", make_message(1))
+            await wait_for(lambda: b.bridge.stats()["unacked"] == 1)
+            await broker.stop()
+            await b.publish_to_topic("dashboard", make_message(2))
+
+            await wait_for(lambda: len(ws_c.sent) == 2)
+            await asyncio.sleep(0.1)
+
+            assert [m["payload"]["n"] for m in ws_c.sent] == [1, 2]
+            assert [m["payload"]["n"] for m in ws_b.sent] == [1, 2]
+            assert b.bridge.stats()["unacked"] == 0
+            assert b.bridge.stats()["resent"] == 1
+
+            await c.stop()
+            await b.stop()
+
+        asyncio.run(scenario())
+
+    def test_failed_reconnect_is_retried(self, tmp_path):
+        """Test that a client keeps trying to reconnect after a failed attempt."""
+
+        async def scenario():
+            path = tmp_path / "bridge.sock"
+            a, _ = await start_worker(UnixSocketBridge(path))
+            b, ws_b = await start_worker(UnixSocketBridge(path))
+            attempts = []
+            open_bridge = b.bridge._open
+
+            async def flaky_open():
+                attempts.append(1)
+                if len(attempts) == 1:
+                    raise OSError("broker not ready")
+                return await open_bridge()
+
+            b.bridge._open = flaky_open
+            await a.stop()
+            await wait_for(lambda: b.bridge.is_broker, timeout=5)
+            await wait_for(lambda: b.bridge._writer is not None)
+
+            c, _ = await start_worker(UnixSocketBridge(path))
+            await c.publish_to_topic("dashboard", make_message(3))
+            await wait_for(lambda: len(ws_b.sent) == 1)
+
+            assert len(attempts) == 2
+            await c.stop()
+            await b.stop()
+
+        asyncio.run(scenario())
+
+
+    @pytest.mark.parametrize(
+        "error", [ConnectionResetError("reset by peer"), ValueError("line is too long")]
+    )
+    def test_read_error_reconnects(self, tmp_path, error):
+        """Test that a reset or oversized frame while reading leads to a reconnect."""
+
+        async def scenario():
+            path = tmp_path / "bridge.sock"
+            a, _ = await start_worker(UnixSocketBridge(path))
+            bridge = UnixSocketBridge(path)
+            readers = []
+            open_bridge = bridge._open
+
+            async def tracked_open():
+                readers.append(await open_bridge())
+                return readers[-1]
+
+            bridge._open = tracked_open
+            b, ws_b = await start_worker(bridge)
+
+            readers[-1].set_exception(error)
+            await wait_for(lambda: bridge.reconnects == 1 and bridge._writer is not None)
+            await a.publish_to_topic("dashboard", make_message(4))
+            await wait_for(lambda: len(ws_b.sent) == 1)
+
+            assert not bridge._reader_task.done()
+            await b.stop()
+            await a.stop()
+
+        asyncio.run(scenario())
+
+
+class TestDeduplication:
+    """Test cases for exactly-once delivery."""
+
+    def test_repeated_envelope_is_delivered_once(self):
+        """Test that a redelivered message id is skipped."""
+
+        async def scenario():
+            manager = WebSocketManager()
+            ws = FakeWebSocket()
+            connection_id = await manager.add_connection(ws)
+            await manager.subscribe(connection_id, "dashboard")
+            envelope = {
+                "id": "m1",
+                "origin": "other-worker",
+                "kind": "topic",
+                "target": "dashboard",
+                "data": json.dumps({"id": "m1"}),
+            }
+
+            await manager._on_bridge_message(envelope)
+            await manager._on_bridge_message(envelope)
+            await wait_for(lambda: ws.sent)
+            await asyncio.sleep(0.02)
+
+            assert len(ws.sent) == 1
+            assert manager.duplicates_skipped == 1
+            await manager.disconnect_all()
+
+        asyncio.run(scenario())
+
+    def test_same_message_to_two_topics_reaches_both(self, tmp_path):
+        """Test that dedup is per target, not per message id alone."""
+
+        async def scenario():
+            path = tmp_path / "bridge.sock"
+            a, _ = await start_worker(UnixSocketBridge(path))
+            b, ws_dashboard = await start_worker(UnixSocketBridge(path))
+            ws_alerts = FakeWebSocket()
+            await b.subscribe(await b.add_connection(ws_alerts), "alerts")
+
+            message = make_message(7)
+            await a.publish_to_topic("dashboard", message)
+            await a.publish_to_topic("alerts", message)
+            await wait_for(lambda: ws_dashboard.sent and ws_alerts.sent)
+            await wait_for(lambda: a.bridge.stats()["unacked"] == 0)
+            await asyncio.sleep(0.05)
+
+            assert len(ws_dashboard.sent) == 1
+            assert len(ws_alerts.sent) == 1
+            assert b.duplicates_skipped == 0
+            await b.stop()
+            await a.stop()
+
+        asyncio.run(scenario())
+
+
+class TestRedisBridge:
+    """Test cases for the Redis bridge."""
+
+    def test_topic_reaches_other_worker_once(self):
+        """Test fan-out across workers sharing a Redis channel."""
+        fakeredis = pytest.importorskip("fakeredis")
+
+        async def scenario():
+            server = fakeredis.FakeServer()
+            a, ws_a = await start_worker(RedisBridge(client=fakeredis.FakeAsyncRedis(server=server)))
+            b, ws_b = await start_worker(RedisBridge(client=fakeredis.FakeAsyncRedis(server=server)))
+
+            for n in range(10):
+                await a.publish_to_topic("dashboard", make_message(n))
+            await wait_for(lambda: len(ws_b.sent) == 10)
+            await asyncio.sleep(0.05)
+
+            assert len(ws_a.sent) == 10
+            assert [m["payload"]["n"] for m in ws_b.sent] == list(range(10))
+
+            await b.stop()
+            await a.stop()
+
+        asyncio.run(scenario())
+
+    def test_resubscribes_and_resends_after_disconnect(self):
+        """Test that a dropped subscription is restored and unacked batches re-sent."""
+        fakeredis = pytest.importorskip("fakeredis")
+
+        class DroppingPubSub:
+            """Subscribes for real but never delivers, then fails like a lost connection"""
+
+            def __init__(self, pubsub, dropped):
+                self.pubsub = pubsub
+                self.dropped = dropped
+
+            async def subscribe(self, channel):
+                await self.pubsub.subscribe(channel)
+
+            async def listen(self):
+                await self.dropped.wait()
+                raise ConnectionError("connection lost")
+                yield
+
+            async def aclose(self):
+                await self.pubsub.aclose()
+
+        async def scenario():
+            server = fakeredis.FakeServer()
+            a, ws_a = await start_worker(RedisBridge(client=fakeredis.FakeAsyncRedis(server=server)))
+            client = fakeredis.FakeAsyncRedis(server=server)
+            dropped = asyncio.Event()
+            real_pubsub = client.pubsub
+            calls = []
+
+            def pubsub(**kwargs):
+                calls.append(1)
+                if len(calls) == 1:
+                    return DroppingPubSub(real_pubsub(**kwargs), dropped)
+                return real_pubsub(**kwargs)
+
+            client.pubsub = pubsub
+            b, ws_b = await start_worker(RedisBridge(client=client, reconnect_delay=0.01))
+
+            await b.publish_to_topic("dashboard", make_message(1))
+            await wait_for(lambda: len(ws_a.sent) == 1)
+            assert b.bridge.stats()["unacked"] == 1
+
+            dropped.set()
+            await wait_for(lambda: b.bridge.stats()["unacked"] == 0)
+            await a.publish_to_topic("dashboard", make_message(2))
+            await wait_for(lambda: len(ws_b.sent) == 2)
+            await asyncio.sleep(0.05)
+
+            assert [m["payload"]["n"] for m in ws_a.sent] == [1, 2]
+            assert a.duplicates_skipped == 1
+            assert b.bridge.stats()["reconnects"] == 1
+            assert b.bridge.stats()["resent"] == 1
+
+            await b.stop()
+            await a.stop()
+
+        asyncio.run(scenario())
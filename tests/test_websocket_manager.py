@@ -0,0 +1,183 @@
+"""
+Unit tests for the WebSocket manager.
+
+Tests that broadcasts are serialised once and delivered concurrently through
+per-connection queues, and the slow-consumer policies.
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+
+from app.websocket_manager import (MessageType, SlowConsumerPolicy, WebSocketManager,
+                                   WebSocketMessage)
+
+
+class FakeWebSocket:
+    """Records sent frames, optionally blocking until released"""
+
+    def __init__(self, delay: float = 0.0, gate: asyncio.Event = None):
+        self.delay = delay
+        self.gate = gate
+        self.sent = []
+        self.closed = False
+
+    async def send(self, data):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+    async def close(self):
+        self.closed = True
+
+
+def make_message(n: int = 0) -> WebSocketMessage:
+    return WebSocketMessage(
+        id=str(uuid.uuid4()),
+        type=MessageType.NOTIFICATION,
+        payload={"n": n},
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+async def drain(manager: WebSocketManager):
+    queues = [c.outbound.join() for c in manager.connections.values()]
+    await asyncio.wait_for(asyncio.gather(*queues), timeout=2)
+
+
+class TestBroadcast:
+    """Test cases for concurrent fan-out."""
+
+    def test_slow_client_does_not_delay_others(self):
+        """Test that broadcast returns without waiting on any client."""
+
+        async def scenario():
+            manager = WebSocketManager()
+            gate = asyncio.Event()
+            slow = FakeWebSocket(gate=gate)
+            fast = [FakeWebSocket() for _ in range(20)]
+            await manager.add_connection(slow)
+            for ws in fast:
+                await manager.add_connection(ws)
+
+            queued = await asyncio.wait_for(manager.broadcast(make_message()), timeout=1)
+            await drain_fast(fast)
+
+            assert queued == 21
+            assert all(len(ws.sent) == 1 for ws in fast)
+            assert slow.sent == []
+
+            gate.set()
+            await drain(manager)
+            assert len(slow.sent) == 1
+            assert fast[0].sent[0] == slow.sent[0]
+            await manager.disconnect_all()
+
+        async def drain_fast(sockets):
+            for _ in range(100):
+                if all(ws.sent for ws in sockets):
+                    return
+                await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+
+    def test_sends_run_concurrently(self):
+        """Test that per-client latency overlaps instead of adding up."""
+
+        async def scenario():
+            manager = WebSocketManager()
+            sockets = [FakeWebSocket(delay=0.05) for _ in range(50)]
+            for ws in sockets:
+                await manager.add_connection(ws)
+
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await manager.broadcast(make_message())
+            await drain(manager)
+
+            assert all(len(ws.sent) == 1 for ws in sockets)
+            assert loop.time() - started < 1.0
+            status = manager.get_status()["outbound"]
+            assert status["messages_sent"] == 50
+            assert status["avg_send_latency"] > 0
+            await manager.disconnect_all()
+
+        asyncio.run(scenario())
+
+    def test_topic_payload_matches_message(self):
+        """Test that topic subscribers receive the serialised message."""
+
+        async def scenario():
+            manager = WebSocketManager()
+            ws = FakeWebSocket()
+            connection_id = await manager.add_connection(ws)
+            await manager.subscribe(connection_id, "metrics")
+            await drain(manager)
+            ws.sent.clear()
+
+            message = make_message(7)
+            assert await manager.publish_to_topic("metrics", message) == 1
+            await drain(manager)
+
+            data = json.loads(ws.sent[0])
+            assert data["id"] == message.id
+            assert data["payload"] == {"n": 7}
+            await manager.disconnect_all()
+
+        asyncio.run(scenario())
+
+
+class TestSlowConsumers:
+    """Test cases for full outbound queues."""
+
+    def run_policy(self, policy):
+        async def scenario():
+            manager = WebSocketManager(max_queue_size=3, slow_consumer_policy=policy)
+            gate = asyncio.Event()
+            ws = FakeWebSocket(gate=gate)
+            connection_id = await manager.add_connection(ws)
+
+            # The first frame is held by the blocked sender, the next three fill the queue
+            await manager.broadcast(make_message(0))
+            await asyncio.sleep(0.01)
+            for n in range(1, 6):
+                await manager.broadcast(make_message(n))
+
+            status = manager.get_status()["outbound"]
+            connected = connection_id in manager.connections
+            gate.set()
+            await drain(manager)
+            return ws, status, connected
+
+        return asyncio.run(scenario())
+
+    def sent_numbers(self, ws):
+        return [json.loads(frame)["payload"]["n"] for frame in ws.sent]
+
+    def test_drop_oldest_keeps_latest(self):
+        """Test that the default policy discards the oldest queued frames."""
+        ws, status, connected = self.run_policy(SlowConsumerPolicy.DROP_OLDEST)
+
+        assert connected
+        assert status["messages_dropped"] == 2
+        assert status["max_queue_depth"] == 3
+        assert self.sent_numbers(ws) == [0, 3, 4, 5]
+
+    def test_drop_newest_keeps_earliest(self):
+        """Test that DROP_NEWEST rejects frames once the queue is full."""
+        ws, status, connected = self.run_policy(SlowConsumerPolicy.DROP_NEWEST)
+
+        assert connected
+        assert status["messages_dropped"] == 2
+        assert self.sent_numbers(ws) == [0, 1, 2, 3]
+
+    def test_disconnect_policy_closes_connection(self):
+        """Test that DISCONNECT removes and closes a lagging client."""
+        ws, status, connected = self.run_policy(SlowConsumerPolicy.DISCONNECT)
+
+        assert not connected
+        assert ws.closed
+        assert status["slow_consumer_disconnects"] == 1
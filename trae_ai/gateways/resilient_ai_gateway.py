@@ -4,13 +4,21 @@ Resilient AI Gateway - Production-Ready Failover System
 Provides intelligent failover and circuit breaker functionality for WebAI services.
 """
 
+import asyncio
+import inspect
 import json
 import logging
 import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
+try:
+    from backend.utils.response_cache import ResponseCache, make_cache_key
+except ImportError:
+    ResponseCache = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,6 +35,41 @@ class CircuitBreakerState:
     next_attempt_time: Optional[datetime] = None
 
 
+class ProviderLatencyStats:
+    """Rolling window of request latencies and outcomes for a provider"""
+
+    __slots__ = ("latencies", "outcomes")
+
+    def __init__(self, window: int = 100):
+        self.latencies: deque = deque(maxlen=window)  # seconds, successful requests only
+        self.outcomes: deque = deque(maxlen=window)  # True for success
+
+    def record(self, latency: float, success: bool):
+        self.outcomes.append(success)
+        if success:
+            self.latencies.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    @property
+    def failure_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": len(self.outcomes),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "failure_rate": self.failure_rate,
+        }
+
+
 class WebRequestError(Exception):
     """Custom exception for web request errors"""
 
@@ -45,10 +88,18 @@ class ResilientAIGateway:
     - Comprehensive logging and metrics
     """
 
+    MIN_LATENCY_SAMPLES = 5  # Samples needed before a provider's p95 is trusted
+
     def __init__(
         self,
         provider_priority: Optional[List[str]] = None,
         config_path: Optional[str] = None,
+        provider_timeout: float = 30.0,
+        hedge: bool = False,
+        hedge_delay: Optional[float] = None,
+        latency_window: int = 100,
+        response_cache: Optional["ResponseCache"] = None,
+        cache_responses: bool = True,
     ):
         """
         Initialize the Resilient AI Gateway
@@ -56,6 +107,13 @@ class ResilientAIGateway:
         Args:
             provider_priority: List of providers in order of preference
             config_path: Path to configuration file
+            provider_timeout: Per-provider timeout for achat_completion, in seconds
+            hedge: Whether achat_completion hedges slow providers by default
+            hedge_delay: Fixed hedge delay; by default each provider's rolling p95
+            latency_window: Number of recent requests kept per provider
+            response_cache: Cache for responses; by default one configured from
+                the AI_GATEWAY_CACHE, AI_GATEWAY_CACHE_DB and AI_GATEWAY_CACHE_TTL env vars
+            cache_responses: Set to False to send every request to a provider
         """
         # Import WebAIClient dynamically to avoid import issues
         self.client = None
@@ -87,6 +145,21 @@ class ResilientAIGateway:
             }
         self.last_reset = datetime.now()
 
+        # Async mode: per-provider timeouts, latency-aware ordering and hedging
+        self.provider_timeout = provider_timeout
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.latency_stats = {
+            provider: ProviderLatencyStats(latency_window) for provider in self.provider_priority
+        }
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+        # Repeated prompts are answered from cache; identical in-flight prompts share one call
+        if response_cache is None and cache_responses and ResponseCache is not None:
+            response_cache = ResponseCache.from_env("AI_GATEWAY", "gateway_responses")
+        self.response_cache = response_cache if cache_responses else None
+
         logger.info(f"ResilientAIGateway initialized with providers: {self.provider_priority}")
 
     def _init_client(self, config_path: Optional[str] = None):
@@ -219,6 +292,18 @@ class ResilientAIGateway:
         Raises:
             ConnectionError: If all providers fail
         """
+        if self.response_cache is None:
+            return self._chat_completion(prompt, preferred_provider)
+        return self.response_cache.get_or_compute(
+            self._cache_key(prompt, preferred_provider),
+            lambda: self._chat_completion(prompt, preferred_provider),
+        )
+
+    def _cache_key(self, prompt: str, preferred_provider: Optional[str]) -> str:
+        return make_cache_key(prompt, gateway="resilient_ai", provider=preferred_provider)
+
+    def _chat_completion(self, prompt: str, preferred_provider: Optional[str] = None) -> str:
+        """Uncached chat_completion"""
         # Adjust provider priority if preferred provider is specified
         providers_to_try = self.provider_priority.copy()
         if preferred_provider and preferred_provider in providers_to_try:
@@ -250,9 +335,11 @@ class ResilientAIGateway:
                 logger.info(f"🔄 GATEWAY: Attempting request with {provider}...")
 
                 # Use the WebAI client's chat_completion method
+                started = time.perf_counter()
                 response = self.client.chat_completion(provider, prompt)
 
                 # Update metrics and circuit breaker
+                self.latency_stats[provider].record(time.perf_counter() - started, True)
                 self._update_metrics(provider, True)
                 self._update_circuit_breaker(provider, True)
 
@@ -264,6 +351,7 @@ class ResilientAIGateway:
                 logger.warning(f"❌ GATEWAY: FAILED with {provider}. Error: {error_message}")
 
                 # Update metrics and circuit breaker
+                self.latency_stats[provider].record(time.perf_counter() - started, False)
                 self._update_metrics(provider, False)
                 self._update_circuit_breaker(provider, False, error_message)
 
@@ -279,6 +367,182 @@ class ResilientAIGateway:
         logger.error(f"🚨 GATEWAY: {error_msg}")
         raise ConnectionError(error_msg) from last_error
 
+    def _ordered_providers(self, preferred_provider: Optional[str] = None) -> List[str]:
+        """Order providers by rolling latency, keeping configured priority for ties
+
+        Providers without enough samples score zero, so they stay in priority
+        order ahead of measured ones and every provider gets measured. A
+        provider's p95 is inflated by its recent failure rate.
+        """
+
+        def score(provider: str) -> float:
+            stats = self.latency_stats[provider]
+            p95 = stats.percentile(0.95)
+            if p95 is None or len(stats.outcomes) < self.MIN_LATENCY_SAMPLES:
+                return 0.0
+            return p95 / max(0.05, 1 - stats.failure_rate)
+
+        providers = sorted(
+            self.provider_priority,
+            key=lambda provider: (score(provider), self.provider_priority.index(provider)),
+        )
+        if preferred_provider and preferred_provider in providers:
+            providers.remove(preferred_provider)
+            providers.insert(0, preferred_provider)
+        return providers
+
+    def _get_hedge_delay(self, provider: str) -> float:
+        """How long to wait on ``provider`` before hedging with the next one"""
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        stats = self.latency_stats[provider]
+        p95 = stats.percentile(0.95)
+        if p95 is None or len(stats.latencies) < self.MIN_LATENCY_SAMPLES:
+            # Without history, hedge halfway to the timeout
+            return self.provider_timeout / 2
+        return p95
+
+    async def _call_provider(self, provider: str, prompt: str) -> Any:
+        """Run one provider request, awaiting async clients and threading sync ones"""
+        if inspect.iscoroutinefunction(self.client.chat_completion):
+            return await self.client.chat_completion(provider, prompt)
+
+        # A timed-out sync call keeps its thread until the client returns
+        response = await asyncio.to_thread(self.client.chat_completion, provider, prompt)
+        if inspect.isawaitable(response):
+            response = await response
+        return response
+
+    async def _attempt_provider(self, provider: str, prompt: str) -> Any:
+        """Call a provider with its timeout, updating metrics and circuit breaker"""
+        logger.info(f"🔄 GATEWAY: Attempting request with {provider}...")
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                self._call_provider(provider, prompt), self.provider_timeout
+            )
+        except asyncio.CancelledError:
+            # Lost a hedge race; says nothing about the provider's health
+            raise
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                e = WebRequestError(f"{provider} timed out after {self.provider_timeout}s")
+            error_message = str(e)
+            logger.warning(f"❌ GATEWAY: FAILED with {provider}. Error: {error_message}")
+            self.latency_stats[provider].record(time.perf_counter() - started, False)
+            self._update_metrics(provider, False)
+            self._update_circuit_breaker(provider, False, error_message)
+            raise e
+
+        self.latency_stats[provider].record(time.perf_counter() - started, True)
+        self._update_metrics(provider, True)
+        self._update_circuit_breaker(provider, True)
+        logger.info(f"✅ GATEWAY: SUCCESS with {provider}!")
+        return response
+
+    async def achat_completion(
+        self,
+        prompt: str,
+        preferred_provider: Optional[str] = None,
+        hedge: Optional[bool] = None,
+    ) -> Any:
+        """
+        Async chat request with per-provider timeouts and optional hedging.
+
+        Providers are tried in latency-aware order. A failure moves on to the
+        next provider immediately. With hedging, a provider that has not
+        answered within its hedge delay (its rolling p95 latency) is raced
+        against the next one, and the first success wins.
+
+        Args:
+            prompt: The message to send to the AI
+            preferred_provider: Optional preferred provider (will be tried first)
+            hedge: Override the gateway's hedging setting for this request
+
+        Returns:
+            The AI response
+
+        Raises:
+            ConnectionError: If all providers fail
+        """
+        if self.response_cache is None:
+            return await self._achat_completion(prompt, preferred_provider, hedge)
+        return await self.response_cache.aget_or_compute(
+            self._cache_key(prompt, preferred_provider),
+            lambda: self._achat_completion(prompt, preferred_provider, hedge),
+        )
+
+    async def _achat_completion(
+        self,
+        prompt: str,
+        preferred_provider: Optional[str] = None,
+        hedge: Optional[bool] = None,
+    ) -> Any:
+        """Uncached achat_completion"""
+        hedge = self.hedge if hedge is None else hedge
+        candidates = iter(self._ordered_providers(preferred_provider))
+        running: Dict[asyncio.Task, str] = {}
+        hedges: set = set()
+        attempted_providers: List[str] = []
+        last_error: Optional[Exception] = None
+
+        def launch_next() -> Optional[asyncio.Task]:
+            for provider in candidates:
+                if not self._is_circuit_available(provider):
+                    logger.info(f"⏸️  CIRCUIT OPEN for {provider}. Skipping...")
+                    continue
+                attempted_providers.append(provider)
+                task = asyncio.create_task(self._attempt_provider(provider, prompt))
+                running[task] = provider
+                return task
+            return None
+
+        logger.info(f"🚀 GATEWAY: Starting async chat completion request (hedge={hedge})")
+        exhausted = launch_next() is None
+        try:
+            while running:
+                timeout = None
+                if hedge and not exhausted:
+                    timeout = self._get_hedge_delay(attempted_providers[-1])
+
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # The latest provider is slower than its p95; race the next one
+                    task = launch_next()
+                    exhausted = task is None
+                    if task is not None:
+                        hedges.add(task)
+                        self.hedged_requests += 1
+                        logger.info(f"⏩ GATEWAY: Hedging with {running[task]}")
+                    continue
+
+                for task in done:
+                    running.pop(task)
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    if task in hedges:
+                        self.hedge_wins += 1
+                    return response
+
+                if not running:
+                    exhausted = launch_next() is None
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        error_msg = (
+            f"All AI providers failed. Attempted: {attempted_providers}. Last error: {last_error}"
+        )
+        logger.error(f"🚨 GATEWAY: {error_msg}")
+        raise ConnectionError(error_msg) from last_error
+
     def start_chat_completion(self, provider: str, prompt: str) -> str:
         """
         Direct provider chat completion (for backward compatibility)
@@ -311,7 +575,13 @@ class ResilientAIGateway:
                 "failed_requests": self.failed_requests,
                 "provider_stats": self.provider_stats,
                 "last_reset": self.last_reset.isoformat(),
+                "hedged_requests": self.hedged_requests,
+                "hedge_wins": self.hedge_wins,
+            },
+            "latency": {
+                provider: stats.to_dict() for provider, stats in self.latency_stats.items()
             },
+            "response_cache": self.response_cache.stats() if self.response_cache else None,
             "health_summary": {
                 "healthy_providers": 0,
                 "degraded_providers": 0,
@@ -4,6 +4,8 @@ Comprehensive Test Suite for ResilientAIGateway
 Tests failover scenarios, circuit breaker functionality, and error handling.
 """
 
+import asyncio
+import time
 import unittest
 from datetime import datetime, timedelta
 from unittest.mock import Mock
@@ -403,6 +405,136 @@ class TestIntegrationScenarios(unittest.TestCase):
         self.assertEqual(response, "Recovery response")
 
 
+class DelayedAsyncClient:
+    """Async client whose providers answer after fixed delays"""
+
+    def __init__(self, delays, failing=()):
+        self.delays = delays
+        self.failing = set(failing)
+        self.calls = []
+
+    async def chat_completion(self, provider, prompt):
+        self.calls.append(provider)
+        await asyncio.sleep(self.delays[provider])
+        if provider in self.failing:
+            raise WebRequestError(f"{provider} unavailable")
+        return f"{provider}: {prompt}"
+
+
+class TestAsyncChatCompletion(unittest.TestCase):
+    """Test suite for achat_completion"""
+
+    def make_gateway(self, delays, failing=(), **kwargs):
+        gateway = ResilientAIGateway(provider_priority=list(delays), **kwargs)
+        gateway.client = DelayedAsyncClient(delays, failing)
+        return gateway
+
+    def test_failover_without_delay(self):
+        """Test that failures move to the next provider immediately"""
+        gateway = self.make_gateway({"chatgpt": 0, "gemini": 0, "claude": 0}, failing={"chatgpt"})
+
+        started = time.perf_counter()
+        response = asyncio.run(gateway.achat_completion("Test prompt"))
+
+        self.assertEqual(response, "gemini: Test prompt")
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(gateway.circuit_breakers["chatgpt"].failure_count, 1)
+
+    def test_provider_timeout(self):
+        """Test that a hung provider fails after its timeout"""
+        gateway = self.make_gateway({"chatgpt": 5, "gemini": 0}, provider_timeout=0.1)
+
+        response = asyncio.run(gateway.achat_completion("Test prompt"))
+
+        self.assertEqual(response, "gemini: Test prompt")
+        self.assertEqual(gateway.provider_stats["chatgpt"]["failures"], 1)
+
+    def test_hedging_takes_first_success(self):
+        """Test that a slow provider is raced against the next one"""
+        gateway = self.make_gateway({"chatgpt": 1.0, "gemini": 0.02}, hedge=True, hedge_delay=0.05)
+
+        started = time.perf_counter()
+        response = asyncio.run(gateway.achat_completion("Test prompt"))
+
+        self.assertEqual(response, "gemini: Test prompt")
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(gateway.hedged_requests, 1)
+        self.assertEqual(gateway.hedge_wins, 1)
+        # The cancelled request is not held against the slow provider
+        self.assertEqual(gateway.circuit_breakers["chatgpt"].failure_count, 0)
+
+    def test_latency_aware_ordering(self):
+        """Test that measured fast providers are tried first"""
+        gateway = self.make_gateway({"chatgpt": 0.03, "gemini": 0.0})
+        for i in range(gateway.MIN_LATENCY_SAMPLES):
+            for provider in ("chatgpt", "gemini"):
+                asyncio.run(gateway.achat_completion(f"Warm up {i}", preferred_provider=provider))
+
+        self.assertEqual(gateway._ordered_providers(), ["gemini", "chatgpt"])
+        self.assertEqual(gateway._ordered_providers("chatgpt"), ["chatgpt", "gemini"])
+
+    def test_open_circuit_is_skipped(self):
+        """Test that open circuits are honoured in async mode"""
+        gateway = self.make_gateway({"chatgpt": 0, "gemini": 0})
+        gateway.circuit_breakers["chatgpt"].state = "open"
+        gateway.circuit_breakers["chatgpt"].next_attempt_time = datetime.now() + timedelta(minutes=5)
+
+        response = asyncio.run(gateway.achat_completion("Test prompt"))
+
+        self.assertEqual(response, "gemini: Test prompt")
+        self.assertEqual(gateway.client.calls, ["gemini"])
+
+    def test_all_providers_fail(self):
+        """Test that ConnectionError is raised when every provider fails"""
+        gateway = self.make_gateway({"chatgpt": 0, "gemini": 0}, failing={"chatgpt", "gemini"})
+
+        with self.assertRaises(ConnectionError):
+            asyncio.run(gateway.achat_completion("Test prompt", hedge=True))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test suite for the gateway response cache"""
+
+    def test_repeated_prompt_is_served_from_cache(self):
+        """Test that whitespace-equivalent prompts hit the cache"""
+        gateway = ResilientAIGateway(provider_priority=["chatgpt", "gemini"])
+        mock_client = Mock()
+        mock_client.chat_completion.return_value = "Cached response"
+        gateway.client = mock_client
+
+        gateway.chat_completion("Summarise  the report")
+        response = gateway.chat_completion(" Summarise the report\n")
+
+        self.assertEqual(response, "Cached response")
+        self.assertEqual(mock_client.chat_completion.call_count, 1)
+        self.assertEqual(gateway.get_gateway_status()["response_cache"]["hits"], 1)
+
+    def test_concurrent_prompts_share_one_call(self):
+        """Test that identical in-flight async prompts are coalesced"""
+        gateway = ResilientAIGateway(provider_priority=["chatgpt"])
+        gateway.client = DelayedAsyncClient({"chatgpt": 0.05})
+
+        async def burst():
+            return await asyncio.gather(*(gateway.achat_completion("Same") for _ in range(10)))
+
+        responses = asyncio.run(burst())
+
+        self.assertEqual(set(responses), {"chatgpt: Same"})
+        self.assertEqual(gateway.client.calls, ["chatgpt"])
+        self.assertEqual(gateway.response_cache.stats()["coalesced"], 9)
+
+    def test_failures_are_not_cached(self):
+        """Test that a failed request is retried on the next call"""
+        gateway = ResilientAIGateway(provider_priority=["chatgpt"])
+        mock_client = Mock()
+        mock_client.chat_completion.side_effect = [WebRequestError("down"), "Recovered"]
+        gateway.client = mock_client
+
+        with self.assertRaises(ConnectionError):
+            gateway.chat_completion("Test prompt")
+        self.assertEqual(gateway.chat_completion("Test prompt"), "Recovered")
+
+
 if __name__ == "__main__":
     # Configure test logging
     import logging
@@ -417,6 +549,8 @@ if __name__ == "__main__":
         TestResilientAIGateway,
         TestCircuitBreakerState,
         TestIntegrationScenarios,
+        TestAsyncChatCompletion,
+        TestResponseCache,
     ]
 
     for test_class in test_classes: